@@ -0,0 +1,133 @@
+"""
+Benchmark the explorer generators against frozen inputs and check them against recorded baselines (see explorer_tools/benchmark.py).
+
+Run it from the `scripts` folder, with a Python environment that has the packages of the generators (e.g. `poetry run` from one of the explorer folders):
+
+    python benchmark_explorers.py                       # compare all generators with their baselines
+    python benchmark_explorers.py --save                # record baselines for all generators
+    python benchmark_explorers.py --freeze              # copy the current sheet and catalog caches into the fixtures
+    python benchmark_explorers.py "wbpip/*" --repeat 5  # only the World Bank PIP generators, best of 5 runs
+
+The fixtures and baselines are committed in `scripts/benchmark` (see the README there), so a clean checkout can run the benchmark offline. Timings depend on the machine, so record the baselines on the machine that checks them.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent.absolute()
+sys.path.append(str(HERE / "poverty-inequality-explorers"))
+from explorer_tools.benchmark import (  # noqa: E402
+    BENCHMARK_DIR,
+    BenchmarkError,
+    compare,
+    freeze_fixtures,
+    load_baselines,
+    measure,
+    save_baselines,
+)
+from explorer_tools.runner import Job, select_jobs  # noqa: E402
+from generate_all_explorers import GENERATORS as POVERTY_GENERATORS  # noqa: E402
+
+GENERATORS = [
+    Job(name, HERE / name / f"{name}.py")
+    for name in [
+        "demography-explorer",
+        "global-food-explorer",
+        "migration-flows-explorer",
+    ]
+] + POVERTY_GENERATORS
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the explorer generators against frozen inputs."
+    )
+    parser.add_argument(
+        "patterns",
+        nargs="*",
+        help="Only run the generators whose name matches one of these glob patterns (e.g. 'wid/*')",
+    )
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        default=BENCHMARK_DIR / "fixtures",
+        help="Folder with the frozen sheets and catalog caches (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--baselines",
+        type=Path,
+        default=BENCHMARK_DIR / "baselines.json",
+        help="JSON file with the baselines (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown or memory increase that counts as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Run every generator this many times and keep the best time, since short runs are noisy (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Record the measurements as the new baselines instead of comparing them",
+    )
+    parser.add_argument(
+        "--freeze",
+        action="store_true",
+        help="Copy the inputs of the generators from the current caches into the fixtures and exit",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List the generators and exit"
+    )
+    args = parser.parse_args()
+
+    try:
+        jobs = select_jobs(GENERATORS, args.patterns)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.list:
+        for job in jobs:
+            print(job.name)
+        sys.exit()
+
+    if args.freeze:
+        freeze_fixtures(jobs, args.fixtures)
+        sys.exit()
+
+    baselines = load_baselines(args.baselines)
+    measurements = []
+    n_problems = 0
+    for job in jobs:
+        try:
+            measurement = measure(job, args.fixtures, repeat=args.repeat)
+        except BenchmarkError as e:
+            print(f"🛑 {e}")
+            n_problems += 1
+            continue
+        measurements.append(measurement)
+        summary = f"{measurement.seconds:.2f}s, {measurement.peak_rss_mb:.0f} MB, {measurement.views} views ({measurement.default_views} default), {measurement.lines} lines"
+
+        if args.save:
+            print(f"💾 {job.name}: {summary}")
+        elif job.name not in baselines:
+            print(f"⚠️ {job.name}: {summary} (no baseline)")
+        else:
+            problems = compare(measurement, baselines[job.name], args.threshold)
+            n_problems += bool(problems)
+            print(f"{'🛑' if problems else '✅'} {job.name}: {summary}")
+            for problem in problems:
+                print(f"  {problem}")
+
+    if args.save:
+        save_baselines(args.baselines, measurements)
+        print(f"💾 Baselines written to {args.baselines}")
+    if n_problems:
+        print(f"🛑 {n_problems} of {len(jobs)} generators failed or regressed")
+        sys.exit(1)
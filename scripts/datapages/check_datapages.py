@@ -0,0 +1,71 @@
+"""
+Check all the datapages in the `datapages` folder against their schema (see explorer_tools/datapage_schema.py), and update the index of the charts they are shown on:
+
+    python check_datapages.py
+    python check_datapages.py --index /tmp/chart-ids.json
+
+The index (`datapages/index/chart-ids.json` by default) maps every chart id to the file of its datapage. It is only written if it changed, and not at all if a chart is claimed by several datapages. The index is committed: the Datapages workflow (.github/workflows/datapages.yml) runs this script and fails if it changes the index.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent.absolute()
+sys.path.append(str(HERE.parent))
+from explorer_tools.datapage_schema import (  # noqa: E402
+    CHART_INDEX_PATH,
+    chart_index,
+    validate_datapages,
+    write_chart_index,
+)
+from explorer_tools.paths import DATAPAGES_DIR  # noqa: E402
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check the datapages and update the index of their charts."
+    )
+    parser.add_argument(
+        "--folder",
+        type=Path,
+        default=DATAPAGES_DIR,
+        help="Folder with the datapages (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=CHART_INDEX_PATH,
+        help="Where to write the index of chart ids (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=16,
+        help="Number of datapages read at the same time (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    datapages, problems = validate_datapages(args.folder, max_workers=args.jobs)
+    for name, file_problems in problems.items():
+        print(f"🛑 {name}: {len(file_problems)} problems")
+        for problem in file_problems:
+            print(f"  {problem}")
+
+    index = chart_index(datapages)
+    for chart_id, names in index.conflicts.items():
+        print(
+            f"🛑 Chart {chart_id} is claimed by {len(names)} datapages: {', '.join(names)}"
+        )
+    if index.conflicts:
+        print("⚠️ The index of chart ids was not updated")
+    elif write_chart_index(index, args.index):
+        print(f"💾 Index of {len(index.chart_ids)} chart ids written to {args.index}")
+    else:
+        print(f"✅ Index of {len(index.chart_ids)} chart ids is up to date")
+
+    print(
+        f"{'🛑' if problems else '✅'} {len(datapages) - len(problems)} of {len(datapages)} datapages are valid"
+    )
+    if problems or index.conflicts:
+        sys.exit(1)
@@ -0,0 +1,97 @@
+"""
+Apply edits to all the datapages in the `datapages` folder, in one pass (see explorer_tools/datapages.py for the syntax of the paths).
+
+Edits are applied to every datapage in the order they are given:
+
+    python edit_datapages.py --delete '$.anomaliesListText'
+    python edit_datapages.py --rename '$.sources[*].retrievedDate' retrievedOn --set '$.status' '"published"'
+    python edit_datapages.py --move '$.variantMethods' '$.descriptionFromSource.methods' --dry-run
+
+Values given to --set are JSON, so strings are quoted. Only the datapages whose content changes are written, so the formatting of the others is kept.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent.absolute()
+sys.path.append(str(HERE.parent))
+from explorer_tools.datapages import (  # noqa: E402
+    DatapageEditError,
+    Edit,
+    edit_datapages,
+)
+from explorer_tools.paths import DATAPAGES_DIR  # noqa: E402
+
+
+class AddEdit(argparse.Action):
+    # Collect the edits of all operations in one list, in the order they are given
+    def __call__(self, parser, namespace, values, option_string=None):
+        edits = getattr(namespace, self.dest) or []
+        try:
+            edits.append(Edit.parse(self.const, *values))
+        except DatapageEditError as e:
+            parser.error(str(e))
+        setattr(namespace, self.dest, edits)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Apply edits to all the datapages, in one pass."
+    )
+    for operation, metavar, help in [
+        ("delete", ("PATH",), "Remove the values at PATH"),
+        ("rename", ("PATH", "NAME"), "Rename the properties at PATH to NAME"),
+        ("set", ("PATH", "VALUE"), "Set the values at PATH to VALUE (JSON)"),
+        ("move", ("PATH", "TARGET"), "Move the value at PATH to TARGET"),
+    ]:
+        parser.add_argument(
+            f"--{operation}",
+            dest="edits",
+            action=AddEdit,
+            const=operation,
+            nargs=len(metavar),
+            metavar=metavar,
+            help=help,
+        )
+    parser.add_argument(
+        "--folder",
+        type=Path,
+        default=DATAPAGES_DIR,
+        help="Folder with the datapages (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report the datapages that would change",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=16,
+        help="Number of datapages edited at the same time (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    try:
+        results = edit_datapages(
+            args.edits or [], args.folder, dry_run=args.dry_run, max_workers=args.jobs
+        )
+    except DatapageEditError as e:
+        sys.exit(f"🛑 {e}")
+
+    n_errors = 0
+    for result in results:
+        if result.error:
+            n_errors += 1
+            print(f"🛑 {result.path.name}: {result.error}")
+        elif result.changed:
+            action = "would change" if args.dry_run else "written"
+            print(f"💾 {result.path.name}: {action} ({result.n_edits} values edited)")
+    n_changed = sum(result.changed for result in results)
+    print(
+        f"✅ {n_changed} of {len(results)} datapages {'would change' if args.dry_run else 'changed'}"
+    )
+    if n_errors:
+        sys.exit(1)
@@ -1,10 +1,31 @@
 # %%
 from os import path
+from glob import glob
+import sys
+
+sys.path.append("..")
+from explorer_tools.manifest import BuildManifest
+from explorer_tools.paths import EXPLORERS_DIR
+
+outfile = EXPLORERS_DIR / "population-and-demography.explorer.tsv"
+
+# Skip the build if neither this script nor its input files changed since the explorer was last generated
+build = BuildManifest(outfile)
+build.add_script("demography-explorer.py")
+build.add_files([*sorted(glob("*.csv")), *sorted(glob("*.tsv"))])
+if build.is_up_to_date():
+    print(f"✅ {path.abspath(outfile)} is up to date")
+    sys.exit()
+
+# %%
 from string import Template
 import textwrap
 import pandas as pd
 import re
-from collections import defaultdict
+
+from explorer_tools.output import open_output
+from explorer_tools.templating import resolve_columns
+from explorer_tools.writer import write_frame, write_template
 
 
 def file_url(tableSlug):
@@ -14,63 +35,60 @@ def file_url(tableSlug):
 
 
 # %%
-def substitute_rows(row):
-    # Rows can include placeholders like ${sex__slug}, which will be replaced here
-    for key in row.keys():
-        if isinstance(row[key], str):
-            while "${" in row[key]:
-                template = Template(row[key])
-                row[key] = template.substitute(**row)
-    return row
-
-
-def table_def(tableSlug, rows, display_names):
-    table_def = f"table	{file_url(tableSlug)}	{tableSlug}"
-    rows["ySlugs"] = rows["ySlugs"].map(lambda x: x.split(" "))
-    rows = rows.explode("ySlugs").drop_duplicates("ySlugs").reset_index(drop=True)
-
-    column_defs = rows.filter(regex="^column__", axis=1).rename(
-        columns=lambda x: re.sub("^column__", "", x)
-    )
-    column_defs = column_defs.drop(columns=["type"])
-    col_names = [
-        "slug",
-        "name",
-        "type",
-        "sourceName",
-        "sourceLink",
-        "dataPublishedBy",
-        "additionalInfo",
-        *column_defs.columns,
-    ]
-    col_names = "\t".join(col_names)
+SOURCE_COLUMNS = [
+    "United Nations, World Population Prospects (2022)",
+    "https://population.un.org/wpp/",
+    "United Nations, Department of Economic and Social Affairs, Population Division (2022). World Population Prospects 2022, Online Edition.",
+    "<p>The 2022 Revision of World Population Prospects was released on 11 July 2022 by the Population Division of the Department of Economic and Social Affairs of the United Nations.</p><p>It presents population estimates from 1950 to the present, based on historical demographic trends. It also includes projections to the year 2100 based on a range of demographic scenarios. The three scenarios that we show (‘Low’, ‘Medium’, ‘High’) differ only with respect to the level of fertility; they share the same assumptions for sex ratio at birth, life expectancy and international migration.</p><p>All values are estimated based on current country borders.</p><p>The next revision of this data by the UN is due in 2024.</p>",
+]
 
-    col_defs = [
+
+def table_defs_by_slug(df, display_names):
+    """
+    Return the table definition of every tableSlug of `df` (except empty ones), in order of appearance: one column per slug in the views' ySlugs, with the `column__*` fields of the first view that uses it.
+    """
+    column_cols = list(df.filter(regex="^column__", axis=1).columns)
+    extra_cols = [col for col in column_cols if col != "column__type"]
+    col_names = "\t".join(
         [
-            row["ySlugs"],
-            display_names[row["ySlugs"]],
-            row["column__type"],
-            "United Nations, World Population Prospects (2022)",
-            "https://population.un.org/wpp/",
-            "United Nations, Department of Economic and Social Affairs, Population Division (2022). World Population Prospects 2022, Online Edition.",
-            "<p>The 2022 Revision of World Population Prospects was released on 11 July 2022 by the Population Division of the Department of Economic and Social Affairs of the United Nations.</p><p>It presents population estimates from 1950 to the present, based on historical demographic trends. It also includes projections to the year 2100 based on a range of demographic scenarios. The three scenarios that we show (‘Low’, ‘Medium’, ‘High’) differ only with respect to the level of fertility; they share the same assumptions for sex ratio at birth, life expectancy and international migration.</p><p>All values are estimated based on current country borders.</p><p>The next revision of this data by the UN is due in 2024.</p>",
-            *column_defs.loc[idx].values.tolist(),
+            "slug",
+            "name",
+            "type",
+            "sourceName",
+            "sourceLink",
+            "dataPublishedBy",
+            "additionalInfo",
+            *[re.sub("^column__", "", col) for col in extra_cols],
         ]
-        for (idx, row) in rows.iterrows()
-    ]
-    col_defs = ["\t".join(col) for col in col_defs]
-    col_defs = textwrap.indent("\n".join(col_defs), "\t")
+    )
 
-    return f"""{table_def}
+    # One row per table and column slug
+    columns = df.loc[df["tableSlug"] != "", ["tableSlug", "ySlugs", *column_cols]]
+    columns["ySlugs"] = columns["ySlugs"].str.split(" ")
+    columns = columns.explode("ySlugs").drop_duplicates(["tableSlug", "ySlugs"])
+
+    names = columns["ySlugs"].map(display_names)
+    if names.isna().any():
+        raise KeyError(columns["ySlugs"][names.isna()].iloc[0])
+    lines = columns["ySlugs"] + "\t" + names + "\t" + columns["column__type"]
+    for value in SOURCE_COLUMNS:
+        lines = lines + "\t" + value
+    for col in extra_cols:
+        lines = lines + "\t" + columns[col]
+
+    col_defs = lines.groupby(columns["tableSlug"], sort=False).agg(
+        lambda table_lines: textwrap.indent("\n".join(table_lines), "\t")
+    )
+    return {
+        tableSlug: f"""table	{file_url(tableSlug)}	{tableSlug}
 columns	{tableSlug}
 	{col_names}
 	location	Country name	EntityName
 	year	Year	Year
-{col_defs}"""
-
+{table_col_defs}"""
+        for tableSlug, table_col_defs in col_defs.items()
+    }
 
-# %%
-outfile = "../../explorers/population-and-demography.explorer.tsv"
 
 # %%
 # Read inputs
@@ -110,7 +128,8 @@ df = df.drop_duplicates(
 
 # %%
 
-df = df.apply(substitute_rows, axis=1)
+# Rows can include placeholders like ${sex__slug}, which will be replaced here by the value of that column in the same row
+df = resolve_columns(df)
 for col in ["title", "subtitle"]:
     df[col] = (
         df[col]
@@ -126,34 +145,39 @@ for col in ["title", "subtitle"]:
 # Note the colon, and especially the quotes around the name. They are required!
 # This config will use the name "15-24 years" as the display name for the column.
 # If an explicit name is not given, the row's title will be used instead.
-col_display_names = {}
-
 y_slug_re = r"([\w\-+]+):\"([^\"]+)\""
-for idx, row in df.iterrows():
-    matches = re.finditer(y_slug_re, row["ySlugs"])
-    slugs = []
-    for match in matches:
-        col_slug, col_name = match.groups()
-        slugs.append(col_slug)
-        if col_slug not in col_display_names:
-            col_display_names[col_slug] = col_name
-
-    if len(slugs):
-        row["ySlugs"] = " ".join(slugs)
-    elif row["ySlugs"] not in col_display_names:
-        col_display_names[row["ySlugs"]] = row["title"]
+named = df["ySlugs"].str.extractall(y_slug_re)
+has_names = df.index.isin(named.index.get_level_values(0))
+
+# Names in the order in which they appear in the views (the first one for each slug wins)
+names = pd.concat(
+    [
+        pd.DataFrame(
+            {
+                "row": df.index.get_indexer(named.index.get_level_values(0)),
+                "match": named.index.get_level_values("match"),
+                "slug": named[0].to_numpy(),
+                "name": named[1].to_numpy(),
+            }
+        ),
+        pd.DataFrame(
+            {
+                "row": (~has_names).nonzero()[0],
+                "match": 0,
+                "slug": df["ySlugs"][~has_names].to_numpy(),
+                "name": df["title"][~has_names].to_numpy(),
+            }
+        ),
+    ]
+)
+names = names.sort_values(["row", "match"], kind="stable").drop_duplicates("slug")
+col_display_names = dict(zip(names["slug"], names["name"]))
+
+# Keep only the slugs in the ySlugs of the views that name their columns
+df.loc[has_names, "ySlugs"] = named[0].groupby(level=0).agg(" ".join)
 
 # %%
-tables = df["tableSlug"].unique()
-table_defs = [
-    table_def(
-        tableSlug,
-        df[df["tableSlug"] == tableSlug].reset_index(drop=True),
-        col_display_names,
-    )
-    for tableSlug in tables
-    if tableSlug != ""
-]
+table_defs = list(table_defs_by_slug(df, col_display_names).values())
 
 # %%
 
@@ -176,23 +200,20 @@ df = df.loc[:, cols]
 df = df.drop(columns=df.filter(regex="__"))
 
 # %%
-graphers_tsv = df.to_csv(sep="\t", index=False)
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
-
 table_defs = "\n".join(table_defs)
 
 # %%
 warning = "# DO NOT EDIT THIS FILE BY HAND. It is automatically generated using a set of input files. Any changes made directly to it will be overwritten.\n\n"
 
-with open(outfile, "w", newline="\n") as f:
-    f.write(
-        warning
-        + template.substitute(
-            graphers_tsv=graphers_tsv_indented,
-            table_defs=table_defs,
-        )
+# The graphers are written to the file in chunks, indented, instead of being substituted into the template as one string
+with open_output(outfile) as f:
+    f.write(warning)
+    write_template(
+        f,
+        template,
+        graphers_tsv=lambda f: write_frame(f, df, index=False),
+        table_defs=table_defs,
     )
 
-    print(f"💾 Explorer config written to {path.abspath(outfile)}")
-
 # %%
+build.save()
@@ -0,0 +1,5 @@
+"""
+Shared helpers for the scripts that generate explorer configs in `explorers/`.
+
+Scripts import this package by adding the `scripts` folder to `sys.path`, so it only depends on the standard library, pandas and numpy.
+"""
@@ -0,0 +1,198 @@
+"""
+Benchmark explorer generators against frozen inputs, and compare the results with recorded baselines.
+
+Each generator runs in its own process, with:
+- its Google Sheets tabs and catalog files read from a fixtures folder, offline (`<fixtures>/sheets` and `<fixtures>/catalog` are a sheets cache and a catalog cache, see sheets.py and catalog.py),
+- its explorer written to a temporary folder (OWID_EXPLORERS_DIR), so `explorers/` is left alone,
+- the build manifest ignored (OWID_FORCE_REBUILD), so it always runs.
+
+For every generator, the wall time of its body, the peak resident memory of its process and the number of views, default views and lines of the explorer it wrote are recorded. A generator regresses when it is more than `threshold` slower or uses more than `threshold` more memory than its baseline. Since the inputs are frozen, a different number of views, default views or lines means that its output changed.
+
+The body of a generator is what follows its last top-level import: starting the interpreter and importing pandas take longer than building most explorers, and would hide their regressions.
+
+Peak memory is read with the `resource` module, so benchmarks only run on Unix.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+from . import catalog, sheets
+from .fs import write_atomic
+from .paths import ROOT_DIR
+from .reader import parse_explorer
+
+# Committed fixtures and baselines (see the README there)
+BENCHMARK_DIR = ROOT_DIR / "scripts" / "benchmark"
+
+# Slowdowns shorter than this are noise, whatever the threshold (runs of the same body vary by a few hundredths of a second)
+SECONDS_SLACK = 0.1
+
+Measurement = namedtuple(
+    "Measurement",
+    ["name", "seconds", "peak_rss_mb", "views", "default_views", "lines"],
+)
+
+# Runs a generator and writes the wall time of its body (the statements after its last top-level import) and its peak memory to a JSON file, even if it fails
+_CHILD = """
+import ast, json, resource, sys, time
+script, stats = sys.argv[1:]
+with open(script, encoding="utf-8") as f:
+    module = ast.parse(f.read(), script)
+imports = [i for i, s in enumerate(module.body) if isinstance(s, (ast.Import, ast.ImportFrom))]
+split = imports[-1] + 1 if imports else 0
+namespace = {"__name__": "__main__", "__file__": script}
+seconds = 0.0
+try:
+    exec(compile(ast.Module(module.body[:split], []), script, "exec"), namespace)
+    start = time.perf_counter()
+    try:
+        exec(compile(ast.Module(module.body[split:], []), script, "exec"), namespace)
+    finally:
+        seconds = time.perf_counter() - start
+finally:
+    with open(stats, "w") as f:
+        json.dump({"seconds": seconds, "maxrss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}, f)
+"""
+
+
+class BenchmarkError(RuntimeError):
+    pass
+
+
+def _peak_rss_mb(maxrss):
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _count_output(output_dir):
+    outputs = sorted(Path(output_dir).glob("*.explorer.tsv"))
+    if len(outputs) != 1:
+        raise BenchmarkError(
+            f"Expected the generator to write one explorer, found {len(outputs)}"
+        )
+    text = outputs[0].read_text(encoding="utf-8")
+    explorer = parse_explorer(text, outputs[0])
+    if explorer.graphers is None:
+        return 0, 0, text.count("\n")
+    default_views = explorer.graphers.columns.get("defaultView", []).count("true")
+    return len(explorer.graphers), default_views, text.count("\n")
+
+
+def run_once(job, fixtures):
+    """
+    Run a generator once against the fixtures in a separate process and return its Measurement.
+    """
+    fixtures = Path(fixtures).absolute()
+    with tempfile.TemporaryDirectory(prefix="explorer-benchmark-") as tmp:
+        stats_path = Path(tmp) / "stats.json"
+        output_dir = Path(tmp) / "explorers"
+        output_dir.mkdir()
+        env = dict(
+            os.environ,
+            OWID_SHEETS_CACHE_DIR=str(fixtures / "sheets"),
+            OWID_SHEETS_OFFLINE="1",
+            OWID_CATALOG_CACHE_DIR=str(fixtures / "catalog"),
+            OWID_CATALOG_OFFLINE="1",
+            OWID_EXPLORERS_DIR=str(output_dir),
+            OWID_FORCE_REBUILD="1",
+        )
+        process = subprocess.run(
+            [sys.executable, "-c", _CHILD, str(job.path), str(stats_path)],
+            cwd=Path(job.path).parent,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            errors="replace",
+        )
+        if process.returncode != 0:
+            raise BenchmarkError(
+                f"{job.name} failed with exit code {process.returncode}:\n{process.stdout}"
+            )
+        stats = json.loads(stats_path.read_text())
+        views, default_views, lines = _count_output(output_dir)
+    return Measurement(
+        job.name,
+        round(stats["seconds"], 3),
+        round(_peak_rss_mb(stats["maxrss"]), 1),
+        views,
+        default_views,
+        lines,
+    )
+
+
+def measure(job, fixtures, repeat=1):
+    """
+    Run a generator `repeat` times and return the fastest time and the highest peak memory of the runs.
+    """
+    runs = [run_once(job, fixtures) for _ in range(repeat)]
+    return runs[0]._replace(
+        seconds=min(run.seconds for run in runs),
+        peak_rss_mb=max(run.peak_rss_mb for run in runs),
+    )
+
+
+def compare(measurement, baseline, threshold):
+    """
+    Return the list of regressions of a measurement against its baseline (a dict with the fields of Measurement).
+    """
+    problems = []
+    max_seconds = max(
+        baseline["seconds"] * (1 + threshold), baseline["seconds"] + SECONDS_SLACK
+    )
+    if measurement.seconds > max_seconds:
+        problems.append(
+            f"took {measurement.seconds:.2f}s, baseline {baseline['seconds']:.2f}s"
+        )
+    if measurement.peak_rss_mb > baseline["peak_rss_mb"] * (1 + threshold):
+        problems.append(
+            f"peak memory {measurement.peak_rss_mb:.0f} MB, baseline {baseline['peak_rss_mb']:.0f} MB"
+        )
+    for field in ("views", "default_views", "lines"):
+        if getattr(measurement, field) != baseline.get(field):
+            problems.append(
+                f"wrote {getattr(measurement, field)} {field}, baseline {baseline[field]} (the output changed)"
+            )
+    return problems
+
+
+def load_baselines(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(path, measurements):
+    """
+    Record measurements as the new baselines of their generators, keeping the baselines of the other generators.
+    """
+    baselines = load_baselines(path)
+    for measurement in measurements:
+        baselines[measurement.name] = dict(measurement._asdict())
+        del baselines[measurement.name]["name"]
+    data = json.dumps(dict(sorted(baselines.items())), indent=2) + "\n"
+    write_atomic(path, data.encode("utf-8"))
+
+
+def freeze_fixtures(jobs, fixtures):
+    """
+    Copy the sheet tabs the generators read, and the catalog cache, from the current caches (fetching what is missing or stale) into a fixtures folder.
+    """
+    fixtures = Path(fixtures)
+    pairs = set().union(*(sheets.sheets_used(job.path) for job in jobs))
+    for sheet_id, sheet_name in sorted(pairs):
+        sheets.fetch_sheet(sheet_id, sheet_name)
+        for source in sheets.cached_files(sheet_id, sheet_name):
+            target = fixtures / "sheets" / source.relative_to(sheets.CACHE_DIR)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, target)
+    if catalog.CACHE_DIR.exists():
+        shutil.copytree(catalog.CACHE_DIR, fixtures / "catalog", dirs_exist_ok=True)
+    print(f"📥 Froze {len(pairs)} sheet tabs and the catalog cache in {fixtures}")
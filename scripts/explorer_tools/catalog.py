@@ -0,0 +1,260 @@
+"""
+Check explorer tables against the CSV files they point to, without downloading those files.
+
+Only the header row of each CSV is fetched, with an HTTP Range request (or, if the server does not support ranges, by reading the response until the end of the first line). When the values of a column are needed, e.g. the entities of a table, only that column is kept while the file is streamed. Results are cached per URL and revalidated with the ETag of the file (If-None-Match) or its Last-Modified date (If-Modified-Since), so unchanged files are not read again. Files served with neither are cached too (for offline use), but their columns are read again every time they are needed.
+
+The cache lives in OWID_CATALOG_CACHE_DIR (default: `scripts/.cache/catalog`). Set OWID_CATALOG_OFFLINE=1 to never hit the network and only use the cache. Any http(s) URL works, so a local HTTP server can stand in for the catalog.
+
+To check the tables of some explorers (all of them by default), from the `scripts` folder:
+
+    python -m explorer_tools.catalog global-food population-and-demography
+"""
+
+import codecs
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+
+from .fs import write_atomic
+from .reader import read_explorers
+
+CACHE_DIR = Path(
+    os.environ.get(
+        "OWID_CATALOG_CACHE_DIR", Path(__file__).parent.parent / ".cache" / "catalog"
+    )
+)
+
+OFFLINE = os.environ.get("OWID_CATALOG_OFFLINE", "").lower() in ("1", "true", "yes")
+
+FETCH_TIMEOUT = 60
+
+# Bytes requested to get the header row. If the header is longer, the file is streamed until the end of the first line.
+HEADER_BYTES = 64 * 1024
+
+# Graphers columns that refer to columns of the view's table
+SLUG_COLUMNS = ("ySlugs", "xSlug", "colorSlug", "sizeSlug")
+
+
+class CatalogUnavailableError(RuntimeError):
+    pass
+
+
+def _cache_path(url):
+    return CACHE_DIR / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _read_cache(url):
+    try:
+        return json.loads(_cache_path(url).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_cache(url, entry):
+    write_atomic(_cache_path(url), json.dumps(entry).encode("utf-8"))
+
+
+def _open(url, headers):
+    """
+    Open a URL, returning None if the server answered 304 Not Modified.
+    """
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        return urllib.request.urlopen(request, timeout=FETCH_TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+
+
+def _first_line(response):
+    data = b""
+    while b"\n" not in data:
+        chunk = response.read(8192)
+        if not chunk:
+            break
+        data += chunk
+    return data.split(b"\n", 1)[0], b"\n" in data
+
+
+def _parse_row(line):
+    text = codecs.decode(line, "utf-8-sig").rstrip("\r")
+    return next(csv.reader([text]), [])
+
+
+def _validators(response):
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def _revalidate(url):
+    """
+    Return the cache entry of a URL, with its header row, after checking that the file did not change.
+    """
+    cached = _read_cache(url)
+    if OFFLINE:
+        if cached is None:
+            raise CatalogUnavailableError(
+                f"{url} is not cached and OWID_CATALOG_OFFLINE is set. Run once with network access to fill the cache in {CACHE_DIR}."
+            )
+        return cached
+
+    headers = {"Range": f"bytes=0-{HEADER_BYTES - 1}"}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = _open(url, headers)
+    if response is None:
+        return cached
+    with response:
+        validators = _validators(response)
+        line, complete = _first_line(response)
+        partial = response.status == 206
+
+    if not complete and partial and len(line) >= HEADER_BYTES:
+        # The header row is longer than the range we asked for
+        with _open(url, {}) as response:
+            line, complete = _first_line(response)
+
+    entry = {"url": url, **validators, "header": _parse_row(line), "columns": {}}
+    if (
+        cached
+        and any(validators.values())
+        and validators == {key: cached.get(key) for key in validators}
+    ):
+        # The server ignored the conditional request, but the file is the same
+        entry["columns"] = cached["columns"]
+    _write_cache(url, entry)
+    return entry
+
+
+def fetch_header(url):
+    """
+    Return the column names of a CSV file.
+    """
+    return _revalidate(url)["header"]
+
+
+def fetch_column(url, column):
+    """
+    Return the distinct values of a column of a CSV file, in order of appearance (empty values are left out). The file is streamed and only that column is kept.
+    """
+    entry = _revalidate(url)
+    if column in entry["columns"]:
+        return entry["columns"][column]
+    if column not in entry["header"]:
+        raise KeyError(f"Column {column} not found in {url}")
+
+    if OFFLINE:
+        raise CatalogUnavailableError(
+            f"Column {column} of {url} is not cached and OWID_CATALOG_OFFLINE is set."
+        )
+
+    position = entry["header"].index(column)
+    values = {}
+    with _open(url, {}) as response:
+        rows = csv.reader(io.TextIOWrapper(response, encoding="utf-8-sig", newline=""))
+        next(rows, None)
+        for row in rows:
+            if len(row) > position and row[position]:
+                values.setdefault(row[position], None)
+
+    entry["columns"][column] = list(values)
+    _write_cache(url, entry)
+    return entry["columns"][column]
+
+
+def missing_columns(url, slugs):
+    header = set(fetch_header(url))
+    return sorted(set(slugs) - header)
+
+
+def _required_slugs(explorer):
+    # Columns that each table must have: the ones its views plot, except the ones computed by a transform
+    transformed = set()
+    for block in explorer.columns.values():
+        if "transform" in block.columns:
+            transformed.update(
+                slug
+                for slug, transform in zip(
+                    block.column("slug"), block.column("transform")
+                )
+                if transform
+            )
+
+    graphers = explorer.graphers
+    required = {slug: set() for slug in explorer.tables}
+    if graphers is None or not explorer.tables:
+        return required
+    default_table = next(iter(explorer.tables))
+    table_slugs = graphers.columns.get("tableSlug", [""] * len(graphers))
+    for name in SLUG_COLUMNS:
+        for table_slug, value in zip(table_slugs, graphers.columns.get(name, ())):
+            table_slug = table_slug or default_table
+            if table_slug in required:
+                required[table_slug].update(value.split())
+    return {slug: slugs - transformed for slug, slugs in required.items()}
+
+
+def check_explorer(explorer, max_workers=16):
+    """
+    Return a list of problems with the tables of an explorer: tables that cannot be fetched and columns used by its views that their table does not have.
+    """
+    required = _required_slugs(explorer)
+    tables = [
+        table
+        for table in explorer.tables.values()
+        if table.url and table.url.startswith(("http://", "https://"))
+    ]
+
+    def check(table):
+        name = table.slug or "(default)"
+        try:
+            missing = missing_columns(table.url, required[table.slug])
+        except (OSError, ValueError, CatalogUnavailableError) as e:
+            return [f"{explorer.slug}: could not read table {name} ({table.url}): {e}"]
+        return [
+            f"{explorer.slug}: column {slug} not found in table {name} ({table.url})"
+            for slug in missing
+        ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [
+            problem for problems in executor.map(check, tables) for problem in problems
+        ]
+
+
+if __name__ == "__main__":
+    patterns = sys.argv[1:] or ["*"]
+    explorers = {
+        slug: explorer
+        for slug, explorer in read_explorers().items()
+        if any(fnmatch(slug, pattern) for pattern in patterns)
+    }
+    if not explorers:
+        sys.exit(f"🛑 No explorer matches {', '.join(patterns)}")
+
+    n_problems = 0
+    for slug, explorer in explorers.items():
+        problems = check_explorer(explorer)
+        n_problems += len(problems)
+        if problems:
+            print(f"🛑 {slug}: {len(problems)} problems")
+            for problem in problems:
+                print(f"  {problem}")
+        else:
+            print(f"✅ {slug}: {len(explorer.tables)} tables checked")
+    if n_problems:
+        sys.exit(1)
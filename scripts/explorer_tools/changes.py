@@ -0,0 +1,293 @@
+"""
+Compare two versions of an explorer view by view, and record what changed in each regeneration.
+
+Views are identified by their selection of controls, written like the query string of the explorer's URL (control names without their type, e.g. `Food=Maize+%28corn%29&Metric=Production&Per+Capita=false`), which does not depend on the position of the view in the graphers block. Hidden controls (empty cells) are left out, and if several views have the same selection (which matrix.py reports as an error), the second one gets `#2` at the end, and so on.
+
+A change set lists, between the previous and the new version of an explorer:
+- `views`: the views added, removed and modified (any cell of their row changed), and the views `affected` by a change of the table or of the definitions of the columns they show (while their row did not change),
+- `tables` (by slug, null for the default table) and `columns` (by [table slug, column slug]): the ones added, removed and modified,
+- `settings`: the names of the settings (explorerTitle, selection, ...) that changed, which may affect every view,
+- `layout`: changes that do not change any view, table, column or setting, but still change the file: the `view order`, the `graphers header` (its columns were reordered, or empty ones added or removed), the `column definitions order`, or else only `formatting` (e.g. quoting or blank lines).
+
+When a generator writes an explorer through output.py, the change set of that run is written next to it, as `<explorer>.changes.json`, together with the sha256 of both versions. A run that does not change the explorer writes an empty change set. Downstream builds that last rendered the version with sha256 `previous_sha256` only have to rebuild the views listed, those that rendered `sha256` have nothing to do, and the others have to rebuild everything.
+
+To compare two versions of an explorer, from the `scripts` folder:
+
+    git show HEAD:explorers/global-food.explorer.tsv > /tmp/global-food.explorer.tsv
+    python -m explorer_tools.changes /tmp/global-food.explorer.tsv ../explorers/global-food.explorer.tsv
+"""
+
+import json
+import sys
+import urllib.parse
+from collections import namedtuple
+from pathlib import Path
+
+from .manifest import hash_bytes
+from .output import write_output
+from .reader import parse_explorer
+
+# Columns of the graphers block that refer to columns of the view's table
+SLUG_COLUMNS = ("ySlugs", "xSlug", "colorSlug", "sizeSlug")
+
+# Keys of one kind of thing (views, tables or columns) that were added, removed or modified
+Changes = namedtuple("Changes", ["added", "removed", "modified"])
+
+ChangeSet = namedtuple(
+    "ChangeSet", ["views", "affected_views", "tables", "columns", "settings", "layout"]
+)
+
+NO_CHANGES = ChangeSet(
+    Changes([], [], []), [], Changes([], [], []), Changes([], [], []), [], []
+)
+
+
+def change_set_path(output):
+    output = Path(output)
+    return output.with_name(f"{output.name}.changes.json")
+
+
+def view_ids(explorer):
+    """
+    Return the id of every view of an explorer, in the order of the graphers block.
+    """
+    if explorer.graphers is None:
+        return []
+    names = [name.rsplit(" ", 1)[0] for name in explorer.controls]
+    columns = [explorer.graphers.column(name) for name in explorer.controls]
+    ids = []
+    seen = {}
+    for i in range(len(explorer.graphers)):
+        selection = sorted(
+            (name, values[i]) for name, values in zip(names, columns) if values[i]
+        )
+        view_id = urllib.parse.urlencode(selection)
+        seen[view_id] = seen.get(view_id, 0) + 1
+        ids.append(view_id if seen[view_id] == 1 else f"{view_id}#{seen[view_id]}")
+    return ids
+
+
+def _cells(block, i):
+    # The non-empty cells of a row, so that adding an empty column does not change it
+    return tuple(
+        (name, values[i])
+        for name, values in zip(block.header, block.values)
+        if values[i]
+    )
+
+
+def _views(explorer):
+    if explorer.graphers is None:
+        return {}
+    return {
+        view_id: _cells(explorer.graphers, i)
+        for i, view_id in enumerate(view_ids(explorer))
+    }
+
+
+def _tables(explorer):
+    return {
+        slug: (
+            table.url,
+            [_cells(table.data, i) for i in range(len(table.data))]
+            if table.data is not None
+            else None,
+        )
+        for slug, table in explorer.tables.items()
+    }
+
+
+def _columns(explorer):
+    # Column definitions by (table slug, column slug), or by position for rows without a slug
+    definitions = {}
+    for table_slug, block in explorer.columns.items():
+        slugs = block.columns.get("slug", [""] * len(block))
+        for i, slug in enumerate(slugs):
+            definitions[(table_slug, slug or f"#{i + 1}")] = _cells(block, i)
+    return definitions
+
+
+def _compare(old, new):
+    return Changes(
+        sorted(new.keys() - old.keys(), key=str),
+        sorted(old.keys() - new.keys(), key=str),
+        sorted((k for k in new.keys() & old.keys() if old[k] != new[k]), key=str),
+    )
+
+
+def _reordered(old, new):
+    # Whether the keys that are in both lists are in a different order
+    common = set(old) & set(new)
+    return [k for k in old if k in common] != [k for k in new if k in common]
+
+
+def _column_headers(explorer):
+    return {slug: block.header for slug, block in explorer.columns.items()}
+
+
+def _layout(old, new):
+    layout = []
+    if old.graphers is not None and new.graphers is not None:
+        if _reordered(view_ids(old), view_ids(new)):
+            layout.append("view order")
+        if old.graphers.header != new.graphers.header:
+            layout.append("graphers header")
+    if _reordered(list(_columns(old)), list(_columns(new))) or any(
+        header != _column_headers(new).get(slug, header)
+        for slug, header in _column_headers(old).items()
+    ):
+        layout.append("column definitions order")
+    return layout
+
+
+def _affected_views(explorer, views, tables, columns):
+    # Views whose row did not change, but that show a table or columns whose definition did
+    changed_tables = set(tables.added + tables.removed + tables.modified)
+    changed_columns = set(columns.added + columns.removed + columns.modified)
+    if explorer.graphers is None or not (changed_tables or changed_columns):
+        return []
+    changed_views = set(views.added + views.modified)
+    graphers = explorer.graphers.columns
+    table_slugs = graphers.get("tableSlug", [""] * len(explorer.graphers))
+    slug_columns = [graphers[name] for name in SLUG_COLUMNS if name in graphers]
+    affected = []
+    for i, view_id in enumerate(view_ids(explorer)):
+        if view_id in changed_views:
+            continue
+        table_slug = table_slugs[i] or None
+        slugs = {slug for values in slug_columns for slug in values[i].split()}
+        if table_slug in changed_tables or any(
+            (table_slug, slug) in changed_columns for slug in slugs
+        ):
+            affected.append(view_id)
+    return sorted(affected)
+
+
+def diff_explorers(old, new):
+    """
+    Return the ChangeSet from one version of an explorer to another (None for an explorer that did not exist, whose views are then all added).
+    """
+    old = old if old is not None else parse_explorer("")
+    views = _compare(_views(old), _views(new))
+    tables = _compare(_tables(old), _tables(new))
+    columns = _compare(_columns(old), _columns(new))
+    settings = sorted(
+        name
+        for name in old.settings.keys() | new.settings.keys()
+        if old.settings.get(name) != new.settings.get(name)
+    )
+    return ChangeSet(
+        views,
+        _affected_views(new, views, tables, columns),
+        tables,
+        columns,
+        settings,
+        _layout(old, new),
+    )
+
+
+def describe(change_set):
+    """
+    Summarize a ChangeSet in a few words, e.g. "views: 3 added, 12 modified; settings: selection" or "layout: view order".
+    """
+    parts = []
+    for kind, changes in [
+        ("views", change_set.views),
+        ("tables", change_set.tables),
+        ("columns", change_set.columns),
+    ]:
+        counts = [
+            f"{len(keys)} {what}"
+            for what, keys in zip(Changes._fields, changes)
+            if keys
+        ]
+        if kind == "views" and change_set.affected_views:
+            counts.append(f"{len(change_set.affected_views)} affected")
+        if counts:
+            parts.append(f"{kind}: {', '.join(counts)}")
+    if change_set.settings:
+        parts.append(f"settings: {', '.join(change_set.settings)}")
+    if change_set.layout:
+        parts.append(f"layout: {', '.join(change_set.layout)}")
+    return "; ".join(parts) or "no changes"
+
+
+def to_json(change_set):
+    views = dict(change_set.views._asdict(), affected=change_set.affected_views)
+    return {
+        "views": views,
+        "tables": change_set.tables._asdict(),
+        "columns": change_set.columns._asdict(),
+        "settings": change_set.settings,
+        "layout": change_set.layout,
+    }
+
+
+def from_json(record):
+    """
+    Return the ChangeSet of a change set written by record_changes (or to_json).
+    """
+    views = dict(record["views"])
+    affected = views.pop("affected")
+    return ChangeSet(
+        Changes(**views),
+        affected,
+        Changes(**record["tables"]),
+        Changes(**record["columns"]),
+        record["settings"],
+        record.get("layout", []),
+    )
+
+
+def diff_bytes(previous, data):
+    """
+    Return the ChangeSet between two versions of an explorer file, given as bytes (None for a file that did not exist). Different bytes with no other change are a change of `formatting`.
+    """
+    if data == previous:
+        return NO_CHANGES
+    old = parse_explorer(previous.decode("utf-8")) if previous is not None else None
+    change_set = diff_explorers(old, parse_explorer(data.decode("utf-8")))
+    if change_set == NO_CHANGES:
+        change_set = change_set._replace(layout=["formatting"])
+    return change_set
+
+
+def record_changes(path, new_path=None):
+    """
+    Write the change set of an explorer about to be replaced by the file at `new_path` (None if it is not replaced, in which case nothing changed), and return it.
+    """
+    path = Path(path)
+    previous = path.read_bytes() if path.exists() else None
+    data = Path(new_path).read_bytes() if new_path is not None else previous
+    change_set = diff_bytes(previous, data)
+
+    record = {
+        "explorer": path.name.split(".")[0],
+        "previous_sha256": hash_bytes(previous) if previous is not None else None,
+        "sha256": hash_bytes(data),
+        **to_json(change_set),
+    }
+    serialized = json.dumps(record, indent=2, ensure_ascii=False) + "\n"
+    write_output(change_set_path(path), serialized.encode("utf-8"))
+    return change_set
+
+
+def read_change_set(output):
+    """
+    Return the change set last written for an explorer, as a dict, or None if there is none.
+    """
+    try:
+        return json.loads(change_set_path(output).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(
+            "Usage: python -m explorer_tools.changes <old explorer> <new explorer>"
+        )
+
+    change_set = diff_bytes(*(Path(arg).read_bytes() for arg in sys.argv[1:]))
+    print(f"📌 {describe(change_set)}")
+    print(json.dumps(to_json(change_set), indent=2, ensure_ascii=False))
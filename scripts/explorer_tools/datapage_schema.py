@@ -0,0 +1,231 @@
+"""
+Check datapages against a schema, and index them by the charts they are shown on.
+
+The schema is written with Python types: a type (str, int, bool) for a value of that type, `[item]` for a list of items, a dict of property to schema for an object (all of its properties are required, unless wrapped in Optional, and no other property is allowed). It is compiled once into nested validation functions, which are then run on every datapage:
+
+    validate = compile_schema(DATAPAGE_SCHEMA)
+    validate(json.loads(text))  # ["$.relatedData[2].url: expected a string, got null", ...]
+
+The chart index maps every chart id in `showDataPageOnChartIds` to the file of its datapage, so finding the datapage of a chart is a lookup instead of reading every datapage. A chart claimed by two datapages is a problem: only one of them can be shown. The index is written to `datapages/index/chart-ids.json` (in a subfolder, so that it is not read as a datapage).
+"""
+
+import json
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .datapages import datapage_paths, serialize
+from .output import UPDATED, write_output
+from .paths import DATAPAGES_DIR
+
+CHART_INDEX_PATH = DATAPAGES_DIR / "index" / "chart-ids.json"
+
+Optional = namedtuple("Optional", ["schema"])
+
+LINK = {"title": str, "url": str}
+
+DATAPAGE_SCHEMA = {
+    "status": str,
+    "showDataPageOnChartIds": [int],
+    "title": str,
+    "googleDocEditLink": str,
+    "topicTagsLinks": [LINK],
+    "variantSource": str,
+    "variantMethods": Optional(str),
+    "nameOfSource": str,
+    "owidProcessingLevel": str,
+    "dateRange": str,
+    "lastUpdated": str,
+    "nextUpdate": str,
+    "subtitle": Optional(str),
+    "descriptionFromSource": {"title": str, "content": Optional(str)},
+    "relatedResearch": [
+        {"title": str, "url": str, "authors": [str], "imageUrl": str},
+    ],
+    "relatedData": [
+        {
+            "title": str,
+            "url": str,
+            "source": Optional(str),
+            "content": Optional(str),
+            "featured": Optional(bool),
+            "type": Optional(str),
+        }
+    ],
+    "sources": [
+        {
+            "sourceName": str,
+            "sourceRetrievedOn": Optional(str),
+            "sourceRetrievedFromUrl": Optional(str),
+            "sourceDescription": Optional(str),
+        }
+    ],
+    "citationData": Optional(str),
+    "citationDatapage": Optional(str),
+}
+
+_TYPE_NAMES = {str: "a string", int: "an integer", bool: "a boolean"}
+
+# `chart_ids` maps chart ids to datapage file names; `conflicts` maps the chart ids claimed by several datapages to all their file names
+ChartIndex = namedtuple("ChartIndex", ["chart_ids", "conflicts"])
+
+
+def _json_type(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "a boolean"
+    if isinstance(value, (int, float)):
+        return "a number"
+    if isinstance(value, str):
+        return "a string"
+    return "a list" if isinstance(value, list) else "an object"
+
+
+def compile_schema(schema):
+    """
+    Return a function that returns the list of problems of a value (empty if it matches the schema).
+    """
+    check = _compile(schema)
+
+    def validate(value):
+        problems = []
+        check(value, "$", problems)
+        return problems
+
+    return validate
+
+
+def _compile(schema):
+    if isinstance(schema, dict):
+        return _compile_object(schema)
+    if isinstance(schema, list):
+        if len(schema) != 1:
+            raise ValueError("List schemas have one item schema")
+        return _compile_list(schema[0])
+    if schema in _TYPE_NAMES:
+        return _compile_type(schema)
+    raise ValueError(f"Unknown schema: {schema!r}")
+
+
+def _compile_type(expected):
+    name = _TYPE_NAMES[expected]
+
+    def check(value, path, problems):
+        # bool is a subclass of int in Python, but not an integer in JSON
+        if not isinstance(value, expected) or (
+            expected is int and isinstance(value, bool)
+        ):
+            problems.append(f"{path}: expected {name}, got {_json_type(value)}")
+
+    return check
+
+
+def _compile_list(item_schema):
+    check_item = _compile(item_schema)
+
+    def check(value, path, problems):
+        if not isinstance(value, list):
+            problems.append(f"{path}: expected a list, got {_json_type(value)}")
+            return
+        for i, item in enumerate(value):
+            check_item(item, f"{path}[{i}]", problems)
+
+    return check
+
+
+def _compile_object(properties):
+    checks = {}
+    required = []
+    for name, schema in properties.items():
+        if isinstance(schema, Optional):
+            schema = schema.schema
+        else:
+            required.append(name)
+        checks[name] = _compile(schema)
+
+    def check(value, path, problems):
+        if not isinstance(value, dict):
+            problems.append(f"{path}: expected an object, got {_json_type(value)}")
+            return
+        for name in required:
+            if name not in value:
+                problems.append(f"{path}: missing property {name}")
+        for name, item in value.items():
+            if name in checks:
+                checks[name](item, f"{path}.{name}", problems)
+            else:
+                problems.append(f"{path}: unknown property {name}")
+
+    return check
+
+
+def chart_ids(datapage):
+    """
+    Return the chart ids in `showDataPageOnChartIds` of a datapage, leaving out those that are not integers (which the schema reports).
+    """
+    ids = datapage.get("showDataPageOnChartIds") if isinstance(datapage, dict) else None
+    if not isinstance(ids, list):
+        return []
+    return [c for c in ids if isinstance(c, int) and not isinstance(c, bool)]
+
+
+def validate_datapages(folder=DATAPAGES_DIR, schema=DATAPAGE_SCHEMA, max_workers=16):
+    """
+    Read and validate all the datapages in a folder, and return the datapages (or None for those that could not be read) and their problems, by file name.
+    """
+    validate = compile_schema(schema)
+
+    def check(path):
+        try:
+            datapage = json.loads(path.read_bytes())
+        except (OSError, ValueError) as e:
+            return path.name, None, [f"cannot be read: {e}"]
+        problems = validate(datapage)
+        for chart_id, count in Counter(chart_ids(datapage)).items():
+            if count > 1:
+                problems.append(
+                    f"$.showDataPageOnChartIds: chart {chart_id} is listed {count} times"
+                )
+        return path.name, datapage, problems
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(check, datapage_paths(folder)))
+    datapages = {name: datapage for name, datapage, _ in results}
+    problems = {name: problems for name, _, problems in results if problems}
+    return datapages, problems
+
+
+def chart_index(datapages):
+    """
+    Return the ChartIndex of datapages given by file name. Charts claimed by several datapages are left out of `chart_ids`.
+    """
+    claims = defaultdict(list)
+    for name, datapage in sorted(datapages.items()):
+        for chart_id in dict.fromkeys(chart_ids(datapage)):
+            claims[chart_id].append(name)
+    unique = {
+        chart_id: names[0]
+        for chart_id, names in sorted(claims.items())
+        if len(names) == 1
+    }
+    conflicts = {
+        chart_id: names for chart_id, names in sorted(claims.items()) if len(names) > 1
+    }
+    return ChartIndex(unique, conflicts)
+
+
+def write_chart_index(index, path=CHART_INDEX_PATH):
+    """
+    Write the chart ids of an index as a JSON object of chart id to file name, unless the file already has these contents. Return True if it was written.
+    """
+    data = serialize(
+        {str(chart_id): name for chart_id, name in index.chart_ids.items()}
+    )
+    return write_output(path, data) == UPDATED
+
+
+def read_chart_index(path=CHART_INDEX_PATH):
+    """
+    Return the chart index written by write_chart_index, as a dict of chart id (int) to datapage file name.
+    """
+    return {int(k): v for k, v in json.loads(path.read_bytes()).items()}
@@ -0,0 +1,258 @@
+"""
+Read datapages (`datapages/*.json`) and apply edits to all of them in one pass.
+
+An edit changes the values at a path in every datapage. Paths are written like JSONPath:
+
+    $.title                    the `title` property
+    $.sources[0].name          the name of the first source
+    $.relatedData[*].source    the source of every related data item ([*] is every item of a list, or every value of an object)
+    $["key with spaces"]       a property whose name is not a plain identifier
+
+and the edits are:
+- delete <path>: remove the values at the path (if there are any),
+- rename <path> <name>: give another name to the properties at the path, keeping their position,
+- set <path> <value>: set the values at the path (creating the objects on the way if needed) to a JSON value,
+- move <path> <target>: remove the value at the path and set it at the target path (which cannot have [*]).
+
+    edits = [Edit.parse("delete", "$.anomaliesListText"), Edit.parse("rename", "$.sources[*].retrievedDate", "retrievedOn")]
+    results = edit_datapages(edits)
+
+Datapages are edited by a bounded pool of threads and only written if their content changed (a value, or the order of the properties of an object). The datapages in the repository are not all formatted the same way, so a datapage that the edits leave alone keeps its bytes, and an edited one is serialized with 4-space indentation, non-ASCII characters as they are and a newline at the end. Files are written to a temporary file that replaces them, so an interrupted run leaves every datapage either as it was or fully edited.
+"""
+
+import copy
+import json
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .fs import write_atomic
+from .paths import DATAPAGES_DIR
+
+OPERATIONS = ("delete", "rename", "set", "move")
+
+# Every item of a list, or every value of an object
+WILDCARD = object()
+
+_STEP = re.compile(
+    r'\.([A-Za-z_][\w-]*)|\[(-?\d+)\]|\[\*\]|\.\*|\[("(?:[^"\\]|\\.)*")\]'
+)
+
+# `changed` is True if the file was (or, in a dry run, would be) written, `error` is the problem found with the file, if any
+DatapageResult = namedtuple("DatapageResult", ["path", "changed", "n_edits", "error"])
+
+
+class DatapageEditError(ValueError):
+    pass
+
+
+def parse_path(path):
+    """
+    Return the steps of a path: property names, list indexes and WILDCARD.
+    """
+    if not path.startswith("$"):
+        raise DatapageEditError(f"Paths start with $: {path}")
+    steps = []
+    position = 1
+    while position < len(path):
+        match = _STEP.match(path, position)
+        if not match:
+            raise DatapageEditError(f"Cannot parse {path!r} at {path[position:]!r}")
+        name, index, quoted = match.groups()
+        if name is not None:
+            steps.append(name)
+        elif index is not None:
+            steps.append(int(index))
+        elif quoted is not None:
+            steps.append(json.loads(quoted))
+        else:
+            steps.append(WILDCARD)
+        position = match.end()
+    if not steps:
+        raise DatapageEditError("Edits cannot change the whole datapage ($)")
+    return tuple(steps)
+
+
+class Edit(namedtuple("Edit", ["operation", "path", "steps", "argument"])):
+    @classmethod
+    def parse(cls, operation, path, argument=None):
+        """
+        Return an edit from its operation, path and argument: the new name (rename), the value (set, given as JSON text) or the target path (move).
+        """
+        if operation not in OPERATIONS:
+            raise DatapageEditError(
+                f"Unknown operation {operation}, use one of {', '.join(OPERATIONS)}"
+            )
+        if operation == "delete":
+            if argument is not None:
+                raise DatapageEditError("delete takes no argument")
+        elif argument is None:
+            raise DatapageEditError(f"{operation} needs an argument")
+        steps = parse_path(path)
+        if operation == "rename" and not isinstance(steps[-1], str):
+            raise DatapageEditError(f"Only properties can be renamed: {path}")
+        if operation == "set":
+            try:
+                argument = json.loads(argument)
+            except json.JSONDecodeError as e:
+                raise DatapageEditError(
+                    f"The value of set {path} is not JSON ({e}): {argument}"
+                )
+        if operation == "move":
+            argument = parse_path(argument)
+            if WILDCARD in argument:
+                raise DatapageEditError(f"Move targets cannot have [*]: {path}")
+        return cls(operation, path, steps, argument)
+
+
+def _children(node, step, create=False):
+    # Values of a node for one step of a path
+    if step is WILDCARD:
+        if isinstance(node, dict):
+            return list(node.values())
+        return list(node) if isinstance(node, list) else []
+    if isinstance(step, int):
+        if isinstance(node, list) and -len(node) <= step < len(node):
+            return [node[step]]
+        return []
+    if isinstance(node, dict):
+        if step not in node and create:
+            node[step] = {}
+        if step in node:
+            return [node[step]]
+    return []
+
+
+def _parents(document, steps, create=False):
+    # The containers that the last step of a path applies to
+    nodes = [document]
+    for step in steps[:-1]:
+        nodes = [child for node in nodes for child in _children(node, step, create)]
+    return nodes
+
+
+def _keys(parent, step):
+    # Keys (or indexes) of a container that the last step of a path matches
+    if isinstance(parent, dict):
+        if step is WILDCARD:
+            return list(parent)
+        return [step] if isinstance(step, str) and step in parent else []
+    if isinstance(parent, list):
+        if step is WILDCARD:
+            return list(range(len(parent)))
+        if isinstance(step, int) and -len(parent) <= step < len(parent):
+            return [step % len(parent)]
+    return []
+
+
+def _pop(document, steps):
+    # Remove and return the values at a path
+    values = []
+    for parent in _parents(document, steps):
+        keys = _keys(parent, steps[-1])
+        if isinstance(parent, list):
+            # Remove items from the end, so that the indexes of the others do not change
+            keys = sorted(keys, reverse=True)
+        for key in keys:
+            values.append(parent.pop(key))
+    return values
+
+
+def _set(document, steps, value):
+    n = 0
+    for parent in _parents(document, steps, create=True):
+        if isinstance(parent, dict) and isinstance(steps[-1], str):
+            keys = [steps[-1]]
+        else:
+            keys = _keys(parent, steps[-1])
+        for key in keys:
+            parent[key] = copy.deepcopy(value)
+            n += 1
+    return n
+
+
+def _rename(document, steps, name):
+    n = 0
+    for parent in _parents(document, steps):
+        old = steps[-1]
+        if not isinstance(parent, dict) or old not in parent or old == name:
+            continue
+        if name in parent:
+            raise DatapageEditError(
+                f"Cannot rename {old} to {name}, there is already a property {name}"
+            )
+        items = [(name if key == old else key, value) for key, value in parent.items()]
+        parent.clear()
+        parent.update(items)
+        n += 1
+    return n
+
+
+def apply_edit(document, edit):
+    """
+    Apply an edit to a datapage (in place) and return the number of values it changed.
+    """
+    if edit.operation == "delete":
+        return len(_pop(document, edit.steps))
+    if edit.operation == "rename":
+        return _rename(document, edit.steps, edit.argument)
+    if edit.operation == "set":
+        return _set(document, edit.steps, edit.argument)
+    values = _pop(document, edit.steps)
+    if len(values) > 1:
+        raise DatapageEditError(
+            f"Cannot move {len(values)} values from {edit.path} to one place"
+        )
+    for value in values:
+        _set(document, edit.argument, value)
+    return len(values)
+
+
+def serialize(document):
+    return (json.dumps(document, indent=4, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def datapage_paths(folder=DATAPAGES_DIR):
+    return sorted(Path(folder).glob("*.json"))
+
+
+def read_datapages(folder=DATAPAGES_DIR):
+    """
+    Read all the datapages in a folder, by file name without extension (the id of the variable they describe).
+    """
+    return {
+        path.stem: json.loads(path.read_text(encoding="utf-8"))
+        for path in datapage_paths(folder)
+    }
+
+
+def edit_datapage(path, edits, dry_run=False):
+    """
+    Apply edits to a datapage file and write it if its content changed (unless `dry_run`).
+    """
+    try:
+        data = path.read_bytes()
+        document = json.loads(data)
+        n_edits = sum(apply_edit(document, edit) for edit in edits)
+        serialized = serialize(document)
+        # Serializing both versions the same way compares the order of the properties too
+        changed = serialized != serialize(json.loads(data))
+    except (OSError, ValueError) as e:
+        return DatapageResult(path, False, 0, str(e))
+    if changed and not dry_run:
+        write_atomic(path, serialized)
+    return DatapageResult(path, changed, n_edits, None)
+
+
+def edit_datapages(edits, folder=DATAPAGES_DIR, dry_run=False, max_workers=16):
+    """
+    Apply edits to all the datapages in a folder and return a DatapageResult per file.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda path: edit_datapage(path, edits, dry_run),
+                datapage_paths(folder),
+            )
+        )
@@ -0,0 +1,77 @@
+"""
+Select the default view of an explorer by the values of its controls, and check that exactly one view matches.
+
+The selector is a dict of column values, usually the dropdowns, radios and checkboxes that lead to the view:
+
+    set_default_view(
+        df_graphers,
+        {
+            "Indicator Dropdown": "Share in poverty",
+            "Poverty line Dropdown": "$2.15 per day: International Poverty Line",
+        },
+    )
+
+marks the matching view with `defaultView` = "true". The views are indexed once by the columns of the selector, so finding the view is a dict lookup instead of comparing every row, and a selector that matches no view (e.g. after a dropdown option was renamed) or several views fails instead of writing an explorer without a default view or with several of them.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+class DefaultViewError(ValueError):
+    pass
+
+
+class ViewIndex:
+    """
+    The positions of the views for every combination of values of some of their columns.
+    """
+
+    def __init__(self, views, columns):
+        self.columns = list(columns)
+        missing = [column for column in self.columns if column not in views]
+        if missing:
+            raise DefaultViewError(
+                f"Not columns of the views: {', '.join(map(str, missing))}"
+            )
+        self.positions = defaultdict(list)
+        keys = zip(*(views[column].tolist() for column in self.columns))
+        for position, key in enumerate(keys):
+            self.positions[key].append(position)
+
+    def find(self, selector):
+        """
+        Return the positions of the views with the values in `selector` (a dict with the indexed columns as keys).
+        """
+        if set(selector) != set(self.columns):
+            raise DefaultViewError(
+                f"The selector should give a value for each of {', '.join(self.columns)}"
+            )
+        key = tuple(selector[column] for column in self.columns)
+        return self.positions.get(key, [])
+
+
+def find_default_view(views, selector):
+    """
+    Return the position of the only view with the values in `selector`.
+    """
+    positions = ViewIndex(views, selector).find(selector)
+    if len(positions) != 1:
+        description = " and ".join(f"{k} == {v!r}" for k, v in selector.items())
+        raise DefaultViewError(
+            f"Default view ({description}) should match exactly one view, but matches {len(positions)} views"
+        )
+    return positions[0]
+
+
+def set_default_view(views, selector, column="defaultView"):
+    """
+    Mark the only view with the values in `selector` with "true" in `column` (added as the last column if it does not exist yet) and return its position.
+    """
+    position = find_default_view(views, selector)
+    if column not in views:
+        views[column] = pd.Series(np.nan, index=views.index, dtype=object)
+    views.iloc[position, views.columns.get_loc(column)] = "true"
+    return position
@@ -0,0 +1,82 @@
+"""
+Build dataframes row by row without growing them cell by cell.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def is_number(value):
+    """
+    Return whether a value keeps a column numeric (float64): a number that is not a boolean, or None, which becomes NaN.
+    """
+    return value is None or (
+        isinstance(value, (int, float, np.integer, np.floating))
+        and not isinstance(value, (bool, np.bool_))
+    )
+
+
+class RowBuilder:
+    """
+    Collect the rows of a dataframe as dicts and create the dataframe once at the end, with `to_frame`.
+
+    This replaces growing a dataframe with `df.loc[j, column] = value` followed by `j += 1`, which reallocates the frame for every new row and column. The dataframe produced is the same one the `.loc` calls produced: columns appear in the order in which they were first set, cells that were never set are NaN, numeric columns are float64 (so 0 is written as 0.0) and a column becomes object as soon as it gets a non-numeric value.
+
+    Strings are interned: equal strings are stored once and shared by all the cells that have them, so long texts repeated on many rows (descriptions built with f-strings or joins in a loop) take the memory of one copy.
+    """
+
+    def __init__(self):
+        # Values are stored per column, padded with NaN for the rows that did not set them
+        self._columns = {}
+        self._numeric = {}
+        self._length = 0
+        self._strings = {}
+
+    def __len__(self):
+        return self._length
+
+    def _set(self, column, index, value):
+        if isinstance(value, str):
+            value = self._strings.setdefault(value, value)
+        if column not in self._columns:
+            self._columns[column] = [np.nan] * self._length
+            self._numeric[column] = is_number(value)
+        elif self._numeric[column] and not is_number(value):
+            # Same upcast as pandas: the values set so far were stored as floats
+            self._columns[column] = [
+                np.nan if v is None else float(v) for v in self._columns[column]
+            ]
+            self._numeric[column] = False
+
+        values = self._columns[column]
+        if index == len(values):
+            values.append(value)
+        else:
+            values[index] = value
+
+    def add_row(self, row):
+        """
+        Add a row, given as a dict of column name to value.
+        """
+        for column, value in row.items():
+            self._set(column, self._length, value)
+        self._length += 1
+        for values in self._columns.values():
+            if len(values) < self._length:
+                values.append(np.nan)
+
+    def set_column(self, column, value):
+        """
+        Set `column` to `value` in all the rows added so far, like `df[column] = value` would on the partially built dataframe.
+        """
+        if isinstance(value, str):
+            value = self._strings.setdefault(value, value)
+        self._columns[column] = [value] * self._length
+        self._numeric[column] = is_number(value)
+
+    def to_frame(self):
+        data = {
+            column: np.array(values, dtype=float if self._numeric[column] else object)
+            for column, values in self._columns.items()
+        }
+        return pd.DataFrame(data, index=pd.RangeIndex(self._length))
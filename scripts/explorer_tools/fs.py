@@ -0,0 +1,48 @@
+"""
+Write files atomically: to a temporary file in the same folder, renamed over the target once it is complete, so an interrupted run never leaves a half-written file behind.
+
+Temporary files are only readable by their owner, so they get the permissions of the file they replace (or those of a new file) before the rename.
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def _umask():
+    # The umask can only be read by setting it
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Permissions of a file created with open(), e.g. 0o644
+NEW_FILE_MODE = 0o666 & ~_umask()
+
+
+def file_mode(path):
+    """
+    Return the permissions of the file at `path`, or those of a new file if it does not exist.
+    """
+    try:
+        return stat.S_IMODE(Path(path).stat().st_mode)
+    except FileNotFoundError:
+        return NEW_FILE_MODE
+
+
+def write_atomic(path, data):
+    """
+    Write bytes to `path` through a temporary file in the same folder (created if needed), replacing the file in one rename.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,166 @@
+"""
+Skip rebuilding an explorer when nothing it is built from has changed.
+
+A build manifest is stored next to each generated explorer, as `<explorer>.manifest.json`. It records the sha256 of every input of the last build (the generator's code, its local CSV and template files, the contents of the sheets and data files it fetched and the versions of the packages it ran with), together with the sha256 of the explorer it wrote:
+
+    build = BuildManifest(outfile)
+    build.add_script("my-explorer.py")
+    build.add_files(["views.csv", "my-explorer.template.tsv"])
+    build.add_data("data", data_bytes)
+    if build.is_up_to_date():
+        sys.exit()
+    ...  # generate the explorer
+    build.save()
+
+The code of a script includes the modules of explorer_tools that it imports, directly or through other modules (found by reading their import statements, so that the manifest can be checked before the script imports them), but not the others: changing a module only used by other tools does not rebuild the explorers.
+
+The explorer is rebuilt if any input changed, if the explorer itself was edited or removed since, or if OWID_FORCE_REBUILD=1 is set.
+
+This module only uses the standard library, so that checking a manifest is fast.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import platform
+from importlib import metadata
+from pathlib import Path
+
+from .output import write_output
+from .paths import ROOT_DIR
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+FORCE = os.environ.get("OWID_FORCE_REBUILD", "").lower() in ("1", "true", "yes")
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hash_bytes(f.read())
+
+
+def manifest_path(output):
+    output = Path(output)
+    return output.with_name(f"{output.name}.manifest.json")
+
+
+def _imported_tools(path):
+    # The explorer_tools modules imported anywhere in a file (including inside functions), by module name
+    tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    in_tools = Path(path).resolve().parent == TOOLS_DIR
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(
+                alias.name.split(".")[1]
+                for alias in node.names
+                if alias.name.startswith("explorer_tools.")
+            )
+        elif isinstance(node, ast.ImportFrom):
+            if node.module == "explorer_tools" or (
+                in_tools and node.level == 1 and node.module is None
+            ):
+                # from explorer_tools import sheets, from . import sheets
+                names.update(alias.name for alias in node.names)
+            elif node.module and node.module.startswith("explorer_tools."):
+                names.add(node.module.split(".")[1])
+            elif in_tools and node.level == 1:
+                names.add(node.module.split(".")[0])
+    return names
+
+
+def tools_modules(path):
+    """
+    Return the files of the explorer_tools modules that a script imports, directly or through other modules, including the package's `__init__.py`.
+    """
+    modules = set()
+    pending = [Path(path)]
+    while pending:
+        for name in _imported_tools(pending.pop()):
+            module = TOOLS_DIR / f"{name}.py"
+            if module.exists() and module not in modules:
+                modules.add(module)
+                pending.append(module)
+    if modules:
+        modules.add(TOOLS_DIR / "__init__.py")
+    return sorted(modules)
+
+
+def _key(path):
+    # Files are recorded relative to the repository, so that manifests do not depend on where it was cloned
+    path = Path(path).absolute()
+    try:
+        return path.relative_to(ROOT_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class BuildManifest:
+    """
+    The inputs of one build of an explorer, to compare them with those of the previous build.
+
+    The versions of Python, pandas and numpy are always part of the inputs.
+    """
+
+    def __init__(self, output, packages=("pandas", "numpy")):
+        self.output = Path(output).absolute()
+        self.inputs = {"python": platform.python_version()}
+        for package in packages:
+            try:
+                self.inputs[package] = metadata.version(package)
+            except metadata.PackageNotFoundError:
+                self.inputs[package] = None
+
+    def add_script(self, path):
+        """
+        Add the code of a generator and of the explorer_tools modules it imports.
+        """
+        self.add_files([path, *tools_modules(path)])
+
+    def add_files(self, paths):
+        for path in paths:
+            self.inputs[_key(path)] = hash_file(path)
+
+    def add_data(self, name, data):
+        """
+        Add fetched contents (e.g. a Google Sheets tab or a remote data file) under a name of your choice.
+        """
+        self.inputs[name] = hash_bytes(data)
+
+    def load(self):
+        """
+        Return the manifest of the previous build, or None if there is none.
+        """
+        try:
+            return json.loads(manifest_path(self.output).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def is_up_to_date(self):
+        if FORCE:
+            return False
+        previous = self.load()
+        if previous is None or previous.get("inputs") != self.inputs:
+            return False
+        # The explorer must still be the one that the previous build wrote
+        try:
+            return hash_file(self.output) == previous.get("output_sha256")
+        except FileNotFoundError:
+            return False
+
+    def save(self):
+        """
+        Record the inputs of this build, once the explorer was written.
+        """
+        manifest = {
+            "output": _key(self.output),
+            "output_sha256": hash_file(self.output),
+            "inputs": self.inputs,
+        }
+        data = json.dumps(manifest, indent=2) + "\n"
+        write_output(manifest_path(self.output), data.encode("utf-8"))
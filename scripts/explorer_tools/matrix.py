@@ -0,0 +1,209 @@
+"""
+Check that the views of an explorer cover the combinations of its controls (dropdowns, radios and checkboxes), once each.
+
+Each control column is encoded as small integer codes (an empty cell, i.e. a control hidden for that view, is -1), so a view is a row of integers and a combination of controls is a single integer (its position in the product of the values of the controls). Then:
+- a combination with more than one view is duplicated: the explorer always shows the first one, and the others cannot be reached,
+- a combination with no view is missing: when a user picks it, the explorer silently switches other controls to show a view that exists.
+
+Views only show some of the controls (e.g. a decile dropdown only for the decile indicators), so combinations are checked for each group of views that show the same controls. And dropdowns are often hierarchical (e.g. the indicators of a health area dropdown, or the sources of an indicator), which leaves most of the product of the values of the controls out on purpose: only the combinations whose values are seen together, two by two, in some view of the group are expected. For example, a combination of an indicator with a source is expected if the indicator has a view with that source, and the combinations of a health area with the indicators of another health area are not. The expected combinations are built one control at a time, as NumPy arrays of codes, so even explorers with thousands of views are checked in milliseconds.
+
+Missing combinations are reported as warnings, and duplicated ones as errors. To check some explorers (all of them by default), from the `scripts` folder:
+
+    python -m explorer_tools.matrix population-and-demography "incomes-across-distribution*"
+"""
+
+import sys
+from collections import namedtuple
+from fnmatch import fnmatch
+
+import numpy as np
+import pandas as pd
+
+from .reader import read_explorers
+
+# Groups with more expected combinations than this are not checked for missing ones
+MAX_CELLS = 1 << 26
+
+# `missing` and `duplicated` are lists of selections (dicts of control name to value, for the controls the views show); `duplicated` selections come with the views (row numbers in the graphers block) that have them
+Coverage = namedtuple(
+    "Coverage", ["controls", "combinations", "n_missing", "missing", "duplicated"]
+)
+
+
+def encode_controls(explorer):
+    """
+    Return the codes of the controls of every view (one row per view, one column per control, -1 for empty cells) and the values of each control, by code.
+    """
+    controls = explorer.controls
+    codes = np.full((len(explorer.graphers), len(controls)), -1, dtype=np.int64)
+    values = []
+    for j, name in enumerate(controls):
+        column_codes, uniques = pd.factorize(
+            np.asarray(explorer.graphers.column(name), dtype=object)
+        )
+        empty = np.flatnonzero(uniques == "")
+        if len(empty):
+            # Renumber the values after the empty one, so that codes stay contiguous
+            column_codes = np.where(
+                column_codes == empty[0],
+                -1,
+                column_codes - (column_codes > empty[0]),
+            )
+            uniques = np.delete(uniques, empty[0])
+        codes[:, j] = column_codes
+        values.append(list(uniques))
+    return codes, values
+
+
+def _keys(codes, sizes):
+    # One integer per row: its position in the product of the sizes (mixed radix), or its rank among the distinct rows if the product does not fit in an int64
+    if not codes.shape[1]:
+        return np.zeros(len(codes), dtype=np.int64)
+    if np.prod(np.asarray(sizes, dtype=float)) < 2**62:
+        return np.ravel_multi_index(tuple(codes.T), sizes)
+    return np.unique(codes, axis=0, return_inverse=True)[1].reshape(-1)
+
+
+def _selection(controls, values, columns, codes):
+    return {
+        controls[j]: values[j][code] for j, code in zip(columns, codes) if code >= 0
+    }
+
+
+def _expected_combinations(codes, sizes):
+    """
+    Return the combinations of a group whose values are seen together, two by two, in some of its views (one row of codes per combination), or None if there are more than MAX_CELLS.
+    """
+    if not codes.shape[1]:
+        return np.zeros((1, 0), dtype=np.int64)
+    # seen[a][b][x, y]: some view has value x for control a and value y for control b
+    seen = {}
+    for b in range(1, len(sizes)):
+        for a in range(b):
+            seen[a, b] = np.zeros((sizes[a], sizes[b]), dtype=bool)
+            seen[a, b][codes[:, a], codes[:, b]] = True
+    combinations = np.arange(sizes[0], dtype=np.int64).reshape(-1, 1)
+    for b in range(1, len(sizes)):
+        if len(combinations) * sizes[b] > MAX_CELLS:
+            return None
+        allowed = np.ones((len(combinations), sizes[b]), dtype=bool)
+        for a in range(b):
+            allowed &= seen[a, b][combinations[:, a]]
+        rows, new_values = np.nonzero(allowed)
+        combinations = np.column_stack([combinations[rows], new_values])
+    return combinations
+
+
+def check_views(explorer, limit=10):
+    """
+    Return the Coverage of the views of an explorer: the number of combinations expected, the number of missing ones (and the first `limit` of them) and the duplicated ones.
+    """
+    controls = explorer.controls
+    if explorer.graphers is None or not len(explorer.graphers) or not controls:
+        return Coverage(controls, 0, 0, [], [])
+    codes, values = encode_controls(explorer)
+
+    # Duplicated combinations, with empty cells as one more value
+    keys = _keys(codes + 1, [len(v) + 1 for v in values])
+    unique_keys, inverse, counts = np.unique(
+        keys, return_inverse=True, return_counts=True
+    )
+    duplicated = []
+    all_columns = range(len(controls))
+    for k in np.flatnonzero(counts > 1):
+        rows = np.flatnonzero(inverse == k)
+        duplicated.append(
+            (_selection(controls, values, all_columns, codes[rows[0]]), list(rows))
+        )
+    duplicated.sort(key=lambda item: item[1][0])
+
+    # Missing combinations, for each group of views that show the same controls
+    shown = codes >= 0
+    groups = shown @ (1 << np.arange(len(controls), dtype=np.int64))
+    combinations = n_missing = 0
+    missing = []
+    for group in pd.unique(groups):
+        rows = groups == group
+        columns = np.flatnonzero(shown[np.flatnonzero(rows)[0]])
+        # Renumber the values of each control within the group
+        group_values = []
+        group_codes = np.zeros((np.count_nonzero(rows), len(columns)), dtype=np.int64)
+        for i, j in enumerate(columns):
+            present, local = np.unique(codes[rows, j], return_inverse=True)
+            group_values.append(present)
+            group_codes[:, i] = local.reshape(-1)
+        sizes = [len(present) for present in group_values]
+        expected = _expected_combinations(group_codes, sizes)
+        if expected is None:
+            combinations += len(np.unique(_keys(group_codes, sizes)))
+            continue
+        gaps = expected[~np.isin(_keys(expected, sizes), _keys(group_codes, sizes))]
+        combinations += len(expected)
+        n_missing += len(gaps)
+        for local in gaps[: max(limit - len(missing), 0)]:
+            global_codes = [present[i] for present, i in zip(group_values, local)]
+            missing.append(_selection(controls, values, columns, global_codes))
+    return Coverage(controls, combinations, n_missing, missing, duplicated)
+
+
+def _describe(selection):
+    return ", ".join(f"{name}={value!r}" for name, value in selection.items())
+
+
+def duplicated_selections(coverage):
+    """
+    Return the duplicated selections of a Coverage, as a set of tuples of (control, value) pairs, to be passed to `report` as the ones already known.
+    """
+    return {tuple(selection.items()) for selection, _ in coverage.duplicated}
+
+
+def report(slug, coverage, known=()):
+    """
+    Print the problems found in an explorer and return the number of duplicated combinations, leaving out the `known` ones (see `duplicated_selections`), which are only reported as warnings.
+    """
+    new = [
+        (selection, rows)
+        for selection, rows in coverage.duplicated
+        if tuple(selection.items()) not in known
+    ]
+    old = [item for item in coverage.duplicated if item not in new]
+    if new:
+        print(f"🛑 {slug}: {len(new)} combinations of controls have more than one view")
+        for selection, rows in new:
+            print(f"  views {', '.join(map(str, rows))}: {_describe(selection)}")
+    if old:
+        print(
+            f"⚠️ {slug}: {len(old)} combinations of controls already had more than one view"
+        )
+        for selection, rows in old:
+            print(f"  views {', '.join(map(str, rows))}: {_describe(selection)}")
+    if coverage.n_missing:
+        print(
+            f"⚠️ {slug}: {coverage.n_missing} of {coverage.combinations} combinations of controls have no view"
+        )
+        for selection in coverage.missing:
+            print(f"  {_describe(selection)}")
+        if coverage.n_missing > len(coverage.missing):
+            print(f"  ... and {coverage.n_missing - len(coverage.missing)} more")
+    if not coverage.duplicated and not coverage.n_missing:
+        print(
+            f"✅ {slug}: {coverage.combinations} combinations of controls, one view each"
+        )
+    return len(new)
+
+
+if __name__ == "__main__":
+    patterns = sys.argv[1:] or ["*"]
+    explorers = {
+        slug: explorer
+        for slug, explorer in read_explorers().items()
+        if any(fnmatch(slug, pattern) for pattern in patterns)
+    }
+    if not explorers:
+        sys.exit(f"🛑 No explorer matches {', '.join(patterns)}")
+
+    n_duplicated = 0
+    for slug, explorer in explorers.items():
+        n_duplicated += report(slug, check_views(explorer))
+    if n_duplicated:
+        sys.exit(1)
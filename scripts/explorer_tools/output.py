@@ -0,0 +1,161 @@
+"""
+Write generated files (explorer configs, manifests, indexes) only when their contents change.
+
+Generators write their explorer through an output file instead of `open(outfile, "w")`:
+
+    with open_output(outfile) as f:
+        f.write(warning)
+        write_frame(f, graphers, index=False)
+    # 💾 .../my.explorer.tsv updated, or ✅ .../my.explorer.tsv unchanged
+
+The text is encoded as UTF-8 (lines end with "\\n", as written) into a temporary file in the same folder, and its sha256 is computed as it is written. When the output file is closed, the sha256 is compared with the one of the existing file (read in chunks, and only if both have the same size):
+- if they are the same, the temporary file is removed and the existing file is left alone, with its modification time, so that deploys and Makefile rules downstream see no change,
+- otherwise, the temporary file replaces the existing one in one rename, so an interrupted run never leaves a half-written explorer behind.
+
+If writing fails, the existing file is not touched. For explorers (`*.explorer.tsv`), the views that changed are also recorded next to them, before they are replaced (see changes.py).
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from .fs import file_mode, write_atomic
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+CHUNK_SIZE = 1 << 20
+
+
+def _same_contents(path, size, digest):
+    # Whether the file at `path` has `size` bytes with this sha256 digest
+    try:
+        if path.stat().st_size != size:
+            return False
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                sha256.update(chunk)
+    except FileNotFoundError:
+        return False
+    return sha256.digest() == digest
+
+
+def file_signature(path):
+    """
+    Return what changes when a file is replaced (its inode and modification time), or None if it does not exist. Files left unchanged by an output keep their signature.
+    """
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def _report(path, status, changes=None):
+    icon = "💾" if status == UPDATED else "✅"
+    if status == UPDATED and changes is not None:
+        from .changes import describe
+
+        print(f"{icon} {path} {status} ({describe(changes)})")
+    else:
+        print(f"{icon} {path} {status}")
+
+
+class OutputFile:
+    """
+    A text file that replaces `path` when it is closed, only if its contents differ. `status` is UPDATED or UNCHANGED once it is closed.
+    """
+
+    def __init__(self, path, quiet=False):
+        self.path = Path(path).absolute()
+        self.quiet = quiet
+        self.status = None
+        self.changes = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}."
+        )
+        self._file = os.fdopen(fd, "wb")
+        self._sha256 = hashlib.sha256()
+        self._size = 0
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        self._sha256.update(data)
+        self._size += len(data)
+        self._file.write(data)
+        return len(text)
+
+    def discard(self):
+        """
+        Remove the temporary file, leaving the existing file as it was.
+        """
+        self._file.close()
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def _record_changes(self, new_path=None):
+        # Explorers get the change set of every run written next to them (imported here, since changes.py writes through this module)
+        if self.path.name.endswith(".explorer.tsv"):
+            from .changes import record_changes
+
+            self.changes = record_changes(self.path, new_path)
+
+    def close(self):
+        """
+        Replace the existing file with the contents written, unless they are the same, and return the status.
+        """
+        if self.status is not None:
+            return self.status
+        try:
+            self._file.close()
+            if _same_contents(self.path, self._size, self._sha256.digest()):
+                self.status = UNCHANGED
+                self._record_changes()
+                os.unlink(self.tmp_path)
+            else:
+                self._record_changes(self.tmp_path)
+                os.chmod(self.tmp_path, file_mode(self.path))
+                os.replace(self.tmp_path, self.path)
+                self.status = UPDATED
+        except BaseException:
+            self.discard()
+            raise
+        if not self.quiet:
+            _report(self.path, self.status, self.changes)
+        return self.status
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def open_output(path, quiet=False):
+    """
+    Return an OutputFile for `path`, to use in a `with` statement. Unless `quiet`, whether the file was updated or unchanged is printed when it is closed.
+    """
+    return OutputFile(path, quiet)
+
+
+def write_output(path, data, quiet=True):
+    """
+    Write bytes to `path` unless it already has these contents, and return UPDATED or UNCHANGED.
+    """
+    path = Path(path).absolute()
+    if _same_contents(path, len(data), hashlib.sha256(data).digest()):
+        status = UNCHANGED
+    else:
+        write_atomic(path, data)
+        status = UPDATED
+    if not quiet:
+        _report(path, status)
+    return status
@@ -0,0 +1,14 @@
+"""
+Where the explorer scripts read from and write to.
+
+The generators write their explorer to EXPLORERS_DIR, which is the `explorers` folder of the repository unless OWID_EXPLORERS_DIR is set, e.g. to write them to a temporary folder (see benchmark.py). Datapages (the JSON files with the metadata shown on the data pages of some charts) are in DATAPAGES_DIR.
+"""
+
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+EXPLORERS_DIR = Path(os.environ.get("OWID_EXPLORERS_DIR", ROOT_DIR / "explorers"))
+
+DATAPAGES_DIR = ROOT_DIR / "datapages"
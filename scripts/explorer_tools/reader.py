@@ -0,0 +1,213 @@
+"""
+Read explorer configs (`explorers/*.explorer.tsv`) into an indexed in-memory model.
+
+An explorer config is made of lines of tab-separated cells. Lines that do not start with a tab are either settings (`explorerTitle`, `selection`, ...) or start a block: `graphers`, `table [url] [slug]` and `columns [slug]`. The indented lines that follow a block keyword are the rows of the block, the first one being its header. Lines starting with `#` are comments.
+
+    explorer = read_explorer("explorers/global-food.explorer.tsv")
+    explorer.settings["explorerTitle"]  # ["Global Food Explorer"]
+    explorer.graphers.column("ySlugs")  # all the ySlugs, one per view
+    explorer.view({"Food Dropdown": "Maize (corn)", "Metric Dropdown": "Production", ...})
+
+The rows of a block are stored per column, and the indexes of the views (by control selection, ySlug, tableSlug and grapherId) are built the first time they are used.
+"""
+
+from collections import defaultdict, namedtuple
+from pathlib import Path
+
+from .paths import EXPLORERS_DIR
+
+# Graphers columns ending with one of these are the controls of the explorer
+CONTROL_TYPES = ("Dropdown", "Radio", "Checkbox")
+
+# A `table` block: the URL of the data (None for inline data), its slug (None for the default table) and the inline data, if any
+Table = namedtuple("Table", ["url", "slug", "data"])
+
+
+def _trim(cells):
+    # Trailing empty cells carry no information (spreadsheets export them when other rows are longer)
+    end = len(cells)
+    while end and not cells[end - 1]:
+        end -= 1
+    return cells[:end]
+
+
+class Block:
+    """
+    The rows of an indented block, stored as one list of strings per column. Missing cells are empty strings.
+
+    A few explorers repeat a column name in a header: `values` has all the columns, in the order of `header`, and `columns` maps each name to its first column.
+    """
+
+    def __init__(self, header, rows):
+        self.header = header
+        self.values = [[] for _ in header]
+        n_columns = len(header)
+        for row in rows:
+            if len(row) < n_columns:
+                row = row + [""] * (n_columns - len(row))
+            for values, value in zip(self.values, row):
+                values.append(value)
+        self._length = len(rows)
+        self.columns = {}
+        for name, values in zip(header, self.values):
+            self.columns.setdefault(name, values)
+
+    def __len__(self):
+        return self._length
+
+    def column(self, name):
+        return self.columns[name]
+
+    def row(self, index):
+        return {name: values[index] for name, values in self.columns.items()}
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            dict(enumerate(self.values)), index=pd.RangeIndex(len(self))
+        ).set_axis(self.header, axis=1)
+
+
+class Explorer:
+    """
+    An explorer config: its settings (setting name to list of values), its graphers block and its tables and column definitions by slug (None for the default table).
+    """
+
+    def __init__(self, path, settings, graphers, tables, columns):
+        self.path = path
+        self.settings = settings
+        self.graphers = graphers
+        self.tables = tables
+        self.columns = columns
+        self._indexes = {}
+
+    @property
+    def slug(self):
+        return self.path.name.split(".")[0]
+
+    @property
+    def controls(self):
+        if self.graphers is None:
+            return []
+        return [
+            name
+            for name in self.graphers.header
+            if name.rsplit(" ", 1)[-1] in CONTROL_TYPES
+        ]
+
+    def _index(self, name, keys_of_row):
+        # Map every key to the list of views (row numbers in the graphers block) that have it
+        if name not in self._indexes:
+            index = defaultdict(list)
+            if self.graphers is not None:
+                for i in range(len(self.graphers)):
+                    for key in keys_of_row(i):
+                        index[key].append(i)
+            self._indexes[name] = dict(index)
+        return self._indexes[name]
+
+    def _column_keys(self, name, split=False):
+        values = self.graphers.columns.get(name) if self.graphers else None
+        if values is None:
+            return lambda i: ()
+        if split:
+            # Space-separated lists of keys, e.g. ySlugs
+            return lambda i: dict.fromkeys(values[i].split())
+        return lambda i: (values[i],) if values[i] else ()
+
+    @property
+    def by_selection(self):
+        """
+        Views by the values of all controls, as a tuple in the order of `controls`.
+        """
+        columns = [self.graphers.columns[name] for name in self.controls]
+        return self._index(
+            "selection", lambda i: [tuple(values[i] for values in columns)]
+        )
+
+    @property
+    def by_y_slug(self):
+        return self._index("ySlugs", self._column_keys("ySlugs", split=True))
+
+    @property
+    def by_table_slug(self):
+        return self._index("tableSlug", self._column_keys("tableSlug"))
+
+    @property
+    def by_grapher_id(self):
+        return self._index("grapherId", self._column_keys("grapherId"))
+
+    def view(self, selection):
+        """
+        Return the view (row number in the graphers block) for a selection of all controls, given as a dict of control name to value, or None if there is no such view.
+        """
+        key = tuple(selection.get(name, "") for name in self.controls)
+        views = self.by_selection.get(key)
+        return views[0] if views else None
+
+
+def parse_explorer(text, path=None):
+    settings = {}
+    graphers = None
+    tables = {}
+    columns = {}
+
+    # The block being read: its kind, its arguments and its rows
+    block = None
+
+    def close_block():
+        nonlocal graphers
+        if block is None:
+            return
+        kind, args, rows = block
+        data = Block(rows[0], rows[1:]) if rows else None
+        if kind == "graphers":
+            graphers = data if data is not None else Block([], [])
+        elif kind == "table":
+            # `table <url> <slug>`, `table <url>` or just `table` followed by inline data
+            url = args[0] if args and "/" in args[0] else None
+            slug = args[1] if len(args) > 1 else (args[0] if args and not url else None)
+            tables[slug] = Table(url, slug, data)
+        elif kind == "columns":
+            columns[args[0] if args else None] = (
+                data if data is not None else Block([], [])
+            )
+
+    for line in text.split("\n"):
+        if line.endswith("\r"):
+            line = line[:-1]
+        if line.startswith("\t"):
+            if block is not None:
+                cells = line.split("\t")[1:]
+                if any(cells):
+                    block[2].append(_trim(cells))
+            continue
+
+        close_block()
+        block = None
+        if not line or line.startswith("#"):
+            continue
+        keyword, *args = _trim(line.split("\t"))
+        if keyword in ("graphers", "table", "columns"):
+            block = (keyword, args, [])
+        else:
+            settings[keyword] = args
+    close_block()
+
+    return Explorer(Path(path) if path else None, settings, graphers, tables, columns)
+
+
+def read_explorer(path):
+    path = Path(path)
+    return parse_explorer(path.read_text(encoding="utf-8"), path)
+
+
+def read_explorers(folder=EXPLORERS_DIR):
+    """
+    Read all the explorer configs in a folder, by slug.
+    """
+    return {
+        explorer.slug: explorer
+        for explorer in map(read_explorer, sorted(Path(folder).glob("*.explorer.tsv")))
+    }
@@ -0,0 +1,275 @@
+"""
+Index which explorers and datapages refer to which charts, variables and columns, in a SQLite database.
+
+Explorers refer to charts by `grapherId`, to variables by `yVariableIds` and to the columns of their tables by `ySlugs` (with `tableSlug`). Datapages are named after the variable they describe and list the charts they are shown on in `showDataPageOnChartIds`. All these references are stored in one table per kind, with one row per (file, view, reference), so that questions like "which explorers and datapages does chart 5476 appear in" are answered by indexed queries:
+
+    db = connect()
+    refresh(db)                  # only re-reads the files that changed since the last refresh
+    chart_references(db, 5476)   # ChartReferences(explorers={...}, datapages=[...], variable_explorers={...})
+
+`variable_explorers` are the explorers that show the variables of the chart's datapages, even if they do not show the chart itself.
+
+The database lives in OWID_REFERENCES_DB (default: `scripts/.cache/references.sqlite`). A file is re-read when its size or modification time changed, and its references are only replaced if its contents did too. To look up some charts, from the `scripts` folder:
+
+    python -m explorer_tools.references 5476 486
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from .datapage_schema import chart_ids
+from .datapages import datapage_paths
+from .manifest import hash_bytes
+from .paths import DATAPAGES_DIR, EXPLORERS_DIR
+from .reader import parse_explorer
+
+DB_PATH = Path(
+    os.environ.get(
+        "OWID_REFERENCES_DB",
+        Path(__file__).parent.parent / ".cache" / "references.sqlite",
+    )
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS explorer_charts (explorer TEXT, view INTEGER, chart_id INTEGER);
+CREATE TABLE IF NOT EXISTS explorer_variables (explorer TEXT, view INTEGER, variable_id INTEGER);
+CREATE TABLE IF NOT EXISTS explorer_columns (explorer TEXT, view INTEGER, table_slug TEXT, slug TEXT);
+CREATE TABLE IF NOT EXISTS datapage_charts (datapage TEXT, variable_id INTEGER, chart_id INTEGER);
+CREATE INDEX IF NOT EXISTS explorer_charts_by_chart ON explorer_charts (chart_id);
+CREATE INDEX IF NOT EXISTS explorer_charts_by_explorer ON explorer_charts (explorer);
+CREATE INDEX IF NOT EXISTS explorer_variables_by_variable ON explorer_variables (variable_id);
+CREATE INDEX IF NOT EXISTS explorer_variables_by_explorer ON explorer_variables (explorer);
+CREATE INDEX IF NOT EXISTS explorer_columns_by_slug ON explorer_columns (slug);
+CREATE INDEX IF NOT EXISTS explorer_columns_by_explorer ON explorer_columns (explorer);
+CREATE INDEX IF NOT EXISTS datapage_charts_by_chart ON datapage_charts (chart_id);
+CREATE INDEX IF NOT EXISTS datapage_charts_by_datapage ON datapage_charts (datapage);
+"""
+
+# Tables with the references of each kind of file, and the column with the name of the file
+REFERENCE_TABLES = {
+    "explorer": [
+        ("explorer_charts", "explorer"),
+        ("explorer_variables", "explorer"),
+        ("explorer_columns", "explorer"),
+    ],
+    "datapage": [("datapage_charts", "datapage")],
+}
+
+# Numbers of files read again, of files whose references changed and of files removed since the last refresh
+RefreshStats = namedtuple("RefreshStats", ["read", "changed", "removed"])
+
+# `explorers` and `variable_explorers` map explorer slugs to the views (row numbers in their graphers block) that show the chart or its variables
+ChartReferences = namedtuple(
+    "ChartReferences", ["explorers", "datapages", "variable_explorers"]
+)
+
+
+def connect(path=DB_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def _int(value):
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def explorer_references(name, data):
+    """
+    Return the rows of the reference tables for an explorer, from the bytes of its config.
+    """
+    explorer = parse_explorer(data.decode("utf-8"))
+    rows = {table: [] for table, _ in REFERENCE_TABLES["explorer"]}
+    graphers = explorer.graphers
+    if graphers is None:
+        return rows
+    for chart_id, views in explorer.by_grapher_id.items():
+        if _int(chart_id) is not None:
+            rows["explorer_charts"].extend(
+                (name, view, int(chart_id)) for view in views
+            )
+
+    variable_ids = graphers.columns.get("yVariableIds", ())
+    for view, value in enumerate(variable_ids):
+        for variable_id in dict.fromkeys(map(_int, value.split())):
+            if variable_id is not None:
+                rows["explorer_variables"].append((name, view, variable_id))
+
+    table_slugs = graphers.columns.get("tableSlug", [""] * len(graphers))
+    for view, (table_slug, y_slugs) in enumerate(
+        zip(table_slugs, graphers.columns.get("ySlugs", ()))
+    ):
+        for slug in dict.fromkeys(y_slugs.split()):
+            rows["explorer_columns"].append((name, view, table_slug or None, slug))
+    return rows
+
+
+def datapage_references(name, data):
+    """
+    Return the rows of the reference tables for a datapage, from the bytes of its file.
+    """
+    datapage = json.loads(data)
+    variable_id = _int(name)
+    return {
+        "datapage_charts": [
+            (name, variable_id, chart_id)
+            for chart_id in dict.fromkeys(chart_ids(datapage))
+        ]
+    }
+
+
+def _sources(explorers_dir, datapages_dir):
+    # Every file to index: (kind, name, path)
+    for path in sorted(Path(explorers_dir).glob("*.explorer.tsv")):
+        yield "explorer", path.name[: -len(".explorer.tsv")], path
+    for path in datapage_paths(datapages_dir):
+        yield "datapage", path.stem, path
+
+
+def _replace(db, kind, name, rows):
+    for table, column in REFERENCE_TABLES[kind]:
+        db.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+        if rows.get(table):
+            placeholders = ", ".join("?" * len(rows[table][0]))
+            db.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows[table])
+
+
+def refresh(db, explorers_dir=EXPLORERS_DIR, datapages_dir=DATAPAGES_DIR):
+    """
+    Update the references of the explorers and datapages that were added, changed or removed since the last refresh, and return RefreshStats.
+    """
+    known = {
+        path: (kind, name, size, mtime_ns, sha256)
+        for path, kind, name, size, mtime_ns, sha256 in db.execute(
+            "SELECT path, kind, name, size, mtime_ns, sha256 FROM files"
+        )
+    }
+    sources = [
+        (kind, name, path, str(Path(path).absolute()))
+        for kind, name, path in _sources(explorers_dir, datapages_dir)
+    ]
+    seen = {key for _, _, _, key in sources}
+    removed = [key for key in known if key not in seen]
+    n_read = n_changed = 0
+    with db:
+        # References are stored by file name: forget the removed files first, in case another file with the same name replaced them
+        for key in removed:
+            kind, name = known[key][:2]
+            _replace(db, kind, name, {})
+            db.execute("DELETE FROM files WHERE path = ?", (key,))
+
+        for kind, name, path, key in sources:
+            stat = path.stat()
+            previous = known.get(key)
+            if previous and previous[2:4] == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            data = path.read_bytes()
+            n_read += 1
+            sha256 = hash_bytes(data)
+            if not previous or previous[4] != sha256:
+                parse = (
+                    explorer_references if kind == "explorer" else datapage_references
+                )
+                try:
+                    rows = parse(name, data)
+                except ValueError as e:
+                    print(f"⚠️ Could not read {path}: {e}")
+                    rows = {}
+                _replace(db, kind, name, rows)
+                n_changed += 1
+            db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, name, stat.st_size, stat.st_mtime_ns, sha256),
+            )
+    return RefreshStats(n_read, n_changed, len(removed))
+
+
+def _views_by_explorer(rows):
+    views = {}
+    for explorer, view in rows:
+        views.setdefault(explorer, []).append(view)
+    return views
+
+
+def chart_references(db, chart_id):
+    """
+    Return the ChartReferences of a chart: the explorers that show it, the datapages shown on it and the explorers that show the variables of those datapages.
+    """
+    explorers = _views_by_explorer(
+        db.execute(
+            "SELECT explorer, view FROM explorer_charts WHERE chart_id = ? ORDER BY explorer, view",
+            (chart_id,),
+        )
+    )
+    datapages = [
+        name
+        for name, in db.execute(
+            "SELECT datapage FROM datapage_charts WHERE chart_id = ? ORDER BY datapage",
+            (chart_id,),
+        )
+    ]
+    variable_explorers = _views_by_explorer(
+        db.execute(
+            """
+            SELECT DISTINCT v.explorer, v.view
+            FROM datapage_charts AS d JOIN explorer_variables AS v ON v.variable_id = d.variable_id
+            WHERE d.chart_id = ?
+            ORDER BY v.explorer, v.view
+            """,
+            (chart_id,),
+        )
+    )
+    return ChartReferences(explorers, datapages, variable_explorers)
+
+
+def _describe(views_by_explorer):
+    return ", ".join(
+        f"{explorer} ({len(views)} views)"
+        for explorer, views in views_by_explorer.items()
+    )
+
+
+if __name__ == "__main__":
+    wanted = [_int(arg) for arg in sys.argv[1:]]
+    if not wanted or None in wanted:
+        sys.exit(
+            "Usage: python -m explorer_tools.references <chart id> [<chart id> ...]"
+        )
+
+    db = connect()
+    stats = refresh(db)
+    print(
+        f"📥 Read {stats.read} files ({stats.changed} changed, {stats.removed} removed) into {DB_PATH}"
+    )
+    for chart_id in wanted:
+        references = chart_references(db, chart_id)
+        if not any(references):
+            print(f"⚠️ Chart {chart_id} is not referenced by any explorer or datapage")
+            continue
+        print(f"📈 Chart {chart_id}:")
+        if references.explorers:
+            print(f"  explorers: {_describe(references.explorers)}")
+        if references.datapages:
+            print(f"  datapages: {', '.join(references.datapages)}")
+        if references.variable_explorers:
+            print(
+                f"  explorers with the variables of its datapages: {_describe(references.variable_explorers)}"
+            )
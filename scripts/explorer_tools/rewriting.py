@@ -0,0 +1,97 @@
+"""
+Rewrite phrases in text columns (e.g. the notes of the graphers) with a table of rules, in one pass per column.
+
+Instead of one `str.replace` per phrase, all the phrases of a generator are compiled into a single regular expression, and each distinct cell of a column is rewritten once, so adding rules does not add passes over the data. The number of cells each rule changed is counted, to spot rules that no longer match anything:
+
+    rules = RewriteRules(
+        [
+            ("Depending on the country and year, the data relates to consumption per capita.", "The data relates to consumption per capita."),
+            ...
+        ]
+    )
+    df_graphers["note"] = rules.apply(df_graphers["note"])
+    rules.counts          # cells changed by each rule, by phrase
+    rules.warn_unused()   # print the rules that changed nothing, if OWID_REWRITE_WARNINGS=1
+
+A rule may only match some versions of the sheets, so unused rules are not reported on every run: set OWID_REWRITE_WARNINGS=1 to check the rules after the sheets changed.
+
+Phrases are literal text. In a single pass, every occurrence of a phrase is replaced once (the longest phrase wins if several start at the same position), so replacements cannot contain a phrase of another rule: that would depend on the order in which the rules are applied.
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+WARN_UNUSED = os.environ.get("OWID_REWRITE_WARNINGS", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+class RewriteRules:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.replacements = {}
+        for old, new in self.rules:
+            if not old:
+                raise ValueError("Rewrite rules need a non-empty phrase")
+            if old in self.replacements:
+                raise ValueError(f"Phrase with more than one rewrite rule: {old!r}")
+            self.replacements[old] = new
+        for old, new in self.rules:
+            chained = [phrase for phrase in self.replacements if phrase in new]
+            if chained:
+                raise ValueError(
+                    f"The replacement of {old!r} contains the phrase of another rule: {chained[0]!r}"
+                )
+
+        # Longest phrases first, so that a phrase is not cut short by one of its prefixes
+        phrases = sorted(self.replacements, key=len, reverse=True)
+        self.pattern = re.compile("|".join(map(re.escape, phrases)))
+        self.rule_of = {old: i for i, (old, _) in enumerate(self.rules)}
+        self.n_cells = np.zeros(len(self.rules), dtype=int)
+
+    def _rewrite(self, text):
+        matched = set()
+
+        def replace(match):
+            matched.add(self.rule_of[match.group()])
+            return self.replacements[match.group()]
+
+        return self.pattern.sub(replace, text), matched
+
+    def apply(self, values):
+        """
+        Return a copy of a Series with the rules applied to its strings (other values are left as they are), and count the cells each rule changed.
+        """
+        is_str = values.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+        strings = values[is_str]
+        rewritten = {}
+        for text, n_cells in strings.value_counts(sort=False).items():
+            rewritten[text], matched = self._rewrite(text)
+            for rule in matched:
+                self.n_cells[rule] += n_cells
+
+        values = values.copy()
+        values[is_str] = strings.map(rewritten)
+        return values
+
+    @property
+    def counts(self):
+        """
+        Number of cells changed by each rule so far, indexed by phrase.
+        """
+        return pd.Series(self.n_cells, index=[old for old, _ in self.rules])
+
+    def warn_unused(self):
+        """
+        Print the rules that did not change any cell, if OWID_REWRITE_WARNINGS is set.
+        """
+        if not WARN_UNUSED:
+            return
+        for (old, _), count in zip(self.rules, self.n_cells):
+            if not count:
+                print(f"⚠️ Rewrite rule did not change any cell: {old}")
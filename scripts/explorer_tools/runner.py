@@ -0,0 +1,118 @@
+"""
+Run explorer generators as jobs in a process pool, with per-job status and timing.
+
+A generator is any script that writes its explorer when executed. Jobs can depend on other jobs: a job only starts once all its dependencies succeeded (or were up to date), and is skipped if any of them failed.
+"""
+
+import os
+import runpy
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fnmatch import fnmatch
+
+Job = namedtuple("Job", ["name", "path", "depends_on"], defaults=[()])
+
+JobResult = namedtuple("JobResult", ["name", "status", "seconds", "error"])
+
+# Statuses of the jobs that can be depended upon
+SUCCESS = ("ok", "up to date")
+
+
+def select_jobs(jobs, patterns):
+    """
+    Return the jobs whose name matches any of the glob patterns (e.g. `wid/*`), together with the jobs they depend on. All jobs are returned if there are no patterns.
+    """
+    if not patterns:
+        return list(jobs)
+
+    by_name = {job.name: job for job in jobs}
+    selected = set()
+    pending = [job.name for job in jobs if any(fnmatch(job.name, p) for p in patterns)]
+    if not pending:
+        raise ValueError(f"No job matches {', '.join(patterns)}")
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(by_name[name].depends_on)
+
+    # Keep the order in which the jobs were registered
+    return [job for job in jobs if job.name in selected]
+
+
+def _run_job(path):
+    start = time.perf_counter()
+    try:
+        runpy.run_path(str(path), run_name="__main__")
+    except BaseException:
+        return time.perf_counter() - start, traceback.format_exc()
+    return time.perf_counter() - start, None
+
+
+def run_jobs(jobs, max_workers=None, initializer=None, initargs=(), up_to_date=()):
+    """
+    Run the jobs in a process pool, starting each one as soon as its dependencies are done. Jobs named in `up_to_date` are not run, but count as succeeded. Returns a list of JobResult, in the order of `jobs`.
+    """
+    by_name = {job.name: job for job in jobs}
+    for job in jobs:
+        missing = set(job.depends_on) - set(by_name)
+        if missing:
+            raise ValueError(f"Job {job.name} depends on unknown jobs: {missing}")
+
+    results = {}
+    running = {}
+    max_workers = max_workers or os.cpu_count()
+    start = time.perf_counter()
+
+    def finish(result):
+        results[result.name] = result
+        icon = {"ok": "✅", "up to date": "✅", "failed": "🛑", "skipped": "⏭️"}[
+            result.status
+        ]
+        print(f"{icon} {result.name} {result.status} ({result.seconds:.1f}s)")
+        if result.error:
+            print(result.error)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        while len(results) < len(jobs):
+            progress = False
+            for job in jobs:
+                if job.name in results or job.name in running.values():
+                    continue
+                deps = [results.get(dep) for dep in job.depends_on]
+                if job.name in up_to_date:
+                    finish(JobResult(job.name, "up to date", 0.0, None))
+                    progress = True
+                elif any(dep is not None and dep.status not in SUCCESS for dep in deps):
+                    finish(JobResult(job.name, "skipped", 0.0, None))
+                    progress = True
+                elif all(dep is not None for dep in deps):
+                    running[executor.submit(_run_job, job.path)] = job.name
+
+            if not running:
+                if not progress:
+                    waiting = [job.name for job in jobs if job.name not in results]
+                    raise ValueError(f"Circular dependencies between jobs: {waiting}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    seconds, error = future.result()
+                except Exception:
+                    seconds, error = 0.0, traceback.format_exc()
+                finish(JobResult(name, "failed" if error else "ok", seconds, error))
+
+    results = [results[job.name] for job in jobs]
+    not_ok = [result.name for result in results if result.status not in SUCCESS]
+    elapsed = time.perf_counter() - start
+    print(
+        f"⏱️ {len(results) - len(not_ok)} of {len(results)} jobs succeeded in {elapsed:.1f}s"
+    )
+    if not_ok:
+        print(f"🛑 Not completed: {', '.join(not_ok)}")
+    return results
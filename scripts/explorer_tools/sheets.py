@@ -0,0 +1,239 @@
+"""
+Read Google Sheets tabs as dataframes, through a local content-addressed cache.
+
+Every tab is downloaded as CSV from the gviz endpoint and its bytes are stored under `<cache>/objects/<sha256>.csv`. A small ref file per (sheet_id, sheet_name) points to the latest blob and records when it was fetched:
+
+    <cache>/refs/<sheet_id>/<sheet_name>.json
+
+The behaviour can be configured with environment variables:
+- OWID_SHEETS_CACHE_DIR: where the cache lives (default: `scripts/.cache/sheets`).
+- OWID_SHEETS_TTL: seconds a cached tab is considered fresh (default: 3600). Use 0 to always refetch.
+- OWID_SHEETS_OFFLINE: set to 1 to never hit the network and only use the cache, however old it is.
+"""
+
+import ast
+import hashlib
+import io
+import json
+import os
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .fs import write_atomic
+
+SHEET_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
+
+CACHE_DIR = Path(
+    os.environ.get(
+        "OWID_SHEETS_CACHE_DIR", Path(__file__).parent.parent / ".cache" / "sheets"
+    )
+)
+TTL = float(os.environ.get("OWID_SHEETS_TTL", 3600))
+OFFLINE = os.environ.get("OWID_SHEETS_OFFLINE", "").lower() in ("1", "true", "yes")
+
+FETCH_TIMEOUT = 60
+
+# Raw CSV bytes of the tabs loaded by prefetch_sheets, keyed by (sheet_id, sheet_name)
+_prefetched = {}
+
+
+class SheetUnavailableError(RuntimeError):
+    pass
+
+
+def sheet_url(sheet_id, sheet_name):
+    return SHEET_URL.format(
+        sheet_id=sheet_id, sheet_name=urllib.parse.quote(sheet_name)
+    )
+
+
+def _ref_path(sheet_id, sheet_name):
+    return (
+        CACHE_DIR
+        / "refs"
+        / sheet_id
+        / f"{urllib.parse.quote(sheet_name, safe='')}.json"
+    )
+
+
+def _object_path(digest):
+    return CACHE_DIR / "objects" / f"{digest}.csv"
+
+
+def read_ref(sheet_id, sheet_name):
+    """
+    Return the cache entry of a tab as a dict with `sha256`, `fetched_at` and `url`, or None if the tab was never cached (or its blob is gone).
+    """
+    ref_path = _ref_path(sheet_id, sheet_name)
+    try:
+        ref = json.loads(ref_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not _object_path(ref["sha256"]).exists():
+        return None
+    return ref
+
+
+def cached_files(sheet_id, sheet_name):
+    """
+    Return the paths of the cache files of a tab, its ref file and the blob it points to, or None if the tab is not cached.
+    """
+    ref = read_ref(sheet_id, sheet_name)
+    if ref is None:
+        return None
+    return _ref_path(sheet_id, sheet_name), _object_path(ref["sha256"])
+
+
+def store_sheet(sheet_id, sheet_name, data):
+    """
+    Store the CSV bytes of a tab in the cache and point its ref to them. Returns the sha256 digest of the content.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    object_path = _object_path(digest)
+    if not object_path.exists():
+        write_atomic(object_path, data)
+
+    ref = {
+        "sha256": digest,
+        "fetched_at": time.time(),
+        "url": sheet_url(sheet_id, sheet_name),
+    }
+    write_atomic(
+        _ref_path(sheet_id, sheet_name), json.dumps(ref, indent=2).encode("utf-8")
+    )
+    return digest
+
+
+def _download(sheet_id, sheet_name):
+    with urllib.request.urlopen(
+        sheet_url(sheet_id, sheet_name), timeout=FETCH_TIMEOUT
+    ) as response:
+        return response.read()
+
+
+def fetch_sheet(sheet_id, sheet_name, ttl=None, offline=None):
+    """
+    Return the raw CSV bytes of a tab, from the cache if it is fresh enough and from Google Sheets otherwise.
+
+    If the download fails, a stale cached copy is used instead (with a warning). In offline mode the network is never used.
+    """
+    ttl = TTL if ttl is None else ttl
+    offline = OFFLINE if offline is None else offline
+
+    ref = read_ref(sheet_id, sheet_name)
+    if ref is not None and (offline or time.time() - ref["fetched_at"] < ttl):
+        return _object_path(ref["sha256"]).read_bytes()
+
+    if offline:
+        raise SheetUnavailableError(
+            f"Sheet {sheet_name} ({sheet_id}) is not cached and OWID_SHEETS_OFFLINE is set. Run once with network access to fill the cache in {CACHE_DIR}."
+        )
+
+    try:
+        data = _download(sheet_id, sheet_name)
+    except OSError as e:
+        if ref is None:
+            raise SheetUnavailableError(
+                f"Could not download sheet {sheet_name} ({sheet_id}) and there is no cached copy: {e}"
+            ) from e
+        age_hours = (time.time() - ref["fetched_at"]) / 3600
+        print(
+            f"⚠️ Could not download sheet {sheet_name} ({sheet_id}), using the cached copy from {age_hours:.1f} hours ago: {e}"
+        )
+        return _object_path(ref["sha256"]).read_bytes()
+
+    store_sheet(sheet_id, sheet_name, data)
+    return data
+
+
+def read_sheet(sheet_id, sheet_name, **kwargs):
+    """
+    Read a tab of a Google Sheet into a dataframe. Keyword arguments are passed on to pd.read_csv.
+    """
+    # pandas is imported here, so that fetching and checking tabs (e.g. in generate_all_explorers.py) does not pay for importing it
+    import pandas as pd
+
+    data = _prefetched.get((sheet_id, sheet_name))
+    if data is None:
+        data = fetch_sheet(sheet_id, sheet_name)
+    return pd.read_csv(io.BytesIO(data), **kwargs)
+
+
+def sheets_used(script_path):
+    """
+    Return the set of (sheet_id, sheet_name) pairs a generator script reads, without running it.
+
+    The scripts assign `sheet_id` and `sheet_name` as string constants at module level and then call `read_sheet(sheet_id, sheet_name, ...)`, so following the assignments in order is enough to resolve every call.
+    """
+    source = Path(script_path).read_text(encoding="utf-8")
+    lines = source.splitlines()
+    tree = ast.parse(source)
+    constants = {}
+    pairs = set()
+
+    def resolve(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Name):
+            return constants.get(node.id)
+        return None
+
+    for statement in tree.body:
+        # Only walk the statements that mention read_sheet, walking the whole script is slow
+        text = "\n".join(lines[statement.lineno - 1 : statement.end_lineno])
+        for node in ast.walk(statement) if "read_sheet" in text else ():
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name)
+                and node.func.id == "read_sheet"
+                and len(node.args) >= 2
+            ):
+                sheet_id, sheet_name = resolve(node.args[0]), resolve(node.args[1])
+                if sheet_id is not None and sheet_name is not None:
+                    pairs.add((sheet_id, sheet_name))
+        if isinstance(statement, ast.Assign):
+            value = resolve(statement.value)
+            for target in statement.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = value
+
+    return pairs
+
+
+def prefetch_sheets(pairs, max_workers=16):
+    """
+    Fetch all the given (sheet_id, sheet_name) pairs concurrently, once each, and keep their contents in memory so that later read_sheet calls in this process do not touch the network or the cache again.
+
+    Returns the list of pairs that could not be loaded. Those are reported here and left for read_sheet to retry, so that a missing tab only breaks the generators that use it.
+    """
+    pairs = sorted(set(pairs) - set(_prefetched))
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_sheet, *pair): pair for pair in pairs}
+        for future in as_completed(futures):
+            pair = futures[future]
+            try:
+                _prefetched[pair] = future.result()
+            except SheetUnavailableError as e:
+                print(f"⚠️ {e}")
+                failed.append(pair)
+
+    print(f"📥 Prefetched {len(pairs) - len(failed)} of {len(pairs)} sheet tabs")
+    return failed
+
+
+def prefetched_sheets():
+    """
+    Return a copy of the tab contents loaded by prefetch_sheets, to hand them over to other processes with preload_sheets.
+    """
+    return dict(_prefetched)
+
+
+def preload_sheets(contents):
+    """
+    Make read_sheet use the given tab contents (as returned by prefetched_sheets) in this process.
+    """
+    _prefetched.update(contents)
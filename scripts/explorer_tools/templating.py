@@ -0,0 +1,190 @@
+"""
+Fill `${placeholder}` templates (string.Template syntax) in whole dataframe columns at a time.
+
+Instead of calling Template.substitute for every cell, each distinct template string is compiled once into its literal parts and placeholders, and all the rows that share it are filled in one go by concatenating the literal parts with the value columns. Missing keys are reported before anything is substituted.
+"""
+
+from functools import lru_cache
+from string import Template
+
+import numpy as np
+import pandas as pd
+
+
+class TemplateError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def compile_template(template):
+    """
+    Split a template into a tuple of parts: `(False, text)` for literal text and `(True, key)` for a placeholder.
+    """
+    parts = []
+    position = 0
+    for match in Template.pattern.finditer(template):
+        if match.group("invalid") is not None:
+            raise TemplateError(
+                f"Invalid placeholder at position {match.start()} in template: {template}"
+            )
+        parts.append((False, template[position : match.start()]))
+        if match.group("escaped") is not None:
+            parts.append((False, "$"))
+        else:
+            parts.append((True, match.group("named") or match.group("braced")))
+        position = match.end()
+    parts.append((False, template[position:]))
+
+    # Merge consecutive literal parts and drop empty ones
+    merged = []
+    for is_key, text in parts:
+        if merged and not is_key and not merged[-1][0]:
+            merged[-1] = (False, merged[-1][1] + text)
+        elif is_key or text:
+            merged.append((is_key, text))
+    return tuple(merged)
+
+
+def escape(text):
+    """
+    Return a template that produces `text` unchanged, i.e. with every `$` written `$$`.
+    """
+    return text.replace("$", "$$")
+
+
+def template_keys(template):
+    return {text for is_key, text in compile_template(template) if is_key}
+
+
+def _templates_by_column(df, columns):
+    # For each column, the row positions of every distinct template string in it (non-string cells are left alone)
+    templates = {}
+    for column in columns:
+        values = df[column]
+        is_str = values.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+        positions = np.flatnonzero(is_str)
+        groups = pd.Series(positions).groupby(values.to_numpy()[is_str]).indices
+        templates[column] = {
+            template: positions[group]
+            for template, group in groups.items()
+            if "$" in template
+        }
+    return templates
+
+
+def _check_keys(templates, available):
+    missing = []
+    for column, column_templates in templates.items():
+        for template in column_templates:
+            for key in sorted(template_keys(template) - set(available)):
+                missing.append(f"  {key} (column {column}: {template!r})")
+    if missing:
+        raise TemplateError(
+            "Templates use placeholders that have no value:\n" + "\n".join(missing)
+        )
+
+
+def fill(template, positions, values):
+    """
+    Return the template filled in for the given row positions, as an object array, where `values` maps every placeholder to either a scalar or a Series (indexed by position).
+
+    Every distinct combination of the values is filled once, and the rows that have it share the same string.
+    """
+    parts = []
+    codes = np.zeros(len(positions), dtype=np.int64)
+    n_combinations = 1
+    for is_key, text in compile_template(template):
+        if is_key and isinstance(values[text], pd.Series):
+            key_codes, uniques = pd.factorize(
+                values[text].iloc[positions].astype(str).to_numpy()
+            )
+            codes = codes * max(len(uniques), 1) + key_codes
+            n_combinations *= max(len(uniques), 1)
+            if n_combinations > len(positions):
+                # Renumber the combinations that occur, so that codes stay small
+                codes, occurring = pd.factorize(codes)
+                n_combinations = len(occurring)
+            parts.append((key_codes, uniques.astype(object)))
+        elif is_key:
+            parts.append(str(values[text]))
+        else:
+            parts.append(text)
+    combinations, first = np.unique(codes, return_index=True)
+
+    filled = np.full(len(first), "", dtype=object)
+    for part in parts:
+        if isinstance(part, str):
+            filled = filled + part
+        else:
+            key_codes, uniques = part
+            filled = filled + uniques[key_codes[first]]
+    return filled[np.searchsorted(combinations, codes)]
+
+
+def _substitute(df, templates, values):
+    # Fill the templates in place
+    for column, column_templates in templates.items():
+        if not column_templates:
+            continue
+        filled = df[column].to_numpy(dtype=object, copy=True)
+        for template, positions in column_templates.items():
+            filled[positions] = fill(template, positions, values)
+        df[column] = filled
+
+
+def substitute_columns(df, columns, values):
+    """
+    Return a copy of `df` where the templates in `columns` are filled in with `values`, which maps every placeholder to either a scalar or a Series with one value per row of `df` (in the same order).
+
+    Equivalent to calling `Template(cell).substitute(**values_of_the_row)` on every string cell of `columns`.
+    """
+    templates = _templates_by_column(df, columns)
+    _check_keys(templates, values)
+
+    df = df.copy()
+    _substitute(df, templates, values)
+    return df
+
+
+def resolve_columns(df, columns=None):
+    """
+    Return a copy of `df` where templates refer to other columns of the same row, e.g. `Population of ${sex__slug}`, and those columns can contain templates themselves.
+
+    The columns are filled in dependency order, so every cell is substituted once. Placeholders that are not columns of `df`, and columns that depend on each other, raise a TemplateError.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    templates = _templates_by_column(df, columns)
+    _check_keys(templates, df.columns)
+
+    depends_on = {
+        column: set().union(*map(template_keys, column_templates))
+        for column, column_templates in templates.items()
+    }
+
+    # Depth-first topological sort of the columns
+    order = []
+    state = {}
+
+    def visit(column, path):
+        if state.get(column) == "done":
+            return
+        if state.get(column) == "visiting":
+            cycle = path[path.index(column) :] + [column]
+            raise TemplateError(
+                f"Columns refer to each other in their templates: {' -> '.join(cycle)}"
+            )
+        state[column] = "visiting"
+        for dependency in sorted(depends_on.get(column, ())):
+            visit(dependency, path + [column])
+        state[column] = "done"
+        order.append(column)
+
+    for column in columns:
+        visit(column, [])
+
+    df = df.copy()
+    for column in order:
+        if templates.get(column):
+            values = {key: df[key] for key in depends_on[column]}
+            _substitute(df, {column: templates[column]}, values)
+    return df
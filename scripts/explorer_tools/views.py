@@ -0,0 +1,292 @@
+"""
+Declare explorer views (or table columns) as dimensions and templated fields, and expand them into a dataframe.
+
+Instead of nested loops that add one row at a time, a family of views is declared once, as a dict of fields, inside `Each` nodes that give the dimensions it varies over:
+
+    graphers = expand_views(
+        Each(
+            {"survey": survey_type},
+            [
+                Each(
+                    {"p": povlines_abs},
+                    [
+                        {
+                            "title": "${p__title_share}",
+                            "ySlugs": "headcount_ratio_${p__cents}",
+                            "Poverty line Dropdown": "${p__povline_dropdown}",
+                            "tableSlug": Column("survey__table_name"),
+                            "yAxisMin": 0,
+                        },
+                    ],
+                ),
+                {"title": "Mean ${survey__text} per day", "ySlugs": "mean"},
+            ],
+        )
+    )
+
+is the same as
+
+    for survey in range(len(survey_type)):
+        for p in range(len(povlines_abs)):
+            rows.add_row({"title": f"{povlines_abs.title_share[p]}", ...})
+        rows.add_row({"title": f"Mean {survey_type.text[survey]} per day", "ySlugs": "mean"})
+
+A dimension is a dataframe with one row per value, and `${dimension__column}` refers to one of its columns. Each node loops over the cartesian product of its dimensions (the first one varying slowest) and, for every combination, adds the rows of its views in order. A field is either:
+- a template string (string.Template syntax, so a literal `$` is written `$$`), filled in with the values of the dimensions as text, like an f-string,
+- `Column("dimension__column")`, to take the values of a dimension as they are (e.g. numbers). The name of the column can itself be a template, to pick the column by the value of another dimension (e.g. `Column("p__scale_poverty_gap_index_${wel__slug}")`),
+- `TemplateColumn("dimension__column")`, when the templates themselves are in a column of a dimension (e.g. slugs kept in a spreadsheet, like `mean_${agg__slug_suffix}`): the template of every row is filled in with the values of the dimensions,
+- any other value, which is the same for all the rows.
+
+The fields of an Each node are set on all the rows of its views, after theirs (like `RowBuilder.set_column` after a loop).
+
+All the rows are laid out at once with NumPy index arithmetic, and every distinct template is filled in a whole column at a time, so the time taken depends on the size of the output and not on the number of loops. The dataframe produced is the same one RowBuilder produces for the equivalent loops (see frames.py for the column types).
+
+`derive_views` builds a family of views from existing ones with the same kind of fields, e.g. the views that show breaks between surveys from the views of an explorer: there, `${column}` and `Column("column")` refer to the columns of the views it starts from.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .frames import is_number
+from .templating import TemplateError, compile_template, fill, template_keys
+
+Each = namedtuple("Each", ["dimensions", "views", "fields"], defaults=[None])
+
+Column = namedtuple("Column", ["name"])
+
+TemplateColumn = namedtuple("TemplateColumn", ["name"])
+
+
+def _cross_positions(sizes):
+    # Row positions in each dimension for every combination, the first dimension varying slowest
+    total = int(np.prod(sizes, dtype=np.int64))
+    positions = []
+    stride = total
+    for size in sizes:
+        stride = stride // size if size else 0
+        positions.append(
+            (np.arange(total) // stride) % size
+            if stride
+            else np.zeros(0, dtype=np.int64)
+        )
+    return total, positions
+
+
+class _Plan:
+    """
+    The rows of an expansion: for every row, the view (leaf) it comes from and its position in each dimension around it.
+
+    Sibling nodes can use the same dimension name for different dataframes, so dimensions are keyed by (node number, name).
+    """
+
+    def __init__(self):
+        # Fields of every view and the dimensions around it, by name
+        self.leaves = []
+        # Fields of every node, the dimensions around them, their leaves and the number of rows of one combination, children before parents
+        self.nodes = []
+        self.dimensions = {}
+
+    def lay_out(self, node, around=None):
+        """
+        Return the leaf number of every row of `node` and their positions in the dimensions of `node` and of the nodes inside it.
+        """
+        around = around or {}
+        if isinstance(node, dict):
+            self.leaves.append((node, around))
+            return np.array([len(self.leaves) - 1]), {}
+
+        if not isinstance(node, Each):
+            node = Each({}, list(node))
+        keys = []
+        for name, frame in node.dimensions.items():
+            if name in around:
+                raise ValueError(
+                    f"Dimension {name} is nested in another one with the same name"
+                )
+            keys.append((len(self.nodes), name))
+            self.dimensions[keys[-1]] = frame.reset_index(drop=True)
+        # Reserve the node number now, children are numbered after it
+        self.nodes.append(None)
+        node_number = len(self.nodes) - 1
+        around = {**around, **{key[1]: key for key in keys}}
+        first_leaf = len(self.leaves)
+
+        # Rows of one combination of this node's dimensions: the rows of its views, in order
+        leaves, positions = [], []
+        for view in node.views:
+            view_leaves, view_positions = self.lay_out(view, around)
+            leaves.append(view_leaves)
+            positions.append(view_positions)
+        inner_leaves = np.concatenate(leaves) if leaves else np.zeros(0, dtype=int)
+        inner = {key: None for view_positions in positions for key in view_positions}
+        for key in inner:
+            inner[key] = np.concatenate(
+                [
+                    view_positions.get(key, np.full(len(view_leaves), -1))
+                    for view_leaves, view_positions in zip(leaves, positions)
+                ]
+            )
+
+        # Repeat them for every combination
+        total, combinations = _cross_positions(
+            [len(self.dimensions[key]) for key in keys]
+        )
+        n_inner = len(inner_leaves)
+        result = {key: np.tile(values, total) for key, values in inner.items()}
+        for key, values in zip(keys, combinations):
+            result[key] = np.repeat(values, n_inner)
+
+        self.nodes[node_number] = (
+            node.fields or {},
+            around,
+            range(first_leaf, len(self.leaves)),
+            n_inner,
+        )
+        return np.tile(inner_leaves, total), result
+
+
+def _lookup(plan, key, around, rows, positions):
+    name, _, column = key.partition("__")
+    if name not in around or column not in plan.dimensions[around[name]]:
+        raise TemplateError(
+            f"{key} is not a column of the dimensions {', '.join(around) or '(none)'}"
+        )
+    dimension = around[name]
+    return plan.dimensions[dimension][column].iloc[positions[dimension][rows]]
+
+
+def _field_values(plan, value, around, rows, positions):
+    """
+    Return the values of a field for the given rows and whether each of them is a number.
+    """
+    if isinstance(value, Column) and "$" in value.name:
+        names, _ = _field_values(plan, value.name, around, rows, positions)
+        values = np.empty(len(rows), dtype=object)
+        numeric = np.zeros(len(rows), dtype=bool)
+        for name, group in (
+            pd.Series(np.arange(len(rows))).groupby(names).indices.items()
+        ):
+            values[group], numeric[group] = _field_values(
+                plan, Column(name), around, rows[group], positions
+            )
+        return values, numeric
+
+    if isinstance(value, TemplateColumn):
+        templates, _ = _field_values(plan, Column(value.name), around, rows, positions)
+        values = np.empty(len(rows), dtype=object)
+        numeric = np.zeros(len(rows), dtype=bool)
+        for template, group in (
+            pd.Series(np.arange(len(rows))).groupby(templates).indices.items()
+        ):
+            values[group], numeric[group] = _field_values(
+                plan, template, around, rows[group], positions
+            )
+        return values, numeric
+
+    if isinstance(value, Column):
+        values = _lookup(plan, value.name, around, rows, positions)
+        if values.dtype.kind in "iuf":
+            numeric = np.ones(len(rows), dtype=bool)
+        else:
+            numeric = np.fromiter(map(is_number, values), bool, len(rows))
+        return values.to_numpy(dtype=object), numeric
+
+    if isinstance(value, str) and "$" in value:
+        compile_template(value)
+        keys = {
+            key: _lookup(plan, key, around, rows, positions)
+            for key in template_keys(value)
+        }
+        return fill(value, np.arange(len(rows)), keys), np.zeros(len(rows), bool)
+
+    return _constant(value, len(rows))
+
+
+def _constant(value, length):
+    values = np.empty(length, dtype=object)
+    values[:] = [value] * length
+    return values, np.full(length, is_number(value))
+
+
+def _build_column(length, chunks):
+    # Same types as RowBuilder: float if every value is a number, otherwise object, with the numbers set before the first non-number turned into floats
+    values = np.full(length, np.nan, dtype=object)
+    numeric = np.ones(length, dtype=bool)
+    for rows, chunk_values, chunk_numeric in chunks:
+        values[rows] = chunk_values
+        numeric[rows] = chunk_numeric
+    if numeric.all():
+        return values.astype(float)
+    upcast = np.flatnonzero(numeric[: np.argmin(numeric)])
+    values[upcast] = [np.nan if v is None else float(v) for v in values[upcast]]
+    return values
+
+
+def expand_views(spec):
+    """
+    Return the dataframe of the rows declared by `spec`: an Each node, a dict of fields (one row) or a list of those.
+    """
+    plan = _Plan()
+    leaf_ids, positions = plan.lay_out(spec)
+    length = len(leaf_ids)
+    rows_of_leaf = pd.Series(np.arange(length)).groupby(leaf_ids).indices
+
+    # Fields of the views, then the fields of the nodes (children before their parents, which override them). Each assignment comes with the row after which it happens: a view sets its fields when its first row is added, a node once the rows of its first combination are added.
+    assignments = []
+    for leaf, (fields, around) in enumerate(plan.leaves):
+        rows = rows_of_leaf.get(leaf, np.zeros(0, dtype=int))
+        assignments.append((fields, around, rows, (rows[0], 0) if len(rows) else None))
+    for fields, around, leaves, n_inner in reversed(plan.nodes):
+        rows = [rows_of_leaf[leaf] for leaf in leaves if leaf in rows_of_leaf]
+        rows = np.sort(np.concatenate(rows)) if rows else np.zeros(0, dtype=int)
+        assignments.append(
+            (fields, around, rows, (rows[n_inner - 1], 1) if len(rows) else None)
+        )
+
+    columns = {}
+    first_set = {}
+    for fields, around, rows, when in assignments:
+        if not len(rows):
+            continue
+        for name, value in fields.items():
+            columns.setdefault(name, []).append(
+                (rows, *_field_values(plan, value, around, rows, positions))
+            )
+            first_set[name] = min(first_set.get(name, when), when)
+
+    # Columns are in the order in which they were first set (sorted is stable, so fields set at the same time keep their order)
+    order = sorted(columns, key=first_set.get)
+    data = {name: _build_column(length, columns[name]) for name in order}
+    return pd.DataFrame(data, index=pd.RangeIndex(length))
+
+
+def derive_views(views, fields, where=None):
+    """
+    Return new views with one row per row of `views` (or per row where the boolean Series `where` is true), and the columns in `fields`: `Column("column")` copies a column of `views`, a template string is filled in with the columns of the row (e.g. `${survey_type}_${ySlugs}`) and any other value is the same for all the rows.
+
+    Same as adding a row per view with RowBuilder and filtering them afterwards, but done a whole column at a time.
+    """
+    if where is not None:
+        views = views[where.to_numpy(dtype=bool)]
+    views = views.reset_index(drop=True)
+    positions = np.arange(len(views))
+
+    data = {}
+    for name, value in fields.items():
+        if isinstance(value, Column):
+            data[name] = views[value.name]
+        elif isinstance(value, str) and "$" in value:
+            keys = template_keys(value)
+            missing = sorted(keys - set(views.columns))
+            if missing:
+                raise TemplateError(
+                    f"{', '.join(missing)} in the template of {name} are not columns of the views"
+                )
+            data[name] = fill(value, positions, {key: views[key] for key in keys})
+        else:
+            data[name] = _build_column(
+                len(views), [(positions, *_constant(value, len(views)))]
+            )
+    return pd.DataFrame(data, index=pd.RangeIndex(len(views)))
@@ -0,0 +1,85 @@
+"""
+Write explorer configs straight to the output file, block by block.
+
+An explorer config is a header block followed by an indented `graphers` block and indented `table`/`columns` blocks. Instead of serializing each dataframe into one string, indenting it into a second one and substituting that into a template, the rows are written to the file in chunks, so the memory used does not grow with the number of views.
+"""
+
+import textwrap
+from string import Template
+
+import numpy as np
+
+from .templating import TemplateError, compile_template
+
+CHUNK_ROWS = 1000
+
+
+def write_frame(f, df, indent="\t", chunksize=CHUNK_ROWS, **kwargs):
+    """
+    Write a dataframe as TSV to the open file `f`, with every line indented. Keyword arguments are passed on to to_csv.
+
+    The output is the same as `f.write(textwrap.indent(df.to_csv(sep="\\t", **kwargs), indent))`, but only `chunksize` rows are serialized at a time.
+    """
+    kwargs.setdefault("sep", "\t")
+    header = kwargs.pop("header", True)
+    for start in range(0, max(len(df), 1), chunksize):
+        chunk = df.iloc[start : start + chunksize].to_csv(
+            header=header if start == 0 else False, **kwargs
+        )
+        f.write(textwrap.indent(chunk, indent) if indent else chunk)
+
+
+class TableBlocks:
+    """
+    The rows of a dataframe split by the values of one or more columns (e.g. tableSlug), to write one `table`/`columns` block per value.
+
+    The dataframe is grouped once and reordered so that the rows of each block are contiguous, and each block is a slice of it (without the `by` columns), so splitting a dataframe into n blocks takes linear time instead of one filter and one copy per block. Blocks keep the original order of their rows.
+
+        blocks = TableBlocks(df_spells, ["master_var", "survey_type"])
+        write_frame(f, blocks[var, survey], index=False)
+
+    A value with no rows gives an empty block, like filtering with `df[df[by] == value]` would.
+    """
+
+    def __init__(self, df, by):
+        positions = df.groupby(by, sort=False).indices
+        bounds = np.cumsum([0] + [len(rows) for rows in positions.values()])
+        order = (
+            np.concatenate(list(positions.values()))
+            if positions
+            else np.zeros(0, dtype=int)
+        )
+        self.rows = df.drop(columns=by).take(order).reset_index(drop=True)
+        self.slices = {
+            key: slice(start, stop)
+            for key, start, stop in zip(positions, bounds[:-1], bounds[1:])
+        }
+
+    def __getitem__(self, key):
+        return self.rows.iloc[self.slices.get(key, slice(0, 0))]
+
+
+def write_template(f, template, **values):
+    """
+    Write a template (string.Template syntax, e.g. the `*.template.tsv` files) to the open file `f`.
+
+    Each value is either a string or a function that writes the value to `f` itself, e.g. `lambda f: write_frame(f, graphers, index=False)`. The output is the same as `f.write(Template(template).substitute(**values))` with the functions' output in place of their placeholders.
+    """
+    if isinstance(template, Template):
+        template = template.template
+    parts = compile_template(template)
+
+    # Check all placeholders before writing anything
+    missing = {text for is_key, text in parts if is_key} - set(values)
+    if missing:
+        raise TemplateError(
+            f"Template placeholders have no value: {', '.join(sorted(missing))}"
+        )
+
+    for is_key, text in parts:
+        if not is_key:
+            f.write(text)
+        elif callable(values[text]):
+            values[text](f)
+        else:
+            f.write(str(values[text]))
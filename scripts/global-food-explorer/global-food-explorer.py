@@ -7,22 +7,44 @@
 # We take the cartesian product between (2) and (3) - according to the tag -, sprinkle some magic dust to make the titles work, and then place that massive table into the template (1).
 
 # %%
-from string import Template
-import pandas as pd
-import numpy as np
-import textwrap
 from os import path
+from glob import glob
 import sys
 
+sys.path.append("..")
+from explorer_tools.manifest import BuildManifest
+from explorer_tools.paths import EXPLORERS_DIR
+
+outfile = EXPLORERS_DIR / "global-food.explorer.tsv"
+
+# Skip the build if neither this script nor its input files changed since the explorer was last generated
+build = BuildManifest(outfile)
+build.add_script("global-food-explorer.py")
+build.add_files([*sorted(glob("*.csv")), *sorted(glob("*.tsv"))])
+if build.is_up_to_date():
+    print(f"✅ {path.abspath(outfile)} is up to date")
+    sys.exit()
+
+# %%
+from string import Template
+import pandas as pd
+
+from explorer_tools.default_view import DefaultViewError, set_default_view
+from explorer_tools.output import open_output
+from explorer_tools.templating import substitute_columns
+from explorer_tools.writer import write_frame, write_template
+
 # Latest ETL version of the food explorer (https://github.com/owid/etl/tree/master/etl/steps/data/explorers/faostat/).
 VERSION = "2023-06-12"
 
 # Get year (to be used in metadata) from the version.
 year = VERSION.split("-")[0]
 
-outfile = "../../explorers/global-food.explorer.tsv"
-
-default_view = '`Food Dropdown` == "Maize (corn)" and `Metric Dropdown` == "Production" and `Per Capita Checkbox` == "false"'
+default_view = {
+    "Food Dropdown": "Maize (corn)",
+    "Metric Dropdown": "Production",
+    "Per Capita Checkbox": "false",
+}
 
 DATA_FILES_URL = f"https://catalog.ourworldindata.org/explorers/faostat/{VERSION}/food_explorer/"
 
@@ -33,20 +55,18 @@ def food_url(food):
     return f"{DATA_FILES_URL}{food}.csv"
 
 
-def substitute_title(row):
-    # The title can include placeholders like ${food_singular}, which will be replaced with the actual food name here.
-    food_slug = row["tableSlug"]
-    food_names = foods_df.loc[food_slug]
-    for key in ["title", "subtitle"]:
-        if isinstance(row[key], str):
-            template = Template(row[key])
-            row[key] = template.substitute(
-                food_singular=food_names["singular"],
-                food_singular_lower=food_names["singular"].lower(),
-                food_plural=food_names["plural"],
-                food_plural_lower=food_names["plural"].lower(),
-            )
-    return row
+def substitute_title(views):
+    # The title can include placeholders like ${food_singular}, which will be replaced with the actual food name here (from the food names joined to the views).
+    return substitute_columns(
+        views,
+        ["title", "subtitle"],
+        dict(
+            food_singular=views["food__singular"],
+            food_singular_lower=views["food__singular"].str.lower(),
+            food_plural=views["food__plural"],
+            food_plural_lower=views["food__plural"].str.lower(),
+        ),
+    )
 
 
 def table_def(food):
@@ -73,6 +93,8 @@ foods_rename = {
     "slug": "tableSlug",
     "_tags": "_tags",
     "note": "food__note",
+    "singular": "food__singular",
+    "plural": "food__plural",
 }
 
 foods = foods_df.reset_index()[foods_rename.keys()].rename(columns=foods_rename)
@@ -92,10 +114,11 @@ if len(symmetric_diff) > 0:
 
 # %%
 # merge on column: _tag
-graphers = views_df.merge(foods).apply(substitute_title, axis=1)
-graphers = graphers.drop(columns="_tag").sort_values(by="Food Dropdown", kind="stable")
-# drop duplicates introduced by the tag merge
+graphers = views_df.merge(foods).drop(columns="_tag")
+# drop duplicates introduced by the tag merge, before the titles are filled in
 graphers = graphers.drop_duplicates()
+graphers = substitute_title(graphers).drop(columns=["food__singular", "food__plural"])
+graphers = graphers.sort_values(by="Food Dropdown", kind="stable")
 
 print(f"📈 Generated {len(graphers.index)} views")
 
@@ -104,7 +127,7 @@ print(f"📈 Generated {len(graphers.index)} views")
 graphers["note"] = graphers["food__note"].str.cat(
     graphers["note"], sep="\\n", na_rep=""
 )
-graphers["note"] = graphers["note"].apply(lambda x: x.strip("\\n"))
+graphers["note"] = graphers["note"].str.strip("\\n")
 graphers = graphers.drop(columns="food__note")
 
 # %%
@@ -135,36 +158,30 @@ if len(remaining_cols) > 0:
 # %%
 # Mark the default view with defaultView=true. This is always the last column.
 if default_view is not None:
-    default_view_mask = graphers.eval(default_view)
-    default_view_count = len(graphers[default_view_mask])
-    if default_view_count != 1:
-        print(
-            f"🛑 fatal! Default view ({default_view}) should match exactly one view, but matches {default_view_count} views:"
-        )
-        print(graphers[default_view_mask])
+    try:
+        default_view_position = set_default_view(graphers, default_view)
+    except DefaultViewError as e:
+        print(f"🛑 fatal! {e}")
         sys.exit(1)
-    print(f"📌 Default view:\n{graphers[default_view_mask]}")
-    graphers["defaultView"] = np.where(default_view_mask, "true", None)
+    print(f"📌 Default view:\n{graphers.iloc[[default_view_position]]}")
 
 # %%
-graphers_tsv = graphers.to_csv(sep="\t", index=False)
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
-
 table_defs = "\n".join([table_def(food) for food in foods_df.index])
 food_slugs = "\t".join(foods_df.index)
 
 # %%
 warning = "# DO NOT EDIT THIS FILE BY HAND. It is automatically generated using a set of input files. Any changes made directly to it will be overwritten.\n\n"
 
-with open(outfile, "w", newline="\n") as f:
-    f.write(
-        warning
-        + template.substitute(
-            food_slugs=food_slugs,
-            graphers_tsv=graphers_tsv_indented,
-            table_defs=table_defs,
-            year=year,
-        )
+# The graphers are written to the file in chunks, indented, instead of being substituted into the template as one string
+with open_output(outfile) as f:
+    f.write(warning)
+    write_template(
+        f,
+        template,
+        food_slugs=food_slugs,
+        graphers_tsv=lambda f: write_frame(f, graphers, index=False),
+        table_defs=table_defs,
+        year=year,
     )
 
-    print(f"💾 Explorer config written to {path.abspath(outfile)}")
+build.save()
@@ -1,31 +1,61 @@
 # %%
-from string import Template
-import pandas as pd
 from os import path
-import textwrap
+from glob import glob
+import sys
 
-outfile = "../../explorers/migration-flows.explorer.tsv"
+sys.path.append("..")
+from explorer_tools.catalog import fetch_column, fetch_header
+from explorer_tools.manifest import BuildManifest
+from explorer_tools.paths import EXPLORERS_DIR
+
+outfile = EXPLORERS_DIR / "migration-flows.explorer.tsv"
 
 datafile_url = "https://raw.githubusercontent.com/owid/importers/migration/migration/output/Migration_matrix.csv"
 
+# Only the column names and the entities of the data file are used, so only those are fetched (and cached by ETag)
+datafile_columns = fetch_header(datafile_url)
+available_entities = fetch_column(datafile_url, "entity")
+
+# Skip the build if neither this script, its input files nor the columns and entities of the data file changed since the explorer was last generated
+build = BuildManifest(outfile)
+build.add_script("migration-flows-explorer.py")
+build.add_files([*sorted(glob("*.csv")), *sorted(glob("*.tsv"))])
+build.add_data(
+    datafile_url, "\n".join([*datafile_columns, *available_entities]).encode("utf-8")
+)
+if build.is_up_to_date():
+    print(f"✅ {path.abspath(outfile)} is up to date")
+    sys.exit()
+
 # %%
+from string import Template
+import numpy as np
+import pandas as pd
 
+from explorer_tools.output import open_output
+from explorer_tools.templating import substitute_columns
+from explorer_tools.writer import write_frame, write_template
 
-def slug(str):
-    return str.replace(" ", "").lower()
+# %%
 
 
-def substitute_title(row, country_name):
-    # Rows can include placeholders like ${country} and ${country_slug}, which will be replaced with the actual country name here.
-    country_slug = slug(country_name)
-    for key in row.keys():
-        if isinstance(row[key], str):
-            template = Template(row[key])
-            row[key] = template.substitute(
-                country=country_name,
-                country_slug=country_slug,
-            )
-    return row
+def per_country(df, countries):
+    """
+    Return one copy of `df` per country (all the rows for the first country, then for the second one, etc.), where placeholders like ${country} and ${country_slug} are replaced with the country's name and slug.
+
+    The countries and rows are cross-joined at once and every template is filled a whole column at a time, so the time taken grows with the size of the output, not with the number of countries times the number of rows.
+    """
+    countries = pd.Series(list(countries), dtype=object)
+    rows = df.iloc[np.tile(np.arange(len(df)), len(countries))].reset_index(drop=True)
+    country = countries.repeat(len(df)).reset_index(drop=True)
+    return substitute_columns(
+        rows,
+        rows.columns,
+        dict(
+            country=country,
+            country_slug=country.str.replace(" ", "", regex=False).str.lower(),
+        ),
+    )
 
 
 # %%
@@ -34,65 +64,43 @@ with open("migration-flows.template.tsv", "r") as templateFile:
 views_df = pd.read_csv("views-per-country.csv", dtype=str)
 column_defs_df = pd.read_csv("column-defs.tsv", sep="\t", dtype=str)
 
-datafile = pd.read_csv(datafile_url)
-available_entities = datafile["entity"].unique()
-
 print(f"📑 Read {len(views_df.index)} different views")
 print(f"💾 Data file has {len(available_entities)} entities")
 
 # %%
-graphers_list = []
-
-for country in available_entities:
-    for (idx, row) in views_df.iterrows():
-        graphers_list.append(
-            substitute_title(
-                row.copy(),
-                country,
-            ),
-        )
-
-graphers = pd.DataFrame(columns=views_df.columns, data=graphers_list)
+graphers = per_country(views_df, available_entities)
 
 print(f"📈 Generated {len(graphers.index)} views")
 
 # %%
 columns_list = [
-    {"slug": "year", "name": "Year", "type": "Year"},
-    {"slug": "entity", "name": "Country", "type": "EntityName"}
+    pd.DataFrame(
+        [
+            {"slug": "year", "name": "Year", "type": "Year"},
+            {"slug": "entity", "name": "Country", "type": "EntityName"}
+        ]
+    )
 ]
 
-for country in available_entities:
-    for (idx, row) in column_defs_df.iterrows():
-        columns_list.append(
-            substitute_title(
-                row.copy(),
-                country,
-            ),
-        )
-
-columns = pd.DataFrame(columns=column_defs_df.columns, data=columns_list)
-
-for (idx, row) in columns.iterrows():
-    col_slug = row["slug"]
-    assert col_slug in datafile.columns, f"Column {col_slug} not found in data file"
-# %%
-graphers_tsv = graphers.to_csv(sep="\t", index=False)
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+columns_list.append(per_country(column_defs_df, available_entities))
 
-columns_tsv = columns.to_csv(sep="\t", index=False)
-columns_tsv_indented = textwrap.indent(columns_tsv, "\t")
+columns = pd.concat(columns_list, ignore_index=True).reindex(
+    columns=column_defs_df.columns
+)
 
+missing = sorted(map(str, set(columns["slug"]) - set(datafile_columns)))
+assert not missing, f"Columns not found in data file: {', '.join(missing)}"
 # %%
 warning = "# DO NOT EDIT THIS FILE BY HAND. It is automatically generated using a set of input files. Any changes made directly to it will be overwritten.\n\n"
 
-with open(outfile, "w", newline="\n") as f:
-    f.write(
-        warning
-        + template.substitute(
-            graphers_tsv=graphers_tsv_indented,
-            column_defs=columns_tsv_indented
-        )
+# The graphers and columns are written to the file in chunks, indented, instead of being substituted into the template as one string
+with open_output(outfile) as f:
+    f.write(warning)
+    write_template(
+        f,
+        template,
+        graphers_tsv=lambda f: write_frame(f, graphers, index=False),
+        column_defs=lambda f: write_frame(f, columns, index=False),
     )
 
-    print(f"💾 Explorer config written to {path.abspath(outfile)}")
+build.save()
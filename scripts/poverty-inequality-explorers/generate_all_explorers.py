@@ -1,23 +1,203 @@
 """
-This script generates all explorers for the poverty and inequality project. Make sure all the explorers are imported in this file.
+This script generates all explorers for the poverty and inequality project. Make sure all the explorers are listed in GENERATORS.
+
+The Google Sheets tabs used by the generators are fetched first, concurrently and only once each, and then the generators run in parallel, each in its own process. Generators can be selected by name with glob patterns:
+
+    python generate_all_explorers.py                  # all generators
+    python generate_all_explorers.py "wid/*"          # only the WID explorers
+    python generate_all_explorers.py "*inequality*" --jobs 4
+    python generate_all_explorers.py --list
+
+Generators whose code and sheet tabs did not change since they last wrote their explorer are skipped (see explorer_tools/manifest.py). Use --force to run them anyway.
+
+Generators only replace their explorer if its contents changed (see explorer_tools/output.py), so that a run that changes nothing does not touch `explorers/`. The explorers updated are listed at the end, with a summary of the views that changed (see explorer_tools/changes.py).
+
+The explorers of the selected generators, whether they ran or were up to date, are then checked for combinations of controls with several views or with none (see explorer_tools/matrix.py). Several views for the same combination is an error, unless the explorer already had them before the run, in which case it is only a warning. Use --no-check to skip the check.
 """
 
-from lis import (
-    lis_expanded_poverty_explorer,
-    lis_incomes_across_distribution_explorer,
-    lis_inequality_explorer,
-)
-from multisource import (
-    incomes_across_distribution_explorer_comparison,
-    inequality_explorer,
-    inequality_explorer_comparison,
-    poverty_explorer_comparison,
+import argparse
+import ast
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).parent.absolute()
+sys.path.append(str(HERE.parent))
+from explorer_tools.changes import describe, from_json, read_change_set  # noqa: E402
+from explorer_tools.manifest import BuildManifest  # noqa: E402
+from explorer_tools.matrix import (  # noqa: E402
+    check_views,
+    duplicated_selections,
+    report,
 )
-from wbpip import (
-    pip_expanded_poverty_explorer,
-    pip_incomes_across_distribution_explorer,
-    pip_inequality_explorer,
-    pip_poverty_explorer,
-    pip_ppp_comparison_explorer,
+from explorer_tools.output import file_signature  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.reader import read_explorer  # noqa: E402
+from explorer_tools.runner import SUCCESS, Job, run_jobs, select_jobs  # noqa: E402
+from explorer_tools.sheets import (  # noqa: E402
+    prefetch_sheets,
+    prefetched_sheets,
+    preload_sheets,
+    sheets_used,
 )
-from wid import wid_incomes_across_distribution_explorer, wid_inequality_explorer
+
+# Generators are named after their path, without extension. None of them depends on another one for now: add their names to depends_on if that changes.
+GENERATORS = [
+    Job(name, HERE / f"{name}.py")
+    for name in [
+        "lis/lis_expanded_poverty_explorer",
+        "lis/lis_incomes_across_distribution_explorer",
+        "lis/lis_inequality_explorer",
+        "multisource/incomes_across_distribution_explorer_comparison",
+        "multisource/inequality_explorer",
+        "multisource/inequality_explorer_comparison",
+        "multisource/poverty_explorer_comparison",
+        "wbpip/pip_expanded_poverty_explorer",
+        "wbpip/pip_incomes_across_distribution_explorer",
+        "wbpip/pip_inequality_explorer",
+        "wbpip/pip_poverty_explorer",
+        "wbpip/pip_ppp_comparison_explorer",
+        "wid/wid_incomes_across_distribution_explorer",
+        "wid/wid_inequality_explorer",
+    ]
+]
+
+
+def generator_output(script_path):
+    """
+    Return the explorer a generator writes, from its `outfile = EXPLORERS_DIR / "..."` assignment.
+    """
+
+    def resolve(node):
+        if isinstance(node, ast.Name) and node.id == "EXPLORERS_DIR":
+            return EXPLORERS_DIR
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Div):
+            return resolve(node.left) / resolve(node.right)
+        raise ValueError(f"Cannot resolve the outfile of {script_path}")
+
+    tree = ast.parse(Path(script_path).read_text(encoding="utf-8"))
+    for statement in tree.body:
+        if isinstance(statement, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "outfile"
+            for target in statement.targets
+        ):
+            return resolve(statement.value)
+    raise ValueError(f"{script_path} does not assign outfile")
+
+
+def build_manifest(job, sheets, contents):
+    """
+    Return the build manifest of a generator, or None if one of its tabs could not be fetched (in which case it has to run, and report the error).
+    """
+    build = BuildManifest(generator_output(job.path))
+    build.add_script(job.path)
+    for sheet_id, sheet_name in sorted(sheets):
+        data = contents.get((sheet_id, sheet_name))
+        if data is None:
+            return None
+        build.add_data(f"sheet:{sheet_id}/{sheet_name}", data)
+    return build
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate the poverty and inequality explorers."
+    )
+    parser.add_argument(
+        "patterns",
+        nargs="*",
+        help="Only run the generators whose name matches one of these glob patterns (e.g. 'wid/*')",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of generators to run at the same time (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run the generators even if their explorer is up to date",
+    )
+    parser.add_argument(
+        "--no-check",
+        action="store_true",
+        help="Do not check the combinations of controls of the explorers",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List the generators and exit"
+    )
+    args = parser.parse_args()
+
+    try:
+        jobs = select_jobs(GENERATORS, args.patterns)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.list:
+        for job in jobs:
+            print(job.name)
+        sys.exit()
+
+    # Collect the tabs of the selected generators and fetch them once (many tabs are shared between generators). Their contents are handed to every worker process.
+    sheets = {job.name: sheets_used(job.path) for job in jobs}
+    prefetch_sheets(set().union(*sheets.values()))
+    contents = prefetched_sheets()
+
+    builds = {job.name: build_manifest(job, sheets[job.name], contents) for job in jobs}
+    up_to_date = set()
+    if not args.force:
+        up_to_date = {
+            name
+            for name, build in builds.items()
+            if build is not None and build.is_up_to_date()
+        }
+
+    # Explorers are only replaced when their contents change (see explorer_tools/output.py), which shows in their signature
+    paths = {job.name: generator_output(job.path) for job in jobs}
+    signatures = {name: file_signature(path) for name, path in paths.items()}
+
+    # Duplicated combinations already in the explorers are only reported as warnings after the run
+    known = {}
+    if not args.no_check:
+        known = {
+            name: duplicated_selections(check_views(read_explorer(path)))
+            for name, path in paths.items()
+            if path.exists()
+        }
+
+    results = run_jobs(
+        jobs,
+        max_workers=args.jobs,
+        initializer=preload_sheets,
+        initargs=(contents,),
+        up_to_date=up_to_date,
+    )
+    for result in results:
+        if result.status == "ok" and builds[result.name] is not None:
+            builds[result.name].save()
+
+    ran = [result.name for result in results if result.status == "ok"]
+    updated = [name for name in ran if file_signature(paths[name]) != signatures[name]]
+    for name in updated:
+        record = read_change_set(paths[name])
+        changes = describe(from_json(record)) if record else "no change set"
+        print(f"💾 {name} updated ({changes})")
+    print(f"📌 {len(updated)} explorers updated, {len(ran) - len(updated)} unchanged")
+
+    # Check the views of every selected explorer, written or not
+    n_duplicated = 0
+    if not args.no_check:
+        for name, path in paths.items():
+            if path.exists():
+                explorer = read_explorer(path)
+                n_duplicated += report(
+                    explorer.slug,
+                    check_views(explorer, limit=3),
+                    known=known.get(name, ()),
+                )
+
+    if n_duplicated or any(result.status not in SUCCESS for result in results):
+        sys.exit(1)
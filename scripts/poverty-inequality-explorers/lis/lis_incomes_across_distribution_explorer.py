@@ -2,7 +2,7 @@
 # # Incomes Across the Distribution Explorer of the Luxembourg Income Study
 # This code creates the tsv file for the incomes across the distribution explorer from the LIS data, available [here](https://owid.cloud/admin/explorers/preview/lis-incomes-across-distribution)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,16 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "lis-incomes-across-distribution.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "lis-incomes-across-distribution.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,39 +32,34 @@ sheet_id = "1UFdwB1iBpP2tEP6GtxCHvW1GGhjsFflh42FWR80rYIg"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-welfare = pd.read_csv(url, keep_default_na=False)
+welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Equivalence scales
 sheet_name = "equivalence_scales"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-equivalence_scales = pd.read_csv(url, keep_default_na=False, dtype={"checkbox": "str"})
+equivalence_scales = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"checkbox": "str"}
+)
 
 # Tables sheet
 sheet_name = "tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-tables = pd.read_csv(url, keep_default_na=False)
+tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Deciles9 sheet (needed to handle thresholds data)
 sheet_name = "deciles9"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles9 = pd.read_csv(url, keep_default_na=False)
+deciles9 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Deciles10 sheet (needed to handle average and share data)
 sheet_name = "deciles10"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles10 = pd.read_csv(url, keep_default_na=False)
+deciles10 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Top sheet (needed to handle data at the top of the distribution)
 sheet_name = "top_pct"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-top_pct = pd.read_csv(url, keep_default_na=False)
+top_pct = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Income aggregation sheet (day, month, year)
 sheet_name = "income_aggregation"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-income_aggregation = pd.read_csv(
-    url, keep_default_na=False, dtype={"multiplier": "str"}
+income_aggregation = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"multiplier": "str"}
 )
 
 # %% [markdown]
@@ -123,281 +127,276 @@ processing_distribution = "Income shares and thresholds by decile are obtained b
 
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables = pd.DataFrame()
-j = 0
-
-for tab in range(len(tables)):
-    # Define country as entityName
-    df_tables.loc[j, "name"] = "Country"
-    df_tables.loc[j, "slug"] = "country"
-    df_tables.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables.loc[j, "name"] = "Year"
-    df_tables.loc[j, "slug"] = "year"
-    df_tables.loc[j, "type"] = "Year"
-    j += 1
-
-    for wel in range(len(welfare)):
-        for eq in range(len(equivalence_scales)):
-            # I need the original variables to not break the aggregations
-            # Mean
-            df_tables.loc[
-                j, "name"
-            ] = f"Mean {welfare['welfare_type'][wel]} ({welfare['title'][wel]})"
-            df_tables.loc[
-                j, "slug"
-            ] = f"mean_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"Mean {welfare['welfare_type'][wel]}.",
-                    welfare["description"][wel],
-                    equivalence_scales["description"][eq],
-                    ppp_description,
-                    notes_title,
-                    processing_description,
-                    processing_gini_mean_median,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_mean"][wel]
-            df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-            j += 1
-
-            # Median
-            df_tables.loc[
-                j, "name"
-            ] = f"Median {welfare['welfare_type'][wel]} ({welfare['title'][wel]})"
-            df_tables.loc[
-                j, "slug"
-            ] = f"median_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_tables.loc[j, "description"] = new_line.join(
+# Capitalized texts, for the start of names, titles and dropdown options
+deciles9["ordinal_capitalized"] = deciles9["ordinal"].str.capitalize()
+deciles10["ordinal_capitalized"] = deciles10["ordinal"].str.capitalize()
+income_aggregation["aggregation_capitalized"] = income_aggregation[
+    "aggregation"
+].str.capitalize()
+welfare["welfare_type_capitalized"] = welfare["welfare_type"].str.capitalize()
+
+df_tables = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            Each(
+                {"wel": welfare},
                 [
-                    f"The level of {welfare['welfare_type'][wel]} below which half of the population falls.",
-                    welfare["description"][wel],
-                    equivalence_scales["description"][eq],
-                    ppp_description,
-                    notes_title,
-                    processing_description,
-                    processing_gini_mean_median,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_median"][wel]
-            df_tables.loc[j, "colorScaleScheme"] = "Blues"
-            j += 1
-
-            # Thresholds - Deciles
-            for dec9 in range(len(deciles9)):
-                df_tables.loc[
-                    j, "name"
-                ] = f"{deciles9['ordinal'][dec9].capitalize()} ({welfare['title'][wel]})"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"thr_{deciles9['lis_notation'][dec9]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The level of {welfare['welfare_type'][wel]} below which {deciles9['decile'][dec9]}0% of the population falls.",
-                        welfare["description"][wel],
-                        equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_distribution,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                # df_tables.loc[j, "colorScaleNumericBins"] = deciles9["scale_thr"][dec9]
-                df_tables.loc[j, "colorScaleScheme"] = "Purples"
-                j += 1
-
-            # Averages - Deciles
-            for dec10 in range(len(deciles10)):
-                df_tables.loc[
-                    j, "name"
-                ] = f"{deciles10['ordinal'][dec10].capitalize()} ({welfare['title'][wel]})"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"avg_{deciles10['lis_notation'][dec10]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The mean {welfare['welfare_type'][wel]} within the {deciles10['ordinal'][dec10]} (tenth of the population).",
-                        welfare["description"][wel],
-                        equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_distribution,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                # df_tables.loc[j, "colorScaleNumericBins"] = deciles10["scale_avg"][
-                #     dec10
-                # ]
-                df_tables.loc[j, "colorScaleScheme"] = "Greens"
-                j += 1
-
-            # Shares - Deciles
-            for dec10 in range(len(deciles10)):
-                df_tables.loc[
-                    j, "name"
-                ] = f"{deciles10['ordinal'][dec10].capitalize()} ({welfare['title'][wel]})"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"share_{deciles10['lis_notation'][dec10]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The share of {welfare['welfare_type'][wel]} received by the {deciles10['ordinal'][dec10]} (tenth of the population).",
-                        welfare["description"][wel],
-                        equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_distribution,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "%"
-                df_tables.loc[j, "shortUnit"] = "%"
-                df_tables.loc[j, "type"] = "Numeric"
-                df_tables.loc[j, "colorScaleNumericBins"] = deciles10[
-                    f"scale_share_{welfare['slug'][wel]}"
-                ][dec10]
-                df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-                j += 1
-
-            # Income aggregations
-            for agg in range(len(income_aggregation)):
-                # Mean
-                df_tables.loc[
-                    j, "name"
-                ] = f"Mean {welfare['welfare_type'][wel]} ({welfare['title'][wel]})"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"mean_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]}.",
-                        welfare["description"][wel],
-                        equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_gini_mean_median,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                df_tables.loc[j, "colorScaleNumericBins"] = income_aggregation["scale"][
-                    agg
-                ]
-                df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-                df_tables.loc[
-                    j, "transform"
-                ] = f"multiplyBy mean_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} {income_aggregation['multiplier'][agg]}"
-                j += 1
-
-                # Median
-                df_tables.loc[
-                    j, "name"
-                ] = f"Median {welfare['welfare_type'][wel]} ({welfare['title'][wel]})"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"median_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The level of {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} below which half of the population falls.",
-                        welfare["description"][wel],
-                        equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_gini_mean_median,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                df_tables.loc[j, "colorScaleNumericBins"] = income_aggregation["scale"][
-                    agg
-                ]
-                df_tables.loc[j, "colorScaleScheme"] = "Blues"
-                df_tables.loc[
-                    j, "transform"
-                ] = f"multiplyBy median_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} {income_aggregation['multiplier'][agg]}"
-                j += 1
-
-                # Thresholds - Deciles
-                for dec9 in range(len(deciles9)):
-                    df_tables.loc[
-                        j, "name"
-                    ] = f"{deciles9['ordinal'][dec9].capitalize()} ({welfare['title'][wel]})"
-                    df_tables.loc[
-                        j, "slug"
-                    ] = f"thr_{deciles9['lis_notation'][dec9]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                    df_tables.loc[j, "description"] = new_line.join(
-                        [
-                            f"The level of {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} below which {deciles9['decile'][dec9]}0% of the population falls.",
-                            welfare["description"][wel],
-                            equivalence_scales["description"][eq],
-                            ppp_description,
-                            notes_title,
-                            processing_description,
-                            processing_distribution,
-                        ]
-                    )
-                    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-                    df_tables.loc[j, "shortUnit"] = "$"
-                    df_tables.loc[j, "type"] = "Numeric"
-                    df_tables.loc[j, "colorScaleNumericBins"] = deciles9[
-                        f"scale_thr_{welfare['slug'][wel]}_{income_aggregation['aggregation'][agg]}"
-                    ][dec9]
-                    df_tables.loc[j, "colorScaleScheme"] = "Purples"
-                    df_tables.loc[
-                        j, "transform"
-                    ] = f"multiplyBy thr_{deciles9['lis_notation'][dec9]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} {income_aggregation['multiplier'][agg]}"
-                    j += 1
-
-                # Averages - Deciles
-                for dec10 in range(len(deciles10)):
-                    df_tables.loc[
-                        j, "name"
-                    ] = f"{deciles10['ordinal'][dec10].capitalize()} ({welfare['title'][wel]})"
-                    df_tables.loc[
-                        j, "slug"
-                    ] = f"avg_{deciles10['lis_notation'][dec10]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                    df_tables.loc[j, "description"] = new_line.join(
+                    Each(
+                        {"eq": equivalence_scales},
                         [
-                            f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (tenth of the population).",
-                            welfare["description"][wel],
-                            equivalence_scales["description"][eq],
-                            ppp_description,
-                            notes_title,
-                            processing_description,
-                            processing_distribution,
-                        ]
+                            # I need the original variables to not break the aggregations
+                            # Mean
+                            {
+                                "name": "Mean ${wel__welfare_type} (${wel__title})",
+                                "slug": "mean_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "Mean ${wel__welfare_type}.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(ppp_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_gini_mean_median),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_mean"),
+                                "colorScaleScheme": "BuGn",
+                            },
+                            # Median
+                            {
+                                "name": "Median ${wel__welfare_type} (${wel__title})",
+                                "slug": "median_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${wel__welfare_type} below which half of the population falls.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(ppp_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_gini_mean_median),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_median"),
+                                "colorScaleScheme": "Blues",
+                            },
+                            # Thresholds - Deciles
+                            Each(
+                                {"dec9": deciles9},
+                                [
+                                    {
+                                        "name": "${dec9__ordinal_capitalized} (${wel__title})",
+                                        "slug": "thr_${dec9__lis_notation}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The level of ${wel__welfare_type} below which ${dec9__decile}0% of the population falls.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_distribution),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables.loc[j, "colorScaleNumericBins"] = deciles9["scale_thr"][dec9]
+                                        "colorScaleScheme": "Purples",
+                                    }
+                                ],
+                            ),
+                            # Averages - Deciles
+                            Each(
+                                {"dec10": deciles10},
+                                [
+                                    {
+                                        "name": "${dec10__ordinal_capitalized} (${wel__title})",
+                                        "slug": "avg_${dec10__lis_notation}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The mean ${wel__welfare_type} within the ${dec10__ordinal} (tenth of the population).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_distribution),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables.loc[j, "colorScaleNumericBins"] = deciles10["scale_avg"][
+                                        #     dec10
+                                        # ]
+                                        "colorScaleScheme": "Greens",
+                                    }
+                                ],
+                            ),
+                            # Shares - Deciles
+                            Each(
+                                {"dec10": deciles10},
+                                [
+                                    {
+                                        "name": "${dec10__ordinal_capitalized} (${wel__title})",
+                                        "slug": "share_${dec10__lis_notation}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The share of ${wel__welfare_type} received by the ${dec10__ordinal} (tenth of the population).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_distribution),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "dec10__scale_share_${wel__slug}"
+                                        ),
+                                        "colorScaleScheme": "OrRd",
+                                    }
+                                ],
+                            ),
+                            # Income aggregations
+                            Each(
+                                {"agg": income_aggregation},
+                                [
+                                    # Mean
+                                    {
+                                        "name": "Mean ${wel__welfare_type} (${wel__title})",
+                                        "slug": "mean_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "Mean ${wel__welfare_type} per ${agg__aggregation}.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_gini_mean_median),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column("agg__scale"),
+                                        "colorScaleScheme": "BuGn",
+                                        "transform": "multiplyBy mean_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                    },
+                                    # Median
+                                    {
+                                        "name": "Median ${wel__welfare_type} (${wel__title})",
+                                        "slug": "median_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The level of ${wel__welfare_type} per ${agg__aggregation} below which half of the population falls.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_gini_mean_median),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column("agg__scale"),
+                                        "colorScaleScheme": "Blues",
+                                        "transform": "multiplyBy median_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                    },
+                                    # Thresholds - Deciles
+                                    Each(
+                                        {"dec9": deciles9},
+                                        [
+                                            {
+                                                "name": "${dec9__ordinal_capitalized} (${wel__title})",
+                                                "slug": "thr_${dec9__lis_notation}_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                                "description": new_line.join(
+                                                    [
+                                                        "The level of ${wel__welfare_type} per ${agg__aggregation} below which ${dec9__decile}0% of the population falls.",
+                                                        "${wel__description}",
+                                                        "${eq__description}",
+                                                        escape(ppp_description),
+                                                        escape(notes_title),
+                                                        escape(processing_description),
+                                                        escape(processing_distribution),
+                                                    ]
+                                                ),
+                                                "unit": "international-$$ in 2017 prices",
+                                                "shortUnit": "$$",
+                                                "type": "Numeric",
+                                                "colorScaleNumericBins": Column(
+                                                    "dec9__scale_thr_${wel__slug}_${agg__aggregation}"
+                                                ),
+                                                "colorScaleScheme": "Purples",
+                                                "transform": "multiplyBy thr_${dec9__lis_notation}_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                            }
+                                        ],
+                                    ),
+                                    # Averages - Deciles
+                                    Each(
+                                        {"dec10": deciles10},
+                                        [
+                                            {
+                                                "name": "${dec10__ordinal_capitalized} (${wel__title})",
+                                                "slug": "avg_${dec10__lis_notation}_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                                "description": new_line.join(
+                                                    [
+                                                        "The mean ${wel__welfare_type} per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population).",
+                                                        "${wel__description}",
+                                                        "${eq__description}",
+                                                        escape(ppp_description),
+                                                        escape(notes_title),
+                                                        escape(processing_description),
+                                                        escape(processing_distribution),
+                                                    ]
+                                                ),
+                                                "unit": "international-$$ in 2017 prices",
+                                                "shortUnit": "$$",
+                                                "type": "Numeric",
+                                                "colorScaleNumericBins": Column(
+                                                    "dec10__scale_avg_${wel__slug}_${agg__aggregation}"
+                                                ),
+                                                "colorScaleScheme": "Greens",
+                                                "transform": "multiplyBy avg_${dec10__lis_notation}_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                            }
+                                        ],
+                                    ),
+                                ],
+                            ),
+                        ],
                     )
-                    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-                    df_tables.loc[j, "shortUnit"] = "$"
-                    df_tables.loc[j, "type"] = "Numeric"
-                    df_tables.loc[j, "colorScaleNumericBins"] = deciles10[
-                        f"scale_avg_{welfare['slug'][wel]}_{income_aggregation['aggregation'][agg]}"
-                    ][dec10]
-                    df_tables.loc[j, "colorScaleScheme"] = "Greens"
-                    df_tables.loc[
-                        j, "transform"
-                    ] = f"multiplyBy avg_{deciles10['lis_notation'][dec10]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} {income_aggregation['multiplier'][agg]}"
-                    j += 1
-
-    df_tables["tableSlug"] = tables["name"][tab]
+                ],
+            ),
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables["sourceName"] = sourceName
 df_tables["dataPublishedBy"] = dataPublishedBy
@@ -419,410 +418,309 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 yAxisMin = 0
 mapTargetTime = 2019
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(tables)):
-    for agg in range(len(income_aggregation)):
-        for eq in range(len(equivalence_scales)):
-            for wel in range(len(welfare)):
-                # Mean
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} ({welfare['title'][wel]})"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"mean_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Mean income"
-                df_graphers.loc[j, "Decile Dropdown"] = np.nan
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j,
-                    "Adjust for cost sharing within households (equivalized income) Checkbox",
-                ] = equivalence_scales["checkbox"][eq]
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"This data is adjusted for inflation and for differences in the cost of living between countries. {welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is expressed in international-$ at 2017 prices. {equivalence_scales['note'][eq]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                df_graphers.loc[j, "hasMapTab"] = "true"
-                df_graphers.loc[j, "tab"] = "map"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-                # Median
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Median {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} ({welfare['title'][wel]})"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"median_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Median income"
-                df_graphers.loc[j, "Decile Dropdown"] = np.nan
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j,
-                    "Adjust for cost sharing within households (equivalized income) Checkbox",
-                ] = equivalence_scales["checkbox"][eq]
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"This data is adjusted for inflation and for differences in the cost of living between countries. {welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is expressed in international-$ at 2017 prices. {equivalence_scales['note'][eq]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                df_graphers.loc[j, "hasMapTab"] = "true"
-                df_graphers.loc[j, "tab"] = "map"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-                # Thresholds - Deciles
-                for dec9 in range(len(deciles9)):
-                    df_graphers.loc[
-                        j, "title"
-                    ] = f"Threshold {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} marking the {deciles9['ordinal'][dec9]} ({welfare['title'][wel]})"
-                    df_graphers.loc[
-                        j, "ySlugs"
-                    ] = f"thr_{deciles9['lis_notation'][dec9]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                    df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-                    df_graphers.loc[j, "Decile Dropdown"] = deciles9["dropdown"][dec9]
-                    df_graphers.loc[
-                        j, "Income measure Dropdown"
-                    ] = f"{welfare['dropdown_option'][wel]}"
-                    df_graphers.loc[
-                        j, "Period Radio"
-                    ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                    df_graphers.loc[
-                        j,
-                        "Adjust for cost sharing within households (equivalized income) Checkbox",
-                    ] = equivalence_scales["checkbox"][eq]
-                    df_graphers.loc[
-                        j, "subtitle"
-                    ] = f"The level of {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} below which {deciles9['decile'][dec9]}0% of the population falls. {welfare['subtitle'][wel]}"
-                    df_graphers.loc[
-                        j, "note"
-                    ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. {equivalence_scales['note'][eq]}"
-                    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                    df_graphers.loc[j, "hasMapTab"] = "true"
-                    df_graphers.loc[j, "tab"] = "map"
-                    df_graphers.loc[j, "yScaleToggle"] = "true"
-                    j += 1
-
-                # Averages - Deciles
-                for dec10 in range(len(deciles10)):
-                    df_graphers.loc[
-                        j, "title"
-                    ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} ({welfare['title'][wel]})"
-                    df_graphers.loc[
-                        j, "ySlugs"
-                    ] = f"avg_{deciles10['lis_notation'][dec10]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                    df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-                    df_graphers.loc[j, "Decile Dropdown"] = deciles10["dropdown"][dec10]
-                    df_graphers.loc[
-                        j, "Income measure Dropdown"
-                    ] = f"{welfare['dropdown_option'][wel]}"
-                    df_graphers.loc[
-                        j, "Period Radio"
-                    ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                    df_graphers.loc[
-                        j,
-                        "Adjust for cost sharing within households (equivalized income) Checkbox",
-                    ] = equivalence_scales["checkbox"][eq]
-                    df_graphers.loc[
-                        j, "subtitle"
-                    ] = f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (tenth of the population). {welfare['subtitle'][wel]}"
-                    df_graphers.loc[
-                        j, "note"
-                    ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. {equivalence_scales['note'][eq]}"
-                    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                    df_graphers.loc[j, "hasMapTab"] = "true"
-                    df_graphers.loc[j, "tab"] = "map"
-                    df_graphers.loc[j, "yScaleToggle"] = "true"
-                    j += 1
-
-                # Thresholds - Multiple deciles
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Threshold {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} for each decile ({welfare['title'][wel]})"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"thr_p10_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p20_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p30_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p40_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p50_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p60_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p70_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p80_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_p90_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-                df_graphers.loc[j, "Decile Dropdown"] = "All deciles"
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j,
-                    "Adjust for cost sharing within households (equivalized income) Checkbox",
-                ] = equivalence_scales["checkbox"][eq]
-                df_graphers.loc[j, "hideRelativeToggle"] = "false"
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The level of income per {income_aggregation['aggregation'][agg]} below which 10%, 20%, 30%, etc. of the population falls. {welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. {equivalence_scales['note'][eq]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-                df_graphers.loc[j, "hasMapTab"] = "false"
-                df_graphers.loc[j, "tab"] = "chart"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-                # Averages - Multiple deciles
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within each decile ({welfare['title'][wel]})"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"avg_p10_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p20_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p30_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p40_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p50_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p60_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p70_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p80_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p90_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_p100_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-                df_graphers.loc[j, "Decile Dropdown"] = "All deciles"
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j,
-                    "Adjust for cost sharing within households (equivalized income) Checkbox",
-                ] = equivalence_scales["checkbox"][eq]
-                df_graphers.loc[j, "hideRelativeToggle"] = "false"
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within each decile (tenth of the population). {welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. {equivalence_scales['note'][eq]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-                df_graphers.loc[j, "hasMapTab"] = "false"
-                df_graphers.loc[j, "tab"] = "chart"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-            # BEFORE VS. AFTER TAX
-            # Mean
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean income per {income_aggregation['aggregation'][agg]} (after tax vs. before tax)"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"mean_mi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} mean_dhi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Mean income"
-            df_graphers.loc[j, "Decile Dropdown"] = np.nan
-            df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This data is adjusted for inflation and for differences in the cost of living between countries."
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is expressed in international-$ at 2017 prices. {equivalence_scales['note'][eq]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Median
-            df_graphers.loc[
-                j, "title"
-            ] = f"Median income per {income_aggregation['aggregation'][agg]} (after tax vs. before tax)"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"median_mi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} median_dhi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Median income"
-            df_graphers.loc[j, "Decile Dropdown"] = np.nan
-            df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This data is adjusted for inflation and for differences in the cost of living between countries."
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is expressed in international-$ at 2017 prices. {equivalence_scales['note'][eq]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Thresholds - Deciles
-            for dec9 in range(len(deciles9)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Threshold income per {income_aggregation['aggregation'][agg]} marking the {deciles9['ordinal'][dec9]} (after tax vs. before tax)"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"thr_{deciles9['lis_notation'][dec9]}_mi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} thr_{deciles9['lis_notation'][dec9]}_dhi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-                df_graphers.loc[j, "Decile Dropdown"] = deciles9["dropdown"][dec9]
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = "After tax vs. before tax"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j,
-                    "Adjust for cost sharing within households (equivalized income) Checkbox",
-                ] = equivalence_scales["checkbox"][eq]
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The level of income per {income_aggregation['aggregation'][agg]} below which {deciles9['decile'][dec9]}0% of the population falls."
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. {equivalence_scales['note'][eq]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-                df_graphers.loc[j, "hasMapTab"] = "false"
-                df_graphers.loc[j, "tab"] = "chart"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-            # Averages - Deciles
-            for dec10 in range(len(deciles10)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Mean income per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (after tax vs. before tax)"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"avg_{deciles10['lis_notation'][dec10]}_mi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]} avg_{deciles10['lis_notation'][dec10]}_dhi_{equivalence_scales['slug'][eq]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-                df_graphers.loc[j, "Decile Dropdown"] = deciles10["dropdown"][dec10]
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = "After tax vs. before tax"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j,
-                    "Adjust for cost sharing within households (equivalized income) Checkbox",
-                ] = equivalence_scales["checkbox"][eq]
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The mean income per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (tenth of the population)."
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. {equivalence_scales['note'][eq]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-                df_graphers.loc[j, "hasMapTab"] = "false"
-                df_graphers.loc[j, "tab"] = "chart"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-    # This is an adaptation of the code to make both before and after tax graphs and share graphs
-    for eq in range(len(equivalence_scales)):
-        for wel in range(len(welfare)):
-            # Shares - Deciles
-            for dec10 in range(len(deciles10)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"{welfare['welfare_type'][wel].capitalize()} share of the {deciles10['ordinal'][dec10]} ({welfare['title'][wel]})"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"share_{deciles10['lis_notation'][dec10]}_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-                df_graphers.loc[j, "Decile Dropdown"] = deciles10["dropdown"][dec10]
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[j, "Period Radio"] = np.nan
-                df_graphers.loc[
-                    j,
-                    "Adjust for cost sharing within households (equivalized income) Checkbox",
-                ] = equivalence_scales["checkbox"][eq]
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The share of {welfare['welfare_type'][wel]} received by the {deciles10['ordinal'][dec10]} (tenth of the population). {welfare['subtitle'][wel]}"
-                df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-                df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                df_graphers.loc[j, "hasMapTab"] = "true"
-                df_graphers.loc[j, "tab"] = "map"
-                j += 1
-
-            # Shares - Multiple deciles
-            df_graphers.loc[
-                j, "title"
-            ] = f"{welfare['welfare_type'][wel].capitalize()} share for each decile ({welfare['title'][wel]})"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"share_p10_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p20_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p30_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p40_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p50_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p60_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p70_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p80_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p90_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]} share_p100_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-            df_graphers.loc[j, "Decile Dropdown"] = "All deciles"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[j, "Period Radio"] = np.nan
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of {welfare['welfare_type'][wel]} received by each decile (tenth of the population). {welfare['subtitle'][wel]}"
-            df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            j += 1
-
-        # BEFORE VS. AFTER TAX
-        # Shares - Deciles
-        for dec10 in range(len(deciles10)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"Income share of the {deciles10['ordinal'][dec10]} (after tax vs. before tax)"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"share_{deciles10['lis_notation'][dec10]}_mi_{equivalence_scales['slug'][eq]} share_{deciles10['lis_notation'][dec10]}_dhi_{equivalence_scales['slug'][eq]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-            df_graphers.loc[j, "Decile Dropdown"] = deciles10["dropdown"][dec10]
-            df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-            df_graphers.loc[j, "Period Radio"] = np.nan
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of income received by the {deciles10['ordinal'][dec10]} (tenth of the population)."
-            df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            j += 1
-
-    df_graphers["tableSlug"] = tables["name"][tab]
+df_graphers = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            Each(
+                {"agg": income_aggregation},
+                [
+                    Each(
+                        {"eq": equivalence_scales},
+                        [
+                            Each(
+                                {"wel": welfare},
+                                [
+                                    # Mean
+                                    {
+                                        "title": "Mean ${wel__welfare_type} per ${agg__aggregation} (${wel__title})",
+                                        "ySlugs": "mean_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Mean income",
+                                        "Decile Dropdown": np.nan,
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                            "eq__checkbox"
+                                        ),
+                                        "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries. ${wel__subtitle}",
+                                        "note": "This data is expressed in international-$$ at 2017 prices. ${eq__note}",
+                                        "selectedFacetStrategy": np.nan,
+                                        "hasMapTab": "true",
+                                        "tab": "map",
+                                        "yScaleToggle": "true",
+                                    },
+                                    # Median
+                                    {
+                                        "title": "Median ${wel__welfare_type} per ${agg__aggregation} (${wel__title})",
+                                        "ySlugs": "median_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Median income",
+                                        "Decile Dropdown": np.nan,
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                            "eq__checkbox"
+                                        ),
+                                        "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries. ${wel__subtitle}",
+                                        "note": "This data is expressed in international-$$ at 2017 prices. ${eq__note}",
+                                        "selectedFacetStrategy": np.nan,
+                                        "hasMapTab": "true",
+                                        "tab": "map",
+                                        "yScaleToggle": "true",
+                                    },
+                                    # Thresholds - Deciles
+                                    Each(
+                                        {"dec9": deciles9},
+                                        [
+                                            {
+                                                "title": "Threshold ${wel__welfare_type} per ${agg__aggregation} marking the ${dec9__ordinal} (${wel__title})",
+                                                "ySlugs": "thr_${dec9__lis_notation}_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                                "Indicator Dropdown": "Decile thresholds",
+                                                "Decile Dropdown": Column(
+                                                    "dec9__dropdown"
+                                                ),
+                                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                                "Period Radio": "${agg__aggregation_capitalized}",
+                                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                                    "eq__checkbox"
+                                                ),
+                                                "subtitle": "The level of ${wel__welfare_type} per ${agg__aggregation} below which ${dec9__decile}0% of the population falls. ${wel__subtitle}",
+                                                "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. ${eq__note}",
+                                                "selectedFacetStrategy": np.nan,
+                                                "hasMapTab": "true",
+                                                "tab": "map",
+                                                "yScaleToggle": "true",
+                                            }
+                                        ],
+                                    ),
+                                    # Averages - Deciles
+                                    Each(
+                                        {"dec10": deciles10},
+                                        [
+                                            {
+                                                "title": "Mean ${wel__welfare_type} per ${agg__aggregation} within the ${dec10__ordinal} (${wel__title})",
+                                                "ySlugs": "avg_${dec10__lis_notation}_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                                "Indicator Dropdown": "Mean income, by decile",
+                                                "Decile Dropdown": Column(
+                                                    "dec10__dropdown"
+                                                ),
+                                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                                "Period Radio": "${agg__aggregation_capitalized}",
+                                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                                    "eq__checkbox"
+                                                ),
+                                                "subtitle": "The mean ${wel__welfare_type} per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population). ${wel__subtitle}",
+                                                "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. ${eq__note}",
+                                                "selectedFacetStrategy": np.nan,
+                                                "hasMapTab": "true",
+                                                "tab": "map",
+                                                "yScaleToggle": "true",
+                                            }
+                                        ],
+                                    ),
+                                    # Thresholds - Multiple deciles
+                                    {
+                                        "title": "Threshold ${wel__welfare_type} per ${agg__aggregation} for each decile (${wel__title})",
+                                        "ySlugs": "thr_p10_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p20_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p30_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p40_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p50_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p60_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p70_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p80_${wel__slug}_${eq__slug}${agg__slug_suffix} thr_p90_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Decile thresholds",
+                                        "Decile Dropdown": "All deciles",
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                            "eq__checkbox"
+                                        ),
+                                        "hideRelativeToggle": "false",
+                                        "subtitle": "The level of income per ${agg__aggregation} below which 10%, 20%, 30%, etc. of the population falls. ${wel__subtitle}",
+                                        "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. ${eq__note}",
+                                        "selectedFacetStrategy": "entity",
+                                        "hasMapTab": "false",
+                                        "tab": "chart",
+                                        "yScaleToggle": "true",
+                                    },
+                                    # Averages - Multiple deciles
+                                    {
+                                        "title": "Mean ${wel__welfare_type} per ${agg__aggregation} within each decile (${wel__title})",
+                                        "ySlugs": "avg_p10_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p20_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p30_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p40_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p50_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p60_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p70_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p80_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p90_${wel__slug}_${eq__slug}${agg__slug_suffix} avg_p100_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Mean income, by decile",
+                                        "Decile Dropdown": "All deciles",
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                            "eq__checkbox"
+                                        ),
+                                        "hideRelativeToggle": "false",
+                                        "subtitle": "The mean ${wel__welfare_type} per ${agg__aggregation} within each decile (tenth of the population). ${wel__subtitle}",
+                                        "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. ${eq__note}",
+                                        "selectedFacetStrategy": "entity",
+                                        "hasMapTab": "false",
+                                        "tab": "chart",
+                                        "yScaleToggle": "true",
+                                    },
+                                ],
+                            ),
+                            # BEFORE VS. AFTER TAX
+                            # Mean
+                            {
+                                "title": "Mean income per ${agg__aggregation} (after tax vs. before tax)",
+                                "ySlugs": "mean_mi_${eq__slug}${agg__slug_suffix} mean_dhi_${eq__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Mean income",
+                                "Decile Dropdown": np.nan,
+                                "Income measure Dropdown": "After tax vs. before tax",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                                "note": "This data is expressed in international-$$ at 2017 prices. ${eq__note}",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            },
+                            # Median
+                            {
+                                "title": "Median income per ${agg__aggregation} (after tax vs. before tax)",
+                                "ySlugs": "median_mi_${eq__slug}${agg__slug_suffix} median_dhi_${eq__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Median income",
+                                "Decile Dropdown": np.nan,
+                                "Income measure Dropdown": "After tax vs. before tax",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                                "note": "This data is expressed in international-$$ at 2017 prices. ${eq__note}",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            },
+                            # Thresholds - Deciles
+                            Each(
+                                {"dec9": deciles9},
+                                [
+                                    {
+                                        "title": "Threshold income per ${agg__aggregation} marking the ${dec9__ordinal} (after tax vs. before tax)",
+                                        "ySlugs": "thr_${dec9__lis_notation}_mi_${eq__slug}${agg__slug_suffix} thr_${dec9__lis_notation}_dhi_${eq__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Decile thresholds",
+                                        "Decile Dropdown": Column("dec9__dropdown"),
+                                        "Income measure Dropdown": "After tax vs. before tax",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                            "eq__checkbox"
+                                        ),
+                                        "subtitle": "The level of income per ${agg__aggregation} below which ${dec9__decile}0% of the population falls.",
+                                        "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. ${eq__note}",
+                                        "selectedFacetStrategy": "entity",
+                                        "hasMapTab": "false",
+                                        "tab": "chart",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                            # Averages - Deciles
+                            Each(
+                                {"dec10": deciles10},
+                                [
+                                    {
+                                        "title": "Mean income per ${agg__aggregation} within the ${dec10__ordinal} (after tax vs. before tax)",
+                                        "ySlugs": "avg_${dec10__lis_notation}_mi_${eq__slug}${agg__slug_suffix} avg_${dec10__lis_notation}_dhi_${eq__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Mean income, by decile",
+                                        "Decile Dropdown": Column("dec10__dropdown"),
+                                        "Income measure Dropdown": "After tax vs. before tax",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                            "eq__checkbox"
+                                        ),
+                                        "subtitle": "The mean income per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population).",
+                                        "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. ${eq__note}",
+                                        "selectedFacetStrategy": "entity",
+                                        "hasMapTab": "false",
+                                        "tab": "chart",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                        ],
+                    )
+                ],
+            ),
+            # This is an adaptation of the code to make both before and after tax graphs and share graphs
+            Each(
+                {"eq": equivalence_scales},
+                [
+                    Each(
+                        {"wel": welfare},
+                        [
+                            # Shares - Deciles
+                            Each(
+                                {"dec10": deciles10},
+                                [
+                                    {
+                                        "title": "${wel__welfare_type_capitalized} share of the ${dec10__ordinal} (${wel__title})",
+                                        "ySlugs": "share_${dec10__lis_notation}_${wel__slug}_${eq__slug}",
+                                        "Indicator Dropdown": "Decile shares",
+                                        "Decile Dropdown": Column("dec10__dropdown"),
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": np.nan,
+                                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                            "eq__checkbox"
+                                        ),
+                                        "subtitle": "The share of ${wel__welfare_type} received by the ${dec10__ordinal} (tenth of the population). ${wel__subtitle}",
+                                        "note": Column("eq__note"),
+                                        "selectedFacetStrategy": np.nan,
+                                        "hasMapTab": "true",
+                                        "tab": "map",
+                                    }
+                                ],
+                            ),
+                            # Shares - Multiple deciles
+                            {
+                                "title": "${wel__welfare_type_capitalized} share for each decile (${wel__title})",
+                                "ySlugs": "share_p10_${wel__slug}_${eq__slug} share_p20_${wel__slug}_${eq__slug} share_p30_${wel__slug}_${eq__slug} share_p40_${wel__slug}_${eq__slug} share_p50_${wel__slug}_${eq__slug} share_p60_${wel__slug}_${eq__slug} share_p70_${wel__slug}_${eq__slug} share_p80_${wel__slug}_${eq__slug} share_p90_${wel__slug}_${eq__slug} share_p100_${wel__slug}_${eq__slug}",
+                                "Indicator Dropdown": "Decile shares",
+                                "Decile Dropdown": "All deciles",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": np.nan,
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "The share of ${wel__welfare_type} received by each decile (tenth of the population). ${wel__subtitle}",
+                                "note": Column("eq__note"),
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                            },
+                        ],
+                    ),
+                    # BEFORE VS. AFTER TAX
+                    # Shares - Deciles
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            {
+                                "title": "Income share of the ${dec10__ordinal} (after tax vs. before tax)",
+                                "ySlugs": "share_${dec10__lis_notation}_mi_${eq__slug} share_${dec10__lis_notation}_dhi_${eq__slug}",
+                                "Indicator Dropdown": "Decile shares",
+                                "Decile Dropdown": Column("dec10__dropdown"),
+                                "Income measure Dropdown": "After tax vs. before tax",
+                                "Period Radio": np.nan,
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "The share of income received by the ${dec10__ordinal} (tenth of the population).",
+                                "note": Column("eq__note"),
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                            }
+                        ],
+                    ),
+                ],
+            ),
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # %% [markdown]
 # Final adjustments to the graphers table: add `relatedQuestion` link and `defaultView`:
@@ -840,19 +738,16 @@ df_graphers["mapTargetTime"] = mapTargetTime
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Indicator Dropdown"] == "Decile thresholds")
-    & (df_graphers["Decile Dropdown"] == "All deciles")
-    & (df_graphers["Income measure Dropdown"] == "After tax")
-    & (df_graphers["Period Radio"] == "Year")
-    & (
-        df_graphers[
-            "Adjust for cost sharing within households (equivalized income) Checkbox"
-        ]
-        == "false"
-    ),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Indicator Dropdown": "Decile thresholds",
+        "Decile Dropdown": "All deciles",
+        "Income measure Dropdown": "After tax",
+        "Period Radio": "Year",
+        "Adjust for cost sharing within households (equivalized income) Checkbox": "false",
+    },
+)
 
 # Reorder dropdown menus
 # Decile/quantile Dropdown
@@ -929,29 +824,18 @@ df_graphers = df_graphers.drop(columns=["metric_dropdown_aux", "decile_dropdown_
 # Define list of variables to iterate: table names
 table_list = list(tables["name"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in range(len(tables)):
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tables["name"][tab]]
-            .copy()
-            .reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tables["name"][tab]]
         f.write("\ntable\t" + tables["link"][tab] + "\t" + tables["name"][tab])
-        f.write("\ncolumns\t" + tables["name"][tab] + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tables["name"][tab] + "\n")
+        write_frame(f, table_tsv, index=False)
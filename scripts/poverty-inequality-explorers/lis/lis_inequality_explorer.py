@@ -2,7 +2,7 @@
 # # Inequality Data Explorer of the Luxembourg Income Study
 # This code creates the tsv file for the inequality explorer from the LIS data, available [here](https://owid.cloud/admin/explorers/preview/lis-inequality)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,16 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "lis-inequality.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "lis-inequality.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,23 +32,21 @@ sheet_id = "1UFdwB1iBpP2tEP6GtxCHvW1GGhjsFflh42FWR80rYIg"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-welfare = pd.read_csv(url, keep_default_na=False)
+welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Equivalence scales
 sheet_name = "equivalence_scales"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-equivalence_scales = pd.read_csv(url, keep_default_na=False, dtype={"checkbox": "str"})
+equivalence_scales = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"checkbox": "str"}
+)
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_rel = pd.read_csv(url)
+povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # Tables sheet
 sheet_name = "tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-tables = pd.read_csv(url, keep_default_na=False)
+tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # %% [markdown]
 # ## Header
@@ -105,152 +112,150 @@ processing_distribution = "Income shares and thresholds by decile are obtained b
 
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables = pd.DataFrame()
-j = 0
-
-for tab in range(len(tables)):
-    # Define country as entityName
-    df_tables.loc[j, "name"] = "Country"
-    df_tables.loc[j, "slug"] = "country"
-    df_tables.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables.loc[j, "name"] = "Year"
-    df_tables.loc[j, "slug"] = "year"
-    df_tables.loc[j, "type"] = "Year"
-    j += 1
-
-    for wel in range(len(welfare)):
-        for eq in range(len(equivalence_scales)):
-            # Gini coefficient
-            df_tables.loc[j, "name"] = f"Gini coefficient ({welfare['title'][wel]})"
-            df_tables.loc[
-                j, "slug"
-            ] = f"gini_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-                    welfare["description"][wel],
-                    equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_gini_mean_median,
-                ]
-            )
-            df_tables.loc[j, "unit"] = np.nan
-            df_tables.loc[j, "shortUnit"] = np.nan
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_gini"][wel]
-            df_tables.loc[j, "colorScaleNumericMinValue"] = 1
-            df_tables.loc[j, "colorScaleScheme"] = "Oranges"
-            j += 1
-
-            # Share of the top 10%
-            df_tables.loc[
-                j, "name"
-            ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 10% ({welfare['title'][wel]})"
-            df_tables.loc[
-                j, "slug"
-            ] = f"share_p100_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The share of {welfare['welfare_type'][wel]} received by the richest 10% of the population.",
-                    welfare["description"][wel],
-                    equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_distribution,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "%"
-            df_tables.loc[j, "shortUnit"] = "%"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_top10"][wel]
-            df_tables.loc[j, "colorScaleNumericMinValue"] = 100
-            df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-            j += 1
-
-            # Share of the bottom 50%
-            df_tables.loc[
-                j, "name"
-            ] = f"{welfare['welfare_type'][wel].capitalize()} share of the poorest 50% ({welfare['title'][wel]})"
-            df_tables.loc[
-                j, "slug"
-            ] = f"share_bottom50_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The share of {welfare['welfare_type'][wel]} received by the poorest 50% of the population.",
-                    welfare["description"][wel],
-                    equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_distribution,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "%"
-            df_tables.loc[j, "shortUnit"] = "%"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_bottom50"][wel]
-            df_tables.loc[j, "colorScaleNumericMinValue"] = 100
-            df_tables.loc[j, "colorScaleScheme"] = "Blues"
-            j += 1
-
-            # Palma ratio
-            df_tables.loc[j, "name"] = f"Palma ratio ({welfare['title'][wel]})"
-            df_tables.loc[
-                j, "slug"
-            ] = f"palma_ratio_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-                    welfare["description"][wel],
-                    equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_distribution,
-                ]
-            )
-            df_tables.loc[j, "unit"] = np.nan
-            df_tables.loc[j, "shortUnit"] = np.nan
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_palma_ratio"][
-                wel
-            ]
-            df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-            df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-            j += 1
-
-            # Headcount ratio (rel)
-            df_tables.loc[
-                j, "name"
-            ] = f"Share in relative poverty ({welfare['title'][wel]})"
-            df_tables.loc[
-                j, "slug"
-            ] = f"headcount_ratio_50_median_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_tables.loc[j, "description"] = new_line.join(
+# Capitalized welfare type, for the start of titles
+welfare["welfare_type_capitalized"] = welfare["welfare_type"].str.capitalize()
+
+df_tables = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            Each(
+                {"wel": welfare},
                 [
-                    f"The share of the population with {welfare['welfare_type'][wel]} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
-                    welfare["description"][wel],
-                    equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_poverty,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "%"
-            df_tables.loc[j, "shortUnit"] = "%"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = welfare[
-                "scale_relative_poverty"
-            ][wel]
-            df_tables.loc[j, "colorScaleNumericMinValue"] = welfare[
-                "min_relative_poverty"
-            ][wel]
-            df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-            j += 1
-
-    df_tables["tableSlug"] = tables["name"][tab]
+                    Each(
+                        {"eq": equivalence_scales},
+                        [
+                            # Gini coefficient
+                            {
+                                "name": "Gini coefficient (${wel__title})",
+                                "slug": "gini_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_gini_mean_median),
+                                    ]
+                                ),
+                                "unit": np.nan,
+                                "shortUnit": np.nan,
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_gini"),
+                                "colorScaleNumericMinValue": 1,
+                                "colorScaleScheme": "Oranges",
+                            },
+                            # Share of the top 10%
+                            {
+                                "name": "${wel__welfare_type_capitalized} share of the richest 10% (${wel__title})",
+                                "slug": "share_p100_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of ${wel__welfare_type} received by the richest 10% of the population.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_distribution),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_top10"),
+                                "colorScaleNumericMinValue": 100,
+                                "colorScaleScheme": "OrRd",
+                            },
+                            # Share of the bottom 50%
+                            {
+                                "name": "${wel__welfare_type_capitalized} share of the poorest 50% (${wel__title})",
+                                "slug": "share_bottom50_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of ${wel__welfare_type} received by the poorest 50% of the population.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_distribution),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_bottom50"),
+                                "colorScaleNumericMinValue": 100,
+                                "colorScaleScheme": "Blues",
+                            },
+                            # Palma ratio
+                            {
+                                "name": "Palma ratio (${wel__title})",
+                                "slug": "palma_ratio_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_distribution),
+                                    ]
+                                ),
+                                "unit": np.nan,
+                                "shortUnit": np.nan,
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "wel__scale_palma_ratio"
+                                ),
+                                "colorScaleNumericMinValue": 0,
+                                "colorScaleScheme": "YlOrBr",
+                            },
+                            # Headcount ratio (rel)
+                            {
+                                "name": "Share in relative poverty (${wel__title})",
+                                "slug": "headcount_ratio_50_median_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of the population with ${wel__welfare_type} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_poverty),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "wel__scale_relative_poverty"
+                                ),
+                                "colorScaleNumericMinValue": Column(
+                                    "wel__min_relative_poverty"
+                                ),
+                                "colorScaleScheme": "YlOrBr",
+                            },
+                        ],
+                    )
+                ],
+            ),
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables["sourceName"] = sourceName
 df_tables["dataPublishedBy"] = dataPublishedBy
@@ -271,235 +276,180 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 yAxisMin = 0
 mapTargetTime = 2019
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(tables)):
-    for eq in range(len(equivalence_scales)):
-        for wel in range(len(welfare)):
-            # Gini coefficient
-            df_graphers.loc[j, "title"] = f"Gini coefficient ({welfare['title'][wel]})"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"gini_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. {welfare['subtitle_ineq'][wel]}"
-            df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            j += 1
-
-            # Share of the top 10%
-            df_graphers.loc[
-                j, "title"
-            ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 10% ({welfare['title'][wel]})"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"share_p100_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of {welfare['welfare_type'][wel]} received by the richest 10% of the population. {welfare['subtitle'][wel]}"
-            df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            j += 1
-
-            # Share of the bottom 50%
-            df_graphers.loc[
-                j, "title"
-            ] = f"{welfare['welfare_type'][wel].capitalize()} share of the poorest 50% ({welfare['title'][wel]})"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"share_bottom50_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Share of the poorest 50%"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of {welfare['welfare_type'][wel]} received by the poorest 50% of the population. {welfare['subtitle'][wel]}"
-            df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            j += 1
-
-            # # Palma ratio
-            df_graphers.loc[j, "title"] = f"Palma ratio ({welfare['title'][wel]})"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"palma_ratio_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Palma ratio"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. {welfare['subtitle_ineq'][wel]}"
-            df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            j += 1
-
-            # Headcount ratio (rel)
-            df_graphers.loc[
-                j, "title"
-            ] = f"Share of people in relative poverty ({welfare['title'][wel]})"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"headcount_ratio_50_median_{welfare['slug'][wel]}_{equivalence_scales['slug'][eq]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = f"Share in relative poverty"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j,
-                "Adjust for cost sharing within households (equivalized income) Checkbox",
-            ] = equivalence_scales["checkbox"][eq]
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of the population with {welfare['welfare_type'][wel]} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution. {welfare['subtitle'][wel]}"
-            df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-            df_graphers.loc[j, "type"] = np.nan
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            j += 1
-
-        # COMPARE BEFORE AND AFTER TAX
-        # Gini coefficient
-        df_graphers.loc[j, "title"] = f"Gini coefficient (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"gini_mi_{equivalence_scales['slug'][eq]} gini_dhi_{equivalence_scales['slug'][eq]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[
-            j, "Adjust for cost sharing within households (equivalized income) Checkbox"
-        ] = equivalence_scales["checkbox"][eq]
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality."
-        df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-        # Share of the top 10%
-        df_graphers.loc[
-            j, "title"
-        ] = f"Income share of the richest 10% (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"share_p100_mi_{equivalence_scales['slug'][eq]} share_p100_dhi_{equivalence_scales['slug'][eq]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[
-            j, "Adjust for cost sharing within households (equivalized income) Checkbox"
-        ] = equivalence_scales["checkbox"][eq]
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the richest 10% of the population."
-        df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-        # Share of the bottom 50%
-        df_graphers.loc[
-            j, "title"
-        ] = f"Income share of the poorest 50% (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"share_bottom50_mi_{equivalence_scales['slug'][eq]} share_bottom50_dhi_{equivalence_scales['slug'][eq]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the poorest 50%"
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[
-            j, "Adjust for cost sharing within households (equivalized income) Checkbox"
-        ] = equivalence_scales["checkbox"][eq]
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the poorest 50% of the population."
-        df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-        # # Palma ratio
-        df_graphers.loc[j, "title"] = f"Palma ratio (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"palma_ratio_mi_{equivalence_scales['slug'][eq]} palma_ratio_dhi_{equivalence_scales['slug'][eq]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Palma ratio"
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[
-            j, "Adjust for cost sharing within households (equivalized income) Checkbox"
-        ] = equivalence_scales["checkbox"][eq]
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality."
-        df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-        # Headcount ratio (rel)
-        df_graphers.loc[
-            j, "title"
-        ] = f"Share of people in relative poverty (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_ratio_50_median_mi_{equivalence_scales['slug'][eq]} headcount_ratio_50_median_dhi_{equivalence_scales['slug'][eq]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = f"Share in relative poverty"
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[
-            j,
-            "Adjust for cost sharing within households (equivalized income) Checkbox",
-        ] = equivalence_scales["checkbox"][eq]
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of the population with {welfare['welfare_type'][wel]} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution."
-        df_graphers.loc[j, "note"] = equivalence_scales["note"][eq]
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-    df_graphers["tableSlug"] = tables["name"][tab]
+# The comparison of relative poverty refers to the welfare type of the last row of the welfare sheet
+last_welfare_type = escape(welfare["welfare_type"].iloc[-1])
+
+df_graphers = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            Each(
+                {"eq": equivalence_scales},
+                [
+                    Each(
+                        {"wel": welfare},
+                        [
+                            # Gini coefficient
+                            {
+                                "title": "Gini coefficient (${wel__title})",
+                                "ySlugs": "gini_${wel__slug}_${eq__slug}",
+                                "Indicator Dropdown": "Gini coefficient",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. ${wel__subtitle_ineq}",
+                                "note": Column("eq__note"),
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                            },
+                            # Share of the top 10%
+                            {
+                                "title": "${wel__welfare_type_capitalized} share of the richest 10% (${wel__title})",
+                                "ySlugs": "share_p100_${wel__slug}_${eq__slug}",
+                                "Indicator Dropdown": "Share of the richest 10%",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "The share of ${wel__welfare_type} received by the richest 10% of the population. ${wel__subtitle}",
+                                "note": Column("eq__note"),
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                            },
+                            # Share of the bottom 50%
+                            {
+                                "title": "${wel__welfare_type_capitalized} share of the poorest 50% (${wel__title})",
+                                "ySlugs": "share_bottom50_${wel__slug}_${eq__slug}",
+                                "Indicator Dropdown": "Share of the poorest 50%",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "The share of ${wel__welfare_type} received by the poorest 50% of the population. ${wel__subtitle}",
+                                "note": Column("eq__note"),
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                            },
+                            # # Palma ratio
+                            {
+                                "title": "Palma ratio (${wel__title})",
+                                "ySlugs": "palma_ratio_${wel__slug}_${eq__slug}",
+                                "Indicator Dropdown": "Palma ratio",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. ${wel__subtitle_ineq}",
+                                "note": Column("eq__note"),
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                            },
+                            # Headcount ratio (rel)
+                            {
+                                "title": "Share of people in relative poverty (${wel__title})",
+                                "ySlugs": "headcount_ratio_50_median_${wel__slug}_${eq__slug}",
+                                "Indicator Dropdown": "Share in relative poverty",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                                    "eq__checkbox"
+                                ),
+                                "subtitle": "The share of the population with ${wel__welfare_type} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution. ${wel__subtitle}",
+                                "note": Column("eq__note"),
+                                "type": np.nan,
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                            },
+                        ],
+                    ),
+                    # COMPARE BEFORE AND AFTER TAX
+                    # Gini coefficient
+                    {
+                        "title": "Gini coefficient (after tax vs. before tax)",
+                        "ySlugs": "gini_mi_${eq__slug} gini_dhi_${eq__slug}",
+                        "Indicator Dropdown": "Gini coefficient",
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                            "eq__checkbox"
+                        ),
+                        "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                        "note": Column("eq__note"),
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    },
+                    # Share of the top 10%
+                    {
+                        "title": "Income share of the richest 10% (after tax vs. before tax)",
+                        "ySlugs": "share_p100_mi_${eq__slug} share_p100_dhi_${eq__slug}",
+                        "Indicator Dropdown": "Share of the richest 10%",
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                            "eq__checkbox"
+                        ),
+                        "subtitle": "The share of income received by the richest 10% of the population.",
+                        "note": Column("eq__note"),
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    },
+                    # Share of the bottom 50%
+                    {
+                        "title": "Income share of the poorest 50% (after tax vs. before tax)",
+                        "ySlugs": "share_bottom50_mi_${eq__slug} share_bottom50_dhi_${eq__slug}",
+                        "Indicator Dropdown": "Share of the poorest 50%",
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                            "eq__checkbox"
+                        ),
+                        "subtitle": "The share of income received by the poorest 50% of the population.",
+                        "note": Column("eq__note"),
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    },
+                    # # Palma ratio
+                    {
+                        "title": "Palma ratio (after tax vs. before tax)",
+                        "ySlugs": "palma_ratio_mi_${eq__slug} palma_ratio_dhi_${eq__slug}",
+                        "Indicator Dropdown": "Palma ratio",
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                            "eq__checkbox"
+                        ),
+                        "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                        "note": Column("eq__note"),
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    },
+                    # Headcount ratio (rel)
+                    {
+                        "title": "Share of people in relative poverty (after tax vs. before tax)",
+                        "ySlugs": "headcount_ratio_50_median_mi_${eq__slug} headcount_ratio_50_median_dhi_${eq__slug}",
+                        "Indicator Dropdown": "Share in relative poverty",
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Adjust for cost sharing within households (equivalized income) Checkbox": Column(
+                            "eq__checkbox"
+                        ),
+                        "subtitle": f"The share of the population with {last_welfare_type} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                        "note": Column("eq__note"),
+                        "type": np.nan,
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    },
+                ],
+            )
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # %% [markdown]
 # Final adjustments to the graphers table: add `relatedQuestion` link and `defaultView`:
@@ -517,17 +467,14 @@ df_graphers["mapTargetTime"] = mapTargetTime
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Indicator Dropdown"] == "Gini coefficient")
-    & (df_graphers["Income measure Dropdown"] == "After tax")
-    & (
-        df_graphers[
-            "Adjust for cost sharing within households (equivalized income) Checkbox"
-        ]
-        == "false"
-    ),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Indicator Dropdown": "Gini coefficient",
+        "Income measure Dropdown": "After tax",
+        "Adjust for cost sharing within households (equivalized income) Checkbox": "false",
+    },
+)
 
 
 # %% [markdown]
@@ -538,29 +485,18 @@ df_graphers.loc[
 # Define list of variables to iterate: table names
 table_list = list(tables["name"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in range(len(tables)):
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tables["name"][tab]]
-            .copy()
-            .reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tables["name"][tab]]
         f.write("\ntable\t" + tables["link"][tab] + "\t" + tables["name"][tab])
-        f.write("\ncolumns\t" + tables["name"][tab] + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tables["name"][tab] + "\n")
+        write_frame(f, table_tsv, index=False)
@@ -2,7 +2,7 @@
 # # Incomes Across the Distribution Explorer - Source Comparison
 # This code creates the tsv file for the incomes across the distribution comparison explorer, available [here](https://owid.cloud/admin/explorers/preview/incomes-across-distribution-comparison)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,9 +11,21 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = (
-    PARENT_DIR / "explorers" / "incomes-across-distribution-comparison.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import (  # noqa: E402
+    Column,
+    Each,
+    TemplateColumn,
+    expand_views,
 )
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "incomes-across-distribution-comparison.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -26,14 +38,15 @@ sheet_id = "1wcFsNZCEn_6SJ05BFkXKLUyvCrnigfR8eeemGKgAYsI"
 
 # Merged sheet (this contains PIP, WID and LIS dataset information together in one file)
 sheet_name = "merged_tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-merged_tables = pd.read_csv(url, keep_default_na=False)
+merged_tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Source checkbox covers all the possible combinations to get for the multi-source selector
 sheet_name = "source_checkbox"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-source_checkbox = pd.read_csv(
-    url, keep_default_na=False, dtype={"pip": "str", "wid": "str", "lis": "str"}
+source_checkbox = read_sheet(
+    sheet_id,
+    sheet_name,
+    keep_default_na=False,
+    dtype={"pip": "str", "wid": "str", "lis": "str"},
 )
 
 # Only get the combinations where all the sources are available (pre and post tax)
@@ -54,16 +67,20 @@ source_checkbox = source_checkbox[
 
 # Deciles9 sheet (needed to handle thresholds data)
 sheet_name = "deciles9"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles9 = pd.read_csv(
-    url, keep_default_na=False, dtype={"dropdown": "str", "decile": "str"}
+deciles9 = read_sheet(
+    sheet_id,
+    sheet_name,
+    keep_default_na=False,
+    dtype={"dropdown": "str", "decile": "str"},
 )
 
 # Deciles10 sheet (needed to handle average and share data)
 sheet_name = "deciles10"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles10 = pd.read_csv(
-    url, keep_default_na=False, dtype={"dropdown": "str", "decile": "str"}
+deciles10 = read_sheet(
+    sheet_id,
+    sheet_name,
+    keep_default_na=False,
+    dtype={"dropdown": "str", "decile": "str"},
 )
 
 # LUXEMBOURG INCOME STUDY
@@ -72,34 +89,28 @@ sheet_id = "1UFdwB1iBpP2tEP6GtxCHvW1GGhjsFflh42FWR80rYIg"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_welfare = pd.read_csv(url, keep_default_na=False)
+lis_welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Equivalence scales
 sheet_name = "equivalence_scales"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_equivalence_scales = pd.read_csv(url, keep_default_na=False)
+lis_equivalence_scales = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_povlines_rel = pd.read_csv(url)
+lis_povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # Deciles9 sheet (needed to handle thresholds data)
 sheet_name = "deciles9"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_deciles9 = pd.read_csv(url, keep_default_na=False)
+lis_deciles9 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Deciles10 sheet (needed to handle average and share data)
 sheet_name = "deciles10"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_deciles10 = pd.read_csv(url, keep_default_na=False)
+lis_deciles10 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Income aggregation sheet (day, month, year)
 sheet_name = "income_aggregation"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_income_aggregation = pd.read_csv(
-    url, keep_default_na=False, dtype={"multiplier": "str"}
+lis_income_aggregation = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"multiplier": "str"}
 )
 
 # WORLD INEQUALITY DATABASE
@@ -108,24 +119,20 @@ sheet_id = "18T5IGnpyJwb8KL9USYvME6IaLEcYIo26ioHCpkDnwRQ"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-wid_welfare = pd.read_csv(url, keep_default_na=False)
+wid_welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Deciles9 sheet (needed to handle thresholds data)
 sheet_name = "deciles9"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-wid_deciles9 = pd.read_csv(url, keep_default_na=False)
+wid_deciles9 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Deciles10 sheet (needed to handle average and share data)
 sheet_name = "deciles10"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-wid_deciles10 = pd.read_csv(url, keep_default_na=False)
+wid_deciles10 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Income aggregation sheet (day, month, year)
 sheet_name = "income_aggregation"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-wid_income_aggregation = pd.read_csv(
-    url, keep_default_na=False, dtype={"multiplier": "str"}
+wid_income_aggregation = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"multiplier": "str"}
 )
 
 # WORLD BANK POVERTY AND INEQUALITY PLATFORM
@@ -134,24 +141,24 @@ sheet_id = "17KJ9YcvfdmO_7-Sv2Ij0vmzAQI6rXSIqHfJtgFHN-a8"
 
 # Survey type sheet
 sheet_name = "table"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_tables = pd.read_csv(url)
+pip_tables = read_sheet(sheet_id, sheet_name)
 
 # Settings for 10 deciles variables (share, avg) sheet
 sheet_name = "deciles10"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_deciles10 = pd.read_csv(url, dtype={"dropdown": "str", "decile": "str"})
+pip_deciles10 = read_sheet(
+    sheet_id, sheet_name, dtype={"dropdown": "str", "decile": "str"}
+)
 
 # Settings for 9 deciles variables (thr) sheet
 sheet_name = "deciles9"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_deciles9 = pd.read_csv(url, dtype={"dropdown": "str", "decile": "str"})
+pip_deciles9 = read_sheet(
+    sheet_id, sheet_name, dtype={"dropdown": "str", "decile": "str"}
+)
 
 # Income aggregation sheet (day, month, year)
 sheet_name = "income_aggregation"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_income_aggregation = pd.read_csv(
-    url, keep_default_na=False, dtype={"multiplier": "str"}
+pip_income_aggregation = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"multiplier": "str"}
 )
 
 # %% [markdown]
@@ -221,235 +228,245 @@ processing_description = new_line.join(
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
 # Table generation
-df_tables_pip = pd.DataFrame()
-j = 0
-
-for tab in range(len(pip_tables)):
-    # Define country as entityName
-    df_tables_pip.loc[j, "name"] = "Country"
-    df_tables_pip.loc[j, "slug"] = "country"
-    df_tables_pip.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables_pip.loc[j, "name"] = "Year"
-    df_tables_pip.loc[j, "slug"] = "year"
-    df_tables_pip.loc[j, "type"] = "Year"
-    j += 1
-
-    # I need the original variables to not break the aggregations
-    # mean
-    df_tables_pip.loc[j, "name"] = f"Mean {pip_tables.text[tab]} (PIP data)"
-    df_tables_pip.loc[j, "slug"] = "mean"
-    df_tables_pip.loc[j, "description"] = new_line.join(
+# Capitalized texts, for the start of names, titles and dropdown options
+lis_deciles10["ordinal_capitalized"] = lis_deciles10["ordinal"].str.capitalize()
+lis_deciles9["ordinal_capitalized"] = lis_deciles9["ordinal"].str.capitalize()
+lis_income_aggregation["aggregation_capitalized"] = lis_income_aggregation[
+    "aggregation"
+].str.capitalize()
+pip_deciles10["ordinal_capitalized"] = pip_deciles10["ordinal"].str.capitalize()
+pip_deciles9["ordinal_capitalized"] = pip_deciles9["ordinal"].str.capitalize()
+source_checkbox["type_title_capitalized"] = source_checkbox[
+    "type_title"
+].str.capitalize()
+wid_deciles10["ordinal_capitalized"] = wid_deciles10["ordinal"].str.capitalize()
+wid_deciles9["ordinal_capitalized"] = wid_deciles9["ordinal"].str.capitalize()
+
+df_tables_pip = expand_views(
+    Each(
+        {"tab": pip_tables},
         [
-            f"Mean {pip_tables.text[tab]}.",
-            additional_description,
-            ppp_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables_pip.loc[j, "shortUnit"] = "$"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100;100.0001"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "BuGn"
-    j += 1
-
-    # median
-    df_tables_pip.loc[j, "name"] = f"Median {pip_tables.text[tab]} (PIP data)"
-    df_tables_pip.loc[j, "slug"] = "median"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {pip_tables.text[tab]} per day below which half of the population falls.",
-            additional_description,
-            ppp_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables_pip.loc[j, "shortUnit"] = "$"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100;100.0001"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "Blues"
-    j += 1
-
-    for dec9 in range(len(pip_deciles9)):
-        # thresholds
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"{pip_deciles9.ordinal[dec9].capitalize()} (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"decile{pip_deciles9.decile[dec9]}_thr"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The level of {pip_tables.text[tab]} per day below which {pip_deciles9.decile[dec9]}0% of the population falls.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100;100.0001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "Purples"
-        j += 1
-
-    for dec10 in range(len(pip_deciles10)):
-        # averages
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"{pip_deciles10.ordinal[dec10].capitalize()} (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"decile{pip_deciles10.decile[dec10]}_avg"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The mean {pip_tables.text[tab]} per day within the {pip_deciles10.ordinal[dec10]} (tenth of the population).",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100;100.0001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "Greens"
-        j += 1
-
-    for dec10 in range(len(pip_deciles10)):
-        # shares
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"{pip_deciles10.ordinal[dec10].capitalize()} (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"decile{pip_deciles10.decile[dec10]}_share"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {pip_tables.text[tab]} received by the {pip_deciles10.ordinal[dec10]} (tenth of the population).",
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "%"
-        df_tables_pip.loc[j, "shortUnit"] = "%"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = pip_deciles10.scale_share[dec10]
-        df_tables_pip.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-    # Daily, monthly, annual aggregations
-    for agg in range(len(pip_income_aggregation)):
-        # mean
-        df_tables_pip.loc[j, "name"] = f"Mean {pip_tables.text[tab]} (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"mean{pip_income_aggregation.slug_suffix[agg]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The mean level of {pip_tables.text[tab]} per {pip_income_aggregation.aggregation[agg]}.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = pip_income_aggregation.scale[
-            agg
-        ]
-        df_tables_pip.loc[j, "colorScaleScheme"] = "BuGn"
-        df_tables_pip.loc[
-            j, "transform"
-        ] = f"multiplyBy mean {pip_income_aggregation.multiplier[agg]}"
-        j += 1
-
-        # median
-        df_tables_pip.loc[j, "name"] = f"Median {pip_tables.text[tab]} (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"median{pip_income_aggregation.slug_suffix[agg]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The level of {pip_tables.text[tab]} per {pip_income_aggregation.aggregation[agg]} below which half of the population falls.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = pip_income_aggregation.scale[
-            agg
-        ]
-        df_tables_pip.loc[j, "colorScaleScheme"] = "Blues"
-        df_tables_pip.loc[
-            j, "transform"
-        ] = f"multiplyBy median {pip_income_aggregation.multiplier[agg]}"
-        j += 1
-
-        for dec9 in range(len(pip_deciles9)):
-            # thresholds
-            df_tables_pip.loc[
-                j, "name"
-            ] = f"{pip_deciles9.ordinal[dec9].capitalize()} (PIP data)"
-            df_tables_pip.loc[
-                j, "slug"
-            ] = f"decile{pip_deciles9.decile[dec9]}_thr{pip_income_aggregation.slug_suffix[agg]}"
-            df_tables_pip.loc[j, "description"] = new_line.join(
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            # I need the original variables to not break the aggregations
+            # mean
+            {
+                "name": "Mean ${tab__text} (PIP data)",
+                "slug": "mean",
+                "description": new_line.join(
+                    [
+                        "Mean ${tab__text}.",
+                        escape(additional_description),
+                        escape(ppp_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "type": "Numeric",
+                "colorScaleNumericBins": "1;2;5;10;20;50;100;100.0001",
+                "colorScaleScheme": "BuGn",
+            },
+            # median
+            {
+                "name": "Median ${tab__text} (PIP data)",
+                "slug": "median",
+                "description": new_line.join(
+                    [
+                        "The level of ${tab__text} per day below which half of the population falls.",
+                        escape(additional_description),
+                        escape(ppp_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "type": "Numeric",
+                "colorScaleNumericBins": "1;2;5;10;20;50;100;100.0001",
+                "colorScaleScheme": "Blues",
+            },
+            Each(
+                {"dec9": pip_deciles9},
                 [
-                    f"The level of {pip_tables.text[tab]} per {pip_income_aggregation.aggregation[agg]} below which {pip_deciles9.decile[dec9]}0% of the population falls.",
-                    additional_description,
-                    ppp_description,
-                    notes_title,
-                    processing_description,
-                ]
-            )
-            df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables_pip.loc[j, "shortUnit"] = "$"
-            df_tables_pip.loc[j, "type"] = "Numeric"
-            df_tables_pip.loc[
-                j, "colorScaleNumericBins"
-            ] = pip_income_aggregation.scale[agg]
-            df_tables_pip.loc[j, "colorScaleScheme"] = "Purples"
-            df_tables_pip.loc[
-                j, "transform"
-            ] = f"multiplyBy decile{pip_deciles9.decile[dec9]}_thr {pip_income_aggregation.multiplier[agg]}"
-            j += 1
-
-        for dec10 in range(len(pip_deciles10)):
-            # averages
-            df_tables_pip.loc[
-                j, "name"
-            ] = f"{pip_deciles10.ordinal[dec10].capitalize()} (PIP data)"
-            df_tables_pip.loc[
-                j, "slug"
-            ] = f"decile{pip_deciles10.decile[dec10]}_avg{pip_income_aggregation.slug_suffix[agg]}"
-            df_tables_pip.loc[j, "description"] = new_line.join(
+                    # thresholds
+                    {
+                        "name": "${dec9__ordinal_capitalized} (PIP data)",
+                        "slug": "decile${dec9__decile}_thr",
+                        "description": new_line.join(
+                            [
+                                "The level of ${tab__text} per day below which ${dec9__decile}0% of the population falls.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "1;2;5;10;20;50;100;100.0001",
+                        "colorScaleScheme": "Purples",
+                    }
+                ],
+            ),
+            Each(
+                {"dec10": pip_deciles10},
                 [
-                    f"The mean {pip_tables.text[tab]} per {pip_income_aggregation.aggregation[agg]} within the {pip_deciles10.ordinal[dec10]} (tenth of the population).",
-                    additional_description,
-                    ppp_description,
-                    notes_title,
-                    processing_description,
-                ]
-            )
-            df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables_pip.loc[j, "shortUnit"] = "$"
-            df_tables_pip.loc[j, "type"] = "Numeric"
-            df_tables_pip.loc[
-                j, "colorScaleNumericBins"
-            ] = pip_income_aggregation.scale[agg]
-            df_tables_pip.loc[j, "colorScaleScheme"] = "Greens"
-            df_tables_pip.loc[
-                j, "transform"
-            ] = f"multiplyBy decile{pip_deciles10.decile[dec10]}_avg {pip_income_aggregation.multiplier[agg]}"
-            j += 1
+                    # averages
+                    {
+                        "name": "${dec10__ordinal_capitalized} (PIP data)",
+                        "slug": "decile${dec10__decile}_avg",
+                        "description": new_line.join(
+                            [
+                                "The mean ${tab__text} per day within the ${dec10__ordinal} (tenth of the population).",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "1;2;5;10;20;50;100;100.0001",
+                        "colorScaleScheme": "Greens",
+                    }
+                ],
+            ),
+            Each(
+                {"dec10": pip_deciles10},
+                [
+                    # shares
+                    {
+                        "name": "${dec10__ordinal_capitalized} (PIP data)",
+                        "slug": "decile${dec10__decile}_share",
+                        "description": new_line.join(
+                            [
+                                "The share of ${tab__text} received by the ${dec10__ordinal} (tenth of the population).",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("dec10__scale_share"),
+                        "colorScaleScheme": "OrRd",
+                    }
+                ],
+            ),
+            # Daily, monthly, annual aggregations
+            Each(
+                {"agg": pip_income_aggregation},
+                [
+                    # mean
+                    {
+                        "name": "Mean ${tab__text} (PIP data)",
+                        "slug": "mean${agg__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                "The mean level of ${tab__text} per ${agg__aggregation}.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("agg__scale"),
+                        "colorScaleScheme": "BuGn",
+                        "transform": "multiplyBy mean ${agg__multiplier}",
+                    },
+                    # median
+                    {
+                        "name": "Median ${tab__text} (PIP data)",
+                        "slug": "median${agg__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                "The level of ${tab__text} per ${agg__aggregation} below which half of the population falls.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("agg__scale"),
+                        "colorScaleScheme": "Blues",
+                        "transform": "multiplyBy median ${agg__multiplier}",
+                    },
+                    Each(
+                        {"dec9": pip_deciles9},
+                        [
+                            # thresholds
+                            {
+                                "name": "${dec9__ordinal_capitalized} (PIP data)",
+                                "slug": "decile${dec9__decile}_thr${agg__slug_suffix}",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${tab__text} per ${agg__aggregation} below which ${dec9__decile}0% of the population falls.",
+                                        escape(additional_description),
+                                        escape(ppp_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("agg__scale"),
+                                "colorScaleScheme": "Purples",
+                                "transform": "multiplyBy decile${dec9__decile}_thr ${agg__multiplier}",
+                            }
+                        ],
+                    ),
+                    Each(
+                        {"dec10": pip_deciles10},
+                        [
+                            # averages
+                            {
+                                "name": "${dec10__ordinal_capitalized} (PIP data)",
+                                "slug": "decile${dec10__decile}_avg${agg__slug_suffix}",
+                                "description": new_line.join(
+                                    [
+                                        "The mean ${tab__text} per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population).",
+                                        escape(additional_description),
+                                        escape(ppp_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("agg__scale"),
+                                "colorScaleScheme": "Greens",
+                                "transform": "multiplyBy decile${dec10__decile}_avg ${agg__multiplier}",
+                            }
+                        ],
+                    ),
+                ],
+            ),
+        ],
+    )
+)
 
 df_tables_pip["tableSlug"] = tableSlug
 df_tables_pip["sourceName"] = sourceName
@@ -481,239 +498,230 @@ additional_description = new_line.join(
 )
 ppp_description = "The data is measured in international-$ at 2022 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables_wid = pd.DataFrame()
-j = 0
-
-for tab in range(len(merged_tables)):
-    for wel in range(len(wid_welfare)):
-        # I need the original variables to not break the aggregations
-        # Mean
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"Mean {wid_welfare['welfare_type'][wel]} (WID data)"
-        df_tables_wid.loc[j, "slug"] = f"p0p100_avg_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"Mean {wid_welfare['welfare_type'][wel]}",
-                wid_welfare["description"][wel],
-                ppp_description,
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-        df_tables_wid.loc[j, "shortUnit"] = "$"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_mean"][wel]
-        df_tables_wid.loc[j, "colorScaleScheme"] = "BuGn"
-        j += 1
-
-        # Median
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"Median {wid_welfare['welfare_type'][wel]} (WID data)"
-        df_tables_wid.loc[j, "slug"] = f"median_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"This is the level of {wid_welfare['welfare_type'][wel]} below which half of the population falls.",
-                wid_welfare["description"][wel],
-                ppp_description,
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-        df_tables_wid.loc[j, "shortUnit"] = "$"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_median"][wel]
-        df_tables_wid.loc[j, "colorScaleScheme"] = "Blues"
-        j += 1
-
-        # Thresholds - Deciles
-        for dec9 in range(len(wid_deciles9)):
-            df_tables_wid.loc[
-                j, "name"
-            ] = f"{wid_deciles9['ordinal'][dec9].capitalize()} (WID data)"
-            df_tables_wid.loc[
-                j, "slug"
-            ] = f"{wid_deciles9['wid_notation'][dec9]}_thr_{wid_welfare['slug'][wel]}"
-            df_tables_wid.loc[j, "description"] = new_line.join(
-                [
-                    f"The level of {wid_welfare['welfare_type'][wel]} below which {wid_deciles9['decile'][dec9]}0% of the population falls.",
-                    wid_welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables_wid.loc[j, "shortUnit"] = "$"
-            df_tables_wid.loc[j, "type"] = "Numeric"
-            # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles9["scale_thr"][
-            #     dec9
-            # ]
-            df_tables_wid.loc[j, "colorScaleScheme"] = "Purples"
-            j += 1
-
-        # Averages - Deciles
-        for dec10 in range(len(wid_deciles10)):
-            df_tables_wid.loc[
-                j, "name"
-            ] = f"{wid_deciles10['ordinal'][dec10].capitalize()} (WID data)"
-            df_tables_wid.loc[
-                j, "slug"
-            ] = f"{wid_deciles10['wid_notation'][dec10]}_avg_{wid_welfare['slug'][wel]}"
-            df_tables_wid.loc[j, "description"] = new_line.join(
-                [
-                    f"The mean {wid_welfare['welfare_type'][wel]} within the {wid_deciles10['ordinal'][dec10]} (tenth of the population).",
-                    wid_welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables_wid.loc[j, "shortUnit"] = "$"
-            df_tables_wid.loc[j, "type"] = "Numeric"
-            # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles10["scale_avg"][
-            #     dec10
-            # ]
-            df_tables_wid.loc[j, "colorScaleScheme"] = "Greens"
-            j += 1
-
-        # Shares - Deciles
-        for dec10 in range(len(wid_deciles10)):
-            df_tables_wid.loc[
-                j, "name"
-            ] = f"{wid_deciles10['ordinal'][dec10].capitalize()} (WID data)"
-            df_tables_wid.loc[
-                j, "slug"
-            ] = f"{wid_deciles10['wid_notation'][dec10]}_share_{wid_welfare['slug'][wel]}"
-            df_tables_wid.loc[j, "description"] = new_line.join(
-                [
-                    f"The share of {wid_welfare['welfare_type'][wel]} received by the {wid_deciles10['ordinal'][dec10]} (tenth of the population).",
-                    wid_welfare["description"][wel],
-                    additional_description,
-                ]
-            )
-            df_tables_wid.loc[j, "unit"] = "%"
-            df_tables_wid.loc[j, "shortUnit"] = "%"
-            df_tables_wid.loc[j, "type"] = "Numeric"
-            # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles10[
-            #     "scale_share"
-            # ][dec10]
-            df_tables_wid.loc[j, "colorScaleScheme"] = "OrRd"
-            j += 1
-
-        # Daily, monthly, annual aggregations
-        for agg in range(len(wid_income_aggregation)):
-            # Mean
-            df_tables_wid.loc[
-                j, "name"
-            ] = f"Mean {wid_welfare['welfare_type'][wel]} (WID data)"
-            df_tables_wid.loc[
-                j, "slug"
-            ] = f"p0p100_avg_{wid_welfare['slug'][wel]}{wid_income_aggregation['slug_suffix'][agg]}"
-            df_tables_wid.loc[j, "description"] = new_line.join(
-                [
-                    f"Mean {wid_welfare['welfare_type'][wel]}.",
-                    wid_welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables_wid.loc[j, "shortUnit"] = "$"
-            df_tables_wid.loc[j, "type"] = "Numeric"
-            # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_mean"][
-            #     wel
-            # ]
-            df_tables_wid.loc[j, "colorScaleScheme"] = "BuGn"
-            df_tables_wid.loc[
-                j, "transform"
-            ] = f"multiplyBy p0p100_avg_{wid_welfare['slug'][wel]} {wid_income_aggregation['multiplier'][agg]}"
-            j += 1
-
-            # Median
-            df_tables_wid.loc[
-                j, "name"
-            ] = f"Median {wid_welfare['welfare_type'][wel]} (WID data)"
-            df_tables_wid.loc[
-                j, "slug"
-            ] = f"median_{wid_welfare['slug'][wel]}{wid_income_aggregation['slug_suffix'][agg]}"
-            df_tables_wid.loc[j, "description"] = new_line.join(
+df_tables_wid = expand_views(
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"wel": wid_welfare},
                 [
-                    f"This is the level of {wid_welfare['welfare_type'][wel]} below which 50% of the population falls.",
-                    wid_welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
+                    # I need the original variables to not break the aggregations
+                    # Mean
+                    {
+                        "name": "Mean ${wel__welfare_type} (WID data)",
+                        "slug": "p0p100_avg_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "Mean ${wel__welfare_type}",
+                                "${wel__description}",
+                                escape(ppp_description),
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2022 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_mean"][wel]
+                        "colorScaleScheme": "BuGn",
+                    },
+                    # Median
+                    {
+                        "name": "Median ${wel__welfare_type} (WID data)",
+                        "slug": "median_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "This is the level of ${wel__welfare_type} below which half of the population falls.",
+                                "${wel__description}",
+                                escape(ppp_description),
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2022 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_median"][wel]
+                        "colorScaleScheme": "Blues",
+                    },
+                    # Thresholds - Deciles
+                    Each(
+                        {"dec9": wid_deciles9},
+                        [
+                            {
+                                "name": "${dec9__ordinal_capitalized} (WID data)",
+                                "slug": "${dec9__wid_notation}_thr_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${wel__welfare_type} below which ${dec9__decile}0% of the population falls.",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles9["scale_thr"][
+                                #     dec9
+                                # ]
+                                "colorScaleScheme": "Purples",
+                            }
+                        ],
+                    ),
+                    # Averages - Deciles
+                    Each(
+                        {"dec10": wid_deciles10},
+                        [
+                            {
+                                "name": "${dec10__ordinal_capitalized} (WID data)",
+                                "slug": "${dec10__wid_notation}_avg_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The mean ${wel__welfare_type} within the ${dec10__ordinal} (tenth of the population).",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles10["scale_avg"][
+                                #     dec10
+                                # ]
+                                "colorScaleScheme": "Greens",
+                            }
+                        ],
+                    ),
+                    # Shares - Deciles
+                    Each(
+                        {"dec10": wid_deciles10},
+                        [
+                            {
+                                "name": "${dec10__ordinal_capitalized} (WID data)",
+                                "slug": "${dec10__wid_notation}_share_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of ${wel__welfare_type} received by the ${dec10__ordinal} (tenth of the population).",
+                                        "${wel__description}",
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles10[
+                                #     "scale_share"
+                                # ][dec10]
+                                "colorScaleScheme": "OrRd",
+                            }
+                        ],
+                    ),
+                    # Daily, monthly, annual aggregations
+                    Each(
+                        {"agg": wid_income_aggregation},
+                        [
+                            # Mean
+                            {
+                                "name": "Mean ${wel__welfare_type} (WID data)",
+                                "slug": "p0p100_avg_${wel__slug}${agg__slug_suffix}",
+                                "description": new_line.join(
+                                    [
+                                        "Mean ${wel__welfare_type}.",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_mean"][
+                                #     wel
+                                # ]
+                                "colorScaleScheme": "BuGn",
+                                "transform": "multiplyBy p0p100_avg_${wel__slug} ${agg__multiplier}",
+                            },
+                            # Median
+                            {
+                                "name": "Median ${wel__welfare_type} (WID data)",
+                                "slug": "median_${wel__slug}${agg__slug_suffix}",
+                                "description": new_line.join(
+                                    [
+                                        "This is the level of ${wel__welfare_type} below which 50% of the population falls.",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_median"][
+                                #     wel
+                                # ]
+                                "colorScaleScheme": "Blues",
+                                "transform": "multiplyBy median_${wel__slug} ${agg__multiplier}",
+                            },
+                            # Thresholds - Deciles
+                            Each(
+                                {"dec9": wid_deciles9},
+                                [
+                                    {
+                                        "name": "${dec9__ordinal_capitalized} (WID data)",
+                                        "slug": "${dec9__wid_notation}_thr_${wel__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The level of ${wel__welfare_type} below which ${dec9__decile}0% of the population falls.",
+                                                "${wel__description}",
+                                                escape(ppp_description),
+                                                escape(additional_description),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2022 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles9[
+                                        #     "scale_thr"
+                                        # ][dec9]
+                                        "colorScaleScheme": "Purples",
+                                        "transform": "multiplyBy ${dec9__wid_notation}_thr_${wel__slug} ${agg__multiplier}",
+                                    }
+                                ],
+                            ),
+                            # Averages - Deciles
+                            Each(
+                                {"dec10": wid_deciles10},
+                                [
+                                    {
+                                        "name": "${dec10__ordinal_capitalized} (WID data)",
+                                        "slug": "${dec10__wid_notation}_avg_${wel__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The mean ${wel__welfare_type} within the ${dec10__ordinal} (tenth of the population).",
+                                                "${wel__description}",
+                                                escape(ppp_description),
+                                                escape(additional_description),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2022 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles10[
+                                        #     "scale_avg"
+                                        # ][dec10]
+                                        "colorScaleScheme": "Greens",
+                                        "transform": "multiplyBy ${dec10__wid_notation}_avg_${wel__slug} ${agg__multiplier}",
+                                    }
+                                ],
+                            ),
+                        ],
+                    ),
+                ],
             )
-            df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables_wid.loc[j, "shortUnit"] = "$"
-            df_tables_wid.loc[j, "type"] = "Numeric"
-            # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_median"][
-            #     wel
-            # ]
-            df_tables_wid.loc[j, "colorScaleScheme"] = "Blues"
-            df_tables_wid.loc[
-                j, "transform"
-            ] = f"multiplyBy median_{wid_welfare['slug'][wel]} {wid_income_aggregation['multiplier'][agg]}"
-            j += 1
-
-            # Thresholds - Deciles
-            for dec9 in range(len(wid_deciles9)):
-                df_tables_wid.loc[
-                    j, "name"
-                ] = f"{wid_deciles9['ordinal'][dec9].capitalize()} (WID data)"
-                df_tables_wid.loc[
-                    j, "slug"
-                ] = f"{wid_deciles9['wid_notation'][dec9]}_thr_{wid_welfare['slug'][wel]}{wid_income_aggregation['slug_suffix'][agg]}"
-                df_tables_wid.loc[j, "description"] = new_line.join(
-                    [
-                        f"The level of {wid_welfare['welfare_type'][wel]} below which {wid_deciles9['decile'][dec9]}0% of the population falls.",
-                        wid_welfare["description"][wel],
-                        ppp_description,
-                        additional_description,
-                    ]
-                )
-                df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-                df_tables_wid.loc[j, "shortUnit"] = "$"
-                df_tables_wid.loc[j, "type"] = "Numeric"
-                # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles9[
-                #     "scale_thr"
-                # ][dec9]
-                df_tables_wid.loc[j, "colorScaleScheme"] = "Purples"
-                df_tables_wid.loc[
-                    j, "transform"
-                ] = f"multiplyBy {wid_deciles9['wid_notation'][dec9]}_thr_{wid_welfare['slug'][wel]} {wid_income_aggregation['multiplier'][agg]}"
-                j += 1
-
-            # Averages - Deciles
-            for dec10 in range(len(wid_deciles10)):
-                df_tables_wid.loc[
-                    j, "name"
-                ] = f"{wid_deciles10['ordinal'][dec10].capitalize()} (WID data)"
-                df_tables_wid.loc[
-                    j, "slug"
-                ] = f"{wid_deciles10['wid_notation'][dec10]}_avg_{wid_welfare['slug'][wel]}{wid_income_aggregation['slug_suffix'][agg]}"
-                df_tables_wid.loc[j, "description"] = new_line.join(
-                    [
-                        f"The mean {wid_welfare['welfare_type'][wel]} within the {wid_deciles10['ordinal'][dec10]} (tenth of the population).",
-                        wid_welfare["description"][wel],
-                        ppp_description,
-                        additional_description,
-                    ]
-                )
-                df_tables_wid.loc[j, "unit"] = "international-$ in 2022 prices"
-                df_tables_wid.loc[j, "shortUnit"] = "$"
-                df_tables_wid.loc[j, "type"] = "Numeric"
-                # df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_deciles10[
-                #     "scale_avg"
-                # ][dec10]
-                df_tables_wid.loc[j, "colorScaleScheme"] = "Greens"
-                df_tables_wid.loc[
-                    j, "transform"
-                ] = f"multiplyBy {wid_deciles10['wid_notation'][dec10]}_avg_{wid_welfare['slug'][wel]} {wid_income_aggregation['multiplier'][agg]}"
-                j += 1
-
-    df_tables_wid["tableSlug"] = merged_tables["name"][tab]
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables_wid["sourceName"] = sourceName
 df_tables_wid["dataPublishedBy"] = dataPublishedBy
@@ -752,288 +760,271 @@ processing_distribution = "Income shares and thresholds by decile are obtained b
 
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables_lis = pd.DataFrame()
-j = 0
-
-for tab in range(len(merged_tables)):
-    for wel in range(len(lis_welfare)):
-        for eq in range(len(lis_equivalence_scales)):
-            # I need the original variables to not break the aggregations
-            # Mean
-            df_tables_lis.loc[
-                j, "name"
-            ] = f"Mean {lis_welfare['welfare_type'][wel]} (LIS data)"
-            df_tables_lis.loc[
-                j, "slug"
-            ] = f"mean_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-            df_tables_lis.loc[j, "description"] = new_line.join(
-                [
-                    f"Mean {lis_welfare['welfare_type'][wel]}.",
-                    lis_welfare["description"][wel],
-                    lis_equivalence_scales["description"][eq],
-                    ppp_description,
-                    notes_title,
-                    processing_description,
-                    processing_gini_mean_median,
-                ]
-            )
-            df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables_lis.loc[j, "shortUnit"] = "$"
-            df_tables_lis.loc[j, "type"] = "Numeric"
-            df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare["scale_mean"][
-                wel
-            ]
-            df_tables_lis.loc[j, "colorScaleScheme"] = "BuGn"
-            df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-            j += 1
-
-            # Median
-            df_tables_lis.loc[
-                j, "name"
-            ] = f"Median {lis_welfare['welfare_type'][wel]} (LIS data)"
-            df_tables_lis.loc[
-                j, "slug"
-            ] = f"median_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-            df_tables_lis.loc[j, "description"] = new_line.join(
+df_tables_lis = expand_views(
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"wel": lis_welfare},
                 [
-                    f"The level of {lis_welfare['welfare_type'][wel]} below which half of the population falls.",
-                    lis_welfare["description"][wel],
-                    lis_equivalence_scales["description"][eq],
-                    ppp_description,
-                    notes_title,
-                    processing_description,
-                    processing_gini_mean_median,
-                ]
-            )
-            df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables_lis.loc[j, "shortUnit"] = "$"
-            df_tables_lis.loc[j, "type"] = "Numeric"
-            df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare["scale_median"][
-                wel
-            ]
-            df_tables_lis.loc[j, "colorScaleScheme"] = "Blues"
-            df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-            j += 1
-
-            # Thresholds - Deciles
-            for dec9 in range(len(lis_deciles9)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"{lis_deciles9['ordinal'][dec9].capitalize()} (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"thr_{lis_deciles9['lis_notation'][dec9]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The level of {lis_welfare['welfare_type'][wel]} below which {lis_deciles9['decile'][dec9]}0% of the population falls.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_distribution,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles9[
-                #     "scale_thr"
-                # ][dec9]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "Purples"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Averages - Deciles
-            for dec10 in range(len(lis_deciles10)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"{lis_deciles10['ordinal'][dec10].capitalize()} (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"avg_{lis_deciles10['lis_notation'][dec10]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The mean {lis_welfare['welfare_type'][wel]} within the {lis_deciles10['ordinal'][dec10]} (tenth of the population).",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_distribution,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles10[
-                #     "scale_avg"
-                # ][dec10]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "Greens"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Shares - Deciles
-            for dec10 in range(len(lis_deciles10)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"{lis_deciles10['ordinal'][dec10].capitalize()} (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"share_{lis_deciles10['lis_notation'][dec10]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The share of {lis_welfare['welfare_type'][wel]} received by the {lis_deciles10['ordinal'][dec10]} (tenth of the population).",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_distribution,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "%"
-                df_tables_lis.loc[j, "shortUnit"] = "%"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles10[
-                #     "scale_share"
-                # ][dec10]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "OrRd"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Daily, monthly, annual aggregations
-            for agg in range(len(lis_income_aggregation)):
-                # Mean
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Mean {lis_welfare['welfare_type'][wel]} (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"mean_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}{lis_income_aggregation['slug_suffix'][agg]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"Mean {lis_welfare['welfare_type'][wel]}.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_gini_mean_median,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare[
-                #     "scale_mean"
-                # ][wel]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "BuGn"
-                df_tables_lis.loc[
-                    j, "transform"
-                ] = f"multiplyBy mean_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]} {lis_income_aggregation['multiplier'][agg]}"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-                # Median
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Median {lis_welfare['welfare_type'][wel]} (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"median_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}{lis_income_aggregation['slug_suffix'][agg]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The level of {lis_welfare['welfare_type'][wel]} below which half of the population falls.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_gini_mean_median,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare[
-                #     "scale_median"
-                # ][wel]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "Blues"
-                df_tables_lis.loc[
-                    j, "transform"
-                ] = f"multiplyBy median_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]} {lis_income_aggregation['multiplier'][agg]}"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-                # Thresholds - Deciles
-                for dec9 in range(len(lis_deciles9)):
-                    df_tables_lis.loc[
-                        j, "name"
-                    ] = f"{lis_deciles9['ordinal'][dec9].capitalize()} (LIS data)"
-                    df_tables_lis.loc[
-                        j, "slug"
-                    ] = f"thr_{lis_deciles9['lis_notation'][dec9]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}{lis_income_aggregation['slug_suffix'][agg]}"
-                    df_tables_lis.loc[j, "description"] = new_line.join(
+                    Each(
+                        {"eq": lis_equivalence_scales},
                         [
-                            f"The level of {lis_welfare['welfare_type'][wel]} below which {lis_deciles9['decile'][dec9]}0% of the population falls.",
-                            lis_welfare["description"][wel],
-                            lis_equivalence_scales["description"][eq],
-                            ppp_description,
-                            notes_title,
-                            processing_description,
-                            processing_distribution,
-                        ]
+                            # I need the original variables to not break the aggregations
+                            # Mean
+                            {
+                                "name": "Mean ${wel__welfare_type} (LIS data)",
+                                "slug": "mean_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "Mean ${wel__welfare_type}.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(ppp_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_gini_mean_median),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_mean"),
+                                "colorScaleScheme": "BuGn",
+                                "equivalized": Column("eq__text"),
+                            },
+                            # Median
+                            {
+                                "name": "Median ${wel__welfare_type} (LIS data)",
+                                "slug": "median_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${wel__welfare_type} below which half of the population falls.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(ppp_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_gini_mean_median),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_median"),
+                                "colorScaleScheme": "Blues",
+                                "equivalized": Column("eq__text"),
+                            },
+                            # Thresholds - Deciles
+                            Each(
+                                {"dec9": lis_deciles9},
+                                [
+                                    {
+                                        "name": "${dec9__ordinal_capitalized} (LIS data)",
+                                        "slug": "thr_${dec9__lis_notation}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The level of ${wel__welfare_type} below which ${dec9__decile}0% of the population falls.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_distribution),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles9[
+                                        #     "scale_thr"
+                                        # ][dec9]
+                                        "colorScaleScheme": "Purples",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Averages - Deciles
+                            Each(
+                                {"dec10": lis_deciles10},
+                                [
+                                    {
+                                        "name": "${dec10__ordinal_capitalized} (LIS data)",
+                                        "slug": "avg_${dec10__lis_notation}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The mean ${wel__welfare_type} within the ${dec10__ordinal} (tenth of the population).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_distribution),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles10[
+                                        #     "scale_avg"
+                                        # ][dec10]
+                                        "colorScaleScheme": "Greens",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Shares - Deciles
+                            Each(
+                                {"dec10": lis_deciles10},
+                                [
+                                    {
+                                        "name": "${dec10__ordinal_capitalized} (LIS data)",
+                                        "slug": "share_${dec10__lis_notation}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The share of ${wel__welfare_type} received by the ${dec10__ordinal} (tenth of the population).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_distribution),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles10[
+                                        #     "scale_share"
+                                        # ][dec10]
+                                        "colorScaleScheme": "OrRd",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Daily, monthly, annual aggregations
+                            Each(
+                                {"agg": lis_income_aggregation},
+                                [
+                                    # Mean
+                                    {
+                                        "name": "Mean ${wel__welfare_type} (LIS data)",
+                                        "slug": "mean_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "Mean ${wel__welfare_type}.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_gini_mean_median),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare[
+                                        #     "scale_mean"
+                                        # ][wel]
+                                        "colorScaleScheme": "BuGn",
+                                        "transform": "multiplyBy mean_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                        "equivalized": Column("eq__text"),
+                                    },
+                                    # Median
+                                    {
+                                        "name": "Median ${wel__welfare_type} (LIS data)",
+                                        "slug": "median_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The level of ${wel__welfare_type} below which half of the population falls.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_gini_mean_median),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare[
+                                        #     "scale_median"
+                                        # ][wel]
+                                        "colorScaleScheme": "Blues",
+                                        "transform": "multiplyBy median_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                        "equivalized": Column("eq__text"),
+                                    },
+                                    # Thresholds - Deciles
+                                    Each(
+                                        {"dec9": lis_deciles9},
+                                        [
+                                            {
+                                                "name": "${dec9__ordinal_capitalized} (LIS data)",
+                                                "slug": "thr_${dec9__lis_notation}_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                                "description": new_line.join(
+                                                    [
+                                                        "The level of ${wel__welfare_type} below which ${dec9__decile}0% of the population falls.",
+                                                        "${wel__description}",
+                                                        "${eq__description}",
+                                                        escape(ppp_description),
+                                                        escape(notes_title),
+                                                        escape(processing_description),
+                                                        escape(processing_distribution),
+                                                    ]
+                                                ),
+                                                "unit": "international-$$ in 2017 prices",
+                                                "shortUnit": "$$",
+                                                "type": "Numeric",
+                                                # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles9[
+                                                #     "scale_thr"
+                                                # ][dec9]
+                                                "colorScaleScheme": "Purples",
+                                                "transform": "multiplyBy thr_${dec9__lis_notation}_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                                "equivalized": Column("eq__text"),
+                                            }
+                                        ],
+                                    ),
+                                    # Averages - Deciles
+                                    Each(
+                                        {"dec10": lis_deciles10},
+                                        [
+                                            {
+                                                "name": "${dec10__ordinal_capitalized} (LIS data)",
+                                                "slug": "avg_${dec10__lis_notation}_${wel__slug}_${eq__slug}${agg__slug_suffix}",
+                                                "description": new_line.join(
+                                                    [
+                                                        "The mean ${wel__welfare_type} within the ${dec10__ordinal} (tenth of the population).",
+                                                        "${wel__description}",
+                                                        "${eq__description}",
+                                                        escape(ppp_description),
+                                                        escape(notes_title),
+                                                        escape(processing_description),
+                                                        escape(processing_distribution),
+                                                    ]
+                                                ),
+                                                "unit": "international-$$ in 2017 prices",
+                                                "shortUnit": "$$",
+                                                "type": "Numeric",
+                                                # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles10[
+                                                #     "scale_avg"
+                                                # ][dec10]
+                                                "colorScaleScheme": "Greens",
+                                                "transform": "multiplyBy avg_${dec10__lis_notation}_${wel__slug}_${eq__slug} ${agg__multiplier}",
+                                                "equivalized": Column("eq__text"),
+                                            }
+                                        ],
+                                    ),
+                                ],
+                            ),
+                        ],
                     )
-                    df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                    df_tables_lis.loc[j, "shortUnit"] = "$"
-                    df_tables_lis.loc[j, "type"] = "Numeric"
-                    # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles9[
-                    #     "scale_thr"
-                    # ][dec9]
-                    df_tables_lis.loc[j, "colorScaleScheme"] = "Purples"
-                    df_tables_lis.loc[
-                        j, "transform"
-                    ] = f"multiplyBy thr_{lis_deciles9['lis_notation'][dec9]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]} {lis_income_aggregation['multiplier'][agg]}"
-                    df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales[
-                        "text"
-                    ][eq]
-                    j += 1
-
-                # Averages - Deciles
-                for dec10 in range(len(lis_deciles10)):
-                    df_tables_lis.loc[
-                        j, "name"
-                    ] = f"{lis_deciles10['ordinal'][dec10].capitalize()} (LIS data)"
-                    df_tables_lis.loc[
-                        j, "slug"
-                    ] = f"avg_{lis_deciles10['lis_notation'][dec10]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}{lis_income_aggregation['slug_suffix'][agg]}"
-                    df_tables_lis.loc[j, "description"] = new_line.join(
-                        [
-                            f"The mean {lis_welfare['welfare_type'][wel]} within the {lis_deciles10['ordinal'][dec10]} (tenth of the population).",
-                            lis_welfare["description"][wel],
-                            lis_equivalence_scales["description"][eq],
-                            ppp_description,
-                            notes_title,
-                            processing_description,
-                            processing_distribution,
-                        ]
-                    )
-                    df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                    df_tables_lis.loc[j, "shortUnit"] = "$"
-                    df_tables_lis.loc[j, "type"] = "Numeric"
-                    # df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_deciles10[
-                    #     "scale_avg"
-                    # ][dec10]
-                    df_tables_lis.loc[j, "colorScaleScheme"] = "Greens"
-                    df_tables_lis.loc[
-                        j, "transform"
-                    ] = f"multiplyBy avg_{lis_deciles10['lis_notation'][dec10]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]} {lis_income_aggregation['multiplier'][agg]}"
-                    df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales[
-                        "text"
-                    ][eq]
-                    j += 1
-
-    df_tables_lis["tableSlug"] = merged_tables["name"][tab]
+                ],
+            )
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables_lis["sourceName"] = sourceName
 df_tables_lis["dataPublishedBy"] = dataPublishedBy
@@ -1068,136 +1059,131 @@ selectedFacetStrategy = "entity"
 hasMapTab = "false"
 tab_parameter = "chart"
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(merged_tables)):
-    for view in range(len(source_checkbox)):
-        for agg in range(len(lis_income_aggregation)):
-            # Mean
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean income per {lis_income_aggregation['aggregation'][agg]} ({source_checkbox['type_title'][view]})"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["mean"][view].replace(
-                "{agg}", lis_income_aggregation["slug_suffix"][agg]
-            )
-            df_graphers.loc[j, "Indicator Dropdown"] = "Mean income or consumption"
-            df_graphers.loc[j, "Decile Dropdown"] = np.nan
-            df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox[
-                "type_title"
-            ][view].capitalize()
-            df_graphers.loc[j, "Period Radio"] = lis_income_aggregation["aggregation"][
-                agg
-            ].capitalize()
-            df_graphers.loc[j, "hideRelativeToggle"] = "false"
-            df_graphers.loc[j, "subtitle"] = f"{source_checkbox['note'][view]}"
-            df_graphers.loc[j, "note"] = f"{source_checkbox['note_ppp'][view]}"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Median
-            df_graphers.loc[
-                j, "title"
-            ] = f"Median income per {lis_income_aggregation['aggregation'][agg]} ({source_checkbox['type_title'][view]})"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["median"][view].replace(
-                "{agg}", lis_income_aggregation["slug_suffix"][agg]
-            )
-            df_graphers.loc[j, "Indicator Dropdown"] = "Median income or consumption"
-            df_graphers.loc[j, "Decile Dropdown"] = np.nan
-            df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox[
-                "type_title"
-            ][view].capitalize()
-            df_graphers.loc[j, "Period Radio"] = lis_income_aggregation["aggregation"][
-                agg
-            ].capitalize()
-            df_graphers.loc[j, "hideRelativeToggle"] = "false"
-            df_graphers.loc[j, "subtitle"] = f"{source_checkbox['note'][view]}"
-            df_graphers.loc[j, "note"] = f"{source_checkbox['note_ppp'][view]}"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Thresholds - Deciles
-            for dec9 in range(len(deciles9)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Threshold income marking the {deciles9['ordinal'][dec9]} ({source_checkbox['type_title'][view]})"
-                df_graphers.loc[j, "ySlugs"] = (
-                    source_checkbox["thr"][view]
-                    .replace("{agg}", lis_income_aggregation["slug_suffix"][agg])
-                    .replace("{dec9_pip}", deciles9["decile"][dec9])
-                    .replace("{dec9_wid}", deciles9["wid_notation"][dec9])
-                    .replace("{dec9_lis}", deciles9["lis_notation"][dec9])
-                )
-                df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-                df_graphers.loc[j, "Decile Dropdown"] = deciles9["dropdown"][dec9]
-                df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox[
-                    "type_title"
-                ][view].capitalize()
-                df_graphers.loc[j, "Period Radio"] = lis_income_aggregation[
-                    "aggregation"
-                ][agg].capitalize()
-                df_graphers.loc[j, "hideRelativeToggle"] = "false"
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The level of income per {lis_income_aggregation['aggregation'][agg]} below which {deciles9['decile'][dec9]}0% of the population falls. {source_checkbox['note'][view]}"
-                df_graphers.loc[j, "note"] = f"{source_checkbox['note_ppp'][view]}"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-            # Averages - Deciles
-            for dec10 in range(len(deciles10)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Mean income within the {deciles10['ordinal'][dec10]} ({source_checkbox['type_title'][view]})"
-                df_graphers.loc[j, "ySlugs"] = (
-                    source_checkbox["avg"][view]
-                    .replace("{agg}", lis_income_aggregation["slug_suffix"][agg])
-                    .replace("{dec10_pip}", deciles10["decile"][dec10])
-                    .replace("{dec10_wid}", deciles10["wid_notation"][dec10])
-                    .replace("{dec10_lis}", deciles10["lis_notation"][dec10])
-                )
-                df_graphers.loc[
-                    j, "Indicator Dropdown"
-                ] = "Mean income or consumption, by decile"
-                df_graphers.loc[j, "Decile Dropdown"] = deciles10["dropdown"][dec10]
-                df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox[
-                    "type_title"
-                ][view].capitalize()
-                df_graphers.loc[j, "Period Radio"] = lis_income_aggregation[
-                    "aggregation"
-                ][agg].capitalize()
-                df_graphers.loc[j, "hideRelativeToggle"] = "false"
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The mean income per {lis_income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (tenth of the population). {source_checkbox['note'][view]}"
-                df_graphers.loc[j, "note"] = f"{source_checkbox['note_ppp'][view]}"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-        # Shares - Deciles
-        for dec10 in range(len(deciles10)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"Income share of the {deciles10['ordinal'][dec10]} ({source_checkbox['type_title'][view]})"
-            df_graphers.loc[j, "ySlugs"] = (
-                source_checkbox["share"][view]
-                .replace("{dec10_pip}", deciles10["decile"][dec10])
-                .replace("{dec10_wid}", deciles10["wid_notation"][dec10])
-                .replace("{dec10_lis}", deciles10["lis_notation"][dec10])
+# The slugs in source_checkbox have placeholders for the income aggregation and the deciles: turn them into templates over the dimensions of the views
+slug_placeholders = {
+    "{agg}": "${agg__slug_suffix}",
+    "{dec9_pip}": "${dec9__decile}",
+    "{dec9_wid}": "${dec9__wid_notation}",
+    "{dec9_lis}": "${dec9__lis_notation}",
+    "{dec10_pip}": "${dec10__decile}",
+    "{dec10_wid}": "${dec10__wid_notation}",
+    "{dec10_lis}": "${dec10__lis_notation}",
+}
+for column in ["mean", "median", "thr", "avg", "share"]:
+    slugs = source_checkbox[column].str.replace("$", "$$", regex=False)
+    for placeholder, template in slug_placeholders.items():
+        slugs = slugs.str.replace(placeholder, template, regex=False)
+    source_checkbox[column] = slugs
+
+df_graphers = expand_views(
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"view": source_checkbox},
+                [
+                    Each(
+                        {"agg": lis_income_aggregation},
+                        [
+                            # Mean
+                            {
+                                "title": "Mean income per ${agg__aggregation} (${view__type_title})",
+                                "ySlugs": TemplateColumn("view__mean"),
+                                "Indicator Dropdown": "Mean income or consumption",
+                                "Decile Dropdown": np.nan,
+                                "Income measure Dropdown": Column(
+                                    "view__type_title_capitalized"
+                                ),
+                                "Period Radio": Column("agg__aggregation_capitalized"),
+                                "hideRelativeToggle": "false",
+                                "subtitle": "${view__note}",
+                                "note": "${view__note_ppp}",
+                                "yScaleToggle": "true",
+                            },
+                            # Median
+                            {
+                                "title": "Median income per ${agg__aggregation} (${view__type_title})",
+                                "ySlugs": TemplateColumn("view__median"),
+                                "Indicator Dropdown": "Median income or consumption",
+                                "Decile Dropdown": np.nan,
+                                "Income measure Dropdown": Column(
+                                    "view__type_title_capitalized"
+                                ),
+                                "Period Radio": Column("agg__aggregation_capitalized"),
+                                "hideRelativeToggle": "false",
+                                "subtitle": "${view__note}",
+                                "note": "${view__note_ppp}",
+                                "yScaleToggle": "true",
+                            },
+                            # Thresholds - Deciles
+                            Each(
+                                {"dec9": deciles9},
+                                [
+                                    {
+                                        "title": "Threshold income marking the ${dec9__ordinal} (${view__type_title})",
+                                        "ySlugs": TemplateColumn("view__thr"),
+                                        "Indicator Dropdown": "Decile thresholds",
+                                        "Decile Dropdown": Column("dec9__dropdown"),
+                                        "Income measure Dropdown": Column(
+                                            "view__type_title_capitalized"
+                                        ),
+                                        "Period Radio": Column(
+                                            "agg__aggregation_capitalized"
+                                        ),
+                                        "hideRelativeToggle": "false",
+                                        "subtitle": "The level of income per ${agg__aggregation} below which ${dec9__decile}0% of the population falls. ${view__note}",
+                                        "note": "${view__note_ppp}",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                            # Averages - Deciles
+                            Each(
+                                {"dec10": deciles10},
+                                [
+                                    {
+                                        "title": "Mean income within the ${dec10__ordinal} (${view__type_title})",
+                                        "ySlugs": TemplateColumn("view__avg"),
+                                        "Indicator Dropdown": "Mean income or consumption, by decile",
+                                        "Decile Dropdown": Column("dec10__dropdown"),
+                                        "Income measure Dropdown": Column(
+                                            "view__type_title_capitalized"
+                                        ),
+                                        "Period Radio": Column(
+                                            "agg__aggregation_capitalized"
+                                        ),
+                                        "hideRelativeToggle": "false",
+                                        "subtitle": "The mean income per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population). ${view__note}",
+                                        "note": "${view__note_ppp}",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                        ],
+                    ),
+                    # Shares - Deciles
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            {
+                                "title": "Income share of the ${dec10__ordinal} (${view__type_title})",
+                                "ySlugs": TemplateColumn("view__share"),
+                                "Indicator Dropdown": "Decile shares",
+                                "Decile Dropdown": Column("dec10__dropdown"),
+                                "Income measure Dropdown": Column(
+                                    "view__type_title_capitalized"
+                                ),
+                                "subtitle": "The share of income received by the ${dec10__ordinal}. ${view__note}",
+                                "note": np.nan,
+                            }
+                        ],
+                    ),
+                ],
             )
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-            df_graphers.loc[j, "Decile Dropdown"] = deciles10["dropdown"][dec10]
-            df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox[
-                "type_title"
-            ][view].capitalize()
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of income received by the {deciles10['ordinal'][dec10]}. {source_checkbox['note'][view]}"
-            df_graphers.loc[j, "note"] = np.nan
-            j += 1
-
-    df_graphers["tableSlug"] = merged_tables["name"][tab]
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # Add yAxisMin and mapTargetTime
 df_graphers["yAxisMin"] = yAxisMin
@@ -1221,12 +1207,14 @@ df_graphers["relatedQuestionUrl"] = np.nan
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Indicator Dropdown"] == "Mean income or consumption")
-    & (df_graphers["Income measure Dropdown"] == "After tax")
-    & (df_graphers["Period Radio"] == "Year"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Indicator Dropdown": "Mean income or consumption",
+        "Income measure Dropdown": "After tax",
+        "Period Radio": "Year",
+    },
+)
 
 # Reorder dropdown menus
 # Decile dropdown
@@ -1290,32 +1278,23 @@ df_graphers = df_graphers.drop(columns=["metric_dropdown_aux", "decile_dropdown_
 # Define list of variables to iterate: table names (from table dataframe)
 table_list = list(df_tables["tableSlug"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in table_list:
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tab].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tab]
         f.write(
             "\ntable\t"
             + merged_tables.loc[merged_tables["name"] == tab, "link"].item()
             + "\t"
             + tab
         )
-        f.write("\ncolumns\t" + tab + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tab + "\n")
+        write_frame(f, table_tsv, index=False)
@@ -2,7 +2,7 @@
 # # Source-switching Inequality Data Explorer
 # This code creates the tsv file for the main inequality explorer in the inequality topic page, available [here](https://owid.cloud/admin/explorers/preview/inequality)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,16 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "inequality.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "inequality.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -24,8 +33,7 @@ sheet_id = "1wcFsNZCEn_6SJ05BFkXKLUyvCrnigfR8eeemGKgAYsI"
 
 # All the tables sheet (this contains PIP, WID and LIS dataset information)
 sheet_name = "all_the_tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-all_the_tables = pd.read_csv(url, keep_default_na=False)
+all_the_tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # NOTE: We decided to drop LIS from the main inequality explorer
 
@@ -35,13 +43,11 @@ sheet_id = "18T5IGnpyJwb8KL9USYvME6IaLEcYIo26ioHCpkDnwRQ"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-wid_welfare = pd.read_csv(url, keep_default_na=False)
+wid_welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Tables sheet
 sheet_name = "tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-wid_tables = pd.read_csv(url, keep_default_na=False)
+wid_tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # WORLD BANK POVERTY AND INEQUALITY PLATFORM
 # Read Google sheets
@@ -49,13 +55,11 @@ sheet_id = "17KJ9YcvfdmO_7-Sv2Ij0vmzAQI6rXSIqHfJtgFHN-a8"
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_povlines_rel = pd.read_csv(url)
+pip_povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # Survey type sheet
 sheet_name = "table"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_tables = pd.read_csv(url)
+pip_tables = read_sheet(sheet_id, sheet_name)
 
 # %% [markdown]
 # ## Header
@@ -122,135 +126,137 @@ processing_description = new_line.join(
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
 # Table generation
-df_tables_pip = pd.DataFrame()
-j = 0
-
-for survey in range(len(pip_tables)):
-    # Define country as entityName
-    df_tables_pip.loc[j, "name"] = "Country"
-    df_tables_pip.loc[j, "slug"] = "country"
-    df_tables_pip.loc[j, "type"] = "EntityName"
-    df_tables_pip.loc[j, "tableSlug"] = pip_tables["table_name"][survey]
-    j += 1
-
-    # Define year as Year
-    df_tables_pip.loc[j, "name"] = "Year"
-    df_tables_pip.loc[j, "slug"] = "year"
-    df_tables_pip.loc[j, "type"] = "Year"
-    df_tables_pip.loc[j, "tableSlug"] = pip_tables["table_name"][survey]
-    j += 1
-
-    # Gini coefficient
-    df_tables_pip.loc[j, "name"] = f"Gini coefficient (World Bank PIP)"
-    df_tables_pip.loc[j, "slug"] = f"gini"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = np.nan
-    df_tables_pip.loc[j, "shortUnit"] = np.nan
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[
-        j, "colorScaleNumericBins"
-    ] = "0.25;0.3;0.35;0.4;0.45;0.5;0.55;0.6"
-    df_tables_pip.loc[j, "colorScaleNumericMinValue"] = 1
-    df_tables_pip.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "Oranges"
-    df_tables_pip.loc[j, "tableSlug"] = pip_tables["table_name"][survey]
-    j += 1
-
-    # Share of the top 10%
-    df_tables_pip.loc[
-        j, "name"
-    ] = f"{pip_tables.text[survey].capitalize()} share of the richest 10% (World Bank PIP)"
-    df_tables_pip.loc[j, "slug"] = f"decile10_share"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            f"The share of after tax income or consumption received by the richest 10% of the population.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = "%"
-    df_tables_pip.loc[j, "shortUnit"] = "%"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "20;25;30;35;40;45;50"
-    df_tables_pip.loc[j, "colorScaleNumericMinValue"] = 100
-    df_tables_pip.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "OrRd"
-    df_tables_pip.loc[j, "tableSlug"] = pip_tables["table_name"][survey]
-    j += 1
-
-    # Share of the bottom 50%
-    df_tables_pip.loc[
-        j, "name"
-    ] = f"{pip_tables.text[survey].capitalize()} share of the poorest 50% (World Bank PIP)"
-    df_tables_pip.loc[j, "slug"] = f"bottom50_share"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            f"The share of after tax income or consumption received by the poorest 50% of the population.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = "%"
-    df_tables_pip.loc[j, "shortUnit"] = "%"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "15;20;25;30;35"
-    df_tables_pip.loc[j, "colorScaleNumericMinValue"] = 100
-    df_tables_pip.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "Blues"
-    df_tables_pip.loc[j, "tableSlug"] = pip_tables["table_name"][survey]
-    j += 1
-
-    # Palma ratio
-    df_tables_pip.loc[j, "name"] = f"Palma ratio (World Bank PIP)"
-    df_tables_pip.loc[j, "slug"] = f"palma_ratio"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = np.nan
-    df_tables_pip.loc[j, "shortUnit"] = np.nan
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "0.5;1;1.5;2;2.5;3;3.5;4;4.5;5;5.5"
-    df_tables_pip.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables_pip.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-    df_tables_pip.loc[j, "tableSlug"] = pip_tables["table_name"][survey]
-    j += 1
-
-    # Headcount ratio (rel)
-    df_tables_pip.loc[j, "name"] = f"Share in relative poverty (World Bank PIP)"
-    df_tables_pip.loc[j, "slug"] = f"headcount_ratio_50_median"
-    df_tables_pip.loc[j, "description"] = new_line.join(
+# Capitalized texts, for the start of names, titles and dropdown options
+pip_tables["text_capitalized"] = pip_tables["text"].str.capitalize()
+wid_welfare["welfare_type_capitalized"] = wid_welfare["welfare_type"].str.capitalize()
+
+df_tables_pip = expand_views(
+    Each(
+        {"survey": pip_tables},
         [
-            f"The share of population with after tax income or consumption below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
-            additional_description,
-            notes_title,
-            "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case 50% of the median – and then run a specific query on the PIP API to return the share of population below that line.",
-            processing_description,
-        ]
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+                "tableSlug": Column("survey__table_name"),
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+                "tableSlug": Column("survey__table_name"),
+            },
+            # Gini coefficient
+            {
+                "name": "Gini coefficient (World Bank PIP)",
+                "slug": "gini",
+                "description": new_line.join(
+                    [
+                        "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": np.nan,
+                "shortUnit": np.nan,
+                "type": "Numeric",
+                "colorScaleNumericBins": "0.25;0.3;0.35;0.4;0.45;0.5;0.55;0.6",
+                "colorScaleNumericMinValue": 1,
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Oranges",
+                "tableSlug": Column("survey__table_name"),
+            },
+            # Share of the top 10%
+            {
+                "name": "${survey__text_capitalized} share of the richest 10% (World Bank PIP)",
+                "slug": "decile10_share",
+                "description": new_line.join(
+                    [
+                        "The share of after tax income or consumption received by the richest 10% of the population.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "%",
+                "shortUnit": "%",
+                "type": "Numeric",
+                "colorScaleNumericBins": "20;25;30;35;40;45;50",
+                "colorScaleNumericMinValue": 100,
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "OrRd",
+                "tableSlug": Column("survey__table_name"),
+            },
+            # Share of the bottom 50%
+            {
+                "name": "${survey__text_capitalized} share of the poorest 50% (World Bank PIP)",
+                "slug": "bottom50_share",
+                "description": new_line.join(
+                    [
+                        "The share of after tax income or consumption received by the poorest 50% of the population.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "%",
+                "shortUnit": "%",
+                "type": "Numeric",
+                "colorScaleNumericBins": "15;20;25;30;35",
+                "colorScaleNumericMinValue": 100,
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Blues",
+                "tableSlug": Column("survey__table_name"),
+            },
+            # Palma ratio
+            {
+                "name": "Palma ratio (World Bank PIP)",
+                "slug": "palma_ratio",
+                "description": new_line.join(
+                    [
+                        "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": np.nan,
+                "shortUnit": np.nan,
+                "type": "Numeric",
+                "colorScaleNumericBins": "0.5;1;1.5;2;2.5;3;3.5;4;4.5;5;5.5",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "YlOrBr",
+                "tableSlug": Column("survey__table_name"),
+            },
+            # Headcount ratio (rel)
+            {
+                "name": "Share in relative poverty (World Bank PIP)",
+                "slug": "headcount_ratio_50_median",
+                "description": new_line.join(
+                    [
+                        "The share of population with after tax income or consumption below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case 50% of the median – and then run a specific query on the PIP API to return the share of population below that line.",
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "%",
+                "shortUnit": "%",
+                "type": "Numeric",
+                "colorScaleNumericBins": "3;6;9;12;15;18;21;24;27",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "YlOrBr",
+                "tableSlug": Column("survey__table_name"),
+            },
+        ],
     )
-    df_tables_pip.loc[j, "unit"] = "%"
-    df_tables_pip.loc[j, "shortUnit"] = "%"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "3;6;9;12;15;18;21;24;27"
-    df_tables_pip.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables_pip.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-    df_tables_pip.loc[j, "tableSlug"] = pip_tables["table_name"][survey]
-    j += 1
+)
 
 df_tables_pip["sourceName"] = sourceName
 df_tables_pip["dataPublishedBy"] = dataPublishedBy
@@ -277,154 +283,145 @@ additional_description = new_line.join(
 )
 ppp_description = "The data is measured in international-$ at 2022 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables_wid = pd.DataFrame()
-j = 0
-
-for tab in range(len(wid_tables)):
-    # Define country as entityName
-    df_tables_wid.loc[j, "name"] = "Country"
-    df_tables_wid.loc[j, "slug"] = "country"
-    df_tables_wid.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables_wid.loc[j, "name"] = "Year"
-    df_tables_wid.loc[j, "slug"] = "year"
-    df_tables_wid.loc[j, "type"] = "Year"
-    j += 1
-
-    for wel in range(len(wid_welfare)):
-        # Gini coefficient
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"Gini coefficient {wid_welfare['title'][wel]} (World Inequality Database)"
-        df_tables_wid.loc[j, "slug"] = f"p0p100_gini_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = np.nan
-        df_tables_wid.loc[j, "shortUnit"] = np.nan
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_gini"][wel]
-        df_tables_wid.loc[j, "colorScaleNumericMinValue"] = 1
-        df_tables_wid.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables_wid.loc[j, "colorScaleScheme"] = "Oranges"
-        j += 1
-
-        # Share of the top 10%
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the richest 10% {wid_welfare['title'][wel]} (World Inequality Database)"
-        df_tables_wid.loc[j, "slug"] = f"p90p100_share_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {wid_welfare['welfare_type'][wel]} received by the richest 10% of the population.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "%"
-        df_tables_wid.loc[j, "shortUnit"] = "%"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_top10"][wel]
-        df_tables_wid.loc[j, "colorScaleNumericMinValue"] = 100
-        df_tables_wid.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables_wid.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-        # Share of the top 1%
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the richest 1% {wid_welfare['title'][wel]} (World Inequality Database)"
-        df_tables_wid.loc[j, "slug"] = f"p99p100_share_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {wid_welfare['welfare_type'][wel]} received by the richest 1% of the population.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "%"
-        df_tables_wid.loc[j, "shortUnit"] = "%"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_top1"][wel]
-        df_tables_wid.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables_wid.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables_wid.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-        # Share of the top 0.1%
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the richest 0.1% {wid_welfare['title'][wel]} (World Inequality Database)"
-        df_tables_wid.loc[j, "slug"] = f"p99_9p100_share_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {wid_welfare['welfare_type'][wel]} received by the richest 0.1% of the population.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "%"
-        df_tables_wid.loc[j, "shortUnit"] = "%"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_top01"][wel]
-        df_tables_wid.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables_wid.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables_wid.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-        # Share of the bottom 50%
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the poorest 50% {wid_welfare['title'][wel]} (World Inequality Database)"
-        df_tables_wid.loc[j, "slug"] = f"p0p50_share_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {wid_welfare['welfare_type'][wel]} received by the poorest 50% of the population.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "%"
-        df_tables_wid.loc[j, "shortUnit"] = "%"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_bottom50"][
-            wel
-        ]
-        df_tables_wid.loc[j, "colorScaleNumericMinValue"] = 100
-        df_tables_wid.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables_wid.loc[j, "colorScaleScheme"] = "Blues"
-        j += 1
-
-        # Palma ratio
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"Palma ratio {wid_welfare['title'][wel]} (World Inequality Database)"
-        df_tables_wid.loc[j, "slug"] = f"palma_ratio_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = np.nan
-        df_tables_wid.loc[j, "shortUnit"] = np.nan
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare[
-            "scale_palma_ratio"
-        ][wel]
-        df_tables_wid.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables_wid.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables_wid.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    df_tables_wid["tableSlug"] = wid_tables["name"][tab]
+df_tables_wid = expand_views(
+    Each(
+        {"tab": wid_tables},
+        [
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            Each(
+                {"wel": wid_welfare},
+                [
+                    # Gini coefficient
+                    {
+                        "name": "Gini coefficient ${wel__title} (World Inequality Database)",
+                        "slug": "p0p100_gini_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_gini"),
+                        "colorScaleNumericMinValue": 1,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Oranges",
+                    },
+                    # Share of the top 10%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the richest 10% ${wel__title} (World Inequality Database)",
+                        "slug": "p90p100_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the richest 10% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_top10"),
+                        "colorScaleNumericMinValue": 100,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                    },
+                    # Share of the top 1%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the richest 1% ${wel__title} (World Inequality Database)",
+                        "slug": "p99p100_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the richest 1% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_top1"),
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                    },
+                    # Share of the top 0.1%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the richest 0.1% ${wel__title} (World Inequality Database)",
+                        "slug": "p99_9p100_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the richest 0.1% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_top01"),
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                    },
+                    # Share of the bottom 50%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the poorest 50% ${wel__title} (World Inequality Database)",
+                        "slug": "p0p50_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the poorest 50% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_bottom50"),
+                        "colorScaleNumericMinValue": 100,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Blues",
+                    },
+                    # Palma ratio
+                    {
+                        "name": "Palma ratio ${wel__title} (World Inequality Database)",
+                        "slug": "palma_ratio_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_palma_ratio"),
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrBr",
+                    },
+                ],
+            ),
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables_wid["sourceName"] = sourceName
 df_tables_wid["dataPublishedBy"] = dataPublishedBy
@@ -457,179 +454,150 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 yAxisMin = 0
 mapTargetTime = 2019
 
-df_graphers_wid = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(wid_tables)):
-    for wel in range(len(wid_welfare)):
-        # Gini coefficient
-        df_graphers_wid.loc[j, "title"] = f"Gini coefficient"
-        df_graphers_wid.loc[j, "ySlugs"] = f"p0p100_gini_{wid_welfare['slug'][wel]}"
-        df_graphers_wid.loc[
-            j, "Data Radio"
-        ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        df_graphers_wid.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-        df_graphers_wid.loc[
-            j, "subtitle"
-        ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. {wid_welfare['subtitle_ineq'][wel]}"
-        df_graphers_wid.loc[j, "note"] = wid_welfare["note"][wel]
-        df_graphers_wid.loc[j, "type"] = np.nan
-        df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        df_graphers_wid.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the top 10%
-        df_graphers_wid.loc[
-            j, "title"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the richest 10%"
-        df_graphers_wid.loc[j, "ySlugs"] = f"p90p100_share_{wid_welfare['slug'][wel]}"
-        df_graphers_wid.loc[
-            j, "Data Radio"
-        ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        df_graphers_wid.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-        df_graphers_wid.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the richest 10% of the population. {wid_welfare['subtitle'][wel]}"
-        df_graphers_wid.loc[j, "note"] = wid_welfare["note"][wel]
-        df_graphers_wid.loc[j, "type"] = np.nan
-        df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        df_graphers_wid.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the top 1%
-        df_graphers_wid.loc[
-            j, "title"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the richest 1%"
-        df_graphers_wid.loc[j, "ySlugs"] = f"p99p100_share_{wid_welfare['slug'][wel]}"
-        df_graphers_wid.loc[
-            j, "Data Radio"
-        ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        df_graphers_wid.loc[j, "Indicator Dropdown"] = "Share of the richest 1%"
-        df_graphers_wid.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the richest 1% of the population. {wid_welfare['subtitle'][wel]}"
-        df_graphers_wid.loc[j, "note"] = wid_welfare["note"][wel]
-        df_graphers_wid.loc[j, "type"] = np.nan
-        df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        df_graphers_wid.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the top 0.1%
-        df_graphers_wid.loc[
-            j, "title"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the richest 0.1%"
-        df_graphers_wid.loc[j, "ySlugs"] = f"p99_9p100_share_{wid_welfare['slug'][wel]}"
-        df_graphers_wid.loc[
-            j, "Data Radio"
-        ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        df_graphers_wid.loc[j, "Indicator Dropdown"] = "Share of the richest 0.1%"
-        df_graphers_wid.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the richest 0.1% of the population. {wid_welfare['subtitle'][wel]}"
-        df_graphers_wid.loc[j, "note"] = wid_welfare["note"][wel]
-        df_graphers_wid.loc[j, "type"] = np.nan
-        df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        df_graphers_wid.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the bottom 50%
-        df_graphers_wid.loc[
-            j, "title"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the poorest 50%"
-        df_graphers_wid.loc[j, "ySlugs"] = f"p0p50_share_{wid_welfare['slug'][wel]}"
-        df_graphers_wid.loc[
-            j, "Data Radio"
-        ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        df_graphers_wid.loc[j, "Indicator Dropdown"] = "Share of the poorest 50%"
-        df_graphers_wid.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the poorest 50% of the population. {wid_welfare['subtitle'][wel]}"
-        df_graphers_wid.loc[j, "note"] = wid_welfare["note"][wel]
-        df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        df_graphers_wid.loc[j, "tab"] = "map"
-        j += 1
-
-        # # P90/P10
-        # df_graphers_wid.loc[
-        #     j, "title"
-        # ] = f"P90/P10 ratio"
-        # df_graphers_wid.loc[j, "ySlugs"] = f"p90_p10_ratio_{wid_welfare['slug'][wel]}"
-        # df_graphers_wid.loc[
-        #     j, "Data Radio"
-        # ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        # df_graphers_wid.loc[j, "Indicator Dropdown"] = "P90/P10"
-        # df_graphers_wid.loc[
-        #     j, "subtitle"
-        # ] = f"P90 and P10 are the levels of {wid_welfare['welfare_type'][wel]} below which 90% and 10% of the population live, respectively. This variable gives the ratio of the two. It is a measure of inequality that indicates the gap between the richest and poorest tenth of the population. {wid_welfare['subtitle'][wel]}"
-        # df_graphers_wid.loc[j, "note"] = f"wid_welfare['note'][wel]"
-        # df_graphers_wid.loc[j, "type"] = np.nan
-        # df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        # df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        # df_graphers_wid.loc[j, "tab"] = "map"
-        # j += 1
-
-        # # P90/P50
-        # df_graphers_wid.loc[
-        #     j, "title"
-        # ] = f"P90/P50 ratio"
-        # df_graphers_wid.loc[j, "ySlugs"] = f"p90_p50_ratio_{wid_welfare['slug'][wel]}"
-        # df_graphers_wid.loc[
-        #     j, "Data Radio"
-        # ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        # df_graphers_wid.loc[j, "Indicator Dropdown"] = "P90/P50"
-        # df_graphers_wid.loc[
-        #     j, "subtitle"
-        # ] = f"The P90/P50 ratio measures the degree of inequality within the richest half of the population. A ratio of 2 means that someone just falling in the richest tenth of the population has twice the median {wid_welfare['welfare_type'][wel]}. {wid_welfare['subtitle'][wel]}"
-        # df_graphers_wid.loc[j, "note"] = f"{wid_welfare['note'][wel]}"
-        # df_graphers_wid.loc[j, "type"] = np.nan
-        # df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        # df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        # df_graphers_wid.loc[j, "tab"] = "map"
-        # j += 1
-
-        # # P50/P10
-        # df_graphers_wid.loc[
-        #     j, "title"
-        # ] = f"P50/P10 ratio"
-        # df_graphers_wid.loc[j, "ySlugs"] = f"p50_p10_ratio_{wid_welfare['slug'][wel]}"
-        # df_graphers_wid.loc[
-        #     j, "Data Radio"
-        # ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        # df_graphers_wid.loc[j, "Indicator Dropdown"] = "P50/P10"
-        # df_graphers_wid.loc[
-        #     j, "subtitle"
-        # ] = f"The P50/P10 ratio measures the degree of inequality within the poorest half of the population. A ratio of 2 means that the median {wid_welfare['welfare_type'][wel]} is two times higher than that of someone just falling in the poorest tenth of the population. {wid_welfare['subtitle'][wel]}"
-        # df_graphers_wid.loc[j, "note"] = f"{wid_welfare['note'][wel]}"
-        # df_graphers_wid.loc[j, "type"] = np.nan
-        # df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        # df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        # df_graphers_wid.loc[j, "tab"] = "map"
-        # j += 1
-
-        # # Palma ratio
-        df_graphers_wid.loc[j, "title"] = f"Palma ratio"
-        df_graphers_wid.loc[j, "ySlugs"] = f"palma_ratio_{wid_welfare['slug'][wel]}"
-        df_graphers_wid.loc[
-            j, "Data Radio"
-        ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
-        df_graphers_wid.loc[j, "Indicator Dropdown"] = "Palma ratio"
-        df_graphers_wid.loc[
-            j, "subtitle"
-        ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. {wid_welfare['subtitle_ineq'][wel]}"
-        df_graphers_wid.loc[j, "note"] = wid_welfare["note"][wel]
-        df_graphers_wid.loc[j, "type"] = np.nan
-        df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers_wid.loc[j, "hasMapTab"] = "true"
-        df_graphers_wid.loc[j, "tab"] = "map"
-        j += 1
-
-    df_graphers_wid["tableSlug"] = wid_tables["name"][tab]
+df_graphers_wid = expand_views(
+    Each(
+        {"tab": wid_tables},
+        [
+            Each(
+                {"wel": wid_welfare},
+                [
+                    # Gini coefficient
+                    {
+                        "title": "Gini coefficient",
+                        "ySlugs": "p0p100_gini_${wel__slug}",
+                        "Data Radio": "${wel__radio_option} (${tab__source_name})",
+                        "Indicator Dropdown": "Gini coefficient",
+                        "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. ${wel__subtitle_ineq}",
+                        "note": Column("wel__note"),
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the top 10%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the richest 10%",
+                        "ySlugs": "p90p100_share_${wel__slug}",
+                        "Data Radio": "${wel__radio_option} (${tab__source_name})",
+                        "Indicator Dropdown": "Share of the richest 10%",
+                        "subtitle": "The share of income received by the richest 10% of the population. ${wel__subtitle}",
+                        "note": Column("wel__note"),
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the top 1%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the richest 1%",
+                        "ySlugs": "p99p100_share_${wel__slug}",
+                        "Data Radio": "${wel__radio_option} (${tab__source_name})",
+                        "Indicator Dropdown": "Share of the richest 1%",
+                        "subtitle": "The share of income received by the richest 1% of the population. ${wel__subtitle}",
+                        "note": Column("wel__note"),
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the top 0.1%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the richest 0.1%",
+                        "ySlugs": "p99_9p100_share_${wel__slug}",
+                        "Data Radio": "${wel__radio_option} (${tab__source_name})",
+                        "Indicator Dropdown": "Share of the richest 0.1%",
+                        "subtitle": "The share of income received by the richest 0.1% of the population. ${wel__subtitle}",
+                        "note": Column("wel__note"),
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the bottom 50%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the poorest 50%",
+                        "ySlugs": "p0p50_share_${wel__slug}",
+                        "Data Radio": "${wel__radio_option} (${tab__source_name})",
+                        "Indicator Dropdown": "Share of the poorest 50%",
+                        "subtitle": "The share of income received by the poorest 50% of the population. ${wel__subtitle}",
+                        "note": Column("wel__note"),
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # # P90/P10
+                    # df_graphers_wid.loc[
+                    #     j, "title"
+                    # ] = f"P90/P10 ratio"
+                    # df_graphers_wid.loc[j, "ySlugs"] = f"p90_p10_ratio_{wid_welfare['slug'][wel]}"
+                    # df_graphers_wid.loc[
+                    #     j, "Data Radio"
+                    # ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
+                    # df_graphers_wid.loc[j, "Indicator Dropdown"] = "P90/P10"
+                    # df_graphers_wid.loc[
+                    #     j, "subtitle"
+                    # ] = f"P90 and P10 are the levels of {wid_welfare['welfare_type'][wel]} below which 90% and 10% of the population live, respectively. This variable gives the ratio of the two. It is a measure of inequality that indicates the gap between the richest and poorest tenth of the population. {wid_welfare['subtitle'][wel]}"
+                    # df_graphers_wid.loc[j, "note"] = f"wid_welfare['note'][wel]"
+                    # df_graphers_wid.loc[j, "type"] = np.nan
+                    # df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
+                    # df_graphers_wid.loc[j, "hasMapTab"] = "true"
+                    # df_graphers_wid.loc[j, "tab"] = "map"
+                    # j += 1
+                    # # P90/P50
+                    # df_graphers_wid.loc[
+                    #     j, "title"
+                    # ] = f"P90/P50 ratio"
+                    # df_graphers_wid.loc[j, "ySlugs"] = f"p90_p50_ratio_{wid_welfare['slug'][wel]}"
+                    # df_graphers_wid.loc[
+                    #     j, "Data Radio"
+                    # ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
+                    # df_graphers_wid.loc[j, "Indicator Dropdown"] = "P90/P50"
+                    # df_graphers_wid.loc[
+                    #     j, "subtitle"
+                    # ] = f"The P90/P50 ratio measures the degree of inequality within the richest half of the population. A ratio of 2 means that someone just falling in the richest tenth of the population has twice the median {wid_welfare['welfare_type'][wel]}. {wid_welfare['subtitle'][wel]}"
+                    # df_graphers_wid.loc[j, "note"] = f"{wid_welfare['note'][wel]}"
+                    # df_graphers_wid.loc[j, "type"] = np.nan
+                    # df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
+                    # df_graphers_wid.loc[j, "hasMapTab"] = "true"
+                    # df_graphers_wid.loc[j, "tab"] = "map"
+                    # j += 1
+                    # # P50/P10
+                    # df_graphers_wid.loc[
+                    #     j, "title"
+                    # ] = f"P50/P10 ratio"
+                    # df_graphers_wid.loc[j, "ySlugs"] = f"p50_p10_ratio_{wid_welfare['slug'][wel]}"
+                    # df_graphers_wid.loc[
+                    #     j, "Data Radio"
+                    # ] = f"{wid_welfare['radio_option'][wel]} ({wid_tables['source_name'][tab]})"
+                    # df_graphers_wid.loc[j, "Indicator Dropdown"] = "P50/P10"
+                    # df_graphers_wid.loc[
+                    #     j, "subtitle"
+                    # ] = f"The P50/P10 ratio measures the degree of inequality within the poorest half of the population. A ratio of 2 means that the median {wid_welfare['welfare_type'][wel]} is two times higher than that of someone just falling in the poorest tenth of the population. {wid_welfare['subtitle'][wel]}"
+                    # df_graphers_wid.loc[j, "note"] = f"{wid_welfare['note'][wel]}"
+                    # df_graphers_wid.loc[j, "type"] = np.nan
+                    # df_graphers_wid.loc[j, "selectedFacetStrategy"] = np.nan
+                    # df_graphers_wid.loc[j, "hasMapTab"] = "true"
+                    # df_graphers_wid.loc[j, "tab"] = "map"
+                    # j += 1
+                    # # Palma ratio
+                    {
+                        "title": "Palma ratio",
+                        "ySlugs": "palma_ratio_${wel__slug}",
+                        "Data Radio": "${wel__radio_option} (${tab__source_name})",
+                        "Indicator Dropdown": "Palma ratio",
+                        "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. ${wel__subtitle_ineq}",
+                        "note": Column("wel__note"),
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                ],
+            )
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # Keep only pretax national values for WID:
 df_graphers_wid = df_graphers_wid[
@@ -647,170 +615,147 @@ df_graphers_wid["mapTargetTime"] = mapTargetTime
 yAxisMin = 0
 mapTargetTime = 2019
 
-df_graphers_pip = pd.DataFrame()
-
-j = 0
-
-for survey in range(len(pip_tables)):
-    # Gini coefficient
-    df_graphers_pip.loc[j, "title"] = f"Gini coefficient"
-    df_graphers_pip.loc[j, "ySlugs"] = f"gini"
-    df_graphers_pip.loc[
-        j, "Data Radio"
-    ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    df_graphers_pip.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-    df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    df_graphers_pip.loc[
-        j, "subtitle"
-    ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita."
-    df_graphers_pip.loc[j, "note"] = ""
-    df_graphers_pip.loc[j, "type"] = np.nan
-    df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    df_graphers_pip.loc[j, "tab"] = "map"
-    j += 1
-
-    # Share of the top 10%
-    df_graphers_pip.loc[
-        j, "title"
-    ] = f"{pip_tables.text[survey].capitalize()} share of the richest 10%"
-    df_graphers_pip.loc[j, "ySlugs"] = f"decile10_share"
-    df_graphers_pip.loc[
-        j, "Data Radio"
-    ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    df_graphers_pip.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-    df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    df_graphers_pip.loc[
-        j, "subtitle"
-    ] = f"The share of after tax income or consumption received by the richest 10% of the population."
-    df_graphers_pip.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita."
-    df_graphers_pip.loc[j, "type"] = np.nan
-    df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    df_graphers_pip.loc[j, "tab"] = "map"
-    j += 1
-
-    # Share of the bottom 50%
-    df_graphers_pip.loc[
-        j, "title"
-    ] = f"{pip_tables.text[survey].capitalize()} share of the poorest 50%"
-    df_graphers_pip.loc[j, "ySlugs"] = f"bottom50_share"
-    df_graphers_pip.loc[
-        j, "Data Radio"
-    ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    df_graphers_pip.loc[j, "Indicator Dropdown"] = "Share of the poorest 50%"
-    df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    df_graphers_pip.loc[
-        j, "subtitle"
-    ] = f"The share of after tax income or consumption received by the poorest 50% of the population."
-    df_graphers_pip.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita."
-    df_graphers_pip.loc[j, "type"] = np.nan
-    df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    df_graphers_pip.loc[j, "tab"] = "map"
-    j += 1
-
-    # # P90/P10
-    # df_graphers_pip.loc[j, "title"] = f"P90/P10 ratio"
-    # df_graphers_pip.loc[j, "ySlugs"] = f"p90_p10_ratio"
-    # df_graphers_pip.loc[
-    #     j, "Data Radio"
-    # ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    # df_graphers_pip.loc[j, "Indicator Dropdown"] = "P90/P10"
-    # df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    # df_graphers_pip.loc[
-    #     j, "subtitle"
-    # ] = f"P90 and P10 are the levels of {pip_tables.text[survey]} below which 90% and 10% of the population live, respectively. This variable gives the ratio of the two. It is a measure of inequality that indicates the gap between the richest and poorest tenth of the population."
-    # df_graphers_pip.loc[
-    #     j, "note"
-    # ] = f"Depending on the country and year, the data relates to disposable {pip_tables.text[survey]} per capita."
-    # df_graphers_pip.loc[j, "type"] = np.nan
-    # df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    # df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    # df_graphers_pip.loc[j, "tab"] = "map"
-    # j += 1
-
-    # # P90/P50
-    # df_graphers_pip.loc[j, "title"] = f"P90/P50 ratio"
-    # df_graphers_pip.loc[j, "ySlugs"] = f"p90_p50_ratio"
-    # df_graphers_pip.loc[
-    #     j, "Data Radio"
-    # ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    # df_graphers_pip.loc[j, "Indicator Dropdown"] = "P90/P50"
-    # df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    # df_graphers_pip.loc[
-    #     j, "subtitle"
-    # ] = f"The P90/P50 ratio measures the degree of inequality within the richest half of the population. A ratio of 2 means that someone just falling in the richest tenth of the population has twice the median {pip_tables.text[survey]}."
-    # df_graphers_pip.loc[
-    #     j, "note"
-    # ] = f"Depending on the country and year, the data relates to disposable {pip_tables.text[survey]} per capita."
-    # df_graphers_pip.loc[j, "type"] = np.nan
-    # df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    # df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    # df_graphers_pip.loc[j, "tab"] = "map"
-    # j += 1
-
-    # # P50/P10
-    # df_graphers_pip.loc[j, "title"] = f"P50/P10 ratio"
-    # df_graphers_pip.loc[j, "ySlugs"] = f"p50_p10_ratio"
-    # df_graphers_pip.loc[
-    #     j, "Data Radio"
-    # ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    # df_graphers_pip.loc[j, "Indicator Dropdown"] = "P50/P10"
-    # df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    # df_graphers_pip.loc[
-    #     j, "subtitle"
-    # ] = f"The P50/P10 ratio measures the degree of inequality within the poorest half of the population. A ratio of 2 means that the median {pip_tables.text[survey]} is two times higher than that of someone just falling in the poorest tenth of the population."
-    # df_graphers_pip.loc[
-    #     j, "note"
-    # ] = f"Depending on the country and year, the data relates to disposable {pip_tables.text[survey]} per capita."
-    # df_graphers_pip.loc[j, "type"] = np.nan
-    # df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    # df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    # df_graphers_pip.loc[j, "tab"] = "map"
-    # j += 1
-
-    # Palma ratio
-    df_graphers_pip.loc[j, "title"] = f"Palma ratio"
-    df_graphers_pip.loc[j, "ySlugs"] = f"palma_ratio"
-    df_graphers_pip.loc[
-        j, "Data Radio"
-    ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    df_graphers_pip.loc[j, "Indicator Dropdown"] = "Palma ratio"
-    df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    df_graphers_pip.loc[
-        j, "subtitle"
-    ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita."
-    df_graphers_pip.loc[j, "note"] = ""
-    df_graphers_pip.loc[j, "type"] = np.nan
-    df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    df_graphers_pip.loc[j, "tab"] = "map"
-    j += 1
-
-    # Headcount ratio (rel)
-    df_graphers_pip.loc[j, "title"] = "Share of people in relative poverty"
-    df_graphers_pip.loc[j, "ySlugs"] = f"headcount_ratio_50_median"
-    df_graphers_pip.loc[
-        j, "Data Radio"
-    ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
-    df_graphers_pip.loc[j, "Indicator Dropdown"] = f"Share in relative poverty"
-    df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
-    df_graphers_pip.loc[
-        j, "subtitle"
-    ] = f"The share of population with after tax income or consumption below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution."
-    df_graphers_pip.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita."
-    df_graphers_pip.loc[j, "type"] = np.nan
-    df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers_pip.loc[j, "hasMapTab"] = "true"
-    df_graphers_pip.loc[j, "tab"] = "map"
-    j += 1
+# The PIP views take the source name of the PIP table at the position of the last WID table (the index left by the WID loops)
+pip_data_radio = (
+    "${survey__dropdown_option} ("
+    + escape(pip_tables["source_name"][len(wid_tables) - 1])
+    + ")"
+)
+
+df_graphers_pip = expand_views(
+    Each(
+        {"survey": pip_tables},
+        [
+            # Gini coefficient
+            {
+                "title": "Gini coefficient",
+                "ySlugs": "gini",
+                "Data Radio": pip_data_radio,
+                "Indicator Dropdown": "Gini coefficient",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita.",
+                "note": "",
+                "type": np.nan,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+            },
+            # Share of the top 10%
+            {
+                "title": "${survey__text_capitalized} share of the richest 10%",
+                "ySlugs": "decile10_share",
+                "Data Radio": pip_data_radio,
+                "Indicator Dropdown": "Share of the richest 10%",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The share of after tax income or consumption received by the richest 10% of the population.",
+                "note": "Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita.",
+                "type": np.nan,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+            },
+            # Share of the bottom 50%
+            {
+                "title": "${survey__text_capitalized} share of the poorest 50%",
+                "ySlugs": "bottom50_share",
+                "Data Radio": pip_data_radio,
+                "Indicator Dropdown": "Share of the poorest 50%",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The share of after tax income or consumption received by the poorest 50% of the population.",
+                "note": "Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita.",
+                "type": np.nan,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+            },
+            # # P90/P10
+            # df_graphers_pip.loc[j, "title"] = f"P90/P10 ratio"
+            # df_graphers_pip.loc[j, "ySlugs"] = f"p90_p10_ratio"
+            # df_graphers_pip.loc[
+            #     j, "Data Radio"
+            # ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
+            # df_graphers_pip.loc[j, "Indicator Dropdown"] = "P90/P10"
+            # df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
+            # df_graphers_pip.loc[
+            #     j, "subtitle"
+            # ] = f"P90 and P10 are the levels of {pip_tables.text[survey]} below which 90% and 10% of the population live, respectively. This variable gives the ratio of the two. It is a measure of inequality that indicates the gap between the richest and poorest tenth of the population."
+            # df_graphers_pip.loc[
+            #     j, "note"
+            # ] = f"Depending on the country and year, the data relates to disposable {pip_tables.text[survey]} per capita."
+            # df_graphers_pip.loc[j, "type"] = np.nan
+            # df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
+            # df_graphers_pip.loc[j, "hasMapTab"] = "true"
+            # df_graphers_pip.loc[j, "tab"] = "map"
+            # j += 1
+            # # P90/P50
+            # df_graphers_pip.loc[j, "title"] = f"P90/P50 ratio"
+            # df_graphers_pip.loc[j, "ySlugs"] = f"p90_p50_ratio"
+            # df_graphers_pip.loc[
+            #     j, "Data Radio"
+            # ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
+            # df_graphers_pip.loc[j, "Indicator Dropdown"] = "P90/P50"
+            # df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
+            # df_graphers_pip.loc[
+            #     j, "subtitle"
+            # ] = f"The P90/P50 ratio measures the degree of inequality within the richest half of the population. A ratio of 2 means that someone just falling in the richest tenth of the population has twice the median {pip_tables.text[survey]}."
+            # df_graphers_pip.loc[
+            #     j, "note"
+            # ] = f"Depending on the country and year, the data relates to disposable {pip_tables.text[survey]} per capita."
+            # df_graphers_pip.loc[j, "type"] = np.nan
+            # df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
+            # df_graphers_pip.loc[j, "hasMapTab"] = "true"
+            # df_graphers_pip.loc[j, "tab"] = "map"
+            # j += 1
+            # # P50/P10
+            # df_graphers_pip.loc[j, "title"] = f"P50/P10 ratio"
+            # df_graphers_pip.loc[j, "ySlugs"] = f"p50_p10_ratio"
+            # df_graphers_pip.loc[
+            #     j, "Data Radio"
+            # ] = f"{pip_tables['dropdown_option'][survey]} ({pip_tables['source_name'][tab]})"
+            # df_graphers_pip.loc[j, "Indicator Dropdown"] = "P50/P10"
+            # df_graphers_pip.loc[j, "tableSlug"] = f"{pip_tables.table_name[survey]}"
+            # df_graphers_pip.loc[
+            #     j, "subtitle"
+            # ] = f"The P50/P10 ratio measures the degree of inequality within the poorest half of the population. A ratio of 2 means that the median {pip_tables.text[survey]} is two times higher than that of someone just falling in the poorest tenth of the population."
+            # df_graphers_pip.loc[
+            #     j, "note"
+            # ] = f"Depending on the country and year, the data relates to disposable {pip_tables.text[survey]} per capita."
+            # df_graphers_pip.loc[j, "type"] = np.nan
+            # df_graphers_pip.loc[j, "selectedFacetStrategy"] = np.nan
+            # df_graphers_pip.loc[j, "hasMapTab"] = "true"
+            # df_graphers_pip.loc[j, "tab"] = "map"
+            # j += 1
+            # Palma ratio
+            {
+                "title": "Palma ratio",
+                "ySlugs": "palma_ratio",
+                "Data Radio": pip_data_radio,
+                "Indicator Dropdown": "Palma ratio",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita.",
+                "note": "",
+                "type": np.nan,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+            },
+            # Headcount ratio (rel)
+            {
+                "title": "Share of people in relative poverty",
+                "ySlugs": "headcount_ratio_50_median",
+                "Data Radio": pip_data_radio,
+                "Indicator Dropdown": "Share in relative poverty",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The share of population with after tax income or consumption below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                "note": "Depending on the country and year, the data relates to income measured after taxes and benefits, or consumption, per capita.",
+                "type": np.nan,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+            },
+        ],
+    )
+)
 
 # Add yAxisMin and mapTargetTime
 df_graphers_pip["yAxisMin"] = yAxisMin
@@ -1053,11 +998,13 @@ df_graphers["relatedQuestionUrl"] = np.nan
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Data Radio"] == "World Inequality Database - Income before tax")
-    & (df_graphers["Indicator Dropdown"] == "Gini coefficient"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Data Radio": "Incomes before tax (World Inequality Database)",
+        "Indicator Dropdown": "Gini coefficient",
+    },
+)
 
 
 # %% [markdown]
@@ -1068,32 +1015,23 @@ df_graphers.loc[
 # Define list of variables to iterate: table names (from table dataframe)
 table_list = list(df_tables["tableSlug"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in table_list:
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tab].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tab]
         f.write(
             "\ntable\t"
             + all_the_tables.loc[all_the_tables["name"] == tab, "link"].item()
             + "\t"
             + tab
         )
-        f.write("\ncolumns\t" + tab + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tab + "\n")
+        write_frame(f, table_tsv, index=False)
@@ -2,7 +2,7 @@
 # # Inequality Data Explorer - Source Comparison
 # This code creates the tsv file for the inequality comparison explorer, available [here](https://owid.cloud/admin/explorers/preview/inequality-comparison)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,16 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "inequality-comparison.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "inequality-comparison.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -24,14 +33,15 @@ sheet_id = "1wcFsNZCEn_6SJ05BFkXKLUyvCrnigfR8eeemGKgAYsI"
 
 # Merged sheet (this contains PIP, WID and LIS dataset information together in one file)
 sheet_name = "merged_tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-merged_tables = pd.read_csv(url, keep_default_na=False)
+merged_tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Source checkbox covers all the possible combinations to get for the multi-source selector
 sheet_name = "source_checkbox"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-source_checkbox = pd.read_csv(
-    url, keep_default_na=False, dtype={"pip": "str", "wid": "str", "lis": "str"}
+source_checkbox = read_sheet(
+    sheet_id,
+    sheet_name,
+    keep_default_na=False,
+    dtype={"pip": "str", "wid": "str", "lis": "str"},
 )
 
 # Only get the combinations where all the sources are available (pre and post tax)
@@ -56,18 +66,15 @@ sheet_id = "1UFdwB1iBpP2tEP6GtxCHvW1GGhjsFflh42FWR80rYIg"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_welfare = pd.read_csv(url, keep_default_na=False)
+lis_welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Equivalence scales
 sheet_name = "equivalence_scales"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_equivalence_scales = pd.read_csv(url, keep_default_na=False)
+lis_equivalence_scales = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_povlines_rel = pd.read_csv(url)
+lis_povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # WORLD INEQUALITY DATABASE
 # Read Google sheets
@@ -75,8 +82,7 @@ sheet_id = "18T5IGnpyJwb8KL9USYvME6IaLEcYIo26ioHCpkDnwRQ"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-wid_welfare = pd.read_csv(url, keep_default_na=False)
+wid_welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # WORLD BANK POVERTY AND INEQUALITY PLATFORM
 # Read Google sheets
@@ -84,13 +90,11 @@ sheet_id = "17KJ9YcvfdmO_7-Sv2Ij0vmzAQI6rXSIqHfJtgFHN-a8"
 
 # Survey type sheet
 sheet_name = "table"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_tables = pd.read_csv(url)
+pip_tables = read_sheet(sheet_id, sheet_name)
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_povlines_rel = pd.read_csv(url)
+pip_povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # %% [markdown]
 # ## Header
@@ -159,118 +163,124 @@ processing_description = new_line.join(
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
 # Table generation
-df_tables_pip = pd.DataFrame()
-j = 0
-
-for tab in range(len(pip_tables)):
-    # Define country as entityName
-    df_tables_pip.loc[j, "name"] = "Country"
-    df_tables_pip.loc[j, "slug"] = "country"
-    df_tables_pip.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables_pip.loc[j, "name"] = "Year"
-    df_tables_pip.loc[j, "slug"] = "year"
-    df_tables_pip.loc[j, "type"] = "Year"
-    j += 1
-
-    # Gini coefficient
-    df_tables_pip.loc[j, "name"] = f"Gini coefficient (PIP data)"
-    df_tables_pip.loc[j, "slug"] = f"gini"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = np.nan
-    df_tables_pip.loc[j, "shortUnit"] = np.nan
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[
-        j, "colorScaleNumericBins"
-    ] = "0.25;0.3;0.35;0.4;0.45;0.5;0.55;0.6"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "Oranges"
-    j += 1
-
-    # Share of the top 10%
-    df_tables_pip.loc[
-        j, "name"
-    ] = f"{pip_tables.text[tab].capitalize()} share of the richest 10% (PIP data)"
-    df_tables_pip.loc[j, "slug"] = f"decile10_share"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            f"The share of after tax income or consumption received by the richest 10% of the population.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = "%"
-    df_tables_pip.loc[j, "shortUnit"] = "%"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "20;25;30;35;40;45;50"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "OrRd"
-    j += 1
-
-    # Share of the bottom 50%
-    df_tables_pip.loc[
-        j, "name"
-    ] = f"{pip_tables.text[tab].capitalize()} share of the poorest 50% (PIP data)"
-    df_tables_pip.loc[j, "slug"] = f"bottom50_share"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            f"The share of after tax income or consumption received by the poorest 50% of the population.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = "%"
-    df_tables_pip.loc[j, "shortUnit"] = "%"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "10;15;20;25;30;35"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "Blues"
-    j += 1
-
-    # Palma ratio
-    df_tables_pip.loc[j, "name"] = f"Palma ratio (PIP data)"
-    df_tables_pip.loc[j, "slug"] = f"palma_ratio"
-    df_tables_pip.loc[j, "description"] = new_line.join(
+# Capitalized texts, for the start of names, titles and dropdown options
+lis_welfare["welfare_type_capitalized"] = lis_welfare["welfare_type"].str.capitalize()
+pip_tables["text_capitalized"] = pip_tables["text"].str.capitalize()
+source_checkbox["type_title_capitalized"] = source_checkbox[
+    "type_title"
+].str.capitalize()
+wid_welfare["welfare_type_capitalized"] = wid_welfare["welfare_type"].str.capitalize()
+
+df_tables_pip = expand_views(
+    Each(
+        {"tab": pip_tables},
         [
-            f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables_pip.loc[j, "unit"] = np.nan
-    df_tables_pip.loc[j, "shortUnit"] = np.nan
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "0.5;1;1.5;2;2.5;3;3.5;4;4.5;5;5.5"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-    j += 1
-
-    # Headcount ratio (rel)
-    df_tables_pip.loc[j, "name"] = f"Share in relative poverty (PIP data)"
-    df_tables_pip.loc[j, "slug"] = f"headcount_ratio_50_median"
-    df_tables_pip.loc[j, "description"] = new_line.join(
-        [
-            f"The share of population with after tax income or consumption below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
-            additional_description,
-            notes_title,
-            "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case 50% of the median – and then run a specific query on the PIP API to return the share of population below that line.",
-            processing_description,
-        ]
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            # Gini coefficient
+            {
+                "name": "Gini coefficient (PIP data)",
+                "slug": "gini",
+                "description": new_line.join(
+                    [
+                        "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": np.nan,
+                "shortUnit": np.nan,
+                "type": "Numeric",
+                "colorScaleNumericBins": "0.25;0.3;0.35;0.4;0.45;0.5;0.55;0.6",
+                "colorScaleScheme": "Oranges",
+            },
+            # Share of the top 10%
+            {
+                "name": "${tab__text_capitalized} share of the richest 10% (PIP data)",
+                "slug": "decile10_share",
+                "description": new_line.join(
+                    [
+                        "The share of after tax income or consumption received by the richest 10% of the population.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "%",
+                "shortUnit": "%",
+                "type": "Numeric",
+                "colorScaleNumericBins": "20;25;30;35;40;45;50",
+                "colorScaleScheme": "OrRd",
+            },
+            # Share of the bottom 50%
+            {
+                "name": "${tab__text_capitalized} share of the poorest 50% (PIP data)",
+                "slug": "bottom50_share",
+                "description": new_line.join(
+                    [
+                        "The share of after tax income or consumption received by the poorest 50% of the population.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "%",
+                "shortUnit": "%",
+                "type": "Numeric",
+                "colorScaleNumericBins": "10;15;20;25;30;35",
+                "colorScaleScheme": "Blues",
+            },
+            # Palma ratio
+            {
+                "name": "Palma ratio (PIP data)",
+                "slug": "palma_ratio",
+                "description": new_line.join(
+                    [
+                        "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": np.nan,
+                "shortUnit": np.nan,
+                "type": "Numeric",
+                "colorScaleNumericBins": "0.5;1;1.5;2;2.5;3;3.5;4;4.5;5;5.5",
+                "colorScaleScheme": "YlOrBr",
+            },
+            # Headcount ratio (rel)
+            {
+                "name": "Share in relative poverty (PIP data)",
+                "slug": "headcount_ratio_50_median",
+                "description": new_line.join(
+                    [
+                        "The share of population with after tax income or consumption below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                        escape(additional_description),
+                        escape(notes_title),
+                        "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case 50% of the median – and then run a specific query on the PIP API to return the share of population below that line.",
+                        escape(processing_description),
+                    ]
+                ),
+                "unit": "%",
+                "shortUnit": "%",
+                "type": "Numeric",
+                "colorScaleNumericBins": "5;10;15;20;25;30",
+                "colorScaleScheme": "YlOrBr",
+            },
+        ],
     )
-    df_tables_pip.loc[j, "unit"] = "%"
-    df_tables_pip.loc[j, "shortUnit"] = "%"
-    df_tables_pip.loc[j, "type"] = "Numeric"
-    df_tables_pip.loc[j, "colorScaleNumericBins"] = "5;10;15;20;25;30"
-    df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-    j += 1
+)
 
 df_tables_pip["tableSlug"] = tableSlug
 df_tables_pip["sourceName"] = sourceName
@@ -302,88 +312,87 @@ additional_description = new_line.join(
 )
 ppp_description = "The data is measured in international-$ at 2022 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables_wid = pd.DataFrame()
-j = 0
-
-for tab in range(len(merged_tables)):
-    for wel in range(len(wid_welfare)):
-        # Gini coefficient
-        df_tables_wid.loc[j, "name"] = f"Gini coefficient (WID data)"
-        df_tables_wid.loc[j, "slug"] = f"p0p100_gini_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = np.nan
-        df_tables_wid.loc[j, "shortUnit"] = np.nan
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_gini"][wel]
-        df_tables_wid.loc[j, "colorScaleScheme"] = "Oranges"
-        j += 1
-
-        # Share of the top 10%
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the richest 10% (WID data)"
-        df_tables_wid.loc[j, "slug"] = f"p90p100_share_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {wid_welfare['welfare_type'][wel]} received by the richest 10% of the population.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "%"
-        df_tables_wid.loc[j, "shortUnit"] = "%"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_top10"][wel]
-        df_tables_wid.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-        # Share of the bottom 50%
-        df_tables_wid.loc[
-            j, "name"
-        ] = f"{wid_welfare['welfare_type'][wel].capitalize()} share of the poorest 50% (WID data)"
-        df_tables_wid.loc[j, "slug"] = f"p0p50_share_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {wid_welfare['welfare_type'][wel]} received by the poorest 50% of the population.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = "%"
-        df_tables_wid.loc[j, "shortUnit"] = "%"
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare["scale_bottom50"][
-            wel
-        ]
-        df_tables_wid.loc[j, "colorScaleScheme"] = "Blues"
-        j += 1
-
-        # Palma ratio
-        df_tables_wid.loc[j, "name"] = f"Palma ratio (WID data)"
-        df_tables_wid.loc[j, "slug"] = f"palma_ratio_{wid_welfare['slug'][wel]}"
-        df_tables_wid.loc[j, "description"] = new_line.join(
-            [
-                f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-                wid_welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables_wid.loc[j, "unit"] = np.nan
-        df_tables_wid.loc[j, "shortUnit"] = np.nan
-        df_tables_wid.loc[j, "type"] = "Numeric"
-        df_tables_wid.loc[j, "colorScaleNumericBins"] = wid_welfare[
-            "scale_palma_ratio"
-        ][wel]
-        df_tables_wid.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    df_tables_wid["tableSlug"] = merged_tables["name"][tab]
+df_tables_wid = expand_views(
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"wel": wid_welfare},
+                [
+                    # Gini coefficient
+                    {
+                        "name": "Gini coefficient (WID data)",
+                        "slug": "p0p100_gini_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_gini"),
+                        "colorScaleScheme": "Oranges",
+                    },
+                    # Share of the top 10%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the richest 10% (WID data)",
+                        "slug": "p90p100_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the richest 10% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_top10"),
+                        "colorScaleScheme": "OrRd",
+                    },
+                    # Share of the bottom 50%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the poorest 50% (WID data)",
+                        "slug": "p0p50_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the poorest 50% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_bottom50"),
+                        "colorScaleScheme": "Blues",
+                    },
+                    # Palma ratio
+                    {
+                        "name": "Palma ratio (WID data)",
+                        "slug": "palma_ratio_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_palma_ratio"),
+                        "colorScaleScheme": "YlOrBr",
+                    },
+                ],
+            )
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables_wid["sourceName"] = sourceName
 df_tables_wid["dataPublishedBy"] = dataPublishedBy
@@ -422,142 +431,133 @@ processing_distribution = "Income shares and thresholds by decile are obtained b
 
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables_lis = pd.DataFrame()
-j = 0
-
-for tab in range(len(merged_tables)):
-    for wel in range(len(lis_welfare)):
-        for eq in range(len(lis_equivalence_scales)):
-            # Gini coefficient
-            df_tables_lis.loc[j, "name"] = f"Gini coefficient (LIS data)"
-            df_tables_lis.loc[
-                j, "slug"
-            ] = f"gini_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-            df_tables_lis.loc[j, "description"] = new_line.join(
-                [
-                    f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-                    lis_welfare["description"][wel],
-                    lis_equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_gini_mean_median,
-                ]
-            )
-            df_tables_lis.loc[j, "unit"] = np.nan
-            df_tables_lis.loc[j, "shortUnit"] = np.nan
-            df_tables_lis.loc[j, "type"] = "Numeric"
-            df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare["scale_gini"][
-                wel
-            ]
-            df_tables_lis.loc[j, "colorScaleScheme"] = "Oranges"
-            df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-            j += 1
-
-            # Share of the top 10%
-            df_tables_lis.loc[
-                j, "name"
-            ] = f"{lis_welfare['welfare_type'][wel].capitalize()} share of the richest 10% (LIS data)"
-            df_tables_lis.loc[
-                j, "slug"
-            ] = f"share_p100_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-            df_tables_lis.loc[j, "description"] = new_line.join(
-                [
-                    f"The share of {lis_welfare['welfare_type'][wel]} received by the richest 10% of the population.",
-                    lis_welfare["description"][wel],
-                    lis_equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_distribution,
-                ]
-            )
-            df_tables_lis.loc[j, "unit"] = "%"
-            df_tables_lis.loc[j, "shortUnit"] = "%"
-            df_tables_lis.loc[j, "type"] = "Numeric"
-            df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare["scale_top10"][
-                wel
-            ]
-            df_tables_lis.loc[j, "colorScaleScheme"] = "OrRd"
-            df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-            j += 1
-
-            # Share of the bottom 50%
-            df_tables_lis.loc[
-                j, "name"
-            ] = f"{lis_welfare['welfare_type'][wel].capitalize()} share of the poorest 50% (LIS data)"
-            df_tables_lis.loc[
-                j, "slug"
-            ] = f"share_bottom50_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-            df_tables_lis.loc[j, "description"] = new_line.join(
-                [
-                    f"The share of {lis_welfare['welfare_type'][wel]} received by the poorest 50% of the population.",
-                    lis_welfare["description"][wel],
-                    lis_equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_distribution,
-                ]
-            )
-            df_tables_lis.loc[j, "unit"] = "%"
-            df_tables_lis.loc[j, "shortUnit"] = "%"
-            df_tables_lis.loc[j, "type"] = "Numeric"
-            df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare[
-                "scale_bottom50"
-            ][wel]
-            df_tables_lis.loc[j, "colorScaleScheme"] = "Blues"
-            df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-            j += 1
-
-            # Palma ratio
-            df_tables_lis.loc[j, "name"] = f"Palma ratio (LIS data)"
-            df_tables_lis.loc[
-                j, "slug"
-            ] = f"palma_ratio_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-            df_tables_lis.loc[j, "description"] = new_line.join(
-                [
-                    f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-                    lis_welfare["description"][wel],
-                    lis_equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_distribution,
-                ]
-            )
-            df_tables_lis.loc[j, "unit"] = np.nan
-            df_tables_lis.loc[j, "shortUnit"] = np.nan
-            df_tables_lis.loc[j, "type"] = "Numeric"
-            df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare[
-                "scale_palma_ratio"
-            ][wel]
-            df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-            df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-            j += 1
-
-            # Headcount ratio (rel)
-            df_tables_lis.loc[j, "name"] = f"Share in relative poverty (LIS data)"
-            df_tables_lis.loc[
-                j, "slug"
-            ] = f"headcount_ratio_50_median_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-            df_tables_lis.loc[j, "description"] = new_line.join(
+df_tables_lis = expand_views(
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"wel": lis_welfare},
                 [
-                    f"The share of the population with {lis_welfare['welfare_type'][wel]} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
-                    lis_welfare["description"][wel],
-                    lis_equivalence_scales["description"][eq],
-                    notes_title,
-                    processing_description,
-                    processing_poverty,
-                ]
+                    Each(
+                        {"eq": lis_equivalence_scales},
+                        [
+                            # Gini coefficient
+                            {
+                                "name": "Gini coefficient (LIS data)",
+                                "slug": "gini_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_gini_mean_median),
+                                    ]
+                                ),
+                                "unit": np.nan,
+                                "shortUnit": np.nan,
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_gini"),
+                                "colorScaleScheme": "Oranges",
+                                "equivalized": Column("eq__text"),
+                            },
+                            # Share of the top 10%
+                            {
+                                "name": "${wel__welfare_type_capitalized} share of the richest 10% (LIS data)",
+                                "slug": "share_p100_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of ${wel__welfare_type} received by the richest 10% of the population.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_distribution),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_top10"),
+                                "colorScaleScheme": "OrRd",
+                                "equivalized": Column("eq__text"),
+                            },
+                            # Share of the bottom 50%
+                            {
+                                "name": "${wel__welfare_type_capitalized} share of the poorest 50% (LIS data)",
+                                "slug": "share_bottom50_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of ${wel__welfare_type} received by the poorest 50% of the population.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_distribution),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column("wel__scale_bottom50"),
+                                "colorScaleScheme": "Blues",
+                                "equivalized": Column("eq__text"),
+                            },
+                            # Palma ratio
+                            {
+                                "name": "Palma ratio (LIS data)",
+                                "slug": "palma_ratio_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_distribution),
+                                    ]
+                                ),
+                                "unit": np.nan,
+                                "shortUnit": np.nan,
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "wel__scale_palma_ratio"
+                                ),
+                                "colorScaleScheme": "YlOrBr",
+                                "equivalized": Column("eq__text"),
+                            },
+                            # Headcount ratio (rel)
+                            {
+                                "name": "Share in relative poverty (LIS data)",
+                                "slug": "headcount_ratio_50_median_${wel__slug}_${eq__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of the population with ${wel__welfare_type} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                                        "${wel__description}",
+                                        "${eq__description}",
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                        escape(processing_poverty),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "wel__scale_relative_poverty"
+                                ),
+                                "colorScaleScheme": "YlOrBr",
+                                "equivalized": Column("eq__text"),
+                            },
+                        ],
+                    )
+                ],
             )
-            df_tables_lis.loc[j, "unit"] = "%"
-            df_tables_lis.loc[j, "shortUnit"] = "%"
-            df_tables_lis.loc[j, "type"] = "Numeric"
-            df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_welfare[
-                "scale_relative_poverty"
-            ][wel]
-            df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-            df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-            j += 1
-
-    df_tables_lis["tableSlug"] = merged_tables["name"][tab]
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables_lis["sourceName"] = sourceName
 df_tables_lis["dataPublishedBy"] = dataPublishedBy
@@ -595,92 +595,83 @@ datasets_description_subtitle = (
     "The definition of income varies across the data sources."
 )
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(merged_tables)):
-    for view in range(len(source_checkbox)):
-        # Gini coefficient
-        df_graphers.loc[
-            j, "title"
-        ] = f"Gini coefficient ({source_checkbox['type_title'][view]})"
-        df_graphers.loc[j, "ySlugs"] = source_checkbox["gini"][view]
-        df_graphers.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-        df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox["type_title"][
-            view
-        ].capitalize()
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. {datasets_description_subtitle}"
-        df_graphers.loc[j, "note"] = source_checkbox["note"][view]
-        df_graphers.loc[j, "type"] = np.nan
-        j += 1
-
-        # Share of the top 10%
-        df_graphers.loc[
-            j, "title"
-        ] = f"Income share of the richest 10% ({source_checkbox['type_title'][view]})"
-        df_graphers.loc[j, "ySlugs"] = source_checkbox["top10"][view]
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-        df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox["type_title"][
-            view
-        ].capitalize()
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the richest 10% of the population. {datasets_description_subtitle}"
-        df_graphers.loc[j, "note"] = source_checkbox["note"][view]
-        df_graphers.loc[j, "type"] = np.nan
-        j += 1
-
-        # Share of the bottom 50%
-        df_graphers.loc[
-            j, "title"
-        ] = f"Income share of the poorest 50% ({source_checkbox['type_title'][view]})"
-        df_graphers.loc[j, "ySlugs"] = source_checkbox["bottom50"][view]
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the poorest 50%"
-        df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox["type_title"][
-            view
-        ].capitalize()
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the poorest 50% of the population. {datasets_description_subtitle}"
-        df_graphers.loc[j, "note"] = source_checkbox["note"][view]
-        j += 1
-
-        # Palma ratio
-        df_graphers.loc[
-            j, "title"
-        ] = f"Palma ratio ({source_checkbox['type_title'][view]})"
-        df_graphers.loc[j, "ySlugs"] = source_checkbox["palma"][view]
-        df_graphers.loc[j, "Indicator Dropdown"] = "Palma ratio"
-        df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox["type_title"][
-            view
-        ].capitalize()
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. {datasets_description_subtitle}"
-        df_graphers.loc[j, "note"] = source_checkbox["note"][view]
-        df_graphers.loc[j, "type"] = np.nan
-        j += 1
-
-        # Headcount ratio (rel)
-        df_graphers.loc[
-            j, "title"
-        ] = f"Share of people in relative poverty ({source_checkbox['type_title'][view]})"
-        df_graphers.loc[j, "ySlugs"] = source_checkbox["relative"][view]
-        df_graphers.loc[j, "Indicator Dropdown"] = f"Share in relative poverty"
-        df_graphers.loc[j, "Income measure Dropdown"] = source_checkbox["type_title"][
-            view
-        ].capitalize()
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of population with income below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution. {datasets_description_subtitle}"
-        df_graphers.loc[j, "note"] = source_checkbox["note"][view]
-        df_graphers.loc[j, "type"] = np.nan
-        j += 1
-
-    df_graphers["tableSlug"] = merged_tables["name"][tab]
+df_graphers = expand_views(
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"view": source_checkbox},
+                [
+                    # Gini coefficient
+                    {
+                        "title": "Gini coefficient (${view__type_title})",
+                        "ySlugs": Column("view__gini"),
+                        "Indicator Dropdown": "Gini coefficient",
+                        "Income measure Dropdown": Column(
+                            "view__type_title_capitalized"
+                        ),
+                        "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. "
+                        + escape(datasets_description_subtitle),
+                        "note": Column("view__note"),
+                        "type": np.nan,
+                    },
+                    # Share of the top 10%
+                    {
+                        "title": "Income share of the richest 10% (${view__type_title})",
+                        "ySlugs": Column("view__top10"),
+                        "Indicator Dropdown": "Share of the richest 10%",
+                        "Income measure Dropdown": Column(
+                            "view__type_title_capitalized"
+                        ),
+                        "subtitle": "The share of income received by the richest 10% of the population. "
+                        + escape(datasets_description_subtitle),
+                        "note": Column("view__note"),
+                        "type": np.nan,
+                    },
+                    # Share of the bottom 50%
+                    {
+                        "title": "Income share of the poorest 50% (${view__type_title})",
+                        "ySlugs": Column("view__bottom50"),
+                        "Indicator Dropdown": "Share of the poorest 50%",
+                        "Income measure Dropdown": Column(
+                            "view__type_title_capitalized"
+                        ),
+                        "subtitle": "The share of income received by the poorest 50% of the population. "
+                        + escape(datasets_description_subtitle),
+                        "note": Column("view__note"),
+                    },
+                    # Palma ratio
+                    {
+                        "title": "Palma ratio (${view__type_title})",
+                        "ySlugs": Column("view__palma"),
+                        "Indicator Dropdown": "Palma ratio",
+                        "Income measure Dropdown": Column(
+                            "view__type_title_capitalized"
+                        ),
+                        "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. "
+                        + escape(datasets_description_subtitle),
+                        "note": Column("view__note"),
+                        "type": np.nan,
+                    },
+                    # Headcount ratio (rel)
+                    {
+                        "title": "Share of people in relative poverty (${view__type_title})",
+                        "ySlugs": Column("view__relative"),
+                        "Indicator Dropdown": "Share in relative poverty",
+                        "Income measure Dropdown": Column(
+                            "view__type_title_capitalized"
+                        ),
+                        "subtitle": "The share of population with income below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution. "
+                        + escape(datasets_description_subtitle),
+                        "note": Column("view__note"),
+                        "type": np.nan,
+                    },
+                ],
+            )
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # Add yAxisMin and mapTargetTime
 df_graphers["yAxisMin"] = yAxisMin
@@ -712,11 +703,13 @@ df_graphers["relatedQuestionUrl"] = np.nan
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Indicator Dropdown"] == "Gini coefficient")
-    & (df_graphers["Income measure Dropdown"] == "After tax"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Indicator Dropdown": "Gini coefficient",
+        "Income measure Dropdown": "After tax",
+    },
+)
 
 
 # %% [markdown]
@@ -727,32 +720,23 @@ df_graphers.loc[
 # Define list of variables to iterate: table names (from table dataframe)
 table_list = list(df_tables["tableSlug"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in table_list:
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tab].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tab]
         f.write(
             "\ntable\t"
             + merged_tables.loc[merged_tables["name"] == tab, "link"].item()
             + "\t"
             + tab
         )
-        f.write("\ncolumns\t" + tab + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tab + "\n")
+        write_frame(f, table_tsv, index=False)
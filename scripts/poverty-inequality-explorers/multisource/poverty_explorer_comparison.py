@@ -2,7 +2,7 @@
 # # Inequality Data Explorer - Source Comparison
 # This code creates the tsv file for the poverty comparison explorer, available [here](https://owid.cloud/admin/explorers/preview/poverty-comparison)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,21 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "poverty-comparison.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import (  # noqa: E402
+    Column,
+    Each,
+    TemplateColumn,
+    expand_views,
+)
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "poverty-comparison.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -24,14 +38,15 @@ sheet_id = "1wcFsNZCEn_6SJ05BFkXKLUyvCrnigfR8eeemGKgAYsI"
 
 # Merged sheet (this contains PIP, WID and LIS dataset information together in one file)
 sheet_name = "merged_tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-merged_tables = pd.read_csv(url, keep_default_na=False)
+merged_tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Source checkbox covers all the possible combinations to get for the multi-source selector
 sheet_name = "source_checkbox"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-source_checkbox = pd.read_csv(
-    url, keep_default_na=False, dtype={"pip": "str", "wid": "str", "lis": "str"}
+source_checkbox = read_sheet(
+    sheet_id,
+    sheet_name,
+    keep_default_na=False,
+    dtype={"pip": "str", "wid": "str", "lis": "str"},
 )
 # Only get the combination where PIP and LIS are true
 source_checkbox = source_checkbox[
@@ -46,23 +61,19 @@ sheet_id = "1UFdwB1iBpP2tEP6GtxCHvW1GGhjsFflh42FWR80rYIg"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_welfare = pd.read_csv(url, keep_default_na=False)
+lis_welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Equivalence scales
 sheet_name = "equivalence_scales"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_equivalence_scales = pd.read_csv(url, keep_default_na=False)
+lis_equivalence_scales = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Absolute poverty sheet
 sheet_name = "povlines_abs"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_povlines_abs = pd.read_csv(url, dtype={"dollars_text": "str"})
+lis_povlines_abs = read_sheet(sheet_id, sheet_name, dtype={"dollars_text": "str"})
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-lis_povlines_rel = pd.read_csv(url)
+lis_povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # WORLD BANK POVERTY AND INEQUALITY PLATFORM
 # Read Google sheets
@@ -70,18 +81,15 @@ sheet_id = "17KJ9YcvfdmO_7-Sv2Ij0vmzAQI6rXSIqHfJtgFHN-a8"
 
 # Survey type sheet
 sheet_name = "table"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_tables = pd.read_csv(url)
+pip_tables = read_sheet(sheet_id, sheet_name)
 
 # Absolute poverty sheet
 sheet_name = "povlines_abs"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_povlines_abs = pd.read_csv(url, dtype={"dollars_text": "str"})
+pip_povlines_abs = read_sheet(sheet_id, sheet_name, dtype={"dollars_text": "str"})
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-pip_povlines_rel = pd.read_csv(url)
+pip_povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # %% [markdown]
 # ## Header
@@ -150,365 +158,363 @@ processing_description = new_line.join(
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
 # Table generation
-df_tables_pip = pd.DataFrame()
-j = 0
-
-for tab in range(len(pip_tables)):
-    # Define country as entityName
-    df_tables_pip.loc[j, "name"] = "Country"
-    df_tables_pip.loc[j, "slug"] = "country"
-    df_tables_pip.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables_pip.loc[j, "name"] = "Year"
-    df_tables_pip.loc[j, "slug"] = "year"
-    df_tables_pip.loc[j, "type"] = "Year"
-    j += 1
-
-    # Headcount ratio (abs)
-    for p in range(len(pip_povlines_abs)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Share below ${pip_povlines_abs.dollars_text[p]} a day (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"headcount_ratio_{pip_povlines_abs.cents[p]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with {pip_tables.text[tab]} below ${pip_povlines_abs.dollars_text[p]} a day.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "%"
-        df_tables_pip.loc[j, "shortUnit"] = "%"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[
-            j, "colorScaleNumericBins"
-        ] = "3;10;20;30;40;50;60;70;80;90;100"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-    # Headcount (abs)
-    for p in range(len(pip_povlines_abs)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Number below ${pip_povlines_abs.dollars_text[p]} a day (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"headcount_{pip_povlines_abs.cents[p]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with {pip_tables.text[tab]} per person below ${pip_povlines_abs.dollars_text[p]} a day.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = np.nan
-        df_tables_pip.loc[j, "shortUnit"] = np.nan
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "Reds"
-        j += 1
-
-    # Total shortfall (abs)
-    for p in range(len(pip_povlines_abs)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Total daily shortfall - ${pip_povlines_abs.dollars_text[p]} a day (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"total_shortfall_{pip_povlines_abs.cents[p]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The total shortfall from a poverty line of ${pip_povlines_abs.dollars_text[p]} a day. This is the amount of money that would be theoretically needed to lift the {pip_tables.text[tab]} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "Oranges"
-        j += 1
-
-    # Total shortfall (abs): Yearly value
-    for p in range(len(pip_povlines_abs)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Total shortfall - ${pip_povlines_abs.dollars_text[p]} a day (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"total_shortfall_{pip_povlines_abs.cents[p]}_year"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The total shortfall from a poverty line of ${pip_povlines_abs.dollars_text[p]} a day. This is the amount of money that would be theoretically needed to lift the {pip_tables.text[tab]} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = pip_povlines_abs[
-            "scale_total_shortfall"
-        ][p]
-        df_tables_pip.loc[j, "colorScaleScheme"] = "Oranges"
-        df_tables_pip.loc[
-            j, "transform"
-        ] = f"multiplyBy total_shortfall_{pip_povlines_abs.cents[p]} 365"
-        j += 1
-
-    # Average shortfall ($ per day)
-    for p in range(len(pip_povlines_abs)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Average shortfall - ${pip_povlines_abs.dollars_text[p]} a day (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"avg_shortfall_{pip_povlines_abs.cents[p]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The average shortfall from a poverty line of ${pip_povlines_abs.dollars_text[p]} a day (averaged across the population in poverty).",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[
-            j, "colorScaleNumericBins"
-        ] = pip_povlines_abs.scale_avg_shortfall[p]
-        df_tables_pip.loc[j, "colorScaleScheme"] = "Purples"
-        j += 1
-
-    # Average shortfall (% of poverty line) [this is the income gap ratio]
-    for p in range(len(pip_povlines_abs)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Income gap ratio - ${pip_povlines_abs.dollars_text[p]} a day (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"income_gap_ratio_{pip_povlines_abs.cents[p]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f'The average shortfall from a poverty line of ${pip_povlines_abs.dollars_text[p]} a day (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "%"
-        df_tables_pip.loc[j, "shortUnit"] = "%"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "10;20;30;40;50;60;70;80;90;100"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrRd"
-        j += 1
-
-    # Poverty gap index
-    for p in range(len(pip_povlines_abs)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Poverty gap index - ${pip_povlines_abs.dollars_text[p]} a day (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"poverty_gap_index_{pip_povlines_abs.cents[p]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The poverty gap index calculated at a poverty line of ${pip_povlines_abs.dollars_text[p]} a day. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
-                additional_description,
-                ppp_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "%"
-        df_tables_pip.loc[j, "shortUnit"] = "%"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "10;20;30;40;50;60;70;80;90;100"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "RdPu"
-        j += 1
-
-    # Headcount ratio (rel)
-    for pct in range(len(pip_povlines_rel)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Share below {pip_povlines_rel.percent[pct]} of median (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"headcount_ratio_{pip_povlines_rel.slug_suffix[pct]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with an {pip_tables.text[tab]} per person below {pip_povlines_rel.percent[pct]} of the median.",
-                additional_description,
-                notes_title,
-                f"Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case {pip_povlines_rel.text[pct]} – and then run a specific query on the PIP API to return the share of population below that line.",
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "%"
-        df_tables_pip.loc[j, "shortUnit"] = "%"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "5;10;15;20;25;30;30.0001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    # Headcount (rel)
-    for pct in range(len(pip_povlines_rel)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Number below {pip_povlines_rel.percent[pct]} of median (PIP data)"
-        df_tables_pip.loc[j, "slug"] = f"headcount_{pip_povlines_rel.slug_suffix[pct]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with an {pip_tables.text[tab]} per person below {pip_povlines_rel.percent[pct]} of the median.",
-                additional_description,
-                notes_title,
-                f"Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case {pip_povlines_rel.text[pct]} – and then run a specific query on the PIP API to return the share of population below that line.",
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = np.nan
-        df_tables_pip.loc[j, "shortUnit"] = np.nan
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    # Total shortfall (rel)
-    for pct in range(len(pip_povlines_rel)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Total daily shortfall - {pip_povlines_rel.percent[pct]} of median (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"total_shortfall_{pip_povlines_rel.slug_suffix[pct]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The total shortfall from a poverty line of {pip_povlines_rel.text[pct]} {pip_tables.text[tab]}. This is the amount of money that would be theoretically needed to lift the {pip_tables.text[tab]} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
-                additional_description,
-                notes_title,
-                f"Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case {pip_povlines_rel.text[pct]} – and then run a specific query on the PIP API to return the share of population below that line.",
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = np.nan
-        df_tables_pip.loc[j, "shortUnit"] = np.nan
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    # Total shortfall (rel): Yearly value
-    for pct in range(len(pip_povlines_rel)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Total shortfall - {pip_povlines_rel.percent[pct]} of median (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"total_shortfall_{pip_povlines_rel.slug_suffix[pct]}_year"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The total shortfall from a poverty line of {pip_povlines_rel.text[pct]} {pip_tables.text[tab]}. This is the amount of money that would be theoretically needed to lift the {pip_tables.text[tab]} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
-                additional_description,
-                notes_title,
-                f"Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case {pip_povlines_rel.text[pct]} – and then run a specific query on the PIP API to return the share of population below that line.",
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = np.nan
-        df_tables_pip.loc[j, "shortUnit"] = np.nan
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-        df_tables_pip.loc[
-            j, "transform"
-        ] = f"multiplyBy total_shortfall_{pip_povlines_rel.slug_suffix[pct]} 365"
-        j += 1
-
-    # Average shortfall ($ per day)
-    for pct in range(len(pip_povlines_rel)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Average shortfall - {pip_povlines_rel.percent[pct]} of median (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"avg_shortfall_{pip_povlines_rel.slug_suffix[pct]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The average shortfall from a poverty line of of {pip_povlines_rel.text[pct]} {pip_tables.text[tab]} (averaged across the population in poverty).",
-                additional_description,
-                notes_title,
-                f"Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case {pip_povlines_rel.text[pct]} – and then run a specific query on the PIP API to return the share of population below that line.",
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables_pip.loc[j, "shortUnit"] = "$"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;20.0001"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    # Average shortfall (% of poverty line) [this is the income gap ratio]
-    for pct in range(len(pip_povlines_rel)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Income gap ratio - {pip_povlines_rel.percent[pct]} of median (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"income_gap_ratio_{pip_povlines_rel.slug_suffix[pct]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f'The average shortfall from a poverty line of of {pip_povlines_rel.text[pct]} {pip_tables.text[tab]} (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
-                additional_description,
-                notes_title,
-                f"Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case {pip_povlines_rel.text[pct]} – and then run a specific query on the PIP API to return the share of population below that line.",
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "%"
-        df_tables_pip.loc[j, "shortUnit"] = "%"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "10;20;30;40;50;60;70;80;90;100"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    # Poverty gap index
-    for pct in range(len(pip_povlines_rel)):
-        df_tables_pip.loc[
-            j, "name"
-        ] = f"Poverty gap index - {pip_povlines_rel.percent[pct]} of median (PIP data)"
-        df_tables_pip.loc[
-            j, "slug"
-        ] = f"poverty_gap_index_{pip_povlines_rel.slug_suffix[pct]}"
-        df_tables_pip.loc[j, "description"] = new_line.join(
-            [
-                f"The poverty gap index calculated at a poverty line of {pip_povlines_rel.text[pct]} {pip_tables.text[tab]}. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
-                additional_description,
-                notes_title,
-                f"Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case {pip_povlines_rel.text[pct]} – and then run a specific query on the PIP API to return the share of population below that line.",
-                processing_description,
-            ]
-        )
-        df_tables_pip.loc[j, "unit"] = "%"
-        df_tables_pip.loc[j, "shortUnit"] = "%"
-        df_tables_pip.loc[j, "type"] = "Numeric"
-        df_tables_pip.loc[j, "colorScaleNumericBins"] = "3;6;9;12;15;18;21"
-        df_tables_pip.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
+df_tables_pip = expand_views(
+    Each(
+        {"tab": pip_tables},
+        [
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            # Headcount ratio (abs)
+            Each(
+                {"p": pip_povlines_abs},
+                [
+                    {
+                        "name": "Share below $$${p__dollars_text} a day (PIP data)",
+                        "slug": "headcount_ratio_${p__cents}",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with ${tab__text} below $$${p__dollars_text} a day.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "3;10;20;30;40;50;60;70;80;90;100",
+                        "colorScaleScheme": "OrRd",
+                    }
+                ],
+            ),
+            # Headcount (abs)
+            Each(
+                {"p": pip_povlines_abs},
+                [
+                    {
+                        "name": "Number below $$${p__dollars_text} a day (PIP data)",
+                        "slug": "headcount_${p__cents}",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with ${tab__text} per person below $$${p__dollars_text} a day.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleScheme": "Reds",
+                    }
+                ],
+            ),
+            # Total shortfall (abs)
+            Each(
+                {"p": pip_povlines_abs},
+                [
+                    {
+                        "name": "Total daily shortfall - $$${p__dollars_text} a day (PIP data)",
+                        "slug": "total_shortfall_${p__cents}",
+                        "description": new_line.join(
+                            [
+                                "The total shortfall from a poverty line of $$${p__dollars_text} a day. This is the amount of money that would be theoretically needed to lift the ${tab__text} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleScheme": "Oranges",
+                    }
+                ],
+            ),
+            # Total shortfall (abs): Yearly value
+            Each(
+                {"p": pip_povlines_abs},
+                [
+                    {
+                        "name": "Total shortfall - $$${p__dollars_text} a day (PIP data)",
+                        "slug": "total_shortfall_${p__cents}_year",
+                        "description": new_line.join(
+                            [
+                                "The total shortfall from a poverty line of $$${p__dollars_text} a day. This is the amount of money that would be theoretically needed to lift the ${tab__text} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("p__scale_total_shortfall"),
+                        "colorScaleScheme": "Oranges",
+                        "transform": "multiplyBy total_shortfall_${p__cents} 365",
+                    }
+                ],
+            ),
+            # Average shortfall ($ per day)
+            Each(
+                {"p": pip_povlines_abs},
+                [
+                    {
+                        "name": "Average shortfall - $$${p__dollars_text} a day (PIP data)",
+                        "slug": "avg_shortfall_${p__cents}",
+                        "description": new_line.join(
+                            [
+                                "The average shortfall from a poverty line of $$${p__dollars_text} a day (averaged across the population in poverty).",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("p__scale_avg_shortfall"),
+                        "colorScaleScheme": "Purples",
+                    }
+                ],
+            ),
+            # Average shortfall (% of poverty line) [this is the income gap ratio]
+            Each(
+                {"p": pip_povlines_abs},
+                [
+                    {
+                        "name": "Income gap ratio - $$${p__dollars_text} a day (PIP data)",
+                        "slug": "income_gap_ratio_${p__cents}",
+                        "description": new_line.join(
+                            [
+                                'The average shortfall from a poverty line of $$${p__dollars_text} a day (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "10;20;30;40;50;60;70;80;90;100",
+                        "colorScaleScheme": "YlOrRd",
+                    }
+                ],
+            ),
+            # Poverty gap index
+            Each(
+                {"p": pip_povlines_abs},
+                [
+                    {
+                        "name": "Poverty gap index - $$${p__dollars_text} a day (PIP data)",
+                        "slug": "poverty_gap_index_${p__cents}",
+                        "description": new_line.join(
+                            [
+                                "The poverty gap index calculated at a poverty line of $$${p__dollars_text} a day. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
+                                escape(additional_description),
+                                escape(ppp_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "10;20;30;40;50;60;70;80;90;100",
+                        "colorScaleScheme": "RdPu",
+                    }
+                ],
+            ),
+            # Headcount ratio (rel)
+            Each(
+                {"pct": pip_povlines_rel},
+                [
+                    {
+                        "name": "Share below ${pct__percent} of median (PIP data)",
+                        "slug": "headcount_ratio_${pct__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with an ${tab__text} per person below ${pct__percent} of the median.",
+                                escape(additional_description),
+                                escape(notes_title),
+                                "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case ${pct__text} – and then run a specific query on the PIP API to return the share of population below that line.",
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "5;10;15;20;25;30;30.0001",
+                        "colorScaleScheme": "YlOrBr",
+                    }
+                ],
+            ),
+            # Headcount (rel)
+            Each(
+                {"pct": pip_povlines_rel},
+                [
+                    {
+                        "name": "Number below ${pct__percent} of median (PIP data)",
+                        "slug": "headcount_${pct__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with an ${tab__text} per person below ${pct__percent} of the median.",
+                                escape(additional_description),
+                                escape(notes_title),
+                                "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case ${pct__text} – and then run a specific query on the PIP API to return the share of population below that line.",
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleScheme": "YlOrBr",
+                    }
+                ],
+            ),
+            # Total shortfall (rel)
+            Each(
+                {"pct": pip_povlines_rel},
+                [
+                    {
+                        "name": "Total daily shortfall - ${pct__percent} of median (PIP data)",
+                        "slug": "total_shortfall_${pct__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                "The total shortfall from a poverty line of ${pct__text} ${tab__text}. This is the amount of money that would be theoretically needed to lift the ${tab__text} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
+                                escape(additional_description),
+                                escape(notes_title),
+                                "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case ${pct__text} – and then run a specific query on the PIP API to return the share of population below that line.",
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleScheme": "YlOrBr",
+                    }
+                ],
+            ),
+            # Total shortfall (rel): Yearly value
+            Each(
+                {"pct": pip_povlines_rel},
+                [
+                    {
+                        "name": "Total shortfall - ${pct__percent} of median (PIP data)",
+                        "slug": "total_shortfall_${pct__slug_suffix}_year",
+                        "description": new_line.join(
+                            [
+                                "The total shortfall from a poverty line of ${pct__text} ${tab__text}. This is the amount of money that would be theoretically needed to lift the ${tab__text} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
+                                escape(additional_description),
+                                escape(notes_title),
+                                "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case ${pct__text} – and then run a specific query on the PIP API to return the share of population below that line.",
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleScheme": "YlOrBr",
+                        "transform": "multiplyBy total_shortfall_${pct__slug_suffix} 365",
+                    }
+                ],
+            ),
+            # Average shortfall ($ per day)
+            Each(
+                {"pct": pip_povlines_rel},
+                [
+                    {
+                        "name": "Average shortfall - ${pct__percent} of median (PIP data)",
+                        "slug": "avg_shortfall_${pct__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                "The average shortfall from a poverty line of of ${pct__text} ${tab__text} (averaged across the population in poverty).",
+                                escape(additional_description),
+                                escape(notes_title),
+                                "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case ${pct__text} – and then run a specific query on the PIP API to return the share of population below that line.",
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "1;2;5;10;20;20.0001",
+                        "colorScaleScheme": "YlOrBr",
+                    }
+                ],
+            ),
+            # Average shortfall (% of poverty line) [this is the income gap ratio]
+            Each(
+                {"pct": pip_povlines_rel},
+                [
+                    {
+                        "name": "Income gap ratio - ${pct__percent} of median (PIP data)",
+                        "slug": "income_gap_ratio_${pct__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                'The average shortfall from a poverty line of of ${pct__text} ${tab__text} (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
+                                escape(additional_description),
+                                escape(notes_title),
+                                "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case ${pct__text} – and then run a specific query on the PIP API to return the share of population below that line.",
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "10;20;30;40;50;60;70;80;90;100",
+                        "colorScaleScheme": "YlOrBr",
+                    }
+                ],
+            ),
+            # Poverty gap index
+            Each(
+                {"pct": pip_povlines_rel},
+                [
+                    {
+                        "name": "Poverty gap index - ${pct__percent} of median (PIP data)",
+                        "slug": "poverty_gap_index_${pct__slug_suffix}",
+                        "description": new_line.join(
+                            [
+                                "The poverty gap index calculated at a poverty line of ${pct__text} ${tab__text}. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
+                                escape(additional_description),
+                                escape(notes_title),
+                                "Measures of relative poverty are not directly available in the World Bank PIP data. To calculate this metric we take the median income or consumption for the country and year, calculate a relative poverty line – in this case ${pct__text} – and then run a specific query on the PIP API to return the share of population below that line.",
+                                escape(processing_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": "3;6;9;12;15;18;21",
+                        "colorScaleScheme": "YlOrBr",
+                    }
+                ],
+            ),
+        ],
+    )
+)
 
 df_tables_pip["tableSlug"] = tableSlug
 df_tables_pip["sourceName"] = sourceName
@@ -547,411 +553,406 @@ processing_distribution = "Income shares and thresholds by decile are obtained b
 
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables_lis = pd.DataFrame()
-j = 0
-
-# NOTE: # I am using the PIP poverty lines to compare with LIS
-for tab in range(len(merged_tables)):
-    for wel in range(len(lis_welfare)):
-        for eq in range(len(lis_equivalence_scales)):
-            # Headcount ratio (abs)
-            for p in range(len(pip_povlines_abs)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Share below ${pip_povlines_abs['dollars_text'][p]} a day (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"headcount_ratio_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs['cents'][p]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"% of population living in households with {lis_welfare['welfare_type'][wel]} below ${pip_povlines_abs['dollars_text'][p]} a day.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "%"
-                df_tables_lis.loc[j, "shortUnit"] = "%"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[
-                    j, "colorScaleNumericBins"
-                ] = "3;10;20;30;40;50;60;70;80;90;100"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "OrRd"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Headcount (abs)
-            for p in range(len(pip_povlines_abs)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Number below ${pip_povlines_abs['dollars_text'][p]} a day (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"headcount_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs['cents'][p]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"Number of people living in households with {lis_welfare['welfare_type'][wel]} below ${pip_povlines_abs['dollars_text'][p]} a day.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = np.nan
-                df_tables_lis.loc[j, "shortUnit"] = np.nan
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[
-                    j, "colorScaleNumericBins"
-                ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "Reds"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Total shortfall (abs)
-            for p in range(len(pip_povlines_abs)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Total shortfall - ${pip_povlines_abs['dollars_text'][p]} a day (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"total_shortfall_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs.cents[p]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The total shortfall from a poverty line of ${pip_povlines_abs['dollars_text'][p]} a day. This is the amount of money that would be theoretically needed to lift the {lis_welfare['welfare_type'][wel]} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = pip_povlines_abs[
-                    "scale_total_shortfall"
-                ][p]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "Oranges"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Average shortfall ($)
-            for p in range(len(pip_povlines_abs)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Average yearly shortfall - ${pip_povlines_abs['dollars_text'][p]} a day (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"avg_shortfall_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs['cents'][p]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The average shortfall from a poverty line of ${pip_povlines_abs['dollars_text'][p]} (averaged across the population in poverty).",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = pip_povlines_abs[
-                    "scale_avg_shortfall"
-                ][p]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "Purples"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Average shortfall ($): Daily value
-            for p in range(len(pip_povlines_abs)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Average shortfall - ${pip_povlines_abs['dollars_text'][p]} a day (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"avg_shortfall_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs['cents'][p]}_day"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The average shortfall from a poverty line of ${pip_povlines_abs['dollars_text'][p]} (averaged across the population in poverty).",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = pip_povlines_abs[
-                    "scale_avg_shortfall"
-                ][p]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "Purples"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                df_tables_lis.loc[
-                    j, "transform"
-                ] = f"multiplyBy avg_shortfall_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs['cents'][p]} 0.00274"
-                j += 1
-
-            # Average shortfall (% of poverty line) [this is the income gap ratio]
-            for p in range(len(pip_povlines_abs)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Income gap ratio - ${pip_povlines_abs['dollars_text'][p]} a day (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"income_gap_ratio_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs['cents'][p]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f'The average shortfall from a poverty line of ${pip_povlines_abs.dollars_text[p]} a day (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "%"
-                df_tables_lis.loc[j, "shortUnit"] = "%"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[
-                    j, "colorScaleNumericBins"
-                ] = "10;20;30;40;50;60;70;80;90;100"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrRd"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Poverty gap index
-            for p in range(len(pip_povlines_abs)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Poverty gap index - ${pip_povlines_abs['dollars_text'][p]} a day (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"poverty_gap_index_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_{pip_povlines_abs['cents'][p]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The poverty gap index calculated at a poverty line of ${pip_povlines_abs['dollars_text'][p]} a day. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        ppp_description,
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "%"
-                df_tables_lis.loc[j, "shortUnit"] = "%"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = "10;20;30;40;50;60"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "RdPu"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Headcount ratio (rel)
-            for pct in range(len(lis_povlines_rel)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Share below {lis_povlines_rel['percent'][pct]} of median (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"headcount_ratio_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        "% of population living in households with {welfare['welfare_type'][wel]} below {povlines_rel['percent'][pct]} of the median {welfare['welfare_type'][wel]}.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "%"
-                df_tables_lis.loc[j, "shortUnit"] = "%"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = "5;10;15;20;25;30"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Headcount (rel)
-            for pct in range(len(lis_povlines_rel)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Number below {lis_povlines_rel['percent'][pct]} of median (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"headcount_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"Number of people living in households with {lis_welfare['welfare_type'][wel]} below {lis_povlines_rel['percent'][pct]} of the median {lis_welfare['welfare_type'][wel]}.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = np.nan
-                df_tables_lis.loc[j, "shortUnit"] = np.nan
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[
-                    j, "colorScaleNumericBins"
-                ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Total shortfall (rel)
-            for pct in range(len(lis_povlines_rel)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Total shortfall - {lis_povlines_rel['percent'][pct]} of median (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"total_shortfall_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The total shortfall from a poverty line of {lis_povlines_rel['text'][pct]} {lis_welfare['welfare_type'][wel]}. This is the amount of money that would be theoretically needed to lift the {lis_welfare['welfare_type'][wel]} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = np.nan
-                df_tables_lis.loc[j, "shortUnit"] = np.nan
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = lis_povlines_rel[
-                    "scale_total_shortfall"
-                ][pct]
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Average shortfall ($)
-            for pct in range(len(lis_povlines_rel)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Average yearly shortfall - {lis_povlines_rel['percent'][pct]} of median (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"avg_shortfall_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The average shortfall from a poverty line of of {lis_povlines_rel['text'][pct]} {lis_welfare['welfare_type'][wel]} (averaged across the population in poverty).",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[
-                    j, "colorScaleNumericBins"
-                ] = "1000;2000;3000;4000;5000"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Average shortfall ($): Daily value
-            for pct in range(len(lis_povlines_rel)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Average shortfall - {lis_povlines_rel['percent'][pct]} of median (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"avg_shortfall_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}_day"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The average shortfall from a poverty line of of {lis_povlines_rel['text'][pct]} {lis_welfare['welfare_type'][wel]} (averaged across the population in poverty).",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "international-$ in 2017 prices"
-                df_tables_lis.loc[j, "shortUnit"] = "$"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[
-                    j, "colorScaleNumericBins"
-                ] = "1000;2000;3000;4000;5000"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                df_tables_lis.loc[
-                    j, "transform"
-                ] = f"multiplyBy avg_shortfall_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]} 0.00274"
-                j += 1
-
-            # Average shortfall (% of poverty line) [this is the income gap ratio]
-            for pct in range(len(lis_povlines_rel)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Income gap ratio - {lis_povlines_rel['percent'][pct]} of median (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"income_gap_ratio_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f'The average shortfall from a poverty line of of {lis_povlines_rel.text[pct]} {lis_welfare.welfare_type[wel]} (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "%"
-                df_tables_lis.loc[j, "shortUnit"] = "%"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = "5;10;15;20;25;30;35;40"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-            # Poverty gap index
-            for pct in range(len(lis_povlines_rel)):
-                df_tables_lis.loc[
-                    j, "name"
-                ] = f"Poverty gap index - {lis_povlines_rel['percent'][pct]} of median (LIS data)"
-                df_tables_lis.loc[
-                    j, "slug"
-                ] = f"poverty_gap_index_{lis_povlines_rel['slug_suffix'][pct]}_{lis_welfare['slug'][wel]}_{lis_equivalence_scales['slug'][eq]}"
-                df_tables_lis.loc[j, "description"] = new_line.join(
-                    [
-                        f"The poverty gap index calculated at a poverty line of {lis_povlines_rel['text'][pct]} {lis_welfare['welfare_type'][wel]}. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
-                        lis_welfare["description"][wel],
-                        lis_equivalence_scales["description"][eq],
-                        notes_title,
-                        processing_description,
-                        processing_poverty,
-                    ]
-                )
-                df_tables_lis.loc[j, "unit"] = "%"
-                df_tables_lis.loc[j, "shortUnit"] = "%"
-                df_tables_lis.loc[j, "type"] = "Numeric"
-                df_tables_lis.loc[j, "colorScaleNumericBins"] = "2;4;6;8;10;12"
-                df_tables_lis.loc[j, "colorScaleScheme"] = "YlOrBr"
-                df_tables_lis.loc[j, "equivalized"] = lis_equivalence_scales["text"][eq]
-                j += 1
-
-    df_tables_lis["tableSlug"] = merged_tables["name"][tab]
+df_tables_lis = expand_views(
+    # NOTE: # I am using the PIP poverty lines to compare with LIS
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"wel": lis_welfare},
+                [
+                    Each(
+                        {"eq": lis_equivalence_scales},
+                        [
+                            # Headcount ratio (abs)
+                            Each(
+                                {"p": pip_povlines_abs},
+                                [
+                                    {
+                                        "name": "Share below $$${p__dollars_text} a day (LIS data)",
+                                        "slug": "headcount_ratio_${wel__slug}_${eq__slug}_${p__cents}",
+                                        "description": new_line.join(
+                                            [
+                                                "% of population living in households with ${wel__welfare_type} below $$${p__dollars_text} a day.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "3;10;20;30;40;50;60;70;80;90;100",
+                                        "colorScaleScheme": "OrRd",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Headcount (abs)
+                            Each(
+                                {"p": pip_povlines_abs},
+                                [
+                                    {
+                                        "name": "Number below $$${p__dollars_text} a day (LIS data)",
+                                        "slug": "headcount_${wel__slug}_${eq__slug}_${p__cents}",
+                                        "description": new_line.join(
+                                            [
+                                                "Number of people living in households with ${wel__welfare_type} below $$${p__dollars_text} a day.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": np.nan,
+                                        "shortUnit": np.nan,
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000",
+                                        "colorScaleScheme": "Reds",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Total shortfall (abs)
+                            Each(
+                                {"p": pip_povlines_abs},
+                                [
+                                    {
+                                        "name": "Total shortfall - $$${p__dollars_text} a day (LIS data)",
+                                        "slug": "total_shortfall_${wel__slug}_${eq__slug}_${p__cents}",
+                                        "description": new_line.join(
+                                            [
+                                                "The total shortfall from a poverty line of $$${p__dollars_text} a day. This is the amount of money that would be theoretically needed to lift the ${wel__welfare_type} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "p__scale_total_shortfall"
+                                        ),
+                                        "colorScaleScheme": "Oranges",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Average shortfall ($)
+                            Each(
+                                {"p": pip_povlines_abs},
+                                [
+                                    {
+                                        "name": "Average yearly shortfall - $$${p__dollars_text} a day (LIS data)",
+                                        "slug": "avg_shortfall_${wel__slug}_${eq__slug}_${p__cents}",
+                                        "description": new_line.join(
+                                            [
+                                                "The average shortfall from a poverty line of $$${p__dollars_text} (averaged across the population in poverty).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "p__scale_avg_shortfall"
+                                        ),
+                                        "colorScaleScheme": "Purples",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Average shortfall ($): Daily value
+                            Each(
+                                {"p": pip_povlines_abs},
+                                [
+                                    {
+                                        "name": "Average shortfall - $$${p__dollars_text} a day (LIS data)",
+                                        "slug": "avg_shortfall_${wel__slug}_${eq__slug}_${p__cents}_day",
+                                        "description": new_line.join(
+                                            [
+                                                "The average shortfall from a poverty line of $$${p__dollars_text} (averaged across the population in poverty).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "p__scale_avg_shortfall"
+                                        ),
+                                        "colorScaleScheme": "Purples",
+                                        "equivalized": Column("eq__text"),
+                                        "transform": "multiplyBy avg_shortfall_${wel__slug}_${eq__slug}_${p__cents} 0.00274",
+                                    }
+                                ],
+                            ),
+                            # Average shortfall (% of poverty line) [this is the income gap ratio]
+                            Each(
+                                {"p": pip_povlines_abs},
+                                [
+                                    {
+                                        "name": "Income gap ratio - $$${p__dollars_text} a day (LIS data)",
+                                        "slug": "income_gap_ratio_${wel__slug}_${eq__slug}_${p__cents}",
+                                        "description": new_line.join(
+                                            [
+                                                'The average shortfall from a poverty line of $$${p__dollars_text} a day (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "10;20;30;40;50;60;70;80;90;100",
+                                        "colorScaleScheme": "YlOrRd",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Poverty gap index
+                            Each(
+                                {"p": pip_povlines_abs},
+                                [
+                                    {
+                                        "name": "Poverty gap index - $$${p__dollars_text} a day (LIS data)",
+                                        "slug": "poverty_gap_index_${wel__slug}_${eq__slug}_${p__cents}",
+                                        "description": new_line.join(
+                                            [
+                                                "The poverty gap index calculated at a poverty line of $$${p__dollars_text} a day. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(ppp_description),
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "10;20;30;40;50;60",
+                                        "colorScaleScheme": "RdPu",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Headcount ratio (rel)
+                            Each(
+                                {"pct": lis_povlines_rel},
+                                [
+                                    {
+                                        "name": "Share below ${pct__percent} of median (LIS data)",
+                                        "slug": "headcount_ratio_${pct__slug_suffix}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "% of population living in households with {welfare['welfare_type'][wel]} below {povlines_rel['percent'][pct]} of the median {welfare['welfare_type'][wel]}.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "5;10;15;20;25;30",
+                                        "colorScaleScheme": "YlOrBr",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Headcount (rel)
+                            Each(
+                                {"pct": lis_povlines_rel},
+                                [
+                                    {
+                                        "name": "Number below ${pct__percent} of median (LIS data)",
+                                        "slug": "headcount_${pct__slug_suffix}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "Number of people living in households with ${wel__welfare_type} below ${pct__percent} of the median ${wel__welfare_type}.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": np.nan,
+                                        "shortUnit": np.nan,
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000",
+                                        "colorScaleScheme": "YlOrBr",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Total shortfall (rel)
+                            Each(
+                                {"pct": lis_povlines_rel},
+                                [
+                                    {
+                                        "name": "Total shortfall - ${pct__percent} of median (LIS data)",
+                                        "slug": "total_shortfall_${pct__slug_suffix}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The total shortfall from a poverty line of ${pct__text} ${wel__welfare_type}. This is the amount of money that would be theoretically needed to lift the ${wel__welfare_type} of all people in poverty up to the poverty line. However this is not a measure of the actual cost of eliminating poverty, since it does not take into account the costs involved in making the necessary transfers nor any changes in behaviour they would bring about.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": np.nan,
+                                        "shortUnit": np.nan,
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "pct__scale_total_shortfall"
+                                        ),
+                                        "colorScaleScheme": "YlOrBr",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Average shortfall ($)
+                            Each(
+                                {"pct": lis_povlines_rel},
+                                [
+                                    {
+                                        "name": "Average yearly shortfall - ${pct__percent} of median (LIS data)",
+                                        "slug": "avg_shortfall_${pct__slug_suffix}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The average shortfall from a poverty line of of ${pct__text} ${wel__welfare_type} (averaged across the population in poverty).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "1000;2000;3000;4000;5000",
+                                        "colorScaleScheme": "YlOrBr",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Average shortfall ($): Daily value
+                            Each(
+                                {"pct": lis_povlines_rel},
+                                [
+                                    {
+                                        "name": "Average shortfall - ${pct__percent} of median (LIS data)",
+                                        "slug": "avg_shortfall_${pct__slug_suffix}_${wel__slug}_${eq__slug}_day",
+                                        "description": new_line.join(
+                                            [
+                                                "The average shortfall from a poverty line of of ${pct__text} ${wel__welfare_type} (averaged across the population in poverty).",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2017 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "1000;2000;3000;4000;5000",
+                                        "colorScaleScheme": "YlOrBr",
+                                        "equivalized": Column("eq__text"),
+                                        "transform": "multiplyBy avg_shortfall_${pct__slug_suffix}_${wel__slug}_${eq__slug} 0.00274",
+                                    }
+                                ],
+                            ),
+                            # Average shortfall (% of poverty line) [this is the income gap ratio]
+                            Each(
+                                {"pct": lis_povlines_rel},
+                                [
+                                    {
+                                        "name": "Income gap ratio - ${pct__percent} of median (LIS data)",
+                                        "slug": "income_gap_ratio_${pct__slug_suffix}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                'The average shortfall from a poverty line of of ${pct__text} ${wel__welfare_type} (averaged across the population in poverty) expressed as a share of the poverty line. This metric is sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than the poverty line.',
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "5;10;15;20;25;30;35;40",
+                                        "colorScaleScheme": "YlOrBr",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                            # Poverty gap index
+                            Each(
+                                {"pct": lis_povlines_rel},
+                                [
+                                    {
+                                        "name": "Poverty gap index - ${pct__percent} of median (LIS data)",
+                                        "slug": "poverty_gap_index_${pct__slug_suffix}_${wel__slug}_${eq__slug}",
+                                        "description": new_line.join(
+                                            [
+                                                "The poverty gap index calculated at a poverty line of ${pct__text} ${wel__welfare_type}. The poverty gap index is a measure that reflects both the depth and prevalence of poverty. It is defined as the mean shortfall of the total population from the poverty line counting the non-poor as having zero shortfall and expressed as a percentage of the poverty line. It is worth unpacking that definition a little. For those below the poverty line, the shortfall corresponds to the amount of money required in order to reach the poverty line. For those at or above the poverty line, the shortfall is counted as zero. The average shortfall is then calculated across the total population – both poor and non-poor – and then expressed as a share of the poverty line. Unlike the more commonly-used metric of the headcount ratio, the poverty gap index is thus sensitive not only to whether a person’s income falls below the poverty line or not, but also by how much – i.e. to the depth of poverty they experience.",
+                                                "${wel__description}",
+                                                "${eq__description}",
+                                                escape(notes_title),
+                                                escape(processing_description),
+                                                escape(processing_poverty),
+                                            ]
+                                        ),
+                                        "unit": "%",
+                                        "shortUnit": "%",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": "2;4;6;8;10;12",
+                                        "colorScaleScheme": "YlOrBr",
+                                        "equivalized": Column("eq__text"),
+                                    }
+                                ],
+                            ),
+                        ],
+                    )
+                ],
+            )
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables_lis["sourceName"] = sourceName
 df_tables_lis["dataPublishedBy"] = dataPublishedBy
@@ -987,247 +988,178 @@ tab_parameter = "chart"
 
 datasets_description = "LIS data relates to income after taxes and benefits per capita. Depending on the country and year, PIP data relates to income measured after taxes and benefits, or consumption, per capita."
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(merged_tables)):
-    for view in range(len(source_checkbox)):
-        for p in range(len(pip_povlines_abs)):
-            # Headcount ratio (abs)
-            df_graphers.loc[j, "title"] = f"{pip_povlines_abs['title_share'][p]}"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["headcount_ratio"][
-                view
-            ].replace("{p}", str(pip_povlines_abs["cents"][p]))
-            df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_abs['povline_dropdown'][p]}"
-            df_graphers.loc[j, "subtitle"] = datasets_description
-            df_graphers.loc[
-                j, "note"
-            ] = f"{pip_povlines_abs['subtitle'][p]} This data is expressed in international-$ at 2017 prices."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Headcount (abs)
-            df_graphers.loc[j, "title"] = f"{pip_povlines_abs.title_number[p]}"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["headcount"][view].replace(
-                "{p}", str(pip_povlines_abs["cents"][p])
+# The slugs in source_checkbox have placeholders for the poverty lines: turn them into templates over the dimensions of the views
+slug_placeholders = {"{p}": "${p__cents}", "{pct}": "${pct__slug_suffix}"}
+for column in [
+    "headcount_ratio",
+    "headcount",
+    "total_shortfall",
+    "avg_shortfall",
+    "income_gap_ratio",
+    "poverty_gap_index",
+    "headcount_ratio_rel",
+    "headcount_rel",
+    "total_shortfall_rel",
+    "avg_shortfall_rel",
+    "income_gap_ratio_rel",
+    "poverty_gap_index_rel",
+]:
+    slugs = source_checkbox[column].str.replace("$", "$$", regex=False)
+    for placeholder, template in slug_placeholders.items():
+        slugs = slugs.str.replace(placeholder, template, regex=False)
+    source_checkbox[column] = slugs
+
+df_graphers = expand_views(
+    Each(
+        {"tab": merged_tables},
+        [
+            Each(
+                {"view": source_checkbox},
+                [
+                    Each(
+                        {"p": pip_povlines_abs},
+                        [
+                            # Headcount ratio (abs)
+                            {
+                                "title": "${p__title_share}",
+                                "ySlugs": TemplateColumn("view__headcount_ratio"),
+                                "Indicator Dropdown": "Share in poverty",
+                                "Poverty line Dropdown": "${p__povline_dropdown}",
+                                "subtitle": escape(datasets_description),
+                                "note": "${p__subtitle} This data is expressed in international-$$ at 2017 prices.",
+                                "type": np.nan,
+                            },
+                            # Headcount (abs)
+                            {
+                                "title": "${p__title_number}",
+                                "ySlugs": TemplateColumn("view__headcount"),
+                                "Indicator Dropdown": "Number in poverty",
+                                "Poverty line Dropdown": "${p__povline_dropdown}",
+                                "subtitle": escape(datasets_description),
+                                "note": "${p__subtitle} This data is expressed in international-$$ at 2017 prices.",
+                                "type": np.nan,
+                            },
+                            # Total shortfall (abs)
+                            {
+                                "title": "${p__title_total_shortfall}",
+                                "ySlugs": TemplateColumn("view__total_shortfall"),
+                                "Indicator Dropdown": "Total shortfall from poverty line",
+                                "Poverty line Dropdown": "${p__povline_dropdown}",
+                                "subtitle": "${p__subtitle_total_shortfall}",
+                                "note": escape(datasets_description)
+                                + " This data is expressed in international-$$ at 2017 prices.",
+                                "type": np.nan,
+                            },
+                            # Average shortfall ($)
+                            {
+                                "title": "${p__title_avg_shortfall}",
+                                "ySlugs": TemplateColumn("view__avg_shortfall"),
+                                "Indicator Dropdown": "Average shortfall ($$)",
+                                "Poverty line Dropdown": "${p__povline_dropdown}",
+                                "subtitle": "${p__subtitle_avg_shortfall}",
+                                "note": escape(datasets_description)
+                                + " This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries.",
+                                "type": np.nan,
+                            },
+                            # Average shortfall (% of poverty line)
+                            {
+                                "title": "${p__title_income_gap_ratio}",
+                                "ySlugs": TemplateColumn("view__income_gap_ratio"),
+                                "Indicator Dropdown": "Average shortfall (% of poverty line)",
+                                "Poverty line Dropdown": "${p__povline_dropdown}",
+                                "subtitle": "${p__subtitle_income_gap_ratio}",
+                                "note": escape(datasets_description)
+                                + " This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries.",
+                                "type": np.nan,
+                            },
+                            # Poverty gap index
+                            {
+                                "title": "Poverty gap index at $$${p__dollars_text} a day",
+                                "ySlugs": TemplateColumn("view__poverty_gap_index"),
+                                "Indicator Dropdown": "Poverty gap index",
+                                "Poverty line Dropdown": "${p__povline_dropdown}",
+                                "subtitle": "The poverty gap index is a poverty measure that reflects both the prevalence and the depth of poverty. It is calculated as the share of population in poverty multiplied by the average shortfall from the poverty line (expressed as a % of the poverty line).",
+                                "note": escape(datasets_description)
+                                + " This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries.",
+                                "type": np.nan,
+                            },
+                        ],
+                    ),
+                    # Headcount ratio (rel)
+                    Each(
+                        {"pct": pip_povlines_rel},
+                        [
+                            {
+                                "title": "${pct__title_share}",
+                                "ySlugs": TemplateColumn("view__headcount_ratio_rel"),
+                                "Indicator Dropdown": "Share in poverty",
+                                "Poverty line Dropdown": "${pct__dropdown}",
+                                "subtitle": escape(datasets_description),
+                                "note": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at ${pct__text}",
+                                "type": np.nan,
+                            },
+                            # Headcount (rel)
+                            {
+                                "title": "${pct__title_number}",
+                                "ySlugs": TemplateColumn("view__headcount_rel"),
+                                "Indicator Dropdown": "Number in poverty",
+                                "Poverty line Dropdown": "${pct__dropdown}",
+                                "subtitle": escape(datasets_description),
+                                "note": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at ${pct__text}",
+                                "type": np.nan,
+                            },
+                            # Total shortfall (rel)
+                            {
+                                "title": "Total shortfall from a poverty line of ${pct__text} income",
+                                "ySlugs": TemplateColumn("view__total_shortfall_rel"),
+                                "Indicator Dropdown": "Total shortfall from poverty line",
+                                "Poverty line Dropdown": "${pct__dropdown}",
+                                "subtitle": "This is the amount of money that would be theoretically needed to lift the incomes of all people in poverty up to ${pct__text}",
+                                "note": escape(datasets_description)
+                                + " This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries.",
+                                "type": np.nan,
+                            },
+                            # Average shortfall ($) (rel)
+                            {
+                                "title": "Average shortfall from a poverty line of ${pct__text} income",
+                                "ySlugs": TemplateColumn("view__avg_shortfall_rel"),
+                                "Indicator Dropdown": "Average shortfall ($$)",
+                                "Poverty line Dropdown": "${pct__dropdown}",
+                                "subtitle": "This is the amount of money that would be theoretically needed to lift the incomes of all people in poverty up to ${pct__text} income, averaged across the population in poverty.",
+                                "note": escape(datasets_description)
+                                + " This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries.",
+                                "type": np.nan,
+                            },
+                            # Average shortfall (% of poverty line) (rel)
+                            {
+                                "title": "Average shortfall from a poverty line of ${pct__text} income (as a share of the poverty line)",
+                                "ySlugs": TemplateColumn("view__income_gap_ratio_rel"),
+                                "Indicator Dropdown": "Average shortfall (% of poverty line)",
+                                "Poverty line Dropdown": "${pct__dropdown}",
+                                "subtitle": 'This is the average shortfall expressed as a share of the poverty line, sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than ${pct__text} income.',
+                                "note": escape(datasets_description)
+                                + " This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries.",
+                                "type": np.nan,
+                            },
+                            # Poverty gap index (rel)
+                            {
+                                "title": "Poverty gap index at ${pct__text} income",
+                                "ySlugs": TemplateColumn("view__poverty_gap_index_rel"),
+                                "Indicator Dropdown": "Poverty gap index",
+                                "Poverty line Dropdown": "${pct__dropdown}",
+                                "subtitle": "The poverty gap index is a poverty measure that reflects both the prevalence and the depth of poverty. It is calculated as the share of population in poverty multiplied by the average shortfall from the poverty line (expressed as a % of the poverty line).",
+                                "note": escape(datasets_description)
+                                + " This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries.",
+                                "type": np.nan,
+                            },
+                        ],
+                    ),
+                ],
             )
-            df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_abs['povline_dropdown'][p]}"
-            df_graphers.loc[j, "subtitle"] = datasets_description
-            df_graphers.loc[
-                j, "note"
-            ] = f"{pip_povlines_abs['subtitle'][p]} This data is expressed in international-$ at 2017 prices."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Total shortfall (abs)
-            df_graphers.loc[
-                j, "title"
-            ] = f"{pip_povlines_abs['title_total_shortfall'][p]}"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["total_shortfall"][
-                view
-            ].replace("{p}", str(pip_povlines_abs["cents"][p]))
-            df_graphers.loc[
-                j, "Indicator Dropdown"
-            ] = "Total shortfall from poverty line"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_abs['povline_dropdown'][p]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"{pip_povlines_abs['subtitle_total_shortfall'][p]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is expressed in international-$ at 2017 prices."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Average shortfall ($)
-            df_graphers.loc[
-                j, "title"
-            ] = f"{pip_povlines_abs['title_avg_shortfall'][p]}"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["avg_shortfall"][
-                view
-            ].replace("{p}", str(pip_povlines_abs["cents"][p]))
-            df_graphers.loc[j, "Indicator Dropdown"] = "Average shortfall ($)"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_abs['povline_dropdown'][p]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"{pip_povlines_abs['subtitle_avg_shortfall'][p]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Average shortfall (% of poverty line)
-            df_graphers.loc[
-                j, "title"
-            ] = f"{pip_povlines_abs['title_income_gap_ratio'][p]}"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["income_gap_ratio"][
-                view
-            ].replace("{p}", str(pip_povlines_abs["cents"][p]))
-            df_graphers.loc[
-                j, "Indicator Dropdown"
-            ] = "Average shortfall (% of poverty line)"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_abs.povline_dropdown[p]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"{pip_povlines_abs['subtitle_income_gap_ratio'][p]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Poverty gap index
-            df_graphers.loc[
-                j, "title"
-            ] = f"Poverty gap index at ${pip_povlines_abs['dollars_text'][p]} a day"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["poverty_gap_index"][
-                view
-            ].replace("{p}", str(pip_povlines_abs["cents"][p]))
-            df_graphers.loc[j, "Indicator Dropdown"] = "Poverty gap index"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_abs['povline_dropdown'][p]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The poverty gap index is a poverty measure that reflects both the prevalence and the depth of poverty. It is calculated as the share of population in poverty multiplied by the average shortfall from the poverty line (expressed as a % of the poverty line)."
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-        # Headcount ratio (rel)
-        for pct in range(len(pip_povlines_rel)):
-            df_graphers.loc[j, "title"] = f"{pip_povlines_rel['title_share'][pct]}"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["headcount_ratio_rel"][
-                view
-            ].replace("{pct}", pip_povlines_rel["slug_suffix"][pct])
-            df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_rel['dropdown'][pct]}"
-            df_graphers.loc[j, "subtitle"] = datasets_description
-            df_graphers.loc[
-                j, "note"
-            ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {pip_povlines_rel['text'][pct]}"
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Headcount (rel)
-            df_graphers.loc[j, "title"] = f"{pip_povlines_rel['title_number'][pct]}"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["headcount_rel"][
-                view
-            ].replace("{pct}", pip_povlines_rel["slug_suffix"][pct])
-            df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_rel['dropdown'][pct]}"
-            df_graphers.loc[j, "subtitle"] = datasets_description
-            df_graphers.loc[
-                j, "note"
-            ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {pip_povlines_rel['text'][pct]}"
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Total shortfall (rel)
-            df_graphers.loc[
-                j, "title"
-            ] = f"Total shortfall from a poverty line of {pip_povlines_rel['text'][pct]} income"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["total_shortfall_rel"][
-                view
-            ].replace("{pct}", pip_povlines_rel["slug_suffix"][pct])
-            df_graphers.loc[
-                j, "Indicator Dropdown"
-            ] = "Total shortfall from poverty line"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_rel['dropdown'][pct]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This is the amount of money that would be theoretically needed to lift the incomes of all people in poverty up to {pip_povlines_rel.text[pct]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Average shortfall ($) (rel)
-            df_graphers.loc[
-                j, "title"
-            ] = f"Average shortfall from a poverty line of {pip_povlines_rel['text'][pct]} income"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["avg_shortfall_rel"][
-                view
-            ].replace("{pct}", pip_povlines_rel["slug_suffix"][pct])
-            df_graphers.loc[j, "Indicator Dropdown"] = "Average shortfall ($)"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_rel['dropdown'][pct]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This is the amount of money that would be theoretically needed to lift the incomes of all people in poverty up to {pip_povlines_rel['text'][pct]} income, averaged across the population in poverty."
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Average shortfall (% of poverty line) (rel)
-            df_graphers.loc[
-                j, "title"
-            ] = f"Average shortfall from a poverty line of {pip_povlines_rel['text'][pct]} income (as a share of the poverty line)"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["income_gap_ratio_rel"][
-                view
-            ].replace("{pct}", pip_povlines_rel["slug_suffix"][pct])
-            df_graphers.loc[
-                j, "Indicator Dropdown"
-            ] = "Average shortfall (% of poverty line)"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_rel['dropdown'][pct]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f'This is the average shortfall expressed as a share of the poverty line, sometimes called the "income gap ratio". It captures the depth of poverty of those living on less than {pip_povlines_rel.text[pct]} income.'
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-            # Poverty gap index (rel)
-            df_graphers.loc[
-                j, "title"
-            ] = f"Poverty gap index at {pip_povlines_rel['text'][pct]} income"
-            df_graphers.loc[j, "ySlugs"] = source_checkbox["poverty_gap_index_rel"][
-                view
-            ].replace("{pct}", pip_povlines_rel["slug_suffix"][pct])
-            df_graphers.loc[j, "Indicator Dropdown"] = "Poverty gap index"
-            df_graphers.loc[
-                j, "Poverty line Dropdown"
-            ] = f"{pip_povlines_rel['dropdown'][pct]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The poverty gap index is a poverty measure that reflects both the prevalence and the depth of poverty. It is calculated as the share of population in poverty multiplied by the average shortfall from the poverty line (expressed as a % of the poverty line)."
-            df_graphers.loc[
-                j, "note"
-            ] = f"{datasets_description} This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "type"] = np.nan
-            j += 1
-
-    df_graphers["tableSlug"] = merged_tables["name"][tab]
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # Add yAxisMin and mapTargetTime
 df_graphers["yAxisMin"] = yAxisMin
@@ -1251,14 +1183,13 @@ df_graphers["relatedQuestionUrl"] = np.nan
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Indicator Dropdown"] == "Share in poverty")
-    & (
-        df_graphers["Poverty line Dropdown"]
-        == "$2.15 per day: International Poverty Line"
-    ),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Indicator Dropdown": "Share in poverty",
+        "Poverty line Dropdown": "$2.15 per day: International Poverty Line",
+    },
+)
 
 
 # %% [markdown]
@@ -1269,32 +1200,23 @@ df_graphers.loc[
 # Define list of variables to iterate: table names (from table dataframe)
 table_list = list(df_tables["tableSlug"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in table_list:
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tab].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tab]
         f.write(
             "\ntable\t"
             + merged_tables.loc[merged_tables["name"] == tab, "link"].item()
             + "\t"
             + tab
         )
-        f.write("\ncolumns\t" + tab + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tab + "\n")
+        write_frame(f, table_tsv, index=False)
@@ -2,7 +2,7 @@
 # # Incomes across the distribution explorer
 # This code creates the tsv file for the incomes across the distribution explorer from the World Bank PIP data, available [here](https://owid.cloud/admin/explorers/preview/incomes-across-distribution-ppp2017)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,17 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "incomes-across-distribution-ppp2017.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.rewriting import RewriteRules  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, derive_views, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "incomes-across-distribution-ppp2017.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,25 +33,21 @@ sheet_id = "17KJ9YcvfdmO_7-Sv2Ij0vmzAQI6rXSIqHfJtgFHN-a8"
 
 # Settings for 10 deciles variables (share, avg) sheet
 sheet_name = "deciles10"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles10 = pd.read_csv(url, dtype={"dropdown": "str", "decile": "str"})
+deciles10 = read_sheet(sheet_id, sheet_name, dtype={"dropdown": "str", "decile": "str"})
 
 # Settings for 9 deciles variables (thr) sheet
 sheet_name = "deciles9"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles9 = pd.read_csv(url, dtype={"dropdown": "str", "decile": "str"})
+deciles9 = read_sheet(sheet_id, sheet_name, dtype={"dropdown": "str", "decile": "str"})
 
 # Income aggregation sheet (day, month, year)
 sheet_name = "income_aggregation"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-income_aggregation = pd.read_csv(
-    url, keep_default_na=False, dtype={"multiplier": "str"}
+income_aggregation = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"multiplier": "str"}
 )
 
 # Survey type sheet
 sheet_name = "survey_type"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-survey_type = pd.read_csv(url)
+survey_type = read_sheet(sheet_id, sheet_name)
 
 # %% [markdown]
 # ## Header
@@ -91,315 +97,301 @@ processing_description = new_line.join(
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
 # Table generation
-df_tables = pd.DataFrame()
-j = 0
-
-for survey in range(len(survey_type)):
-    # Raw variables to not break aggregations
-    # mean
-    df_tables.loc[j, "name"] = f"Mean {survey_type.text[survey]} per day"
-    df_tables.loc[j, "slug"] = f"mean"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
+# Capitalized texts, for the start of names, titles and dropdown options
+deciles10["ordinal_capitalized"] = deciles10["ordinal"].str.capitalize()
+deciles9["ordinal_capitalized"] = deciles9["ordinal"].str.capitalize()
+income_aggregation["aggregation_title"] = income_aggregation["aggregation"].str.title()
+survey_type["text_capitalized"] = survey_type["text"].str.capitalize()
+
+df_tables = expand_views(
+    Each(
+        {"survey": survey_type},
         [
-            f"The mean level of {survey_type.text[survey]} per person per day.",
-            ppp_description,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # median
-    df_tables.loc[j, "name"] = f"Median {survey_type.text[survey]} per day"
-    df_tables.loc[j, "slug"] = f"median"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per person per day below which half of the population falls.",
-            ppp_description,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Blues"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    for dec9 in range(len(deciles9)):
-        # thresholds
-        df_tables.loc[j, "name"] = deciles9.ordinal[dec9].capitalize()
-        df_tables.loc[j, "slug"] = f"decile{deciles9.decile[dec9]}_thr"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The level of {survey_type.text[survey]} per person per day below which {deciles9.decile[dec9]}0% of the population falls.",
-                ppp_description,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables.loc[j, "shortUnit"] = "$"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Purples"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    for dec10 in range(len(deciles10)):
-        # averages
-        df_tables.loc[j, "name"] = deciles10.ordinal[dec10].capitalize()
-        df_tables.loc[j, "slug"] = f"decile{deciles10.decile[dec10]}_avg"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The mean {survey_type.text[survey]} per person per day within the {deciles10.ordinal[dec10]} (tenth of the population).",
-                ppp_description,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables.loc[j, "shortUnit"] = "$"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Greens"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    for dec10 in range(len(deciles10)):
-        # shares
-        df_tables.loc[j, "name"] = deciles10.ordinal[dec10].capitalize()
-        df_tables.loc[j, "slug"] = f"decile{deciles10.decile[dec10]}_share"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The {survey_type.text[survey]} of the {deciles10.ordinal[dec10]} (tenth of the population) as a share of total {survey_type.text[survey]}.",
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = deciles10.scale_share[dec10]
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Aggregations
-    for agg in range(len(income_aggregation)):
-        # mean
-        df_tables.loc[
-            j, "name"
-        ] = f"Mean {survey_type.text[survey]} per {income_aggregation.aggregation[agg]}"
-        df_tables.loc[j, "slug"] = f"mean{income_aggregation.slug_suffix[agg]}"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The mean level of {survey_type.text[survey]} per person per {income_aggregation.aggregation[agg]}.",
-                ppp_description,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables.loc[j, "shortUnit"] = "$"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = income_aggregation.scale[agg]
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-        df_tables.loc[
-            j, "transform"
-        ] = f"multiplyBy mean {income_aggregation.multiplier[agg]}"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-        # median
-        df_tables.loc[
-            j, "name"
-        ] = f"Median {survey_type.text[survey]} per {income_aggregation.aggregation[agg]}"
-        df_tables.loc[j, "slug"] = f"median{income_aggregation.slug_suffix[agg]}"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The level of {survey_type.text[survey]} per person per {income_aggregation.aggregation[agg]} below which half of the population falls.",
-                ppp_description,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-        df_tables.loc[j, "shortUnit"] = "$"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = income_aggregation.scale[agg]
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Blues"
-        df_tables.loc[
-            j, "transform"
-        ] = f"multiplyBy median {income_aggregation.multiplier[agg]}"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-        for dec9 in range(len(deciles9)):
-            # thresholds
-            df_tables.loc[j, "name"] = deciles9.ordinal[dec9].capitalize()
-            df_tables.loc[
-                j, "slug"
-            ] = f"decile{deciles9.decile[dec9]}_thr{income_aggregation.slug_suffix[agg]}"
-            df_tables.loc[
-                j, "sourceName"
-            ] = "World Bank Poverty and Inequality Platform (2022)"
-            df_tables.loc[j, "description"] = new_line.join(
+            # Raw variables to not break aggregations
+            # mean
+            {
+                "name": "Mean ${survey__text} per day",
+                "slug": "mean",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The mean level of ${survey__text} per person per day.",
+                        escape(ppp_description),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;100",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "BuGn",
+                "survey_type": Column("survey__table_name"),
+            },
+            # median
+            {
+                "name": "Median ${survey__text} per day",
+                "slug": "median",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per person per day below which half of the population falls.",
+                        escape(ppp_description),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;100",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Blues",
+                "survey_type": Column("survey__table_name"),
+            },
+            Each(
+                {"dec9": deciles9},
                 [
-                    f"The level of {survey_type.text[survey]} per person per {income_aggregation.aggregation[agg]} below which {deciles9.decile[dec9]}0% of the population falls.",
-                    ppp_description,
-                    survey_type.description[survey],
-                    additional_description,
-                    notes_title,
-                    processing_description,
-                ]
-            )
-            df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-            df_tables.loc[
-                j, "dataPublishedBy"
-            ] = "World Bank Poverty and Inequality Platform (PIP)"
-            df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "tolerance"] = 5
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-            df_tables.loc[j, "colorScaleNumericBins"] = deciles9[
-                f"scale_thr_{income_aggregation.aggregation[agg]}"
-            ][dec9]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "Purples"
-            df_tables.loc[
-                j, "transform"
-            ] = f"multiplyBy decile{deciles9.decile[dec9]}_thr {income_aggregation.multiplier[agg]}"
-            df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-            j += 1
-
-        for dec10 in range(len(deciles10)):
-            # averages
-            df_tables.loc[j, "name"] = deciles10.ordinal[dec10].capitalize()
-            df_tables.loc[
-                j, "slug"
-            ] = f"decile{deciles10.decile[dec10]}_avg{income_aggregation.slug_suffix[agg]}"
-            df_tables.loc[
-                j, "sourceName"
-            ] = "World Bank Poverty and Inequality Platform (2022)"
-            df_tables.loc[j, "description"] = new_line.join(
+                    # thresholds
+                    {
+                        "name": Column("dec9__ordinal_capitalized"),
+                        "slug": "decile${dec9__decile}_thr",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "The level of ${survey__text} per person per day below which ${dec9__decile}0% of the population falls.",
+                                escape(ppp_description),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "1;2;5;10;20;50;100",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Purples",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            Each(
+                {"dec10": deciles10},
                 [
-                    f"The mean {survey_type.text[survey]} per person per {income_aggregation.aggregation[agg]} within the {deciles10.ordinal[dec10]} (tenth of the population).",
-                    ppp_description,
-                    survey_type.description[survey],
-                    additional_description,
-                    notes_title,
-                    processing_description,
-                ]
-            )
-            df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-            df_tables.loc[
-                j, "dataPublishedBy"
-            ] = "World Bank Poverty and Inequality Platform (PIP)"
-            df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "tolerance"] = 5
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-            df_tables.loc[j, "colorScaleNumericBins"] = deciles10[
-                f"scale_avg_{income_aggregation.aggregation[agg]}"
-            ][dec10]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "Greens"
-            df_tables.loc[
-                j, "transform"
-            ] = f"multiplyBy decile{deciles10.decile[dec10]}_avg {income_aggregation.multiplier[agg]}"
-            df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-            j += 1
+                    # averages
+                    {
+                        "name": Column("dec10__ordinal_capitalized"),
+                        "slug": "decile${dec10__decile}_avg",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "The mean ${survey__text} per person per day within the ${dec10__ordinal} (tenth of the population).",
+                                escape(ppp_description),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "1;2;5;10;20;50;100",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Greens",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            Each(
+                {"dec10": deciles10},
+                [
+                    # shares
+                    {
+                        "name": Column("dec10__ordinal_capitalized"),
+                        "slug": "decile${dec10__decile}_share",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "The ${survey__text} of the ${dec10__ordinal} (tenth of the population) as a share of total ${survey__text}.",
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": Column("dec10__scale_share"),
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Aggregations
+            Each(
+                {"agg": income_aggregation},
+                [
+                    # mean
+                    {
+                        "name": "Mean ${survey__text} per ${agg__aggregation}",
+                        "slug": "mean${agg__slug_suffix}",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "The mean level of ${survey__text} per person per ${agg__aggregation}.",
+                                escape(ppp_description),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": Column("agg__scale"),
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "BuGn",
+                        "transform": "multiplyBy mean ${agg__multiplier}",
+                        "survey_type": Column("survey__table_name"),
+                    },
+                    # median
+                    {
+                        "name": "Median ${survey__text} per ${agg__aggregation}",
+                        "slug": "median${agg__slug_suffix}",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "The level of ${survey__text} per person per ${agg__aggregation} below which half of the population falls.",
+                                escape(ppp_description),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "international-$$ in 2017 prices",
+                        "shortUnit": "$$",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": Column("agg__scale"),
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Blues",
+                        "transform": "multiplyBy median ${agg__multiplier}",
+                        "survey_type": Column("survey__table_name"),
+                    },
+                    Each(
+                        {"dec9": deciles9},
+                        [
+                            # thresholds
+                            {
+                                "name": Column("dec9__ordinal_capitalized"),
+                                "slug": "decile${dec9__decile}_thr${agg__slug_suffix}",
+                                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${survey__text} per person per ${agg__aggregation} below which ${dec9__decile}0% of the population falls.",
+                                        escape(ppp_description),
+                                        "${survey__description}",
+                                        escape(additional_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                    ]
+                                ),
+                                "sourceLink": "https://pip.worldbank.org/",
+                                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "tolerance": 5,
+                                "type": "Numeric",
+                                "colorScaleNumericMinValue": 0,
+                                "colorScaleNumericBins": Column(
+                                    "dec9__scale_thr_${agg__aggregation}"
+                                ),
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "Purples",
+                                "transform": "multiplyBy decile${dec9__decile}_thr ${agg__multiplier}",
+                                "survey_type": Column("survey__table_name"),
+                            }
+                        ],
+                    ),
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            # averages
+                            {
+                                "name": Column("dec10__ordinal_capitalized"),
+                                "slug": "decile${dec10__decile}_avg${agg__slug_suffix}",
+                                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                                "description": new_line.join(
+                                    [
+                                        "The mean ${survey__text} per person per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population).",
+                                        escape(ppp_description),
+                                        "${survey__description}",
+                                        escape(additional_description),
+                                        escape(notes_title),
+                                        escape(processing_description),
+                                    ]
+                                ),
+                                "sourceLink": "https://pip.worldbank.org/",
+                                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                                "unit": "international-$$ in 2017 prices",
+                                "shortUnit": "$$",
+                                "tolerance": 5,
+                                "type": "Numeric",
+                                "colorScaleNumericMinValue": 0,
+                                "colorScaleNumericBins": Column(
+                                    "dec10__scale_avg_${agg__aggregation}"
+                                ),
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "Greens",
+                                "transform": "multiplyBy decile${dec10__decile}_avg ${agg__multiplier}",
+                                "survey_type": Column("survey__table_name"),
+                            }
+                        ],
+                    ),
+                ],
+            ),
+        ],
+    )
+)
 
 # Make tolerance integer (to not break the parameter in the platform)
 df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
@@ -409,56 +401,55 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 # These variables consider a breaks in the series due to changes in surveys' methodology. Special modifications have to be included to graph monthly and yearly variables properly.
 
 # %%
-# Create master table for line breaks
-df_spells = pd.DataFrame()
-j = 0
-
-for i in range(len(df_tables)):
-    for c_spell in range(1, 7):
-        df_spells.loc[j, "master_var"] = df_tables.slug[i]
-        df_spells.loc[j, "name"] = "Consumption surveys"
-        df_spells.loc[j, "slug"] = f"consumption_spell_{c_spell}"
-        df_spells.loc[j, "sourceName"] = df_tables.sourceName[i]
-        df_spells.loc[j, "description"] = df_tables.description[i]
-        df_spells.loc[j, "sourceLink"] = df_tables.sourceLink[i]
-        df_spells.loc[j, "dataPublishedBy"] = df_tables.dataPublishedBy[i]
-        df_spells.loc[j, "unit"] = df_tables.unit[i]
-        df_spells.loc[j, "shortUnit"] = df_tables.shortUnit[i]
-        df_spells.loc[j, "tolerance"] = df_tables.tolerance[i]
-        df_spells.loc[j, "type"] = df_tables.type[i]
-        df_spells.loc[
-            j, "colorScaleNumericMinValue"
-        ] = df_tables.colorScaleNumericMinValue[i]
-        df_spells.loc[j, "colorScaleNumericBins"] = df_tables.colorScaleNumericBins[i]
-        df_spells.loc[j, "colorScaleEqualSizeBins"] = df_tables.colorScaleEqualSizeBins[
-            i
-        ]
-        df_spells.loc[j, "colorScaleScheme"] = df_tables.colorScaleScheme[i]
-        df_spells.loc[j, "survey_type"] = df_tables.survey_type[i]
-        j += 1
+# Create master table for line breaks: every variable of df_tables, once per consumption spell and once per income spell
+spell_fields = {
+    column: Column(f"var__{column}")
+    for column in [
+        "sourceName",
+        "description",
+        "sourceLink",
+        "dataPublishedBy",
+        "unit",
+        "shortUnit",
+        "tolerance",
+        "type",
+        "colorScaleNumericMinValue",
+        "colorScaleNumericBins",
+        "colorScaleEqualSizeBins",
+        "colorScaleScheme",
+        "survey_type",
+    ]
+}
 
-    for i_spell in range(1, 8):
-        df_spells.loc[j, "master_var"] = df_tables.slug[i]
-        df_spells.loc[j, "name"] = "Income surveys"
-        df_spells.loc[j, "slug"] = f"income_spell_{i_spell}"
-        df_spells.loc[j, "sourceName"] = df_tables.sourceName[i]
-        df_spells.loc[j, "description"] = df_tables.description[i]
-        df_spells.loc[j, "sourceLink"] = df_tables.sourceLink[i]
-        df_spells.loc[j, "dataPublishedBy"] = df_tables.dataPublishedBy[i]
-        df_spells.loc[j, "unit"] = df_tables.unit[i]
-        df_spells.loc[j, "shortUnit"] = df_tables.shortUnit[i]
-        df_spells.loc[j, "tolerance"] = df_tables.tolerance[i]
-        df_spells.loc[j, "type"] = df_tables.type[i]
-        df_spells.loc[
-            j, "colorScaleNumericMinValue"
-        ] = df_tables.colorScaleNumericMinValue[i]
-        df_spells.loc[j, "colorScaleNumericBins"] = df_tables.colorScaleNumericBins[i]
-        df_spells.loc[j, "colorScaleEqualSizeBins"] = df_tables.colorScaleEqualSizeBins[
-            i
-        ]
-        df_spells.loc[j, "colorScaleScheme"] = df_tables.colorScaleScheme[i]
-        df_spells.loc[j, "survey_type"] = df_tables.survey_type[i]
-        j += 1
+df_spells = expand_views(
+    Each(
+        {"var": df_tables},
+        [
+            Each(
+                {"spell": pd.DataFrame({"number": range(1, 7)})},
+                [
+                    {
+                        "master_var": Column("var__slug"),
+                        "name": "Consumption surveys",
+                        "slug": "consumption_spell_${spell__number}",
+                        **spell_fields,
+                    }
+                ],
+            ),
+            Each(
+                {"spell": pd.DataFrame({"number": range(1, 8)})},
+                [
+                    {
+                        "master_var": Column("var__slug"),
+                        "name": "Income surveys",
+                        "slug": "income_spell_${spell__number}",
+                        **spell_fields,
+                    }
+                ],
+            ),
+        ],
+    )
+)
 
 # Delete monthly and yearly variables, because there are not spells files for them
 df_spells = df_spells[~df_spells["master_var"].str.contains("_month")].reset_index(
@@ -509,289 +500,204 @@ df_spells["tolerance"] = df_spells["tolerance"].astype("Int64")
 # %%
 # Grapher table generation
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for survey in range(len(survey_type)):
-    for agg in range(len(income_aggregation)):
-        # mean
-        df_graphers.loc[
-            j, "title"
-        ] = f"Mean {survey_type.text[survey]} per {income_aggregation.aggregation[agg]}"
-        df_graphers.loc[j, "ySlugs"] = f"mean{income_aggregation.slug_suffix[agg]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Mean income or consumption"
-        df_graphers.loc[j, "Decile Dropdown"] = np.nan
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[
-            j, "Period Radio"
-        ] = f"{income_aggregation.aggregation[agg].title()}"
-        df_graphers.loc[
-            j, "Show breaks between less comparable surveys Checkbox"
-        ] = "false"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "yScaleToggle"] = "true"
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-        # median
-        df_graphers.loc[
-            j, "title"
-        ] = f"Median {survey_type.text[survey]} per {income_aggregation.aggregation[agg]}"
-        df_graphers.loc[j, "ySlugs"] = f"median{income_aggregation.slug_suffix[agg]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Median income or consumption"
-        df_graphers.loc[j, "Decile Dropdown"] = np.nan
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[
-            j, "Period Radio"
-        ] = f"{income_aggregation.aggregation[agg].title()}"
-        df_graphers.loc[
-            j, "Show breaks between less comparable surveys Checkbox"
-        ] = "false"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "yScaleToggle"] = "true"
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-        for dec9 in range(len(deciles9)):
-            # thresholds
-            df_graphers.loc[
-                j, "title"
-            ] = f"Threshold {survey_type.text[survey]} per {income_aggregation.aggregation[agg]} marking the {deciles9.ordinal[dec9]}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"decile{deciles9.decile[dec9]}_thr{income_aggregation.slug_suffix[agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-            df_graphers.loc[j, "Decile Dropdown"] = f"{deciles9.dropdown[dec9]}"
-            df_graphers.loc[
-                j, "Household survey data type Dropdown"
-            ] = f"{survey_type.dropdown_option[survey]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation.aggregation[agg].title()}"
-            df_graphers.loc[
-                j, "Show breaks between less comparable surveys Checkbox"
-            ] = "false"
-            df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The level of {survey_type.text_ineq[survey]} per person per {income_aggregation.aggregation[agg]} below which {deciles9.decile[dec9]}0% of the population falls."
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-            df_graphers.loc[j, "type"] = np.nan
-            df_graphers.loc[j, "yAxisMin"] = 0
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            df_graphers.loc[j, "mapTargetTime"] = 2019
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-            j += 1
-
-        for dec10 in range(len(deciles10)):
-            # averages
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean {survey_type.text[survey]} per {income_aggregation.aggregation[agg]} within the {deciles10.ordinal[dec10]}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"decile{deciles10.decile[dec10]}_avg{income_aggregation.slug_suffix[agg]}"
-            df_graphers.loc[
-                j, "Indicator Dropdown"
-            ] = "Mean income or consumption, by decile"
-            df_graphers.loc[j, "Decile Dropdown"] = f"{deciles10.dropdown[dec10]}"
-            df_graphers.loc[
-                j, "Household survey data type Dropdown"
-            ] = f"{survey_type.dropdown_option[survey]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation.aggregation[agg].title()}"
-            df_graphers.loc[
-                j, "Show breaks between less comparable surveys Checkbox"
-            ] = "false"
-            df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The mean {survey_type.text_ineq[survey]} per person per {income_aggregation.aggregation[agg]} within the {deciles10.ordinal[dec10]} (tenth of the population)."
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-            df_graphers.loc[j, "type"] = np.nan
-            df_graphers.loc[j, "yAxisMin"] = 0
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            df_graphers.loc[j, "mapTargetTime"] = 2019
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-            j += 1
-
-        # Only add relative toggle to these
-        # thresholds - multiple deciles
-        df_graphers.loc[
-            j, "title"
-        ] = f"Threshold {survey_type.text[survey]} per {income_aggregation.aggregation[agg]} for each decile"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"decile1_thr{income_aggregation.slug_suffix[agg]} decile2_thr{income_aggregation.slug_suffix[agg]} decile3_thr{income_aggregation.slug_suffix[agg]} decile4_thr{income_aggregation.slug_suffix[agg]} decile5_thr{income_aggregation.slug_suffix[agg]} decile6_thr{income_aggregation.slug_suffix[agg]} decile7_thr{income_aggregation.slug_suffix[agg]} decile8_thr{income_aggregation.slug_suffix[agg]} decile9_thr{income_aggregation.slug_suffix[agg]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-        df_graphers.loc[j, "Decile Dropdown"] = "All deciles"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[
-            j, "Period Radio"
-        ] = f"{income_aggregation.aggregation[agg].title()}"
-        df_graphers.loc[
-            j, "Show breaks between less comparable surveys Checkbox"
-        ] = "false"
-        df_graphers.loc[j, "hideRelativeToggle"] = "false"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The level of {survey_type.text_ineq[survey]} per person per {income_aggregation.aggregation[agg]} below which 10%, 20%, 30%, etc. of the population falls."
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = np.nan
-        df_graphers.loc[j, "tab"] = np.nan
-        df_graphers.loc[j, "mapTargetTime"] = np.nan
-        df_graphers.loc[j, "yScaleToggle"] = "true"
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-        # averages - multiple deciles
-        df_graphers.loc[
-            j, "title"
-        ] = f"Mean {survey_type.text[survey]} per {income_aggregation.aggregation[agg]} within each decile"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"decile1_avg{income_aggregation.slug_suffix[agg]} decile2_avg{income_aggregation.slug_suffix[agg]} decile3_avg{income_aggregation.slug_suffix[agg]} decile4_avg{income_aggregation.slug_suffix[agg]} decile5_avg{income_aggregation.slug_suffix[agg]} decile6_avg{income_aggregation.slug_suffix[agg]} decile7_avg{income_aggregation.slug_suffix[agg]} decile8_avg{income_aggregation.slug_suffix[agg]} decile9_avg{income_aggregation.slug_suffix[agg]} decile10_avg{income_aggregation.slug_suffix[agg]}"
-        df_graphers.loc[
-            j, "Indicator Dropdown"
-        ] = "Mean income or consumption, by decile"
-        df_graphers.loc[j, "Decile Dropdown"] = "All deciles"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[
-            j, "Period Radio"
-        ] = f"{income_aggregation.aggregation[agg].title()}"
-        df_graphers.loc[
-            j, "Show breaks between less comparable surveys Checkbox"
-        ] = "false"
-        df_graphers.loc[j, "hideRelativeToggle"] = "false"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The mean {survey_type.text_ineq[survey]} per person per {income_aggregation.aggregation[agg]} within each decile (tenth of the population)."
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = np.nan
-        df_graphers.loc[j, "tab"] = np.nan
-        df_graphers.loc[j, "mapTargetTime"] = np.nan
-        df_graphers.loc[j, "yScaleToggle"] = "true"
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Shares do not have aggregation nor relative change
-    for dec10 in range(len(deciles10)):
-        # shares
-        df_graphers.loc[
-            j, "title"
-        ] = f"{survey_type.text[survey].capitalize()} share of the {deciles10.ordinal[dec10]}"
-        df_graphers.loc[j, "ySlugs"] = f"decile{deciles10.decile[dec10]}_share"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-        df_graphers.loc[j, "Decile Dropdown"] = f"{deciles10.dropdown[dec10]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "Period Radio"] = np.nan
-        df_graphers.loc[
-            j, "Show breaks between less comparable surveys Checkbox"
-        ] = "false"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of {survey_type.text_ineq[survey]} received by the {deciles10.ordinal[dec10]} (tenth of the population)."
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "yScaleToggle"] = "false"
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # shares - multiple deciles
-    df_graphers.loc[
-        j, "title"
-    ] = f"{survey_type.text[survey].capitalize()} share for each decile"
-    df_graphers.loc[
-        j, "ySlugs"
-    ] = f"decile1_share decile2_share decile3_share decile4_share decile5_share decile6_share decile7_share decile8_share decile9_share decile10_share"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-    df_graphers.loc[j, "Decile Dropdown"] = "All deciles"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "Period Radio"] = np.nan
-    df_graphers.loc[j, "Show breaks between less comparable surveys Checkbox"] = "false"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The share of {survey_type.text_ineq[survey]} received by each decile (tenth of the population)."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = np.nan
-    df_graphers.loc[j, "tab"] = np.nan
-    df_graphers.loc[j, "mapTargetTime"] = np.nan
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
+df_graphers = expand_views(
+    Each(
+        {"survey": survey_type},
+        [
+            Each(
+                {"agg": income_aggregation},
+                [
+                    # mean
+                    {
+                        "title": "Mean ${survey__text} per ${agg__aggregation}",
+                        "ySlugs": "mean${agg__slug_suffix}",
+                        "Indicator Dropdown": "Mean income or consumption",
+                        "Decile Dropdown": np.nan,
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "Period Radio": "${agg__aggregation_title}",
+                        "Show breaks between less comparable surveys Checkbox": "false",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                        "note": "This data is expressed in international-$$ at 2017 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "yScaleToggle": "true",
+                        "survey_type": Column("survey__table_name"),
+                    },
+                    # median
+                    {
+                        "title": "Median ${survey__text} per ${agg__aggregation}",
+                        "ySlugs": "median${agg__slug_suffix}",
+                        "Indicator Dropdown": "Median income or consumption",
+                        "Decile Dropdown": np.nan,
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "Period Radio": "${agg__aggregation_title}",
+                        "Show breaks between less comparable surveys Checkbox": "false",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                        "note": "This data is expressed in international-$$ at 2017 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "yScaleToggle": "true",
+                        "survey_type": Column("survey__table_name"),
+                    },
+                    Each(
+                        {"dec9": deciles9},
+                        [
+                            # thresholds
+                            {
+                                "title": "Threshold ${survey__text} per ${agg__aggregation} marking the ${dec9__ordinal}",
+                                "ySlugs": "decile${dec9__decile}_thr${agg__slug_suffix}",
+                                "Indicator Dropdown": "Decile thresholds",
+                                "Decile Dropdown": "${dec9__dropdown}",
+                                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_title}",
+                                "Show breaks between less comparable surveys Checkbox": "false",
+                                "tableSlug": "${survey__table_name}",
+                                "subtitle": "The level of ${survey__text_ineq} per person per ${agg__aggregation} below which ${dec9__decile}0% of the population falls.",
+                                "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                                "type": np.nan,
+                                "yAxisMin": 0,
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                                "mapTargetTime": 2019,
+                                "yScaleToggle": "true",
+                                "survey_type": Column("survey__table_name"),
+                            }
+                        ],
+                    ),
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            # averages
+                            {
+                                "title": "Mean ${survey__text} per ${agg__aggregation} within the ${dec10__ordinal}",
+                                "ySlugs": "decile${dec10__decile}_avg${agg__slug_suffix}",
+                                "Indicator Dropdown": "Mean income or consumption, by decile",
+                                "Decile Dropdown": "${dec10__dropdown}",
+                                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_title}",
+                                "Show breaks between less comparable surveys Checkbox": "false",
+                                "tableSlug": "${survey__table_name}",
+                                "subtitle": "The mean ${survey__text_ineq} per person per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population).",
+                                "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                                "type": np.nan,
+                                "yAxisMin": 0,
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                                "mapTargetTime": 2019,
+                                "yScaleToggle": "true",
+                                "survey_type": Column("survey__table_name"),
+                            }
+                        ],
+                    ),
+                    # Only add relative toggle to these
+                    # thresholds - multiple deciles
+                    {
+                        "title": "Threshold ${survey__text} per ${agg__aggregation} for each decile",
+                        "ySlugs": "decile1_thr${agg__slug_suffix} decile2_thr${agg__slug_suffix} decile3_thr${agg__slug_suffix} decile4_thr${agg__slug_suffix} decile5_thr${agg__slug_suffix} decile6_thr${agg__slug_suffix} decile7_thr${agg__slug_suffix} decile8_thr${agg__slug_suffix} decile9_thr${agg__slug_suffix}",
+                        "Indicator Dropdown": "Decile thresholds",
+                        "Decile Dropdown": "All deciles",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "Period Radio": "${agg__aggregation_title}",
+                        "Show breaks between less comparable surveys Checkbox": "false",
+                        "hideRelativeToggle": "false",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "The level of ${survey__text_ineq} per person per ${agg__aggregation} below which 10%, 20%, 30%, etc. of the population falls.",
+                        "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": np.nan,
+                        "tab": np.nan,
+                        "mapTargetTime": np.nan,
+                        "yScaleToggle": "true",
+                        "survey_type": Column("survey__table_name"),
+                    },
+                    # averages - multiple deciles
+                    {
+                        "title": "Mean ${survey__text} per ${agg__aggregation} within each decile",
+                        "ySlugs": "decile1_avg${agg__slug_suffix} decile2_avg${agg__slug_suffix} decile3_avg${agg__slug_suffix} decile4_avg${agg__slug_suffix} decile5_avg${agg__slug_suffix} decile6_avg${agg__slug_suffix} decile7_avg${agg__slug_suffix} decile8_avg${agg__slug_suffix} decile9_avg${agg__slug_suffix} decile10_avg${agg__slug_suffix}",
+                        "Indicator Dropdown": "Mean income or consumption, by decile",
+                        "Decile Dropdown": "All deciles",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "Period Radio": "${agg__aggregation_title}",
+                        "Show breaks between less comparable surveys Checkbox": "false",
+                        "hideRelativeToggle": "false",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "The mean ${survey__text_ineq} per person per ${agg__aggregation} within each decile (tenth of the population).",
+                        "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": np.nan,
+                        "tab": np.nan,
+                        "mapTargetTime": np.nan,
+                        "yScaleToggle": "true",
+                        "survey_type": Column("survey__table_name"),
+                    },
+                ],
+            ),
+            # Shares do not have aggregation nor relative change
+            Each(
+                {"dec10": deciles10},
+                [
+                    # shares
+                    {
+                        "title": "${survey__text_capitalized} share of the ${dec10__ordinal}",
+                        "ySlugs": "decile${dec10__decile}_share",
+                        "Indicator Dropdown": "Decile shares",
+                        "Decile Dropdown": "${dec10__dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "Period Radio": np.nan,
+                        "Show breaks between less comparable surveys Checkbox": "false",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "The share of ${survey__text_ineq} received by the ${dec10__ordinal} (tenth of the population).",
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "yScaleToggle": "false",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # shares - multiple deciles
+            {
+                "title": "${survey__text_capitalized} share for each decile",
+                "ySlugs": "decile1_share decile2_share decile3_share decile4_share decile5_share decile6_share decile7_share decile8_share decile9_share decile10_share",
+                "Indicator Dropdown": "Decile shares",
+                "Decile Dropdown": "All deciles",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "Period Radio": np.nan,
+                "Show breaks between less comparable surveys Checkbox": "false",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The share of ${survey__text_ineq} received by each decile (tenth of the population).",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": np.nan,
+                "tab": np.nan,
+                "mapTargetTime": np.nan,
+                "survey_type": Column("survey__table_name"),
+            },
+        ],
+    )
+)
 
 df_graphers["Show breaks between less comparable surveys Checkbox"] = "false"
 
@@ -800,47 +706,31 @@ df_graphers["Show breaks between less comparable surveys Checkbox"] = "false"
 # Similar to the tables, additional modifications have to be done to process monthly and yearly data properly.
 
 # %%
-df_graphers_spells = pd.DataFrame()
-j = 0
-
-for i in range(len(df_graphers)):
-    df_graphers_spells.loc[j, "title"] = df_graphers["title"][i]
-    df_graphers_spells.loc[
-        j, "ySlugs"
-    ] = "consumption_spell_1 consumption_spell_2 consumption_spell_3 consumption_spell_4 consumption_spell_5 consumption_spell_6 income_spell_1 income_spell_2 income_spell_3 income_spell_4 income_spell_5 income_spell_6 income_spell_7"
-    df_graphers_spells.loc[j, "Indicator Dropdown"] = df_graphers["Indicator Dropdown"][
-        i
-    ]
-    df_graphers_spells.loc[j, "Decile Dropdown"] = df_graphers["Decile Dropdown"][i]
-    df_graphers_spells.loc[j, "Household survey data type Dropdown"] = df_graphers[
-        "Household survey data type Dropdown"
-    ][i]
-    df_graphers_spells.loc[j, "Period Radio"] = df_graphers["Period Radio"][i]
-    df_graphers_spells.loc[j, "tableSlug"] = (
-        df_graphers["survey_type"][i] + "_" + df_graphers["ySlugs"][i]
-    )
-    df_graphers_spells.loc[j, "subtitle"] = " ".join(
-        [
-            df_graphers["subtitle"][i],
-            "The chart shows breaks in the comparability of the underlying household survey data over time within each country individually.",
-        ]
-    )
-    df_graphers_spells.loc[j, "note"] = df_graphers["note"][i]
-    df_graphers_spells.loc[j, "type"] = df_graphers["type"][i]
-    df_graphers_spells.loc[j, "yAxisMin"] = df_graphers["yAxisMin"][i]
-    df_graphers_spells.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers_spells.loc[j, "hasMapTab"] = "false"
-    df_graphers_spells.loc[j, "tab"] = np.nan
-    df_graphers_spells.loc[j, "mapTargetTime"] = np.nan
-    df_graphers_spells.loc[
-        j, "Show breaks between less comparable surveys Checkbox"
-    ] = "true"
-    j += 1
-
-# Delete spells views for multiple deciles
-df_graphers_spells = df_graphers_spells[
-    ~(df_graphers_spells["Decile Dropdown"] == "All deciles")
-].reset_index(drop=True)
+# Same views, showing breaks between surveys (except the ones with all deciles)
+df_graphers_spells = derive_views(
+    df_graphers,
+    {
+        "title": Column("title"),
+        "ySlugs": "consumption_spell_1 consumption_spell_2 consumption_spell_3 consumption_spell_4 consumption_spell_5 consumption_spell_6 income_spell_1 income_spell_2 income_spell_3 income_spell_4 income_spell_5 income_spell_6 income_spell_7",
+        "Indicator Dropdown": Column("Indicator Dropdown"),
+        "Decile Dropdown": Column("Decile Dropdown"),
+        "Household survey data type Dropdown": Column(
+            "Household survey data type Dropdown"
+        ),
+        "Period Radio": Column("Period Radio"),
+        "tableSlug": "${survey_type}_${ySlugs}",
+        "subtitle": "${subtitle} The chart shows breaks in the comparability of the underlying household survey data over time within each country individually.",
+        "note": Column("note"),
+        "type": Column("type"),
+        "yAxisMin": Column("yAxisMin"),
+        "selectedFacetStrategy": "entity",
+        "hasMapTab": "false",
+        "tab": np.nan,
+        "mapTargetTime": np.nan,
+        "Show breaks between less comparable surveys Checkbox": "true",
+    },
+    where=df_graphers["Decile Dropdown"] != "All deciles",
+)
 
 # Modify views to be able to see spells for aggregated data
 for agg in range(len(income_aggregation)):
@@ -888,39 +778,44 @@ df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 # "Depending on the country and year, the data relates to income measured after taxes and benefits per capita."
 # "Depending on the country and year, the data relates to consumption per capita."
 
-# When int-$ are not included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
-    "The data relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to consumption per capita.",
-    "The data relates to consumption per capita.",
-    regex=False,
+rewrite_rules = RewriteRules(
+    [
+        # When int-$ are not included
+        (
+            "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
+            "The data relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, the data relates to consumption per capita.",
+            "The data relates to consumption per capita.",
+        ),
+        # When int-$ are included
+        (
+            "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
+            "It relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, it relates to consumption per capita.",
+            "It relates to consumption per capita.",
+        ),
+    ]
 )
+df_graphers["note"] = rewrite_rules.apply(df_graphers["note"])
 
-# When int-$ are included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
-    "It relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to consumption per capita.",
-    "It relates to consumption per capita.",
-    regex=False,
-)
+# Warn about rules that no longer match anything (with OWID_REWRITE_WARNINGS=1)
+rewrite_rules.warn_unused()
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Decile Dropdown"] == "All deciles")
-    & (df_graphers["Indicator Dropdown"] == "Decile thresholds")
-    & (df_graphers["Period Radio"] == "Day")
-    & (df_graphers["Show breaks between less comparable surveys Checkbox"] == "false")
-    & (df_graphers["tableSlug"] == "inc_or_cons"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Decile Dropdown": "All deciles",
+        "Indicator Dropdown": "Decile thresholds",
+        "Period Radio": "Day",
+        "Show breaks between less comparable surveys Checkbox": "false",
+        "tableSlug": "inc_or_cons",
+    },
+)
 
 
 # Reorder dropdown menus
@@ -986,28 +881,22 @@ df_graphers = df_graphers.drop(columns=["metric_dropdown_aux", "decile_dropdown_
 survey_list = list(survey_type["table_name"].unique())
 var_list = list(df_spells["master_var"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Auxiliar variable `survey_type` is dropped and graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers.drop(columns=["survey_type"])
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
+# Auxiliar variable `survey_type` is dropped from the graphers table
+graphers = df_graphers.drop(columns=["survey_type"])
 
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by survey type (and the spell tables by variable and survey type), to write them one by one
+table_blocks = TableBlocks(df_tables, "survey_type")
+spell_blocks = TableBlocks(df_spells, ["master_var", "survey_type"])
 
 # The dataframes are combined, including tables which are filtered by survey type and variable
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, graphers, index=False)
 
     for i in survey_list:
-        table_tsv = (
-            df_tables[df_tables["survey_type"] == i].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["survey_type"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[i]
         f.write(
             "\ntable\t"
             + "https://raw.githubusercontent.com/owid/notebooks/main/BetterDataDocs/JoeHasell/PIP/data/ppp_2017/final/OWID_internal_upload/explorer_database/"
@@ -1017,20 +906,12 @@ with open(outfile, "w", newline="\n", encoding="utf-8") as f:
             + ".csv\t"
             + i
         )
-        f.write("\ncolumns\t" + i + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + i + "\n")
+        write_frame(f, table_tsv, index=False)
 
     for var in var_list:
         for i in survey_list:
-            table_tsv = (
-                df_spells[
-                    (df_spells["master_var"] == var) & (df_spells["survey_type"] == i)
-                ]
-                .copy()
-                .reset_index(drop=True)
-            )
-            table_tsv = table_tsv.drop(columns=["master_var", "survey_type"])
-            table_tsv = table_tsv.to_csv(sep="\t", index=False)
-            table_tsv_indented = textwrap.indent(table_tsv, "\t")
+            table_tsv = spell_blocks[var, i]
             f.write(
                 "\ntable\t"
                 + "https://raw.githubusercontent.com/owid/notebooks/main/BetterDataDocs/JoeHasell/PIP/data/ppp_2017/final/OWID_internal_upload/explorer_database/comparability_data/"
@@ -1042,4 +923,5 @@ with open(outfile, "w", newline="\n", encoding="utf-8") as f:
                 + "_"
                 + var
             )
-            f.write("\ncolumns\t" + i + "_" + var + "\n" + table_tsv_indented)
+            f.write("\ncolumns\t" + i + "_" + var + "\n")
+            write_frame(f, table_tsv, index=False)
@@ -2,7 +2,7 @@
 # # Inequality Data Explorer of World Bank data
 # This code creates the tsv file for the inequality explorer from the World Bank PIP data, available [here](https://owid.cloud/admin/explorers/preview/pip-inequality-explorer)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,17 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "pip-inequality-explorer.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.rewriting import RewriteRules  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, derive_views, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "pip-inequality-explorer.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,13 +33,11 @@ sheet_id = "17KJ9YcvfdmO_7-Sv2Ij0vmzAQI6rXSIqHfJtgFHN-a8"
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_rel = pd.read_csv(url)
+povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # Survey type sheet
 sheet_name = "survey_type"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-survey_type = pd.read_csv(url)
+survey_type = read_sheet(sheet_id, sheet_name)
 
 # %% [markdown]
 # ## Header
@@ -85,151 +93,146 @@ processing_description = new_line.join(
 )
 
 # Table generation
-df_tables = pd.DataFrame()
-j = 0
-
-for survey in range(len(survey_type)):
-    # Gini coefficient
-    df_tables.loc[j, "name"] = f"Gini coefficient"
-    df_tables.loc[j, "slug"] = f"gini"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = np.nan
-    df_tables.loc[j, "shortUnit"] = np.nan
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 1
-    df_tables.loc[j, "colorScaleNumericBins"] = "0.25;0.3;0.35;0.4;0.45;0.5;0.55;0.6"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Oranges"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Share of the top 10%
-    df_tables.loc[
-        j, "name"
-    ] = f"{survey_type.text[survey].capitalize()} share of the richest 10%"
-    df_tables.loc[j, "slug"] = f"decile10_share"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The {survey_type.text[survey]} of the richest decile (tenth of the population) as a share of total {survey_type.text[survey]}.",
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "%"
-    df_tables.loc[j, "shortUnit"] = "%"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 100
-    df_tables.loc[j, "colorScaleNumericBins"] = "20;25;30;35;40;45;50"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Palma ratio
-    df_tables.loc[j, "name"] = f"Palma ratio"
-    df_tables.loc[j, "slug"] = f"palma_ratio"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-    df_tables.loc[j, "unit"] = np.nan
-    df_tables.loc[j, "shortUnit"] = np.nan
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "0.5;1;1.5;2;2.5;3;3.5;4;4.5;5;5.5"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Headcount ratio (rel)
-    df_tables.loc[j, "name"] = f"Share in relative poverty"
-    df_tables.loc[j, "slug"] = f"headcount_ratio_50_median"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The share of population with {survey_type.text_ineq[survey]} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-    df_tables.loc[j, "unit"] = "%"
-    df_tables.loc[j, "shortUnit"] = "%"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "3;6;9;12;15;18;21;24;27"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # MLD
-    df_tables.loc[j, "name"] = f"Mean Log Deviation"
-    df_tables.loc[j, "slug"] = f"mld"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
+# Capitalized texts, for the start of names, titles and dropdown options
+survey_type["text_capitalized"] = survey_type["text"].str.capitalize()
+
+df_tables = expand_views(
+    Each(
+        {"survey": survey_type},
         [
-            f"The mean log deviation (MLD) is a measure of inequality. An MLD of zero indicates perfect equality and it takes on larger positive values as incomes become more unequal. The measure is also referred to as 'Theil L' or 'GE(0)', in reference to the wider families of inequality measures to which the MLD belongs.",
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
+            # Gini coefficient
+            {
+                "name": "Gini coefficient",
+                "slug": "gini",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": np.nan,
+                "shortUnit": np.nan,
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 1,
+                "colorScaleNumericBins": "0.25;0.3;0.35;0.4;0.45;0.5;0.55;0.6",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Oranges",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Share of the top 10%
+            {
+                "name": "${survey__text_capitalized} share of the richest 10%",
+                "slug": "decile10_share",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The ${survey__text} of the richest decile (tenth of the population) as a share of total ${survey__text}.",
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "%",
+                "shortUnit": "%",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 100,
+                "colorScaleNumericBins": "20;25;30;35;40;45;50",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "OrRd",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Palma ratio
+            {
+                "name": "Palma ratio",
+                "slug": "palma_ratio",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                "unit": np.nan,
+                "shortUnit": np.nan,
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "0.5;1;1.5;2;2.5;3;3.5;4;4.5;5;5.5",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "YlOrBr",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Headcount ratio (rel)
+            {
+                "name": "Share in relative poverty",
+                "slug": "headcount_ratio_50_median",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The share of population with ${survey__text_ineq} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                "unit": "%",
+                "shortUnit": "%",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "3;6;9;12;15;18;21;24;27",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "YlOrBr",
+                "survey_type": Column("survey__table_name"),
+            },
+            # MLD
+            {
+                "name": "Mean Log Deviation",
+                "slug": "mld",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The mean log deviation (MLD) is a measure of inequality. An MLD of zero indicates perfect equality and it takes on larger positive values as incomes become more unequal. The measure is also referred to as 'Theil L' or 'GE(0)', in reference to the wider families of inequality measures to which the MLD belongs.",
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": np.nan,
+                "shortUnit": np.nan,
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "0.1;0.2;0.3;0.4;0.5;0.6;0.7;0.8;0.9;1",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "RdPu",
+                "survey_type": Column("survey__table_name"),
+            },
+        ],
     )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = np.nan
-    df_tables.loc[j, "shortUnit"] = np.nan
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "0.1;0.2;0.3;0.4;0.5;0.6;0.7;0.8;0.9;1"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "RdPu"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
+)
 
 # Make tolerance integer (to not break the parameter in the platform)
 df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
@@ -239,56 +242,55 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 # These variables consider a breaks in the series due to changes in surveys' methodology.
 
 # %%
-# Create master table for line breaks
-df_spells = pd.DataFrame()
-j = 0
-
-for i in range(len(df_tables)):
-    for c_spell in range(1, 7):
-        df_spells.loc[j, "master_var"] = df_tables.slug[i]
-        df_spells.loc[j, "name"] = "Consumption surveys"
-        df_spells.loc[j, "slug"] = f"consumption_spell_{c_spell}"
-        df_spells.loc[j, "sourceName"] = df_tables.sourceName[i]
-        df_spells.loc[j, "description"] = df_tables.description[i]
-        df_spells.loc[j, "sourceLink"] = df_tables.sourceLink[i]
-        df_spells.loc[j, "dataPublishedBy"] = df_tables.dataPublishedBy[i]
-        df_spells.loc[j, "unit"] = df_tables.unit[i]
-        df_spells.loc[j, "shortUnit"] = df_tables.shortUnit[i]
-        df_spells.loc[j, "tolerance"] = df_tables.tolerance[i]
-        df_spells.loc[j, "type"] = df_tables.type[i]
-        df_spells.loc[
-            j, "colorScaleNumericMinValue"
-        ] = df_tables.colorScaleNumericMinValue[i]
-        df_spells.loc[j, "colorScaleNumericBins"] = df_tables.colorScaleNumericBins[i]
-        df_spells.loc[j, "colorScaleEqualSizeBins"] = df_tables.colorScaleEqualSizeBins[
-            i
-        ]
-        df_spells.loc[j, "colorScaleScheme"] = df_tables.colorScaleScheme[i]
-        df_spells.loc[j, "survey_type"] = df_tables.survey_type[i]
-        j += 1
-
-    for i_spell in range(1, 8):
-        df_spells.loc[j, "master_var"] = df_tables.slug[i]
-        df_spells.loc[j, "name"] = "Income surveys"
-        df_spells.loc[j, "slug"] = f"income_spell_{i_spell}"
-        df_spells.loc[j, "sourceName"] = df_tables.sourceName[i]
-        df_spells.loc[j, "description"] = df_tables.description[i]
-        df_spells.loc[j, "sourceLink"] = df_tables.sourceLink[i]
-        df_spells.loc[j, "dataPublishedBy"] = df_tables.dataPublishedBy[i]
-        df_spells.loc[j, "unit"] = df_tables.unit[i]
-        df_spells.loc[j, "shortUnit"] = df_tables.shortUnit[i]
-        df_spells.loc[j, "tolerance"] = df_tables.tolerance[i]
-        df_spells.loc[j, "type"] = df_tables.type[i]
-        df_spells.loc[
-            j, "colorScaleNumericMinValue"
-        ] = df_tables.colorScaleNumericMinValue[i]
-        df_spells.loc[j, "colorScaleNumericBins"] = df_tables.colorScaleNumericBins[i]
-        df_spells.loc[j, "colorScaleEqualSizeBins"] = df_tables.colorScaleEqualSizeBins[
-            i
-        ]
-        df_spells.loc[j, "colorScaleScheme"] = df_tables.colorScaleScheme[i]
-        df_spells.loc[j, "survey_type"] = df_tables.survey_type[i]
-        j += 1
+# Create master table for line breaks: every variable of df_tables, once per consumption spell and once per income spell
+spell_fields = {
+    column: Column(f"var__{column}")
+    for column in [
+        "sourceName",
+        "description",
+        "sourceLink",
+        "dataPublishedBy",
+        "unit",
+        "shortUnit",
+        "tolerance",
+        "type",
+        "colorScaleNumericMinValue",
+        "colorScaleNumericBins",
+        "colorScaleEqualSizeBins",
+        "colorScaleScheme",
+        "survey_type",
+    ]
+}
+
+df_spells = expand_views(
+    Each(
+        {"var": df_tables},
+        [
+            Each(
+                {"spell": pd.DataFrame({"number": range(1, 7)})},
+                [
+                    {
+                        "master_var": Column("var__slug"),
+                        "name": "Consumption surveys",
+                        "slug": "consumption_spell_${spell__number}",
+                        **spell_fields,
+                    }
+                ],
+            ),
+            Each(
+                {"spell": pd.DataFrame({"number": range(1, 8)})},
+                [
+                    {
+                        "master_var": Column("var__slug"),
+                        "name": "Income surveys",
+                        "slug": "income_spell_${spell__number}",
+                        **spell_fields,
+                    }
+                ],
+            ),
+        ],
+    )
+)
 
 # Make tolerance integer (to not break the parameter in the platform)
 df_spells["tolerance"] = df_spells["tolerance"].astype("Int64")
@@ -300,163 +302,125 @@ df_spells["tolerance"] = df_spells["tolerance"].astype("Int64")
 # %%
 # Grapher table generation
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for survey in range(len(survey_type)):
-    # Gini coefficient
-    df_graphers.loc[j, "title"] = f"Gini coefficient"
-    df_graphers.loc[j, "ySlugs"] = f"gini"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "note"] = ""
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Share of the top 10%
-    df_graphers.loc[
-        j, "title"
-    ] = f"{survey_type.text[survey].capitalize()} share of the richest 10%"
-    df_graphers.loc[j, "ySlugs"] = f"decile10_share"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The share of {survey_type.text_ineq[survey]} received by the richest 10% of the population."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Palma ratio
-    df_graphers.loc[j, "title"] = f"Palma ratio"
-    df_graphers.loc[j, "ySlugs"] = f"palma_ratio"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Palma ratio"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "note"] = ""
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Headcount ratio (rel)
-    df_graphers.loc[j, "title"] = f"Share of people in relative poverty"
-    df_graphers.loc[j, "ySlugs"] = f"headcount_ratio_50_median"
-    df_graphers.loc[j, "Indicator Dropdown"] = f"Share in relative poverty"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The share of population with {survey_type.text_ineq[survey]} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # MLD
-    df_graphers.loc[j, "title"] = f"Mean log deviation"
-    df_graphers.loc[j, "ySlugs"] = f"mld"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Mean log deviation"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The mean log deviation (MLD) is a measure of inequality. An MLD of zero indicates perfect equality and it takes on larger positive values as incomes become more unequal."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
+df_graphers = expand_views(
+    Each(
+        {"survey": survey_type},
+        [
+            # Gini coefficient
+            {
+                "title": "Gini coefficient",
+                "ySlugs": "gini",
+                "Indicator Dropdown": "Gini coefficient",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "note": "",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "survey_type": Column("survey__table_name"),
+            },
+            # Share of the top 10%
+            {
+                "title": "${survey__text_capitalized} share of the richest 10%",
+                "ySlugs": "decile10_share",
+                "Indicator Dropdown": "Share of the richest 10%",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The share of ${survey__text_ineq} received by the richest 10% of the population.",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "survey_type": Column("survey__table_name"),
+            },
+            # Palma ratio
+            {
+                "title": "Palma ratio",
+                "ySlugs": "palma_ratio",
+                "Indicator Dropdown": "Palma ratio",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "note": "",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "survey_type": Column("survey__table_name"),
+            },
+            # Headcount ratio (rel)
+            {
+                "title": "Share of people in relative poverty",
+                "ySlugs": "headcount_ratio_50_median",
+                "Indicator Dropdown": "Share in relative poverty",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The share of population with ${survey__text_ineq} below 50% of the median. Relative poverty reflects the extent of inequality within the bottom of the distribution.",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "survey_type": Column("survey__table_name"),
+            },
+            # MLD
+            {
+                "title": "Mean log deviation",
+                "ySlugs": "mld",
+                "Indicator Dropdown": "Mean log deviation",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "The mean log deviation (MLD) is a measure of inequality. An MLD of zero indicates perfect equality and it takes on larger positive values as incomes become more unequal.",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "survey_type": Column("survey__table_name"),
+            },
+        ],
+    )
+)
 
 df_graphers["Show breaks between less comparable surveys Checkbox"] = "false"
 # %% [markdown]
 # ### Grapher views to show breaks in the curves
 
 # %%
-df_graphers_spells = pd.DataFrame()
-j = 0
-
-for i in range(len(df_graphers)):
-    df_graphers_spells.loc[j, "title"] = df_graphers["title"][i]
-    df_graphers_spells.loc[
-        j, "ySlugs"
-    ] = "consumption_spell_1 consumption_spell_2 consumption_spell_3 consumption_spell_4 consumption_spell_5 consumption_spell_6 income_spell_1 income_spell_2 income_spell_3 income_spell_4 income_spell_5 income_spell_6 income_spell_7"
-    df_graphers_spells.loc[j, "Indicator Dropdown"] = df_graphers["Indicator Dropdown"][
-        i
-    ]
-    df_graphers_spells.loc[j, "Household survey data type Dropdown"] = df_graphers[
-        "Household survey data type Dropdown"
-    ][i]
-    df_graphers_spells.loc[j, "tableSlug"] = (
-        df_graphers["survey_type"][i] + "_" + df_graphers["ySlugs"][i]
-    )
-    df_graphers_spells.loc[j, "subtitle"] = " ".join(
-        [
-            df_graphers["subtitle"][i],
-            "The chart shows breaks in the comparability of the underlying household survey data over time within each country individually.",
-        ]
-    )
-    df_graphers_spells.loc[j, "note"] = df_graphers["note"][i]
-    df_graphers_spells.loc[j, "type"] = df_graphers["type"][i]
-    df_graphers_spells.loc[j, "yAxisMin"] = df_graphers["yAxisMin"][i]
-    df_graphers_spells.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers_spells.loc[j, "hasMapTab"] = "false"
-    df_graphers_spells.loc[j, "tab"] = np.nan
-    df_graphers_spells.loc[j, "mapTargetTime"] = np.nan
-    df_graphers_spells.loc[
-        j, "Show breaks between less comparable surveys Checkbox"
-    ] = "true"
-    j += 1
+df_graphers_spells = derive_views(
+    df_graphers,
+    {
+        "title": Column("title"),
+        "ySlugs": "consumption_spell_1 consumption_spell_2 consumption_spell_3 consumption_spell_4 consumption_spell_5 consumption_spell_6 income_spell_1 income_spell_2 income_spell_3 income_spell_4 income_spell_5 income_spell_6 income_spell_7",
+        "Indicator Dropdown": Column("Indicator Dropdown"),
+        "Household survey data type Dropdown": Column(
+            "Household survey data type Dropdown"
+        ),
+        "tableSlug": "${survey_type}_${ySlugs}",
+        "subtitle": "${subtitle} The chart shows breaks in the comparability of the underlying household survey data over time within each country individually.",
+        "note": Column("note"),
+        "type": Column("type"),
+        "yAxisMin": Column("yAxisMin"),
+        "selectedFacetStrategy": "entity",
+        "hasMapTab": "false",
+        "tab": np.nan,
+        "mapTargetTime": np.nan,
+        "Show breaks between less comparable surveys Checkbox": "true",
+    },
+)
 
 df_graphers = pd.concat([df_graphers, df_graphers_spells], ignore_index=True)
 
@@ -475,49 +439,45 @@ df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 # "Depending on the country and year, the data relates to income measured after taxes and benefits per capita."
 # "Depending on the country and year, the data relates to consumption per capita."
 
-# When int-$ are not included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
-    "The data relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to consumption per capita.",
-    "The data relates to consumption per capita.",
-    regex=False,
-)
-
-# When int-$ are included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
-    "It relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to consumption per capita.",
-    "It relates to consumption per capita.",
-    regex=False,
+rewrite_rules = RewriteRules(
+    [
+        # When int-$ are not included
+        (
+            "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
+            "The data relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, the data relates to consumption per capita.",
+            "The data relates to consumption per capita.",
+        ),
+        # When int-$ are included
+        (
+            "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
+            "It relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, it relates to consumption per capita.",
+            "It relates to consumption per capita.",
+        ),
+    ]
 )
+df_graphers["note"] = rewrite_rules.apply(df_graphers["note"])
 
 # For Gini/Palma subtitle:
-df_graphers["subtitle"] = df_graphers["subtitle"].str.replace(
-    "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
-    "The data relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["subtitle"] = df_graphers["subtitle"].str.replace(
-    "Depending on the country and year, the data relates to consumption per capita.",
-    "The data relates to consumption per capita.",
-    regex=False,
-)
+df_graphers["subtitle"] = rewrite_rules.apply(df_graphers["subtitle"])
+
+# Warn about rules that no longer match anything (with OWID_REWRITE_WARNINGS=1)
+rewrite_rules.warn_unused()
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["ySlugs"] == "gini")
-    & (df_graphers["Show breaks between less comparable surveys Checkbox"] == "false")
-    & (df_graphers["tableSlug"] == "inc_or_cons"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "ySlugs": "gini",
+        "Show breaks between less comparable surveys Checkbox": "false",
+        "tableSlug": "inc_or_cons",
+    },
+)
 
 
 # %% [markdown]
@@ -529,28 +489,22 @@ df_graphers.loc[
 survey_list = list(survey_type["table_name"].unique())
 var_list = list(df_spells["master_var"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Auxiliar variable `survey_type` is dropped and graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers.drop(columns=["survey_type"])
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
+# Auxiliar variable `survey_type` is dropped from the graphers table
+graphers = df_graphers.drop(columns=["survey_type"])
 
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by survey type (and the spell tables by variable and survey type), to write them one by one
+table_blocks = TableBlocks(df_tables, "survey_type")
+spell_blocks = TableBlocks(df_spells, ["master_var", "survey_type"])
 
 # The dataframes are combined, including tables which are filtered by survey type and variable
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, graphers, index=False)
 
     for i in survey_list:
-        table_tsv = (
-            df_tables[df_tables["survey_type"] == i].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["survey_type"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[i]
         f.write(
             "\ntable\t"
             + "https://raw.githubusercontent.com/owid/notebooks/main/BetterDataDocs/JoeHasell/PIP/data/ppp_2017/final/OWID_internal_upload/explorer_database/"
@@ -560,20 +514,12 @@ with open(outfile, "w", newline="\n", encoding="utf-8") as f:
             + ".csv\t"
             + i
         )
-        f.write("\ncolumns\t" + i + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + i + "\n")
+        write_frame(f, table_tsv, index=False)
 
     for var in var_list:
         for i in survey_list:
-            table_tsv = (
-                df_spells[
-                    (df_spells["master_var"] == var) & (df_spells["survey_type"] == i)
-                ]
-                .copy()
-                .reset_index(drop=True)
-            )
-            table_tsv = table_tsv.drop(columns=["master_var", "survey_type"])
-            table_tsv = table_tsv.to_csv(sep="\t", index=False)
-            table_tsv_indented = textwrap.indent(table_tsv, "\t")
+            table_tsv = spell_blocks[var, i]
             f.write(
                 "\ntable\t"
                 + "https://raw.githubusercontent.com/owid/notebooks/main/BetterDataDocs/JoeHasell/PIP/data/ppp_2017/final/OWID_internal_upload/explorer_database/comparability_data/"
@@ -585,4 +531,5 @@ with open(outfile, "w", newline="\n", encoding="utf-8") as f:
                 + "_"
                 + var
             )
-            f.write("\ncolumns\t" + i + "_" + var + "\n" + table_tsv_indented)
+            f.write("\ncolumns\t" + i + "_" + var + "\n")
+            write_frame(f, table_tsv, index=False)
@@ -2,7 +2,7 @@
 # # Poverty Data Explorer of World Bank data
 # This code creates the tsv file for the poverty metrics explorer from the World Bank PIP data, migrated from Joe's R code to Python and available [here](https://owid.cloud/admin/explorers/preview/poverty-explorer)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,17 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "poverty-explorer.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.rewriting import RewriteRules  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, derive_views, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "poverty-explorer.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,18 +33,15 @@ sheet_id = "17KJ9YcvfdmO_7-Sv2Ij0vmzAQI6rXSIqHfJtgFHN-a8"
 
 # Absolute poverty sheet
 sheet_name = "povlines_abs"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_abs = pd.read_csv(url, dtype={"dollars_text": "str"})
+povlines_abs = read_sheet(sheet_id, sheet_name, dtype={"dollars_text": "str"})
 
 # Relative poverty sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_rel = pd.read_csv(url)
+povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # Survey type sheet
 sheet_name = "survey_type"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-survey_type = pd.read_csv(url)
+survey_type = read_sheet(sheet_id, sheet_name)
 
 # %% [markdown]
 # ## Header
@@ -84,267 +91,234 @@ processing_description = new_line.join(
 )
 ppp_description = "The data is measured in international-$ at 2017 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-# Table generation
-df_tables = pd.DataFrame()
-j = 0
-
-for survey in range(len(survey_type)):
-    # Headcount ratio (abs)
-    for p in range(len(povlines_abs)):
-        df_tables.loc[j, "name"] = f"Share below ${povlines_abs.dollars_text[p]} a day"
-        df_tables.loc[j, "slug"] = f"headcount_ratio_{povlines_abs.cents[p]}"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with an {survey_type.text[survey]} per person below ${povlines_abs.dollars_text[p]} a day.",
-                ppp_description,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = "3;10;20;30;40;50;60;70;80;90;100"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Headcount (abs)
-    for p in range(len(povlines_abs)):
-        df_tables.loc[j, "name"] = f"Number below ${povlines_abs.dollars_text[p]} a day"
-        df_tables.loc[j, "slug"] = f"headcount_{povlines_abs.cents[p]}"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with an {survey_type.text[survey]} per person below ${povlines_abs.dollars_text[p]} a day.",
-                ppp_description,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Reds"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Headcount ratio (rel)
-    for pct in range(len(povlines_rel)):
-        df_tables.loc[
-            j, "name"
-        ] = f"{povlines_rel.percent[pct]} of median - share of population below poverty line"
-        df_tables.loc[j, "slug"] = f"headcount_ratio_{povlines_rel.slug_suffix[pct]}"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with an {survey_type.text[survey]} per person below {povlines_rel.percent[pct]} of the median.",
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = povlines_rel[
-            "scale_headcount_ratio"
-        ][pct]
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Headcount (rel)
-    for pct in range(len(povlines_rel)):
-        df_tables.loc[
-            j, "name"
-        ] = f"{povlines_rel.percent[pct]} of median - total number of people below poverty line"
-        df_tables.loc[j, "slug"] = f"headcount_{povlines_rel.slug_suffix[pct]}"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with an {survey_type.text[survey]} per person below {povlines_rel.percent[pct]} of the median.",
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # mean
-    df_tables.loc[j, "name"] = f"Mean {survey_type.text[survey]} per day"
-    df_tables.loc[j, "slug"] = "mean"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The mean level of {survey_type.text[survey]} per day.",
-            ppp_description,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # median
-    df_tables.loc[j, "name"] = f"Median {survey_type.text[survey]} per day"
-    df_tables.loc[j, "slug"] = "median"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per day below which half of the population live.",
-            ppp_description,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Blues"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P10
-    df_tables.loc[
-        j, "name"
-    ] = "Threshold income or consumption per day marking the poorest decile"
-    df_tables.loc[j, "slug"] = "decile1_thr"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per day below which 10% of the population falls.",
-            ppp_description,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Purples"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P90
-    df_tables.loc[
-        j, "name"
-    ] = "Threshold income or consumption per day marking the richest decile"
-    df_tables.loc[j, "slug"] = "decile9_thr"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
+# Table generation: one family of columns per indicator, repeated for every survey type (and poverty line)
+description_notes = [additional_description, notes_title, processing_description]
+
+df_tables = expand_views(
+    Each(
+        {"survey": survey_type},
         [
-            f"The level of {survey_type.text[survey]} per day below which 90% of the population falls.",
-            ppp_description,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
+            # Headcount ratio (abs)
+            Each(
+                {"p": povlines_abs},
+                [
+                    {
+                        "name": "Share below $$${p__dollars_text} a day",
+                        "slug": "headcount_ratio_${p__cents}",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with an ${survey__text} per person below $$${p__dollars_text} a day.",
+                                escape(ppp_description),
+                                "${survey__description}",
+                                *description_notes,
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "3;10;20;30;40;50;60;70;80;90;100",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Headcount (abs)
+            Each(
+                {"p": povlines_abs},
+                [
+                    {
+                        "name": "Number below $$${p__dollars_text} a day",
+                        "slug": "headcount_${p__cents}",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with an ${survey__text} per person below $$${p__dollars_text} a day.",
+                                escape(ppp_description),
+                                "${survey__description}",
+                                *description_notes,
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Reds",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Headcount ratio (rel)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "name": "${pct__percent} of median - share of population below poverty line",
+                        "slug": "headcount_ratio_${pct__slug_suffix}",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with an ${survey__text} per person below ${pct__percent} of the median.",
+                                "${survey__description}",
+                                *description_notes,
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": Column("pct__scale_headcount_ratio"),
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrBr",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Headcount (rel)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "name": "${pct__percent} of median - total number of people below poverty line",
+                        "slug": "headcount_${pct__slug_suffix}",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with an ${survey__text} per person below ${pct__percent} of the median.",
+                                "${survey__description}",
+                                *description_notes,
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrBr",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # mean
+            {
+                "name": "Mean ${survey__text} per day",
+                "slug": "mean",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The mean level of ${survey__text} per day.",
+                        escape(ppp_description),
+                        "${survey__description}",
+                        *description_notes,
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;100",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "BuGn",
+                "survey_type": Column("survey__table_name"),
+            },
+            # median
+            {
+                "name": "Median ${survey__text} per day",
+                "slug": "median",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which half of the population live.",
+                        escape(ppp_description),
+                        "${survey__description}",
+                        *description_notes,
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;100",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Blues",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P10
+            {
+                "name": "Threshold income or consumption per day marking the poorest decile",
+                "slug": "decile1_thr",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which 10% of the population falls.",
+                        escape(ppp_description),
+                        "${survey__description}",
+                        *description_notes,
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Purples",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P90
+            {
+                "name": "Threshold income or consumption per day marking the richest decile",
+                "slug": "decile9_thr",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which 90% of the population falls.",
+                        escape(ppp_description),
+                        "${survey__description}",
+                        *description_notes,
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;100;200",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Purples",
+                "survey_type": Column("survey__table_name"),
+            },
+        ],
     )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;100;200"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Purples"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
+)
 
 # Make tolerance integer (to not break the parameter in the platform)
 df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
@@ -354,56 +328,55 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 # These variables consider a breaks in the series due to changes in surveys' methodology.
 
 # %%
-# Create master table for line breaks
-df_spells = pd.DataFrame()
-j = 0
-
-for i in range(len(df_tables)):
-    for c_spell in range(1, 7):
-        df_spells.loc[j, "master_var"] = df_tables.slug[i]
-        df_spells.loc[j, "name"] = "Consumption surveys"
-        df_spells.loc[j, "slug"] = f"consumption_spell_{c_spell}"
-        df_spells.loc[j, "sourceName"] = df_tables.sourceName[i]
-        df_spells.loc[j, "description"] = df_tables.description[i]
-        df_spells.loc[j, "sourceLink"] = df_tables.sourceLink[i]
-        df_spells.loc[j, "dataPublishedBy"] = df_tables.dataPublishedBy[i]
-        df_spells.loc[j, "unit"] = df_tables.unit[i]
-        df_spells.loc[j, "shortUnit"] = df_tables.shortUnit[i]
-        df_spells.loc[j, "tolerance"] = df_tables.tolerance[i]
-        df_spells.loc[j, "type"] = df_tables.type[i]
-        df_spells.loc[
-            j, "colorScaleNumericMinValue"
-        ] = df_tables.colorScaleNumericMinValue[i]
-        df_spells.loc[j, "colorScaleNumericBins"] = df_tables.colorScaleNumericBins[i]
-        df_spells.loc[j, "colorScaleEqualSizeBins"] = df_tables.colorScaleEqualSizeBins[
-            i
-        ]
-        df_spells.loc[j, "colorScaleScheme"] = df_tables.colorScaleScheme[i]
-        df_spells.loc[j, "survey_type"] = df_tables.survey_type[i]
-        j += 1
-
-    for i_spell in range(1, 8):
-        df_spells.loc[j, "master_var"] = df_tables.slug[i]
-        df_spells.loc[j, "name"] = "Income surveys"
-        df_spells.loc[j, "slug"] = f"income_spell_{i_spell}"
-        df_spells.loc[j, "sourceName"] = df_tables.sourceName[i]
-        df_spells.loc[j, "description"] = df_tables.description[i]
-        df_spells.loc[j, "sourceLink"] = df_tables.sourceLink[i]
-        df_spells.loc[j, "dataPublishedBy"] = df_tables.dataPublishedBy[i]
-        df_spells.loc[j, "unit"] = df_tables.unit[i]
-        df_spells.loc[j, "shortUnit"] = df_tables.shortUnit[i]
-        df_spells.loc[j, "tolerance"] = df_tables.tolerance[i]
-        df_spells.loc[j, "type"] = df_tables.type[i]
-        df_spells.loc[
-            j, "colorScaleNumericMinValue"
-        ] = df_tables.colorScaleNumericMinValue[i]
-        df_spells.loc[j, "colorScaleNumericBins"] = df_tables.colorScaleNumericBins[i]
-        df_spells.loc[j, "colorScaleEqualSizeBins"] = df_tables.colorScaleEqualSizeBins[
-            i
-        ]
-        df_spells.loc[j, "colorScaleScheme"] = df_tables.colorScaleScheme[i]
-        df_spells.loc[j, "survey_type"] = df_tables.survey_type[i]
-        j += 1
+# Create master table for line breaks: every variable of df_tables, once per consumption spell and once per income spell
+spell_fields = {
+    column: Column(f"var__{column}")
+    for column in [
+        "sourceName",
+        "description",
+        "sourceLink",
+        "dataPublishedBy",
+        "unit",
+        "shortUnit",
+        "tolerance",
+        "type",
+        "colorScaleNumericMinValue",
+        "colorScaleNumericBins",
+        "colorScaleEqualSizeBins",
+        "colorScaleScheme",
+        "survey_type",
+    ]
+}
+
+df_spells = expand_views(
+    Each(
+        {"var": df_tables},
+        [
+            Each(
+                {"spell": pd.DataFrame({"number": range(1, 7)})},
+                [
+                    {
+                        "master_var": Column("var__slug"),
+                        "name": "Consumption surveys",
+                        "slug": "consumption_spell_${spell__number}",
+                        **spell_fields,
+                    }
+                ],
+            ),
+            Each(
+                {"spell": pd.DataFrame({"number": range(1, 8)})},
+                [
+                    {
+                        "master_var": Column("var__slug"),
+                        "name": "Income surveys",
+                        "slug": "income_spell_${spell__number}",
+                        **spell_fields,
+                    }
+                ],
+            ),
+        ],
+    )
+)
 
 # Make tolerance integer (to not break the parameter in the platform)
 df_spells["tolerance"] = df_spells["tolerance"].astype("Int64")
@@ -414,326 +387,252 @@ df_spells["tolerance"] = df_spells["tolerance"].astype("Int64")
 
 # %%
 # Grapher table generation
-
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for survey in range(len(survey_type)):
-    # Headcount ratio (abs)
-    for p in range(len(povlines_abs)):
-        df_graphers.loc[j, "title"] = f"{povlines_abs.title_share[p]}"
-        df_graphers.loc[j, "ySlugs"] = f"headcount_ratio_{povlines_abs.cents[p]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_abs.povline_dropdown[p]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_abs.subtitle[p]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Headcount (abs)
-    for p in range(len(povlines_abs)):
-        df_graphers.loc[j, "title"] = f"{povlines_abs.title_number[p]}"
-        df_graphers.loc[j, "ySlugs"] = f"headcount_{povlines_abs.cents[p]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_abs.povline_dropdown[p]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_abs.subtitle[p]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Headcount ratio (abs) - Multiple lines
-    df_graphers.loc[
-        j, "title"
-    ] = "Share of population living below a range of poverty lines"
-    df_graphers.loc[
-        j, "ySlugs"
-    ] = "headcount_ratio_100 headcount_ratio_215 headcount_ratio_365 headcount_ratio_685 headcount_ratio_1000 headcount_ratio_2000 headcount_ratio_3000 headcount_ratio_4000"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-    df_graphers.loc[j, "Poverty line Dropdown"] = "Multiple lines"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = "false"
-    df_graphers.loc[j, "tab"] = "chart"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Headcount (abs) - Multiple lines
-    df_graphers.loc[
-        j, "title"
-    ] = "Number of people living below a range of poverty lines"
-    df_graphers.loc[
-        j, "ySlugs"
-    ] = "headcount_100 headcount_215 headcount_365 headcount_685 headcount_1000 headcount_2000 headcount_3000 headcount_4000"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-    df_graphers.loc[j, "Poverty line Dropdown"] = "Multiple lines"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = "false"
-    df_graphers.loc[j, "tab"] = "chart"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Headcount ratio (rel)
-    for pct in range(len(povlines_rel)):
-        df_graphers.loc[j, "title"] = f"{povlines_rel.title_share[pct]}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_ratio_{povlines_rel.slug_suffix[pct]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-        df_graphers.loc[j, "Poverty line Dropdown"] = f"{povlines_rel.dropdown[pct]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {povlines_rel.text[pct]} {survey_type.text[survey]}."
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Headcount (rel)
-    for pct in range(len(povlines_rel)):
-        df_graphers.loc[j, "title"] = f"{povlines_rel.title_number[pct]}"
-        df_graphers.loc[j, "ySlugs"] = f"headcount_{povlines_rel.slug_suffix[pct]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-        df_graphers.loc[j, "Poverty line Dropdown"] = f"{povlines_rel.dropdown[pct]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {povlines_rel.text[pct]} {survey_type.text[survey]}."
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # mean
-    df_graphers.loc[j, "title"] = f"Mean {survey_type.text[survey]} per day"
-    df_graphers.loc[j, "ySlugs"] = "mean"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Mean income or consumption"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # median
-    df_graphers.loc[j, "title"] = f"Median {survey_type.text[survey]} per day"
-    df_graphers.loc[j, "ySlugs"] = "median"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Median income or consumption"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P10
-    df_graphers.loc[
-        j, "title"
-    ] = f"Threshold {survey_type.text[survey]} per day marking the poorest decile"
-    df_graphers.loc[j, "ySlugs"] = "decile1_thr"
-    df_graphers.loc[
-        j, "Indicator Dropdown"
-    ] = "Income or consumption of the poorest 10%"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"This is the level of {survey_type.text[survey]} per day below which 10% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P90
-    df_graphers.loc[
-        j, "title"
-    ] = f"Threshold {survey_type.text[survey]} per day marking the richest decile"
-    df_graphers.loc[j, "ySlugs"] = "decile9_thr"
-    df_graphers.loc[
-        j, "Indicator Dropdown"
-    ] = "Income or consumption of the richest 10%"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"This is the level of {survey_type.text[survey]} per day below which 90% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
+int_dollars_note = "This data is expressed in international-$$ at 2017 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita."
+threshold_note = "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita."
+relative_subtitle = "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at ${pct__text} ${survey__text}."
+ppp_subtitle = "This data is adjusted for inflation and for differences in the cost of living between countries."
+
+df_graphers = expand_views(
+    Each(
+        {"survey": survey_type},
+        [
+            # Headcount ratio (abs)
+            Each(
+                {"p": povlines_abs},
+                [
+                    {
+                        "title": "${p__title_share}",
+                        "ySlugs": "headcount_ratio_${p__cents}",
+                        "Indicator Dropdown": "Share in poverty",
+                        "Poverty line Dropdown": "${p__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p__subtitle}",
+                        "note": int_dollars_note,
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Headcount (abs)
+            Each(
+                {"p": povlines_abs},
+                [
+                    {
+                        "title": "${p__title_number}",
+                        "ySlugs": "headcount_${p__cents}",
+                        "Indicator Dropdown": "Number in poverty",
+                        "Poverty line Dropdown": "${p__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p__subtitle}",
+                        "note": int_dollars_note,
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Headcount ratio (abs) - Multiple lines
+            {
+                "title": "Share of population living below a range of poverty lines",
+                "ySlugs": "headcount_ratio_100 headcount_ratio_215 headcount_ratio_365 headcount_ratio_685 headcount_ratio_1000 headcount_ratio_2000 headcount_ratio_3000 headcount_ratio_4000",
+                "Indicator Dropdown": "Share in poverty",
+                "Poverty line Dropdown": "Multiple lines",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": ppp_subtitle,
+                "note": int_dollars_note,
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": "false",
+                "tab": "chart",
+                "mapTargetTime": 2019,
+                "survey_type": Column("survey__table_name"),
+            },
+            # Headcount (abs) - Multiple lines
+            {
+                "title": "Number of people living below a range of poverty lines",
+                "ySlugs": "headcount_100 headcount_215 headcount_365 headcount_685 headcount_1000 headcount_2000 headcount_3000 headcount_4000",
+                "Indicator Dropdown": "Number in poverty",
+                "Poverty line Dropdown": "Multiple lines",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": ppp_subtitle,
+                "note": int_dollars_note,
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": "false",
+                "tab": "chart",
+                "mapTargetTime": 2019,
+                "survey_type": Column("survey__table_name"),
+            },
+            # Headcount ratio (rel)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "title": "${pct__title_share}",
+                        "ySlugs": "headcount_ratio_${pct__slug_suffix}",
+                        "Indicator Dropdown": "Share in poverty",
+                        "Poverty line Dropdown": "${pct__dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": relative_subtitle,
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Headcount (rel)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "title": "${pct__title_number}",
+                        "ySlugs": "headcount_${pct__slug_suffix}",
+                        "Indicator Dropdown": "Number in poverty",
+                        "Poverty line Dropdown": "${pct__dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": relative_subtitle,
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # mean
+            {
+                "title": "Mean ${survey__text} per day",
+                "ySlugs": "mean",
+                "Indicator Dropdown": "Mean income or consumption",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": ppp_subtitle,
+                "note": int_dollars_note,
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # median
+            {
+                "title": "Median ${survey__text} per day",
+                "ySlugs": "median",
+                "Indicator Dropdown": "Median income or consumption",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": ppp_subtitle,
+                "note": int_dollars_note,
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P10
+            {
+                "title": "Threshold ${survey__text} per day marking the poorest decile",
+                "ySlugs": "decile1_thr",
+                "Indicator Dropdown": "Income or consumption of the poorest 10%",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This is the level of ${survey__text} per day below which 10% of the population falls.",
+                "note": threshold_note,
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P90
+            {
+                "title": "Threshold ${survey__text} per day marking the richest decile",
+                "ySlugs": "decile9_thr",
+                "Indicator Dropdown": "Income or consumption of the richest 10%",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This is the level of ${survey__text} per day below which 90% of the population falls.",
+                "note": threshold_note,
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+        ],
+    )
+)
 
 df_graphers["Show breaks between less comparable surveys Checkbox"] = "false"
 # %% [markdown]
 # ### Grapher views to show breaks in the curves
 
 # %%
-df_graphers_spells = pd.DataFrame()
-j = 0
-
-for i in range(len(df_graphers)):
-    df_graphers_spells.loc[j, "title"] = df_graphers["title"][i]
-    df_graphers_spells.loc[
-        j, "ySlugs"
-    ] = "consumption_spell_1 consumption_spell_2 consumption_spell_3 consumption_spell_4 consumption_spell_5 consumption_spell_6 income_spell_1 income_spell_2 income_spell_3 income_spell_4 income_spell_5 income_spell_6 income_spell_7"
-    df_graphers_spells.loc[j, "Indicator Dropdown"] = df_graphers["Indicator Dropdown"][
-        i
-    ]
-    df_graphers_spells.loc[j, "Poverty line Dropdown"] = df_graphers[
-        "Poverty line Dropdown"
-    ][i]
-    df_graphers_spells.loc[j, "Household survey data type Dropdown"] = df_graphers[
-        "Household survey data type Dropdown"
-    ][i]
-    df_graphers_spells.loc[j, "tableSlug"] = (
-        df_graphers["survey_type"][i] + "_" + df_graphers["ySlugs"][i]
-    )
-    df_graphers_spells.loc[j, "subtitle"] = " ".join(
-        [
-            df_graphers["subtitle"][i],
-            "The chart shows breaks in the comparability of the underlying household survey data over time within each country individually.",
-        ]
-    )
-
-    df_graphers_spells.loc[j, "note"] = df_graphers["note"][i]
-    df_graphers_spells.loc[j, "type"] = df_graphers["type"][i]
-    df_graphers_spells.loc[j, "yAxisMin"] = df_graphers["yAxisMin"][i]
-    df_graphers_spells.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers_spells.loc[j, "hasMapTab"] = "false"
-    df_graphers_spells.loc[j, "tab"] = np.nan
-    df_graphers_spells.loc[j, "mapTargetTime"] = np.nan
-    df_graphers_spells.loc[
-        j, "Show breaks between less comparable surveys Checkbox"
-    ] = "true"
-    j += 1
-
-# Delete spells views for multiple poverty lines
-df_graphers_spells = df_graphers_spells[
-    ~(df_graphers_spells["Poverty line Dropdown"] == "Multiple lines")
-].reset_index(drop=True)
+# Same views, showing breaks between surveys (except the ones with multiple poverty lines)
+df_graphers_spells = derive_views(
+    df_graphers,
+    {
+        "title": Column("title"),
+        "ySlugs": "consumption_spell_1 consumption_spell_2 consumption_spell_3 consumption_spell_4 consumption_spell_5 consumption_spell_6 income_spell_1 income_spell_2 income_spell_3 income_spell_4 income_spell_5 income_spell_6 income_spell_7",
+        "Indicator Dropdown": Column("Indicator Dropdown"),
+        "Poverty line Dropdown": Column("Poverty line Dropdown"),
+        "Household survey data type Dropdown": Column(
+            "Household survey data type Dropdown"
+        ),
+        "tableSlug": "${survey_type}_${ySlugs}",
+        "subtitle": "${subtitle} The chart shows breaks in the comparability of the underlying household survey data over time within each country individually.",
+        "note": Column("note"),
+        "type": Column("type"),
+        "yAxisMin": Column("yAxisMin"),
+        "selectedFacetStrategy": "entity",
+        "hasMapTab": "false",
+        "tab": np.nan,
+        "mapTargetTime": np.nan,
+        "Show breaks between less comparable surveys Checkbox": "true",
+    },
+    where=df_graphers["Poverty line Dropdown"] != "Multiple lines",
+)
 
 df_graphers = pd.concat([df_graphers, df_graphers_spells], ignore_index=True)
 
@@ -753,37 +652,42 @@ df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 # "Depending on the country and year, the data relates to income measured after taxes and benefits per capita."
 # "Depending on the country and year, the data relates to consumption per capita."
 
-# When int-$ are not included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
-    "The data relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to consumption per capita.",
-    "The data relates to consumption per capita.",
-    regex=False,
+rewrite_rules = RewriteRules(
+    [
+        # When int-$ are not included
+        (
+            "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
+            "The data relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, the data relates to consumption per capita.",
+            "The data relates to consumption per capita.",
+        ),
+        # When int-$ are included
+        (
+            "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
+            "It relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, it relates to consumption per capita.",
+            "It relates to consumption per capita.",
+        ),
+    ]
 )
+df_graphers["note"] = rewrite_rules.apply(df_graphers["note"])
 
-# When int-$ are included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
-    "It relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to consumption per capita.",
-    "It relates to consumption per capita.",
-    regex=False,
-)
+# Warn about rules that no longer match anything (with OWID_REWRITE_WARNINGS=1)
+rewrite_rules.warn_unused()
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["ySlugs"] == "headcount_ratio_215")
-    & (df_graphers["tableSlug"] == "inc_or_cons")
-    & (df_graphers["Show breaks between less comparable surveys Checkbox"] == "false"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "ySlugs": "headcount_ratio_215",
+        "tableSlug": "inc_or_cons",
+        "Show breaks between less comparable surveys Checkbox": "false",
+    },
+)
 
 # %% [markdown]
 # ## Explorer generation
@@ -794,28 +698,22 @@ df_graphers.loc[
 survey_list = list(survey_type["table_name"].unique())
 var_list = list(df_spells["master_var"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Auxiliar variable `survey_type` is dropped and graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers.drop(columns=["survey_type"])
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
+# Auxiliar variable `survey_type` is dropped from the graphers table
+graphers = df_graphers.drop(columns=["survey_type"])
 
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by survey type (and the spell tables by variable and survey type), to write them one by one
+table_blocks = TableBlocks(df_tables, "survey_type")
+spell_blocks = TableBlocks(df_spells, ["master_var", "survey_type"])
 
 # The dataframes are combined, including tables which are filtered by survey type and variable
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, graphers, index=False)
 
     for i in survey_list:
-        table_tsv = (
-            df_tables[df_tables["survey_type"] == i].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["survey_type"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[i]
         f.write(
             "\ntable\t"
             + "https://raw.githubusercontent.com/owid/notebooks/main/BetterDataDocs/JoeHasell/PIP/data/ppp_2017/final/OWID_internal_upload/explorer_database/"
@@ -825,20 +723,12 @@ with open(outfile, "w", newline="\n", encoding="utf-8") as f:
             + ".csv\t"
             + i
         )
-        f.write("\ncolumns\t" + i + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + i + "\n")
+        write_frame(f, table_tsv, index=False)
 
     for var in var_list:
         for i in survey_list:
-            table_tsv = (
-                df_spells[
-                    (df_spells["master_var"] == var) & (df_spells["survey_type"] == i)
-                ]
-                .copy()
-                .reset_index(drop=True)
-            )
-            table_tsv = table_tsv.drop(columns=["master_var", "survey_type"])
-            table_tsv = table_tsv.to_csv(sep="\t", index=False)
-            table_tsv_indented = textwrap.indent(table_tsv, "\t")
+            table_tsv = spell_blocks[var, i]
             f.write(
                 "\ntable\t"
                 + "https://raw.githubusercontent.com/owid/notebooks/main/BetterDataDocs/JoeHasell/PIP/data/ppp_2017/final/OWID_internal_upload/explorer_database/comparability_data/"
@@ -850,4 +740,5 @@ with open(outfile, "w", newline="\n", encoding="utf-8") as f:
                 + "_"
                 + var
             )
-            f.write("\ncolumns\t" + i + "_" + var + "\n" + table_tsv_indented)
+            f.write("\ncolumns\t" + i + "_" + var + "\n")
+            write_frame(f, table_tsv, index=False)
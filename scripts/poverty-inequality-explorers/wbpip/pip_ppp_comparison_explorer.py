@@ -2,7 +2,7 @@
 # # Poverty Data Explorer of World Bank data: 2011 vs 2017 prices
 # This code creates the tsv file for the PPP comparison explorer from the World Bank PIP data, available [here](https://ourworldindata.org/explorers/poverty-explorer-2011-vs-2017-ppp)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,17 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "poverty-explorer-2011-vs-2017-ppp.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.rewriting import RewriteRules  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "poverty-explorer-2011-vs-2017-ppp.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,30 +33,25 @@ sheet_id = "1mR0LPEGlY-wCp1q9lNTlDbVIG65JazKvHL16my9tH8Y"
 
 # Poverty lines in 2011 prices sheet
 sheet_name = "povlines_ppp2011"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_ppp2011 = pd.read_csv(url, dtype={"dollars_text": "str"})
+povlines_ppp2011 = read_sheet(sheet_id, sheet_name, dtype={"dollars_text": "str"})
 
 # Poverty lines in 2017 prices sheet
 sheet_name = "povlines_ppp2017"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_ppp2017 = pd.read_csv(url, dtype={"dollars_text": "str"})
+povlines_ppp2017 = read_sheet(sheet_id, sheet_name, dtype={"dollars_text": "str"})
 
 # Poverty lines in both 2011 and 2017 prices sheet
 sheet_name = "povlines_both"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_both = pd.read_csv(
-    url, dtype={"dollars_2011_text": "str", "dollars_2017_text": "str"}
+povlines_both = read_sheet(
+    sheet_id, sheet_name, dtype={"dollars_2011_text": "str", "dollars_2017_text": "str"}
 )
 
 # Relative poverty lines sheet
 sheet_name = "povlines_rel"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-povlines_rel = pd.read_csv(url)
+povlines_rel = read_sheet(sheet_id, sheet_name)
 
 # Survey type sheet
 sheet_name = "survey_type"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-survey_type = pd.read_csv(url)
+survey_type = read_sheet(sheet_id, sheet_name)
 
 # %% [markdown]
 # ## Header
@@ -94,530 +99,481 @@ ppp_description_2017 = "The data is measured in international-$ at 2017 prices 
 ppp_description_2011 = "The data is measured in international-$ at 2011 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
 # Table generation
-df_tables = pd.DataFrame()
-j = 0
-
-for survey in range(len(survey_type)):
-    # Shares (2011)
-    for p_2011 in range(len(povlines_ppp2011)):
-        df_tables.loc[
-            j, "name"
-        ] = f"Share of population below ${povlines_ppp2011.dollars_text[p_2011]} a day (2011 prices)"
-
-        df_tables.loc[
-            j, "slug"
-        ] = f"headcount_ratio_{povlines_ppp2011.cents[p_2011]}_ppp2011"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with an {survey_type.text[survey]} per person below ${povlines_ppp2011.dollars_text[p_2011]} a day (2011 prices).",
-                ppp_description_2011,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = "3;10;20;30;40;50;60;70;80;90;100"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Shares (2017)
-    for p_2017 in range(len(povlines_ppp2017)):
-        df_tables.loc[
-            j, "name"
-        ] = f"Share of population below ${povlines_ppp2017.dollars_text[p_2017]} a day (2017 prices)"
-        df_tables.loc[
-            j, "slug"
-        ] = f"headcount_ratio_{povlines_ppp2017.cents[p_2017]}_ppp2017"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with an {survey_type.text[survey]} per person below ${povlines_ppp2017.dollars_text[p_2017]} a day (2017 prices).",
-                ppp_description_2017,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = "3;10;20;30;40;50;60;70;80;90;100"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (2011)
-    for p_2011 in range(len(povlines_ppp2011)):
-        df_tables.loc[
-            j, "name"
-        ] = f"Number of people below ${povlines_ppp2011.dollars_text[p_2011]} a day (2011 prices)"
-        df_tables.loc[j, "slug"] = f"headcount_{povlines_ppp2011.cents[p_2011]}_ppp2011"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with an {survey_type.text[survey]} per person below ${povlines_ppp2011.dollars_text[p_2011]} a day (2011 prices).",
-                ppp_description_2011,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Reds"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (2017)
-    for p_2017 in range(len(povlines_ppp2017)):
-        df_tables.loc[
-            j, "name"
-        ] = f"Number of people below ${povlines_ppp2017.dollars_text[p_2017]} a day (2017 prices)"
-        df_tables.loc[j, "slug"] = f"headcount_{povlines_ppp2017.cents[p_2017]}_ppp2017"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with an {survey_type.text[survey]} per person below ${povlines_ppp2017.dollars_text[p_2017]} a day (2017 prices).",
-                ppp_description_2017,
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP)"
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Reds"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Share (relative, 2011)
-    for pct in range(len(povlines_rel)):
-        df_tables.loc[
-            j, "name"
-        ] = f"{povlines_rel.percent[pct]} of median - share of population below poverty line (2011 prices)"
-        df_tables.loc[
-            j, "slug"
-        ] = f"headcount_ratio_{povlines_rel.slug_suffix[pct]}_ppp2011"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with an {survey_type.text[survey]} per person below {povlines_rel.percent[pct]} of the median (2011 prices).",
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = "5;10;15;20;25;30;30.0001"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Share (relative, 2017)
-    for pct in range(len(povlines_rel)):
-        df_tables.loc[
-            j, "name"
-        ] = f"{povlines_rel.percent[pct]} of median - share of population below poverty line (2017 prices)"
-        df_tables.loc[
-            j, "slug"
-        ] = f"headcount_ratio_{povlines_rel.slug_suffix[pct]}_ppp2017"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"% of population living in households with an {survey_type.text[survey]} per person below {povlines_rel.percent[pct]} of the median (2017 prices).",
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleNumericBins"] = "5;10;15;20;25;30;30.0001"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (relative, 2011)
-    for pct in range(len(povlines_rel)):
-        df_tables.loc[
-            j, "name"
-        ] = f"{povlines_rel.percent[pct]} of median - total number of people below poverty line (2011 prices)"
-        df_tables.loc[j, "slug"] = f"headcount_{povlines_rel.slug_suffix[pct]}_ppp2011"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with an {survey_type.text[survey]} per person below {povlines_rel.percent[pct]} of the median (2011 prices).",
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "YlOrRd"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (relative, 2017)
-    for pct in range(len(povlines_rel)):
-        df_tables.loc[
-            j, "name"
-        ] = f"{povlines_rel.percent[pct]} of median - total number of people below poverty line (2017 prices)"
-        df_tables.loc[j, "slug"] = f"headcount_{povlines_rel.slug_suffix[pct]}_ppp2017"
-        df_tables.loc[
-            j, "sourceName"
-        ] = "World Bank Poverty and Inequality Platform (2022)"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"Number of people living in households with an {survey_type.text[survey]} per person below {povlines_rel.percent[pct]} of the median (2017 prices).",
-                survey_type.description[survey],
-                additional_description,
-                notes_title,
-                processing_description,
-            ]
-        )
-        df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-        df_tables.loc[
-            j, "dataPublishedBy"
-        ] = "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data."
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "tolerance"] = 5
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[
-            j, "colorScaleNumericBins"
-        ] = "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001"
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "YlOrRd"
-        df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Mean (2011)
-    df_tables.loc[j, "name"] = f"Mean {survey_type.text[survey]} per day (2011 prices)"
-    df_tables.loc[j, "slug"] = "mean_ppp2011"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The mean level of {survey_type.text[survey]} per day (2011 prices).",
-            ppp_description_2011,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ at 2011 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;50.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Mean (2017)
-    df_tables.loc[j, "name"] = f"Mean {survey_type.text[survey]} per day (2017 prices)"
-    df_tables.loc[j, "slug"] = "mean_ppp2017"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The mean level of {survey_type.text[survey]} per day (2017 prices).",
-            ppp_description_2017,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;50.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Median (2011)
-    df_tables.loc[
-        j, "name"
-    ] = f"Median {survey_type.text[survey]} per day (2011 prices)"
-    df_tables.loc[j, "slug"] = "median_ppp2011"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per day below which half of the population live (2011 prices).",
-            ppp_description_2011,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ at 2011 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;50.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Median (2017)
-    df_tables.loc[
-        j, "name"
-    ] = f"Median {survey_type.text[survey]} per day (2017 prices)"
-    df_tables.loc[j, "slug"] = "median_ppp2017"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per day below which half of the population live (2017 prices).",
-            ppp_description_2017,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;50;50.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P10 (2011)
-    df_tables.loc[j, "name"] = "P10 (2011 prices)"
-    df_tables.loc[j, "slug"] = "decile1_thr_ppp2011"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per day below which 10% of the population falls (2011 prices).",
-            ppp_description_2011,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ at 2011 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;20.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Greens"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P10 (2017)
-    df_tables.loc[j, "name"] = "P10 (2017 prices)"
-    df_tables.loc[j, "slug"] = "decile1_thr_ppp2017"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per day below which 10% of the population falls (2017 prices).",
-            ppp_description_2017,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "1;2;5;10;20;20.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Greens"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P90 (2011)
-    df_tables.loc[j, "name"] = "P90 (2011 prices)"
-    df_tables.loc[j, "slug"] = "decile9_thr_ppp2011"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
-        [
-            f"The level of {survey_type.text[survey]} per day below which 90% of the population falls (2011 prices).",
-            ppp_description_2011,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
-    )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ at 2011 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "5;10;20;50;100;100.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Blues"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P90 (2017)
-    df_tables.loc[j, "name"] = "P90 (2017 prices)"
-    df_tables.loc[j, "slug"] = "decile9_thr_ppp2017"
-    df_tables.loc[j, "sourceName"] = "World Bank Poverty and Inequality Platform (2022)"
-    df_tables.loc[j, "description"] = new_line.join(
+df_tables = expand_views(
+    Each(
+        {"survey": survey_type},
         [
-            f"The level of {survey_type.text[survey]} per day below which 90% of the population falls (2017 prices).",
-            ppp_description_2017,
-            survey_type.description[survey],
-            additional_description,
-            notes_title,
-            processing_description,
-        ]
+            # Shares (2011)
+            Each(
+                {"p_2011": povlines_ppp2011},
+                [
+                    {
+                        "name": "Share of population below $$${p_2011__dollars_text} a day (2011 prices)",
+                        "slug": "headcount_ratio_${p_2011__cents}_ppp2011",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with an ${survey__text} per person below $$${p_2011__dollars_text} a day (2011 prices).",
+                                escape(ppp_description_2011),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "3;10;20;30;40;50;60;70;80;90;100",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Shares (2017)
+            Each(
+                {"p_2017": povlines_ppp2017},
+                [
+                    {
+                        "name": "Share of population below $$${p_2017__dollars_text} a day (2017 prices)",
+                        "slug": "headcount_ratio_${p_2017__cents}_ppp2017",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with an ${survey__text} per person below $$${p_2017__dollars_text} a day (2017 prices).",
+                                escape(ppp_description_2017),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "3;10;20;30;40;50;60;70;80;90;100",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (2011)
+            Each(
+                {"p_2011": povlines_ppp2011},
+                [
+                    {
+                        "name": "Number of people below $$${p_2011__dollars_text} a day (2011 prices)",
+                        "slug": "headcount_${p_2011__cents}_ppp2011",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with an ${survey__text} per person below $$${p_2011__dollars_text} a day (2011 prices).",
+                                escape(ppp_description_2011),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Reds",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (2017)
+            Each(
+                {"p_2017": povlines_ppp2017},
+                [
+                    {
+                        "name": "Number of people below $$${p_2017__dollars_text} a day (2017 prices)",
+                        "slug": "headcount_${p_2017__cents}_ppp2017",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with an ${survey__text} per person below $$${p_2017__dollars_text} a day (2017 prices).",
+                                escape(ppp_description_2017),
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Reds",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Share (relative, 2011)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "name": "${pct__percent} of median - share of population below poverty line (2011 prices)",
+                        "slug": "headcount_ratio_${pct__slug_suffix}_ppp2011",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with an ${survey__text} per person below ${pct__percent} of the median (2011 prices).",
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "5;10;15;20;25;30;30.0001",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrBr",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Share (relative, 2017)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "name": "${pct__percent} of median - share of population below poverty line (2017 prices)",
+                        "slug": "headcount_ratio_${pct__slug_suffix}_ppp2017",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "% of population living in households with an ${survey__text} per person below ${pct__percent} of the median (2017 prices).",
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "5;10;15;20;25;30;30.0001",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrBr",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (relative, 2011)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "name": "${pct__percent} of median - total number of people below poverty line (2011 prices)",
+                        "slug": "headcount_${pct__slug_suffix}_ppp2011",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with an ${survey__text} per person below ${pct__percent} of the median (2011 prices).",
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrRd",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (relative, 2017)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "name": "${pct__percent} of median - total number of people below poverty line (2017 prices)",
+                        "slug": "headcount_${pct__slug_suffix}_ppp2017",
+                        "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                        "description": new_line.join(
+                            [
+                                "Number of people living in households with an ${survey__text} per person below ${pct__percent} of the median (2017 prices).",
+                                "${survey__description}",
+                                escape(additional_description),
+                                escape(notes_title),
+                                escape(processing_description),
+                            ]
+                        ),
+                        "sourceLink": "https://pip.worldbank.org/",
+                        "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP), adapted by Our World in Data.",
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "tolerance": 5,
+                        "type": "Numeric",
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleNumericBins": "100000;300000;1000000;3000000;10000000;30000000;100000000;300000000;1000000000;1000000001",
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrRd",
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Mean (2011)
+            {
+                "name": "Mean ${survey__text} per day (2011 prices)",
+                "slug": "mean_ppp2011",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The mean level of ${survey__text} per day (2011 prices).",
+                        escape(ppp_description_2011),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ at 2011 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;50.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "BuGn",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Mean (2017)
+            {
+                "name": "Mean ${survey__text} per day (2017 prices)",
+                "slug": "mean_ppp2017",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The mean level of ${survey__text} per day (2017 prices).",
+                        escape(ppp_description_2017),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;50.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "BuGn",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Median (2011)
+            {
+                "name": "Median ${survey__text} per day (2011 prices)",
+                "slug": "median_ppp2011",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which half of the population live (2011 prices).",
+                        escape(ppp_description_2011),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ at 2011 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;50.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "BuGn",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Median (2017)
+            {
+                "name": "Median ${survey__text} per day (2017 prices)",
+                "slug": "median_ppp2017",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which half of the population live (2017 prices).",
+                        escape(ppp_description_2017),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;50;50.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "BuGn",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P10 (2011)
+            {
+                "name": "P10 (2011 prices)",
+                "slug": "decile1_thr_ppp2011",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which 10% of the population falls (2011 prices).",
+                        escape(ppp_description_2011),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ at 2011 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;20.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Greens",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P10 (2017)
+            {
+                "name": "P10 (2017 prices)",
+                "slug": "decile1_thr_ppp2017",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which 10% of the population falls (2017 prices).",
+                        escape(ppp_description_2017),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "1;2;5;10;20;20.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Greens",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P90 (2011)
+            {
+                "name": "P90 (2011 prices)",
+                "slug": "decile9_thr_ppp2011",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which 90% of the population falls (2011 prices).",
+                        escape(ppp_description_2011),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ at 2011 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "5;10;20;50;100;100.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Blues",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P90 (2017)
+            {
+                "name": "P90 (2017 prices)",
+                "slug": "decile9_thr_ppp2017",
+                "sourceName": "World Bank Poverty and Inequality Platform (2022)",
+                "description": new_line.join(
+                    [
+                        "The level of ${survey__text} per day below which 90% of the population falls (2017 prices).",
+                        escape(ppp_description_2017),
+                        "${survey__description}",
+                        escape(additional_description),
+                        escape(notes_title),
+                        escape(processing_description),
+                    ]
+                ),
+                "sourceLink": "https://pip.worldbank.org/",
+                "dataPublishedBy": "World Bank Poverty and Inequality Platform (PIP)",
+                "unit": "international-$$ in 2017 prices",
+                "shortUnit": "$$",
+                "tolerance": 5,
+                "type": "Numeric",
+                "colorScaleNumericMinValue": 0,
+                "colorScaleNumericBins": "5;10;20;50;100;100.0001",
+                "colorScaleEqualSizeBins": "true",
+                "colorScaleScheme": "Blues",
+                "survey_type": Column("survey__table_name"),
+            },
+        ],
     )
-    df_tables.loc[j, "sourceLink"] = "https://pip.worldbank.org/"
-    df_tables.loc[
-        j, "dataPublishedBy"
-    ] = "World Bank Poverty and Inequality Platform (PIP)"
-    df_tables.loc[j, "unit"] = "international-$ in 2017 prices"
-    df_tables.loc[j, "shortUnit"] = "$"
-    df_tables.loc[j, "tolerance"] = 5
-    df_tables.loc[j, "type"] = "Numeric"
-    df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-    df_tables.loc[j, "colorScaleNumericBins"] = "5;10;20;50;100;100.0001"
-    df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-    df_tables.loc[j, "colorScaleScheme"] = "Blues"
-    df_tables.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
+)
 
 # Make tolerance integer (to not break the parameter in the platform)
 df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
@@ -629,684 +585,531 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 # %%
 # Grapher table generation
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for survey in range(len(survey_type)):
-    # Share (2011)
-    for p_2011 in range(len(povlines_ppp2011)):
-        df_graphers.loc[j, "title"] = f"{povlines_ppp2011.title_share[p_2011]}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_ratio_{povlines_ppp2011.cents[p_2011]}_ppp2011"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_ppp2011.povline_dropdown[p_2011]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_ppp2011.subtitle[p_2011]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2011 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Share (2017)
-    for p_2017 in range(len(povlines_ppp2017)):
-        df_graphers.loc[j, "title"] = f"{povlines_ppp2017.title_share[p_2017]}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_ratio_{povlines_ppp2017.cents[p_2017]}_ppp2017"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_ppp2017.povline_dropdown[p_2017]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_ppp2017.subtitle[p_2017]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (2011)
-    for p_2011 in range(len(povlines_ppp2011)):
-        df_graphers.loc[j, "title"] = f"{povlines_ppp2011.title_number[p_2011]}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_{povlines_ppp2011.cents[p_2011]}_ppp2011"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_ppp2011.povline_dropdown[p_2011]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_ppp2011.subtitle[p_2011]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2011 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (2017)
-    for p_2017 in range(len(povlines_ppp2017)):
-        df_graphers.loc[j, "title"] = f"{povlines_ppp2017.title_number[p_2017]}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_{povlines_ppp2017.cents[p_2017]}_ppp2017"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_ppp2017.povline_dropdown[p_2017]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_ppp2017.subtitle[p_2017]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Share (2011 and 2017)
-    for p in range(len(povlines_both)):
-        df_graphers.loc[j, "title"] = f"{povlines_both.title_share[p]}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_ratio_{povlines_both.cents_2011[p]}_ppp2011 headcount_ratio_{povlines_both.cents_2017[p]}_ppp2017"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_both.povline_dropdown[p]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_both.subtitle[p]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = np.nan
-        df_graphers.loc[j, "tab"] = np.nan
-        df_graphers.loc[j, "mapTargetTime"] = np.nan
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (2011 and 2017)
-    for p in range(len(povlines_both)):
-        df_graphers.loc[j, "title"] = f"{povlines_both.title_number[p]}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_{povlines_both.cents_2011[p]}_ppp2011 headcount_{povlines_both.cents_2017[p]}_ppp2017"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-        df_graphers.loc[
-            j, "Poverty line Dropdown"
-        ] = f"{povlines_both.povline_dropdown[p]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[j, "subtitle"] = f"{povlines_both.subtitle[p]}"
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = np.nan
-        df_graphers.loc[j, "tab"] = np.nan
-        df_graphers.loc[j, "mapTargetTime"] = np.nan
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Share (relative, 2011)
-    for pct in range(len(povlines_rel)):
-        df_graphers.loc[j, "title"] = f"{povlines_rel.title_share[pct]} (2011 prices)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_ratio_{povlines_rel.slug_suffix[pct]}_ppp2011"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-        df_graphers.loc[j, "Poverty line Dropdown"] = f"{povlines_rel.dropdown[pct]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {povlines_rel.text[pct]} {survey_type.text[survey]}."
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Share (relative, 2017)
-    for pct in range(len(povlines_rel)):
-        df_graphers.loc[j, "title"] = f"{povlines_rel.title_share[pct]} (2017 prices)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_ratio_{povlines_rel.slug_suffix[pct]}_ppp2017"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-        df_graphers.loc[j, "Poverty line Dropdown"] = f"{povlines_rel.dropdown[pct]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {povlines_rel.text[pct]} {survey_type.text[survey]}."
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (relative, 2011)
-    for pct in range(len(povlines_rel)):
-        df_graphers.loc[j, "title"] = f"{povlines_rel.title_number[pct]} (2011 prices)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_{povlines_rel.slug_suffix[pct]}_ppp2011"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-        df_graphers.loc[j, "Poverty line Dropdown"] = f"{povlines_rel.dropdown[pct]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {povlines_rel.text[pct]} {survey_type.text[survey]}."
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Number (relative, 2017)
-    for pct in range(len(povlines_rel)):
-        df_graphers.loc[j, "title"] = f"{povlines_rel.title_number[pct]} (2017 prices)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"headcount_{povlines_rel.slug_suffix[pct]}_ppp2017"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-        df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-        df_graphers.loc[j, "Poverty line Dropdown"] = f"{povlines_rel.dropdown[pct]}"
-        df_graphers.loc[
-            j, "Household survey data type Dropdown"
-        ] = f"{survey_type.dropdown_option[survey]}"
-        df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at {povlines_rel.text[pct]} {survey_type.text[survey]}."
-        df_graphers.loc[
-            j, "note"
-        ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "yAxisMin"] = 0
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        df_graphers.loc[j, "mapTargetTime"] = 2019
-        df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-        j += 1
-
-    # Share (relative, 2011 vs 2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Relative poverty: Share of people below 60% of the median (2011 vs. 2017 prices)"
-    df_graphers.loc[
-        j, "ySlugs"
-    ] = f"headcount_ratio_60_median_ppp2011 headcount_ratio_60_median_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Share in poverty"
-    df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = f"Relative poverty: 60% of median"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at 60% of the median {survey_type.text[survey]}."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = np.nan
-    df_graphers.loc[j, "tab"] = np.nan
-    df_graphers.loc[j, "mapTargetTime"] = np.nan
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Number (relative, 2011 vs 2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Relative poverty: Number of people below 60% of the median (2011 vs. 2017 prices)"
-    df_graphers.loc[
-        j, "ySlugs"
-    ] = f"headcount_60_median_ppp2011 headcount_60_median_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Number in poverty"
-    df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = f"Relative poverty: 60% of median"
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at 60% of the median {survey_type.text[survey]}."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = np.nan
-    df_graphers.loc[j, "tab"] = np.nan
-    df_graphers.loc[j, "mapTargetTime"] = np.nan
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Mean (2011)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Mean {survey_type.text[survey]} per day (2011 prices)"
-    df_graphers.loc[j, "ySlugs"] = "mean_ppp2011"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Mean income or consumption"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2011 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Mean (2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Mean {survey_type.text[survey]} per day (2017 prices)"
-    df_graphers.loc[j, "ySlugs"] = "mean_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Mean income or consumption"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Mean (2011, 2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Mean {survey_type.text[survey]} per day: 2011 vs. 2017 prices"
-    df_graphers.loc[j, "ySlugs"] = "mean_ppp2011 mean_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Mean income or consumption"
-    df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = np.nan
-    df_graphers.loc[j, "tab"] = np.nan
-    df_graphers.loc[j, "mapTargetTime"] = np.nan
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Median (2011)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Median {survey_type.text[survey]} per day (2011 prices)"
-    df_graphers.loc[j, "ySlugs"] = "median_ppp2011"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Median income or consumption"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2011 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Median (2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Median {survey_type.text[survey]} per day (2017 prices)"
-    df_graphers.loc[j, "ySlugs"] = "median_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Median income or consumption"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is expressed in international-$ at 2017 prices. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # Median (2011, 2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"Median {survey_type.text[survey]} per day: 2011 vs. 2017 prices"
-    df_graphers.loc[j, "ySlugs"] = "median_ppp2011 median_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Median income or consumption"
-    df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = "This data is adjusted for inflation and for differences in the cost of living between countries."
-    df_graphers.loc[
-        j, "note"
-    ] = f"Depending on the country and year, the data relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = np.nan
-    df_graphers.loc[j, "tab"] = np.nan
-    df_graphers.loc[j, "mapTargetTime"] = np.nan
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P10 (2011)
-    df_graphers.loc[
-        j, "title"
-    ] = f"P10: The {survey_type.text[survey]} of the poorest tenth (2011 prices)"
-    df_graphers.loc[j, "ySlugs"] = "decile1_thr_ppp2011"
-    df_graphers.loc[j, "Indicator Dropdown"] = "P10 (poorest tenth)"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"P10 is the level of {survey_type.text[survey]} per day below which 10% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is measured in international-$ at 2011 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P10 (2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"P10: The {survey_type.text[survey]} of the poorest tenth (2017 prices)"
-    df_graphers.loc[j, "ySlugs"] = "decile1_thr_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "P10 (poorest tenth)"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"P10 is the level of {survey_type.text[survey]} per day below which 10% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P10 (2011, 2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"P10: The {survey_type.text[survey]} of the poorest tenth (2011 vs. 2017 prices)"
-    df_graphers.loc[j, "ySlugs"] = "decile1_thr_ppp2011 decile1_thr_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "P10 (poorest tenth)"
-    df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"P10 is the level of {survey_type.text[survey]} per day below which 10% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is adjusted for inflation and for differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = np.nan
-    df_graphers.loc[j, "tab"] = np.nan
-    df_graphers.loc[j, "mapTargetTime"] = np.nan
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P90 (2011)
-    df_graphers.loc[
-        j, "title"
-    ] = f"P90: The {survey_type.text[survey]} of the richest tenth (2011 prices)"
-    df_graphers.loc[j, "ySlugs"] = "decile9_thr_ppp2011"
-    df_graphers.loc[j, "Indicator Dropdown"] = "P90 (richest tenth)"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"P90 is the level of {survey_type.text[survey]} per day above which 10% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is measured in international-$ at 2011 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P90 (2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"P90: The {survey_type.text[survey]} of the richest tenth (2017 prices)"
-    df_graphers.loc[j, "ySlugs"] = "decile9_thr_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "P90 (richest tenth)"
-    df_graphers.loc[j, "International-$ Dropdown"] = "2017 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"P90 is the level of {survey_type.text[survey]} per day above which 10% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is measured in international-$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-    df_graphers.loc[j, "hasMapTab"] = "true"
-    df_graphers.loc[j, "tab"] = "map"
-    df_graphers.loc[j, "mapTargetTime"] = 2019
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
-
-    # P90 (2011, 2017)
-    df_graphers.loc[
-        j, "title"
-    ] = f"P90: The {survey_type.text[survey]} of the richest tenth (2011 vs. 2017 prices)"
-    df_graphers.loc[j, "ySlugs"] = "decile9_thr_ppp2011 decile9_thr_ppp2017"
-    df_graphers.loc[j, "Indicator Dropdown"] = "P90 (richest tenth)"
-    df_graphers.loc[j, "International-$ Dropdown"] = "Compare 2017 and 2011 prices"
-    df_graphers.loc[j, "Poverty line Dropdown"] = np.nan
-    df_graphers.loc[
-        j, "Household survey data type Dropdown"
-    ] = f"{survey_type.dropdown_option[survey]}"
-    df_graphers.loc[j, "tableSlug"] = f"{survey_type.table_name[survey]}"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"P90 is the level of {survey_type.text[survey]} per day above which 10% of the population falls."
-    df_graphers.loc[
-        j, "note"
-    ] = f"This data is adjusted for inflation and for differences in the cost of living between countries. Depending on the country and year, it relates to {survey_type.detailed_text[survey]} per capita."
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "yAxisMin"] = 0
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = np.nan
-    df_graphers.loc[j, "tab"] = np.nan
-    df_graphers.loc[j, "mapTargetTime"] = np.nan
-    df_graphers.loc[j, "yScaleToggle"] = "true"
-    df_graphers.loc[j, "survey_type"] = survey_type["table_name"][survey]
-    j += 1
+df_graphers = expand_views(
+    Each(
+        {"survey": survey_type},
+        [
+            # Share (2011)
+            Each(
+                {"p_2011": povlines_ppp2011},
+                [
+                    {
+                        "title": "${p_2011__title_share}",
+                        "ySlugs": "headcount_ratio_${p_2011__cents}_ppp2011",
+                        "Indicator Dropdown": "Share in poverty",
+                        "International-$ Dropdown": "2011 prices",
+                        "Poverty line Dropdown": "${p_2011__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p_2011__subtitle}",
+                        "note": "This data is expressed in international-$$ at 2011 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Share (2017)
+            Each(
+                {"p_2017": povlines_ppp2017},
+                [
+                    {
+                        "title": "${p_2017__title_share}",
+                        "ySlugs": "headcount_ratio_${p_2017__cents}_ppp2017",
+                        "Indicator Dropdown": "Share in poverty",
+                        "International-$ Dropdown": "2017 prices",
+                        "Poverty line Dropdown": "${p_2017__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p_2017__subtitle}",
+                        "note": "This data is expressed in international-$$ at 2017 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (2011)
+            Each(
+                {"p_2011": povlines_ppp2011},
+                [
+                    {
+                        "title": "${p_2011__title_number}",
+                        "ySlugs": "headcount_${p_2011__cents}_ppp2011",
+                        "Indicator Dropdown": "Number in poverty",
+                        "International-$ Dropdown": "2011 prices",
+                        "Poverty line Dropdown": "${p_2011__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p_2011__subtitle}",
+                        "note": "This data is expressed in international-$$ at 2011 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (2017)
+            Each(
+                {"p_2017": povlines_ppp2017},
+                [
+                    {
+                        "title": "${p_2017__title_number}",
+                        "ySlugs": "headcount_${p_2017__cents}_ppp2017",
+                        "Indicator Dropdown": "Number in poverty",
+                        "International-$ Dropdown": "2017 prices",
+                        "Poverty line Dropdown": "${p_2017__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p_2017__subtitle}",
+                        "note": "This data is expressed in international-$$ at 2017 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Share (2011 and 2017)
+            Each(
+                {"p": povlines_both},
+                [
+                    {
+                        "title": "${p__title_share}",
+                        "ySlugs": "headcount_ratio_${p__cents_2011}_ppp2011 headcount_ratio_${p__cents_2017}_ppp2017",
+                        "Indicator Dropdown": "Share in poverty",
+                        "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                        "Poverty line Dropdown": "${p__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p__subtitle}",
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": np.nan,
+                        "tab": np.nan,
+                        "mapTargetTime": np.nan,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (2011 and 2017)
+            Each(
+                {"p": povlines_both},
+                [
+                    {
+                        "title": "${p__title_number}",
+                        "ySlugs": "headcount_${p__cents_2011}_ppp2011 headcount_${p__cents_2017}_ppp2017",
+                        "Indicator Dropdown": "Number in poverty",
+                        "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                        "Poverty line Dropdown": "${p__povline_dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "${p__subtitle}",
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": np.nan,
+                        "tab": np.nan,
+                        "mapTargetTime": np.nan,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Share (relative, 2011)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "title": "${pct__title_share} (2011 prices)",
+                        "ySlugs": "headcount_ratio_${pct__slug_suffix}_ppp2011",
+                        "Indicator Dropdown": "Share in poverty",
+                        "International-$ Dropdown": "2011 prices",
+                        "Poverty line Dropdown": "${pct__dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at ${pct__text} ${survey__text}.",
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Share (relative, 2017)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "title": "${pct__title_share} (2017 prices)",
+                        "ySlugs": "headcount_ratio_${pct__slug_suffix}_ppp2017",
+                        "Indicator Dropdown": "Share in poverty",
+                        "International-$ Dropdown": "2017 prices",
+                        "Poverty line Dropdown": "${pct__dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at ${pct__text} ${survey__text}.",
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (relative, 2011)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "title": "${pct__title_number} (2011 prices)",
+                        "ySlugs": "headcount_${pct__slug_suffix}_ppp2011",
+                        "Indicator Dropdown": "Number in poverty",
+                        "International-$ Dropdown": "2011 prices",
+                        "Poverty line Dropdown": "${pct__dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at ${pct__text} ${survey__text}.",
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Number (relative, 2017)
+            Each(
+                {"pct": povlines_rel},
+                [
+                    {
+                        "title": "${pct__title_number} (2017 prices)",
+                        "ySlugs": "headcount_${pct__slug_suffix}_ppp2017",
+                        "Indicator Dropdown": "Number in poverty",
+                        "International-$ Dropdown": "2017 prices",
+                        "Poverty line Dropdown": "${pct__dropdown}",
+                        "Household survey data type Dropdown": "${survey__dropdown_option}",
+                        "tableSlug": "${survey__table_name}",
+                        "subtitle": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at ${pct__text} ${survey__text}.",
+                        "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                        "type": np.nan,
+                        "yAxisMin": 0,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                        "mapTargetTime": 2019,
+                        "survey_type": Column("survey__table_name"),
+                    }
+                ],
+            ),
+            # Share (relative, 2011 vs 2017)
+            {
+                "title": "Relative poverty: Share of people below 60% of the median (2011 vs. 2017 prices)",
+                "ySlugs": "headcount_ratio_60_median_ppp2011 headcount_ratio_60_median_ppp2017",
+                "Indicator Dropdown": "Share in poverty",
+                "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                "Poverty line Dropdown": "Relative poverty: 60% of median",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at 60% of the median ${survey__text}.",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": np.nan,
+                "tab": np.nan,
+                "mapTargetTime": np.nan,
+                "survey_type": Column("survey__table_name"),
+            },
+            # Number (relative, 2011 vs 2017)
+            {
+                "title": "Relative poverty: Number of people below 60% of the median (2011 vs. 2017 prices)",
+                "ySlugs": "headcount_60_median_ppp2011 headcount_60_median_ppp2017",
+                "Indicator Dropdown": "Number in poverty",
+                "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                "Poverty line Dropdown": "Relative poverty: 60% of median",
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "Relative poverty is measured in terms of a poverty line that rises and falls over time with average incomes – in this case set at 60% of the median ${survey__text}.",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": np.nan,
+                "tab": np.nan,
+                "mapTargetTime": np.nan,
+                "survey_type": Column("survey__table_name"),
+            },
+            # Mean (2011)
+            {
+                "title": "Mean ${survey__text} per day (2011 prices)",
+                "ySlugs": "mean_ppp2011",
+                "Indicator Dropdown": "Mean income or consumption",
+                "International-$ Dropdown": "2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                "note": "This data is expressed in international-$$ at 2011 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Mean (2017)
+            {
+                "title": "Mean ${survey__text} per day (2017 prices)",
+                "ySlugs": "mean_ppp2017",
+                "Indicator Dropdown": "Mean income or consumption",
+                "International-$ Dropdown": "2017 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                "note": "This data is expressed in international-$$ at 2017 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Mean (2011, 2017)
+            {
+                "title": "Mean ${survey__text} per day: 2011 vs. 2017 prices",
+                "ySlugs": "mean_ppp2011 mean_ppp2017",
+                "Indicator Dropdown": "Mean income or consumption",
+                "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": np.nan,
+                "tab": np.nan,
+                "mapTargetTime": np.nan,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Median (2011)
+            {
+                "title": "Median ${survey__text} per day (2011 prices)",
+                "ySlugs": "median_ppp2011",
+                "Indicator Dropdown": "Median income or consumption",
+                "International-$ Dropdown": "2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                "note": "This data is expressed in international-$$ at 2011 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Median (2017)
+            {
+                "title": "Median ${survey__text} per day (2017 prices)",
+                "ySlugs": "median_ppp2017",
+                "Indicator Dropdown": "Median income or consumption",
+                "International-$ Dropdown": "2017 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                "note": "This data is expressed in international-$$ at 2017 prices. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # Median (2011, 2017)
+            {
+                "title": "Median ${survey__text} per day: 2011 vs. 2017 prices",
+                "ySlugs": "median_ppp2011 median_ppp2017",
+                "Indicator Dropdown": "Median income or consumption",
+                "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                "note": "Depending on the country and year, the data relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": np.nan,
+                "tab": np.nan,
+                "mapTargetTime": np.nan,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P10 (2011)
+            {
+                "title": "P10: The ${survey__text} of the poorest tenth (2011 prices)",
+                "ySlugs": "decile1_thr_ppp2011",
+                "Indicator Dropdown": "P10 (poorest tenth)",
+                "International-$ Dropdown": "2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "P10 is the level of ${survey__text} per day below which 10% of the population falls.",
+                "note": "This data is measured in international-$$ at 2011 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P10 (2017)
+            {
+                "title": "P10: The ${survey__text} of the poorest tenth (2017 prices)",
+                "ySlugs": "decile1_thr_ppp2017",
+                "Indicator Dropdown": "P10 (poorest tenth)",
+                "International-$ Dropdown": "2017 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "P10 is the level of ${survey__text} per day below which 10% of the population falls.",
+                "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P10 (2011, 2017)
+            {
+                "title": "P10: The ${survey__text} of the poorest tenth (2011 vs. 2017 prices)",
+                "ySlugs": "decile1_thr_ppp2011 decile1_thr_ppp2017",
+                "Indicator Dropdown": "P10 (poorest tenth)",
+                "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "P10 is the level of ${survey__text} per day below which 10% of the population falls.",
+                "note": "This data is adjusted for inflation and for differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": np.nan,
+                "tab": np.nan,
+                "mapTargetTime": np.nan,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P90 (2011)
+            {
+                "title": "P90: The ${survey__text} of the richest tenth (2011 prices)",
+                "ySlugs": "decile9_thr_ppp2011",
+                "Indicator Dropdown": "P90 (richest tenth)",
+                "International-$ Dropdown": "2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "P90 is the level of ${survey__text} per day above which 10% of the population falls.",
+                "note": "This data is measured in international-$$ at 2011 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P90 (2017)
+            {
+                "title": "P90: The ${survey__text} of the richest tenth (2017 prices)",
+                "ySlugs": "decile9_thr_ppp2017",
+                "Indicator Dropdown": "P90 (richest tenth)",
+                "International-$ Dropdown": "2017 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "P90 is the level of ${survey__text} per day above which 10% of the population falls.",
+                "note": "This data is measured in international-$$ at 2017 prices to account for inflation and differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": np.nan,
+                "hasMapTab": "true",
+                "tab": "map",
+                "mapTargetTime": 2019,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+            # P90 (2011, 2017)
+            {
+                "title": "P90: The ${survey__text} of the richest tenth (2011 vs. 2017 prices)",
+                "ySlugs": "decile9_thr_ppp2011 decile9_thr_ppp2017",
+                "Indicator Dropdown": "P90 (richest tenth)",
+                "International-$ Dropdown": "Compare 2017 and 2011 prices",
+                "Poverty line Dropdown": np.nan,
+                "Household survey data type Dropdown": "${survey__dropdown_option}",
+                "tableSlug": "${survey__table_name}",
+                "subtitle": "P90 is the level of ${survey__text} per day above which 10% of the population falls.",
+                "note": "This data is adjusted for inflation and for differences in the cost of living between countries. Depending on the country and year, it relates to ${survey__detailed_text} per capita.",
+                "type": np.nan,
+                "yAxisMin": 0,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": np.nan,
+                "tab": np.nan,
+                "mapTargetTime": np.nan,
+                "yScaleToggle": "true",
+                "survey_type": Column("survey__table_name"),
+            },
+        ],
+    )
+)
 
 # %% [markdown]
 # Final adjustments to the graphers table:
@@ -1324,39 +1127,44 @@ df_graphers[
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["ySlugs"] == "headcount_ratio_190_ppp2011 headcount_ratio_215_ppp2017")
-    & (df_graphers["tableSlug"] == "inc_or_cons"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "ySlugs": "headcount_ratio_190_ppp2011 headcount_ratio_215_ppp2017",
+        "tableSlug": "inc_or_cons",
+    },
+)
 
 # When the "Depending on" footnote is introduced, it generates unwanted texts as:
 # "Depending on the country and year, the data relates to income measured after taxes and benefits per capita."
 # "Depending on the country and year, the data relates to consumption per capita."
 
-# When int-$ are not included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
-    "The data relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, the data relates to consumption per capita.",
-    "The data relates to consumption per capita.",
-    regex=False,
+rewrite_rules = RewriteRules(
+    [
+        # When int-$ are not included
+        (
+            "Depending on the country and year, the data relates to income measured after taxes and benefits per capita.",
+            "The data relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, the data relates to consumption per capita.",
+            "The data relates to consumption per capita.",
+        ),
+        # When int-$ are included
+        (
+            "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
+            "It relates to income measured after taxes and benefits per capita.",
+        ),
+        (
+            "Depending on the country and year, it relates to consumption per capita.",
+            "It relates to consumption per capita.",
+        ),
+    ]
 )
+df_graphers["note"] = rewrite_rules.apply(df_graphers["note"])
 
-# When int-$ are included
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to income measured after taxes and benefits per capita.",
-    "It relates to income measured after taxes and benefits per capita.",
-    regex=False,
-)
-df_graphers["note"] = df_graphers["note"].str.replace(
-    "Depending on the country and year, it relates to consumption per capita.",
-    "It relates to consumption per capita.",
-    regex=False,
-)
+# Warn about rules that no longer match anything (with OWID_REWRITE_WARNINGS=1)
+rewrite_rules.warn_unused()
 
 # Reorder dropdown menus
 povline_dropdown_list = [
@@ -1401,28 +1209,21 @@ df_graphers = df_graphers.drop(columns=["povline_dropdown_aux"])
 # Define list of variables to iterate: survey types
 survey_list = list(survey_type["table_name"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
+# Auxiliar variable `survey_type` is dropped from the graphers table
+graphers = df_graphers.drop(columns=["survey_type"])
 
-# Auxiliar variable `survey_type` is dropped and graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers.drop(columns=["survey_type"])
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by survey type, to write them one by one
+table_blocks = TableBlocks(df_tables, "survey_type")
 
 # The dataframes are combined, including tables which are filtered by survey type and variable
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, graphers, index=False)
 
     for i in survey_list:
-        table_tsv = (
-            df_tables[df_tables["survey_type"] == i].copy().reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["survey_type"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[i]
         f.write(
             "\ntable\t"
             + "https://raw.githubusercontent.com/owid/notebooks/main/BetterDataDocs/JoeHasell/PIP/data/ppp_vs/final/OWID_internal_upload/explorer_database/"
@@ -1432,4 +1233,5 @@ with open(outfile, "w", newline="\n", encoding="utf-8") as f:
             + ".csv\t"
             + i
         )
-        f.write("\ncolumns\t" + i + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + i + "\n")
+        write_frame(f, table_tsv, index=False)
@@ -2,7 +2,7 @@
 # # Incomes Across the Distribution Explorer of the World Inequality Database
 # This code creates the tsv file for the incomes across the distribution explorer from the WID data, available [here](https://owid.cloud/admin/explorers/preview/wid-keymetrics)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,16 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "wid-incomes-across-distribution.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "wid-incomes-across-distribution.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,34 +32,30 @@ sheet_id = "18T5IGnpyJwb8KL9USYvME6IaLEcYIo26ioHCpkDnwRQ"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-welfare = pd.read_csv(url, keep_default_na=False)
+welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Tables sheet
 sheet_name = "tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-tables = pd.read_csv(url, keep_default_na=False)
+tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Deciles9 sheet (needed to handle thresholds data)
 sheet_name = "deciles9"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles9 = pd.read_csv(url, keep_default_na=False)
+deciles9 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Deciles10 sheet (needed to handle average and share data)
 sheet_name = "deciles10"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-deciles10 = pd.read_csv(url, keep_default_na=False)
+deciles10 = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Top sheet (needed to handle data at the top of the distribution)
 sheet_name = "top_pct"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-top_pct = pd.read_csv(url, keep_default_na=False, dtype={"percentage": "str"})
+top_pct = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"percentage": "str"}
+)
 
 # Income aggregation sheet (day, month, year)
 sheet_name = "income_aggregation"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-income_aggregation = pd.read_csv(
-    url, keep_default_na=False, dtype={"multiplier": "str"}
+income_aggregation = read_sheet(
+    sheet_id, sheet_name, keep_default_na=False, dtype={"multiplier": "str"}
 )
 
 # %% [markdown]
@@ -106,387 +111,384 @@ additional_description = new_line.join(
 )
 ppp_description = "The data is measured in international-$ at 2022 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables = pd.DataFrame()
-j = 0
-
-for tab in range(len(tables)):
-    # Define country as entityName
-    df_tables.loc[j, "name"] = "Country"
-    df_tables.loc[j, "slug"] = "country"
-    df_tables.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables.loc[j, "name"] = "Year"
-    df_tables.loc[j, "slug"] = "year"
-    df_tables.loc[j, "type"] = "Year"
-    j += 1
-
-    # Define original variables to not break income aggregations
-    for wel in range(len(welfare)):
-        # Mean
-        df_tables.loc[
-            j, "name"
-        ] = f"Mean {welfare['welfare_type'][wel]} {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"p0p100_avg_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"Mean {welfare['welfare_type'][wel]}",
-                welfare["description"][wel],
-                ppp_description,
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-        df_tables.loc[j, "shortUnit"] = "$"
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_mean"][wel]
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-        j += 1
-
-        # Median
-        df_tables.loc[
-            j, "name"
-        ] = f"Median {welfare['welfare_type'][wel]} {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"median_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The level of {welfare['welfare_type'][wel]} below which half of the population falls.",
-                welfare["description"][wel],
-                ppp_description,
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-        df_tables.loc[j, "shortUnit"] = "$"
-        df_tables.loc[j, "type"] = "Numeric"
-        # df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_median"][wel]
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Blues"
-        j += 1
-
-        # Thresholds - Deciles
-        for dec9 in range(len(deciles9)):
-            df_tables.loc[
-                j, "name"
-            ] = f"{deciles9['ordinal'][dec9].capitalize()} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"{deciles9['wid_notation'][dec9]}_thr_{welfare['slug'][wel]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The level of {welfare['welfare_type'][wel]} below which {deciles9['decile'][dec9]}0% of the population falls.",
-                    welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            # df_tables.loc[j, "colorScaleNumericBins"] = deciles9["scale_thr"][dec9]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "Purples"
-            j += 1
-
-        # Averages - Deciles
-        for dec10 in range(len(deciles10)):
-            df_tables.loc[
-                j, "name"
-            ] = f"{deciles10['ordinal'][dec10].capitalize()} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"{deciles10['wid_notation'][dec10]}_avg_{welfare['slug'][wel]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The mean {welfare['welfare_type'][wel]} within the {deciles10['ordinal'][dec10]} (tenth of the population).",
-                    welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            # df_tables.loc[j, "colorScaleNumericBins"] = deciles10["scale_avg"][dec10]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "Greens"
-            j += 1
-
-        # Shares - Deciles
-        for dec10 in range(len(deciles10)):
-            df_tables.loc[
-                j, "name"
-            ] = f"{deciles10['ordinal'][dec10].capitalize()} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"{deciles10['wid_notation'][dec10]}_share_{welfare['slug'][wel]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The share of {welfare['welfare_type'][wel]} received by the {deciles10['ordinal'][dec10]} (tenth of the population).",
-                    welfare["description"][wel],
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "%"
-            df_tables.loc[j, "shortUnit"] = "%"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = deciles10[
-                f"scale_share_{welfare['slug'][wel]}"
-            ][dec10]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-            j += 1
-
-        # Thresholds - Top percentiles
-        for top in range(len(top_pct)):
-            df_tables.loc[
-                j, "name"
-            ] = f"{top_pct['name'][top].capitalize()} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"{top_pct['wid_notation'][top]}_thr_{welfare['slug'][wel]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The level of {welfare['welfare_type'][wel]} marking the richest {top_pct['percentage'][top]}",
-                    welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            # df_tables.loc[j, "colorScaleNumericBins"] = top_pct["scale_thr"][top]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "Purples"
-            j += 1
-
-        # Averages - Top percentiles
-        for top in range(len(top_pct)):
-            df_tables.loc[
-                j, "name"
-            ] = f"{top_pct['name'][top].capitalize()} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"{top_pct['wid_notation'][top]}_avg_{welfare['slug'][wel]}"
-            df_tables.loc[j, "description"] = new_line.join(
+# Capitalized texts, for the start of names, titles and dropdown options
+deciles9["ordinal_capitalized"] = deciles9["ordinal"].str.capitalize()
+deciles10["ordinal_capitalized"] = deciles10["ordinal"].str.capitalize()
+top_pct["name_capitalized"] = top_pct["name"].str.capitalize()
+income_aggregation["aggregation_capitalized"] = income_aggregation[
+    "aggregation"
+].str.capitalize()
+welfare["title_capitalized"] = welfare["title"].str.capitalize()
+welfare["welfare_type_capitalized"] = welfare["welfare_type"].str.capitalize()
+
+df_tables = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            # Define original variables to not break income aggregations
+            Each(
+                {"wel": welfare},
                 [
-                    f"The mean {welfare['welfare_type'][wel]} within the richest {top_pct['percentage'][top]}.",
-                    welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            # df_tables.loc[j, "colorScaleNumericBins"] = top_pct["scale_avg"][top]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "Greens"
-            j += 1
-
-        # Shares - Top percentiles
-        for top in range(len(top_pct)):
-            df_tables.loc[
-                j, "name"
-            ] = f"{top_pct['name'][top].capitalize()} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"{top_pct['wid_notation'][top]}_share_{welfare['slug'][wel]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The share of {welfare['welfare_type'][wel]} received by the richest {top_pct['percentage'][top]} of the population.",
-                    welfare["description"][wel],
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "%"
-            df_tables.loc[j, "shortUnit"] = "%"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = top_pct[
-                f"scale_share_{welfare['slug'][wel]}"
-            ][top]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-            j += 1
-
-        # Income aggregations
-        for agg in range(len(income_aggregation)):
-            # Mean
-            df_tables.loc[
-                j, "name"
-            ] = f"Mean {welfare['welfare_type'][wel]} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"p0p100_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]}.",
-                    welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = income_aggregation[
-                f"scale_{welfare['slug'][wel]}"
-            ][agg]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "BuGn"
-            df_tables.loc[
-                j, "transform"
-            ] = f"multiplyBy p0p100_avg_{welfare['slug'][wel]} {income_aggregation['multiplier'][agg]}"
-            j += 1
-
-            # Median
-            df_tables.loc[
-                j, "name"
-            ] = f"Median {welfare['welfare_type'][wel]} {welfare['title'][wel]}"
-            df_tables.loc[
-                j, "slug"
-            ] = f"median_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_tables.loc[j, "description"] = new_line.join(
-                [
-                    f"The level of {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} below which hald of the population falls.",
-                    welfare["description"][wel],
-                    ppp_description,
-                    additional_description,
-                ]
-            )
-            df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-            df_tables.loc[j, "shortUnit"] = "$"
-            df_tables.loc[j, "type"] = "Numeric"
-            df_tables.loc[j, "colorScaleNumericBins"] = income_aggregation[
-                f"scale_{welfare['slug'][wel]}"
-            ][agg]
-            df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-            df_tables.loc[j, "colorScaleScheme"] = "Blues"
-            df_tables.loc[
-                j, "transform"
-            ] = f"multiplyBy median_{welfare['slug'][wel]} {income_aggregation['multiplier'][agg]}"
-            j += 1
-
-            # Thresholds - Deciles
-            for dec9 in range(len(deciles9)):
-                df_tables.loc[
-                    j, "name"
-                ] = f"{deciles9['ordinal'][dec9].capitalize()} {welfare['title'][wel]}"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"{deciles9['wid_notation'][dec9]}_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The level of {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} below which {deciles9['decile'][dec9]}0% of the population falls.",
-                        welfare["description"][wel],
-                        ppp_description,
-                        additional_description,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                df_tables.loc[j, "colorScaleNumericBins"] = deciles9[
-                    f"scale_thr_{welfare['slug'][wel]}_{income_aggregation['aggregation'][agg]}"
-                ][dec9]
-                df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-                df_tables.loc[j, "colorScaleScheme"] = "Purples"
-                df_tables.loc[
-                    j, "transform"
-                ] = f"multiplyBy {deciles9['wid_notation'][dec9]}_thr_{welfare['slug'][wel]} {income_aggregation['multiplier'][agg]}"
-                j += 1
-
-            # Averages - Deciles
-            for dec10 in range(len(deciles10)):
-                df_tables.loc[
-                    j, "name"
-                ] = f"{deciles10['ordinal'][dec10].capitalize()} {welfare['title'][wel]}"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"{deciles10['wid_notation'][dec10]}_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (tenth of the population).",
-                        welfare["description"][wel],
-                        ppp_description,
-                        additional_description,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                df_tables.loc[j, "colorScaleNumericBins"] = deciles10[
-                    f"scale_avg_{welfare['slug'][wel]}_{income_aggregation['aggregation'][agg]}"
-                ][dec10]
-                df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-                df_tables.loc[j, "colorScaleScheme"] = "Greens"
-                df_tables.loc[
-                    j, "transform"
-                ] = f"multiplyBy {deciles10['wid_notation'][dec10]}_avg_{welfare['slug'][wel]} {income_aggregation['multiplier'][agg]}"
-                j += 1
-
-            # Thresholds - Top percentiles
-            for top in range(len(top_pct)):
-                df_tables.loc[
-                    j, "name"
-                ] = f"{top_pct['name'][top].capitalize()} {welfare['title'][wel]}"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"{top_pct['wid_notation'][top]}_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The level of {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} marking the richest {top_pct['percentage'][top]}",
-                        welfare["description"][wel],
-                        ppp_description,
-                        additional_description,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                df_tables.loc[j, "colorScaleNumericBins"] = top_pct[
-                    f"scale_thr_{welfare['slug'][wel]}_{income_aggregation['aggregation'][agg]}"
-                ][top]
-                df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-                df_tables.loc[j, "colorScaleScheme"] = "Purples"
-                df_tables.loc[
-                    j, "transform"
-                ] = f"multiplyBy {top_pct['wid_notation'][top]}_thr_{welfare['slug'][wel]} {income_aggregation['multiplier'][agg]}"
-                j += 1
-
-            # Averages - Top percentiles
-            for top in range(len(top_pct)):
-                df_tables.loc[
-                    j, "name"
-                ] = f"{top_pct['name'][top].capitalize()} {welfare['title'][wel]}"
-                df_tables.loc[
-                    j, "slug"
-                ] = f"{top_pct['wid_notation'][top]}_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_tables.loc[j, "description"] = new_line.join(
-                    [
-                        f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the richest {top_pct['percentage'][top]}.",
-                        welfare["description"][wel],
-                        ppp_description,
-                        additional_description,
-                    ]
-                )
-                df_tables.loc[j, "unit"] = "international-$ in 2022 prices"
-                df_tables.loc[j, "shortUnit"] = "$"
-                df_tables.loc[j, "type"] = "Numeric"
-                df_tables.loc[j, "colorScaleNumericBins"] = top_pct[
-                    f"scale_avg_{welfare['slug'][wel]}_{income_aggregation['aggregation'][agg]}"
-                ][top]
-                df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-                df_tables.loc[j, "colorScaleScheme"] = "Greens"
-                df_tables.loc[
-                    j, "transform"
-                ] = f"multiplyBy {top_pct['wid_notation'][top]}_avg_{welfare['slug'][wel]} {income_aggregation['multiplier'][agg]}"
-                j += 1
-
-    df_tables["tableSlug"] = tables["name"][tab]
+                    # Mean
+                    {
+                        "name": "Mean ${wel__welfare_type} ${wel__title}",
+                        "slug": "p0p100_avg_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "Mean ${wel__welfare_type}",
+                                "${wel__description}",
+                                escape(ppp_description),
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2022 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_mean"),
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "BuGn",
+                    },
+                    # Median
+                    {
+                        "name": "Median ${wel__welfare_type} ${wel__title}",
+                        "slug": "median_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The level of ${wel__welfare_type} below which half of the population falls.",
+                                "${wel__description}",
+                                escape(ppp_description),
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "international-$$ in 2022 prices",
+                        "shortUnit": "$$",
+                        "type": "Numeric",
+                        # df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_median"][wel]
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Blues",
+                    },
+                    # Thresholds - Deciles
+                    Each(
+                        {"dec9": deciles9},
+                        [
+                            {
+                                "name": "${dec9__ordinal_capitalized} ${wel__title}",
+                                "slug": "${dec9__wid_notation}_thr_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${wel__welfare_type} below which ${dec9__decile}0% of the population falls.",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables.loc[j, "colorScaleNumericBins"] = deciles9["scale_thr"][dec9]
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "Purples",
+                            }
+                        ],
+                    ),
+                    # Averages - Deciles
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            {
+                                "name": "${dec10__ordinal_capitalized} ${wel__title}",
+                                "slug": "${dec10__wid_notation}_avg_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The mean ${wel__welfare_type} within the ${dec10__ordinal} (tenth of the population).",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables.loc[j, "colorScaleNumericBins"] = deciles10["scale_avg"][dec10]
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "Greens",
+                            }
+                        ],
+                    ),
+                    # Shares - Deciles
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            {
+                                "name": "${dec10__ordinal_capitalized} ${wel__title}",
+                                "slug": "${dec10__wid_notation}_share_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of ${wel__welfare_type} received by the ${dec10__ordinal} (tenth of the population).",
+                                        "${wel__description}",
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "dec10__scale_share_${wel__slug}"
+                                ),
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "OrRd",
+                            }
+                        ],
+                    ),
+                    # Thresholds - Top percentiles
+                    Each(
+                        {"top": top_pct},
+                        [
+                            {
+                                "name": "${top__name_capitalized} ${wel__title}",
+                                "slug": "${top__wid_notation}_thr_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${wel__welfare_type} marking the richest ${top__percentage}",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables.loc[j, "colorScaleNumericBins"] = top_pct["scale_thr"][top]
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "Purples",
+                            }
+                        ],
+                    ),
+                    # Averages - Top percentiles
+                    Each(
+                        {"top": top_pct},
+                        [
+                            {
+                                "name": "${top__name_capitalized} ${wel__title}",
+                                "slug": "${top__wid_notation}_avg_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The mean ${wel__welfare_type} within the richest ${top__percentage}.",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                # df_tables.loc[j, "colorScaleNumericBins"] = top_pct["scale_avg"][top]
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "Greens",
+                            }
+                        ],
+                    ),
+                    # Shares - Top percentiles
+                    Each(
+                        {"top": top_pct},
+                        [
+                            {
+                                "name": "${top__name_capitalized} ${wel__title}",
+                                "slug": "${top__wid_notation}_share_${wel__slug}",
+                                "description": new_line.join(
+                                    [
+                                        "The share of ${wel__welfare_type} received by the richest ${top__percentage} of the population.",
+                                        "${wel__description}",
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "%",
+                                "shortUnit": "%",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "top__scale_share_${wel__slug}"
+                                ),
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "OrRd",
+                            }
+                        ],
+                    ),
+                    # Income aggregations
+                    Each(
+                        {"agg": income_aggregation},
+                        [
+                            # Mean
+                            {
+                                "name": "Mean ${wel__welfare_type} ${wel__title}",
+                                "slug": "p0p100_avg_${wel__slug}${agg__slug_suffix}",
+                                "description": new_line.join(
+                                    [
+                                        "Mean ${wel__welfare_type} per ${agg__aggregation}.",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "agg__scale_${wel__slug}"
+                                ),
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "BuGn",
+                                "transform": "multiplyBy p0p100_avg_${wel__slug} ${agg__multiplier}",
+                            },
+                            # Median
+                            {
+                                "name": "Median ${wel__welfare_type} ${wel__title}",
+                                "slug": "median_${wel__slug}${agg__slug_suffix}",
+                                "description": new_line.join(
+                                    [
+                                        "The level of ${wel__welfare_type} per ${agg__aggregation} below which hald of the population falls.",
+                                        "${wel__description}",
+                                        escape(ppp_description),
+                                        escape(additional_description),
+                                    ]
+                                ),
+                                "unit": "international-$$ in 2022 prices",
+                                "shortUnit": "$$",
+                                "type": "Numeric",
+                                "colorScaleNumericBins": Column(
+                                    "agg__scale_${wel__slug}"
+                                ),
+                                "colorScaleEqualSizeBins": "true",
+                                "colorScaleScheme": "Blues",
+                                "transform": "multiplyBy median_${wel__slug} ${agg__multiplier}",
+                            },
+                            # Thresholds - Deciles
+                            Each(
+                                {"dec9": deciles9},
+                                [
+                                    {
+                                        "name": "${dec9__ordinal_capitalized} ${wel__title}",
+                                        "slug": "${dec9__wid_notation}_thr_${wel__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The level of ${wel__welfare_type} per ${agg__aggregation} below which ${dec9__decile}0% of the population falls.",
+                                                "${wel__description}",
+                                                escape(ppp_description),
+                                                escape(additional_description),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2022 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "dec9__scale_thr_${wel__slug}_${agg__aggregation}"
+                                        ),
+                                        "colorScaleEqualSizeBins": "true",
+                                        "colorScaleScheme": "Purples",
+                                        "transform": "multiplyBy ${dec9__wid_notation}_thr_${wel__slug} ${agg__multiplier}",
+                                    }
+                                ],
+                            ),
+                            # Averages - Deciles
+                            Each(
+                                {"dec10": deciles10},
+                                [
+                                    {
+                                        "name": "${dec10__ordinal_capitalized} ${wel__title}",
+                                        "slug": "${dec10__wid_notation}_avg_${wel__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The mean ${wel__welfare_type} per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population).",
+                                                "${wel__description}",
+                                                escape(ppp_description),
+                                                escape(additional_description),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2022 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "dec10__scale_avg_${wel__slug}_${agg__aggregation}"
+                                        ),
+                                        "colorScaleEqualSizeBins": "true",
+                                        "colorScaleScheme": "Greens",
+                                        "transform": "multiplyBy ${dec10__wid_notation}_avg_${wel__slug} ${agg__multiplier}",
+                                    }
+                                ],
+                            ),
+                            # Thresholds - Top percentiles
+                            Each(
+                                {"top": top_pct},
+                                [
+                                    {
+                                        "name": "${top__name_capitalized} ${wel__title}",
+                                        "slug": "${top__wid_notation}_thr_${wel__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The level of ${wel__welfare_type} per ${agg__aggregation} marking the richest ${top__percentage}",
+                                                "${wel__description}",
+                                                escape(ppp_description),
+                                                escape(additional_description),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2022 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "top__scale_thr_${wel__slug}_${agg__aggregation}"
+                                        ),
+                                        "colorScaleEqualSizeBins": "true",
+                                        "colorScaleScheme": "Purples",
+                                        "transform": "multiplyBy ${top__wid_notation}_thr_${wel__slug} ${agg__multiplier}",
+                                    }
+                                ],
+                            ),
+                            # Averages - Top percentiles
+                            Each(
+                                {"top": top_pct},
+                                [
+                                    {
+                                        "name": "${top__name_capitalized} ${wel__title}",
+                                        "slug": "${top__wid_notation}_avg_${wel__slug}${agg__slug_suffix}",
+                                        "description": new_line.join(
+                                            [
+                                                "The mean ${wel__welfare_type} per ${agg__aggregation} within the richest ${top__percentage}.",
+                                                "${wel__description}",
+                                                escape(ppp_description),
+                                                escape(additional_description),
+                                            ]
+                                        ),
+                                        "unit": "international-$$ in 2022 prices",
+                                        "shortUnit": "$$",
+                                        "type": "Numeric",
+                                        "colorScaleNumericBins": Column(
+                                            "top__scale_avg_${wel__slug}_${agg__aggregation}"
+                                        ),
+                                        "colorScaleEqualSizeBins": "true",
+                                        "colorScaleScheme": "Greens",
+                                        "transform": "multiplyBy ${top__wid_notation}_avg_${wel__slug} ${agg__multiplier}",
+                                    }
+                                ],
+                            ),
+                        ],
+                    ),
+                ],
+            ),
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables["sourceName"] = sourceName
 df_tables["dataPublishedBy"] = dataPublishedBy
@@ -507,594 +509,434 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 yAxisMin = 0
 mapTargetTime = 2019
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(tables)):
-    for agg in range(len(income_aggregation)):
-        for wel in range(len(welfare)):
-            # Mean
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"p0p100_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Mean income"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = np.nan
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This data is adjusted for inflation and for differences in the cost of living between countries. {welfare['subtitle'][wel]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is expressed in international-$ at 2022 prices. {welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Median
-            df_graphers.loc[
-                j, "title"
-            ] = f"Median {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"median_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Median income"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = np.nan
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This data is adjusted for inflation and for differences in the cost of living between countries. {welfare['subtitle'][wel]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is expressed in international-$ at 2022 prices. {welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Thresholds - Deciles
-            for dec9 in range(len(deciles9)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Threshold {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} marking the {deciles9['ordinal'][dec9]} {welfare['title'][wel].capitalize()}"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"{deciles9['wid_notation'][dec9]}_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-                df_graphers.loc[j, "Decile/quantile Dropdown"] = deciles9["dropdown"][
-                    dec9
-                ]
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The level of {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} below which {deciles9['decile'][dec9]}0% of the population falls. {welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries. {welfare['note'][wel]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                df_graphers.loc[j, "hasMapTab"] = "true"
-                df_graphers.loc[j, "tab"] = "map"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-            # Averages - Deciles
-            for dec10 in range(len(deciles10)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} {welfare['title'][wel].capitalize()}"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"{deciles10['wid_notation'][dec10]}_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-                df_graphers.loc[j, "Decile/quantile Dropdown"] = deciles10["dropdown"][
-                    dec10
-                ]
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (tenth of the population). {welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries. {welfare['note'][wel]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                df_graphers.loc[j, "hasMapTab"] = "true"
-                df_graphers.loc[j, "tab"] = "map"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-            # Thresholds - Top
-            for top in range(len(top_pct)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Threshold {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} marking the richest {top_pct['percentage'][top]} {welfare['title'][wel].capitalize()}"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"{top_pct['wid_notation'][top]}_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-                df_graphers.loc[j, "Decile/quantile Dropdown"] = top_pct["name"][
-                    top
-                ].capitalize()
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[j, "subtitle"] = f"{welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries. {welfare['note'][wel]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                df_graphers.loc[j, "hasMapTab"] = "true"
-                df_graphers.loc[j, "tab"] = "map"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-            # Averages - Top
-            for top in range(len(top_pct)):
-                df_graphers.loc[
-                    j, "title"
-                ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the richest {top_pct['percentage'][top]} {welfare['title'][wel].capitalize()}"
-                df_graphers.loc[
-                    j, "ySlugs"
-                ] = f"{top_pct['wid_notation'][top]}_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-                df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-                df_graphers.loc[j, "Decile/quantile Dropdown"] = top_pct["name"][
-                    top
-                ].capitalize()
-                df_graphers.loc[
-                    j, "Income measure Dropdown"
-                ] = f"{welfare['dropdown_option'][wel]}"
-                df_graphers.loc[
-                    j, "Period Radio"
-                ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-                df_graphers.loc[
-                    j, "subtitle"
-                ] = f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within the richest {top_pct['percentage'][top]} of the population. {welfare['subtitle'][wel]}"
-                df_graphers.loc[
-                    j, "note"
-                ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries. {welfare['note'][wel]}"
-                df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-                df_graphers.loc[j, "hasMapTab"] = "true"
-                df_graphers.loc[j, "tab"] = "map"
-                df_graphers.loc[j, "yScaleToggle"] = "true"
-                j += 1
-
-            # Thresholds - Multiple deciles
-            df_graphers.loc[
-                j, "title"
-            ] = f"Threshold {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} for each decile {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"p10p20_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p20p30_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p30p40_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p40p50_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p50p60_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p60p70_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p70p80_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p80p90_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p90p100_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = "All deciles"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[j, "hideRelativeToggle"] = "false"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The level of income per {income_aggregation['aggregation'][agg]} below which 10%, 20%, 30%, etc. of the population falls. {welfare['subtitle'][wel]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries. {welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Averages - Multiple deciles
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within each decile {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"p0p10_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p10p20_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p20p30_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p30p40_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p40p50_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p50p60_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p60p70_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p70p80_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p80p90_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p90p100_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = "All deciles"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[j, "hideRelativeToggle"] = "false"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within each decile (tenth of the population). {welfare['subtitle'][wel]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries. {welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Thresholds - Multiple deciles (including top)
-            df_graphers.loc[
-                j, "title"
-            ] = f"Threshold {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} for each decile {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"p10p20_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p20p30_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p30p40_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p40p50_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p50p60_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p60p70_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p70p80_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p80p90_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p90p100_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p99p100_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p99_9p100_thr_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = "All deciles + top"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[j, "hideRelativeToggle"] = "false"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The level of income per {income_aggregation['aggregation'][agg]} below which 10%, 20%, 30%, etc. of the population falls. {welfare['subtitle'][wel]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries. {welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-            # Averages - Multiple deciles (including top)
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean {welfare['welfare_type'][wel]} per {income_aggregation['aggregation'][agg]} within each decile {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"p0p10_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p10p20_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p20p30_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p30p40_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p40p50_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p50p60_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p60p70_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p70p80_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p80p90_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p90p100_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p99p100_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]} p99_9p100_avg_{welfare['slug'][wel]}{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = "All deciles + top"
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[j, "hideRelativeToggle"] = "false"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This data is adjusted for inflation and for differences in the cost of living between countries. {welfare['subtitle'][wel]}"
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is expressed in international-$ at 2022 prices. {welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-        # BEFORE VS. AFTER TAX
-        # Mean
-        df_graphers.loc[
-            j, "title"
-        ] = f"Mean income per {income_aggregation['aggregation'][agg]} (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"p0p100_avg_pretax{income_aggregation['slug_suffix'][agg]} p0p100_avg_posttax_nat{income_aggregation['slug_suffix'][agg]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Mean income"
-        df_graphers.loc[j, "Decile/quantile Dropdown"] = np.nan
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[
-            j, "Period Radio"
-        ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"This data is adjusted for inflation and for differences in the cost of living between countries."
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2022 prices."
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        df_graphers.loc[j, "yScaleToggle"] = "true"
-        j += 1
-
-        # Median
-        df_graphers.loc[
-            j, "title"
-        ] = f"Median income per {income_aggregation['aggregation'][agg]} (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"median_pretax{income_aggregation['slug_suffix'][agg]} median_posttax_nat{income_aggregation['slug_suffix'][agg]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Median income"
-        df_graphers.loc[j, "Decile/quantile Dropdown"] = np.nan
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[
-            j, "Period Radio"
-        ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"This data is adjusted for inflation and for differences in the cost of living between countries."
-        df_graphers.loc[
-            j, "note"
-        ] = f"This data is expressed in international-$ at 2022 prices."
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        df_graphers.loc[j, "yScaleToggle"] = "true"
-        j += 1
-
-        # Thresholds - Deciles
-        for dec9 in range(len(deciles9)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"Threshold income per {income_aggregation['aggregation'][agg]} marking the {deciles9['ordinal'][dec9]} (after tax vs. before tax)"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"{deciles9['wid_notation'][dec9]}_thr_pretax{income_aggregation['slug_suffix'][agg]} {deciles9['wid_notation'][dec9]}_thr_posttax_nat{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = deciles9["dropdown"][dec9]
-            df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The level of income per {income_aggregation['aggregation'][agg]} below which {deciles9['decile'][dec9]}0% of the population falls."
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-        # Averages - Deciles
-        for dec10 in range(len(deciles10)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean income per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (after tax vs. before tax)"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"{deciles10['wid_notation'][dec10]}_avg_pretax{income_aggregation['slug_suffix'][agg]} {deciles10['wid_notation'][dec10]}_avg_posttax_nat{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = deciles10["dropdown"][
-                dec10
-            ]
-            df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The mean income per {income_aggregation['aggregation'][agg]} within the {deciles10['ordinal'][dec10]} (tenth of the population)."
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-        # Thresholds - Top
-        for top in range(len(top_pct)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"Threshold income per {income_aggregation['aggregation'][agg]} marking the richest {top_pct['percentage'][top]} (after tax vs. before tax)"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"{top_pct['wid_notation'][top]}_thr_pretax{income_aggregation['slug_suffix'][agg]} {top_pct['wid_notation'][top]}_thr_posttax_nat{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile thresholds"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = top_pct["name"][
-                top
-            ].capitalize()
-            df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[j, "subtitle"] = ""
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-        # Averages - Top
-        for top in range(len(top_pct)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"Mean income per {income_aggregation['aggregation'][agg]} within the richest {top_pct['percentage'][top]} (after tax vs. before tax)"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"{top_pct['wid_notation'][top]}_avg_pretax{income_aggregation['slug_suffix'][agg]} {top_pct['wid_notation'][top]}_avg_posttax_nat{income_aggregation['slug_suffix'][agg]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Mean income, by decile"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = top_pct["name"][
-                top
-            ].capitalize()
-            df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-            df_graphers.loc[
-                j, "Period Radio"
-            ] = f"{income_aggregation['aggregation'][agg].capitalize()}"
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"This is the mean income per {income_aggregation['aggregation'][agg]} within the richest {top_pct['percentage'][top]} of the population."
-            df_graphers.loc[
-                j, "note"
-            ] = f"This data is measured in international-$ at 2022 prices to account for inflation and differences in the cost of living between countries."
-            df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-            df_graphers.loc[j, "hasMapTab"] = "false"
-            df_graphers.loc[j, "tab"] = "chart"
-            df_graphers.loc[j, "yScaleToggle"] = "true"
-            j += 1
-
-    # This is an adaptation of the code to make both before and after tax graphs and share graphs
-    for wel in range(len(welfare)):
-        # Shares - Deciles
-        for dec10 in range(len(deciles10)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"{welfare['welfare_type'][wel].capitalize()} share of the {deciles10['ordinal'][dec10]} {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"{deciles10['wid_notation'][dec10]}_share_{welfare['slug'][wel]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = deciles10["dropdown"][
-                dec10
-            ]
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[j, "Period Radio"] = np.nan
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of {welfare['welfare_type'][wel]} received by the {deciles10['ordinal'][dec10]} (tenth of the population). {welfare['subtitle'][wel]}"
-            df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            j += 1
-
-        # Shares - Top
-        for top in range(len(top_pct)):
-            df_graphers.loc[
-                j, "title"
-            ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest {top_pct['percentage'][top]} {welfare['title'][wel].capitalize()}"
-            df_graphers.loc[
-                j, "ySlugs"
-            ] = f"{top_pct['wid_notation'][top]}_share_{welfare['slug'][wel]}"
-            df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-            df_graphers.loc[j, "Decile/quantile Dropdown"] = top_pct["name"][
-                top
-            ].capitalize()
-            df_graphers.loc[
-                j, "Income measure Dropdown"
-            ] = f"{welfare['dropdown_option'][wel]}"
-            df_graphers.loc[j, "Period Radio"] = np.nan
-            df_graphers.loc[
-                j, "subtitle"
-            ] = f"The share of {welfare['welfare_type'][wel]} received by the richest {top_pct['percentage'][top]} of the population. {welfare['subtitle'][wel]}"
-            df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-            df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-            df_graphers.loc[j, "hasMapTab"] = "true"
-            df_graphers.loc[j, "tab"] = "map"
-            j += 1
-
-        # Shares - Multiple deciles
-        df_graphers.loc[
-            j, "title"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share for each decile {welfare['title'][wel].capitalize()}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"p0p10_share_{welfare['slug'][wel]} p20p30_share_{welfare['slug'][wel]} p30p40_share_{welfare['slug'][wel]} p40p50_share_{welfare['slug'][wel]} p50p60_share_{welfare['slug'][wel]} p60p70_share_{welfare['slug'][wel]} p70p80_share_{welfare['slug'][wel]} p80p90_share_{welfare['slug'][wel]} p90p100_share_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-        df_graphers.loc[j, "Decile/quantile Dropdown"] = "All deciles"
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[j, "Period Radio"] = np.nan
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of {welfare['welfare_type'][wel]} received by each decile (tenth of the population). {welfare['subtitle'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-        # Shares - Multiple deciles (including top)
-        df_graphers.loc[
-            j, "title"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share for each decile {welfare['title'][wel].capitalize()}"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"p0p10_share_{welfare['slug'][wel]} p10p20_share_{welfare['slug'][wel]} p20p30_share_{welfare['slug'][wel]} p30p40_share_{welfare['slug'][wel]} p40p50_share_{welfare['slug'][wel]} p50p60_share_{welfare['slug'][wel]} p60p70_share_{welfare['slug'][wel]} p70p80_share_{welfare['slug'][wel]} p80p90_share_{welfare['slug'][wel]} p90p100_share_{welfare['slug'][wel]} p99p100_share_{welfare['slug'][wel]} p99_9p100_share_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-        df_graphers.loc[j, "Decile/quantile Dropdown"] = "All deciles + top"
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[j, "Period Radio"] = np.nan
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of {welfare['welfare_type'][wel]} received by each decile (tenth of the population). {welfare['subtitle'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-    # BEFORE VS. AFTER TAX
-    # Shares - Deciles
-    for dec10 in range(len(deciles10)):
-        df_graphers.loc[
-            j, "title"
-        ] = f"Income share of the {deciles10['ordinal'][dec10]} (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"{deciles10['wid_notation'][dec10]}_share_pretax {deciles10['wid_notation'][dec10]}_share_posttax_nat"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-        df_graphers.loc[j, "Decile/quantile Dropdown"] = deciles10["dropdown"][dec10]
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[j, "Period Radio"] = np.nan
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the {deciles10['ordinal'][dec10]} (tenth of the population)."
-        df_graphers.loc[j, "note"] = ""
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-    # Shares - Top
-    for top in range(len(top_pct)):
-        df_graphers.loc[
-            j, "title"
-        ] = f"Income share of the richest {top_pct['percentage'][top]} (after tax vs. before tax)"
-        df_graphers.loc[
-            j, "ySlugs"
-        ] = f"{top_pct['wid_notation'][top]}_share_pretax {top_pct['wid_notation'][top]}_share_posttax_nat"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Decile shares"
-        df_graphers.loc[j, "Decile/quantile Dropdown"] = top_pct["name"][
-            top
-        ].capitalize()
-        df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-        df_graphers.loc[j, "Period Radio"] = np.nan
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of income received by the richest {top_pct['percentage'][top]} of the population."
-        df_graphers.loc[j, "note"] = ""
-        df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-        df_graphers.loc[j, "hasMapTab"] = "false"
-        df_graphers.loc[j, "tab"] = "chart"
-        j += 1
-
-    df_graphers["tableSlug"] = tables["name"][tab]
+df_graphers = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            Each(
+                {"agg": income_aggregation},
+                [
+                    Each(
+                        {"wel": welfare},
+                        [
+                            # Mean
+                            {
+                                "title": "Mean ${wel__welfare_type} per ${agg__aggregation} ${wel__title_capitalized}",
+                                "ySlugs": "p0p100_avg_${wel__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Mean income",
+                                "Decile/quantile Dropdown": np.nan,
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries. ${wel__subtitle}",
+                                "note": "This data is expressed in international-$$ at 2022 prices. ${wel__note}",
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                                "yScaleToggle": "true",
+                            },
+                            # Median
+                            {
+                                "title": "Median ${wel__welfare_type} per ${agg__aggregation} ${wel__title_capitalized}",
+                                "ySlugs": "median_${wel__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Median income",
+                                "Decile/quantile Dropdown": np.nan,
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries. ${wel__subtitle}",
+                                "note": "This data is expressed in international-$$ at 2022 prices. ${wel__note}",
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                                "yScaleToggle": "true",
+                            },
+                            # Thresholds - Deciles
+                            Each(
+                                {"dec9": deciles9},
+                                [
+                                    {
+                                        "title": "Threshold ${wel__welfare_type} per ${agg__aggregation} marking the ${dec9__ordinal} ${wel__title_capitalized}",
+                                        "ySlugs": "${dec9__wid_notation}_thr_${wel__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Decile thresholds",
+                                        "Decile/quantile Dropdown": Column(
+                                            "dec9__dropdown"
+                                        ),
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "subtitle": "The level of ${wel__welfare_type} per ${agg__aggregation} below which ${dec9__decile}0% of the population falls. ${wel__subtitle}",
+                                        "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries. ${wel__note}",
+                                        "selectedFacetStrategy": np.nan,
+                                        "hasMapTab": "true",
+                                        "tab": "map",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                            # Averages - Deciles
+                            Each(
+                                {"dec10": deciles10},
+                                [
+                                    {
+                                        "title": "Mean ${wel__welfare_type} per ${agg__aggregation} within the ${dec10__ordinal} ${wel__title_capitalized}",
+                                        "ySlugs": "${dec10__wid_notation}_avg_${wel__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Mean income, by decile",
+                                        "Decile/quantile Dropdown": Column(
+                                            "dec10__dropdown"
+                                        ),
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "subtitle": "The mean ${wel__welfare_type} per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population). ${wel__subtitle}",
+                                        "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries. ${wel__note}",
+                                        "selectedFacetStrategy": np.nan,
+                                        "hasMapTab": "true",
+                                        "tab": "map",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                            # Thresholds - Top
+                            Each(
+                                {"top": top_pct},
+                                [
+                                    {
+                                        "title": "Threshold ${wel__welfare_type} per ${agg__aggregation} marking the richest ${top__percentage} ${wel__title_capitalized}",
+                                        "ySlugs": "${top__wid_notation}_thr_${wel__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Decile thresholds",
+                                        "Decile/quantile Dropdown": Column(
+                                            "top__name_capitalized"
+                                        ),
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "subtitle": "${wel__subtitle}",
+                                        "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries. ${wel__note}",
+                                        "selectedFacetStrategy": np.nan,
+                                        "hasMapTab": "true",
+                                        "tab": "map",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                            # Averages - Top
+                            Each(
+                                {"top": top_pct},
+                                [
+                                    {
+                                        "title": "Mean ${wel__welfare_type} per ${agg__aggregation} within the richest ${top__percentage} ${wel__title_capitalized}",
+                                        "ySlugs": "${top__wid_notation}_avg_${wel__slug}${agg__slug_suffix}",
+                                        "Indicator Dropdown": "Mean income, by decile",
+                                        "Decile/quantile Dropdown": Column(
+                                            "top__name_capitalized"
+                                        ),
+                                        "Income measure Dropdown": "${wel__dropdown_option}",
+                                        "Period Radio": "${agg__aggregation_capitalized}",
+                                        "subtitle": "The mean ${wel__welfare_type} per ${agg__aggregation} within the richest ${top__percentage} of the population. ${wel__subtitle}",
+                                        "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries. ${wel__note}",
+                                        "selectedFacetStrategy": np.nan,
+                                        "hasMapTab": "true",
+                                        "tab": "map",
+                                        "yScaleToggle": "true",
+                                    }
+                                ],
+                            ),
+                            # Thresholds - Multiple deciles
+                            {
+                                "title": "Threshold ${wel__welfare_type} per ${agg__aggregation} for each decile ${wel__title_capitalized}",
+                                "ySlugs": "p10p20_thr_${wel__slug}${agg__slug_suffix} p20p30_thr_${wel__slug}${agg__slug_suffix} p30p40_thr_${wel__slug}${agg__slug_suffix} p40p50_thr_${wel__slug}${agg__slug_suffix} p50p60_thr_${wel__slug}${agg__slug_suffix} p60p70_thr_${wel__slug}${agg__slug_suffix} p70p80_thr_${wel__slug}${agg__slug_suffix} p80p90_thr_${wel__slug}${agg__slug_suffix} p90p100_thr_${wel__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Decile thresholds",
+                                "Decile/quantile Dropdown": "All deciles",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "hideRelativeToggle": "false",
+                                "subtitle": "The level of income per ${agg__aggregation} below which 10%, 20%, 30%, etc. of the population falls. ${wel__subtitle}",
+                                "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries. ${wel__note}",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            },
+                            # Averages - Multiple deciles
+                            {
+                                "title": "Mean ${wel__welfare_type} per ${agg__aggregation} within each decile ${wel__title_capitalized}",
+                                "ySlugs": "p0p10_avg_${wel__slug}${agg__slug_suffix} p10p20_avg_${wel__slug}${agg__slug_suffix} p20p30_avg_${wel__slug}${agg__slug_suffix} p30p40_avg_${wel__slug}${agg__slug_suffix} p40p50_avg_${wel__slug}${agg__slug_suffix} p50p60_avg_${wel__slug}${agg__slug_suffix} p60p70_avg_${wel__slug}${agg__slug_suffix} p70p80_avg_${wel__slug}${agg__slug_suffix} p80p90_avg_${wel__slug}${agg__slug_suffix} p90p100_avg_${wel__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Mean income, by decile",
+                                "Decile/quantile Dropdown": "All deciles",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "hideRelativeToggle": "false",
+                                "subtitle": "The mean ${wel__welfare_type} per ${agg__aggregation} within each decile (tenth of the population). ${wel__subtitle}",
+                                "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries. ${wel__note}",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            },
+                            # Thresholds - Multiple deciles (including top)
+                            {
+                                "title": "Threshold ${wel__welfare_type} per ${agg__aggregation} for each decile ${wel__title_capitalized}",
+                                "ySlugs": "p10p20_thr_${wel__slug}${agg__slug_suffix} p20p30_thr_${wel__slug}${agg__slug_suffix} p30p40_thr_${wel__slug}${agg__slug_suffix} p40p50_thr_${wel__slug}${agg__slug_suffix} p50p60_thr_${wel__slug}${agg__slug_suffix} p60p70_thr_${wel__slug}${agg__slug_suffix} p70p80_thr_${wel__slug}${agg__slug_suffix} p80p90_thr_${wel__slug}${agg__slug_suffix} p90p100_thr_${wel__slug}${agg__slug_suffix} p99p100_thr_${wel__slug}${agg__slug_suffix} p99_9p100_thr_${wel__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Decile thresholds",
+                                "Decile/quantile Dropdown": "All deciles + top",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "hideRelativeToggle": "false",
+                                "subtitle": "The level of income per ${agg__aggregation} below which 10%, 20%, 30%, etc. of the population falls. ${wel__subtitle}",
+                                "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries. ${wel__note}",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            },
+                            # Averages - Multiple deciles (including top)
+                            {
+                                "title": "Mean ${wel__welfare_type} per ${agg__aggregation} within each decile ${wel__title_capitalized}",
+                                "ySlugs": "p0p10_avg_${wel__slug}${agg__slug_suffix} p10p20_avg_${wel__slug}${agg__slug_suffix} p20p30_avg_${wel__slug}${agg__slug_suffix} p30p40_avg_${wel__slug}${agg__slug_suffix} p40p50_avg_${wel__slug}${agg__slug_suffix} p50p60_avg_${wel__slug}${agg__slug_suffix} p60p70_avg_${wel__slug}${agg__slug_suffix} p70p80_avg_${wel__slug}${agg__slug_suffix} p80p90_avg_${wel__slug}${agg__slug_suffix} p90p100_avg_${wel__slug}${agg__slug_suffix} p99p100_avg_${wel__slug}${agg__slug_suffix} p99_9p100_avg_${wel__slug}${agg__slug_suffix}",
+                                "Indicator Dropdown": "Mean income, by decile",
+                                "Decile/quantile Dropdown": "All deciles + top",
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "hideRelativeToggle": "false",
+                                "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries. ${wel__subtitle}",
+                                "note": "This data is expressed in international-$$ at 2022 prices. ${wel__note}",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            },
+                        ],
+                    ),
+                    # BEFORE VS. AFTER TAX
+                    # Mean
+                    {
+                        "title": "Mean income per ${agg__aggregation} (after tax vs. before tax)",
+                        "ySlugs": "p0p100_avg_pretax${agg__slug_suffix} p0p100_avg_posttax_nat${agg__slug_suffix}",
+                        "Indicator Dropdown": "Mean income",
+                        "Decile/quantile Dropdown": np.nan,
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Period Radio": "${agg__aggregation_capitalized}",
+                        "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                        "note": "This data is expressed in international-$$ at 2022 prices.",
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                        "yScaleToggle": "true",
+                    },
+                    # Median
+                    {
+                        "title": "Median income per ${agg__aggregation} (after tax vs. before tax)",
+                        "ySlugs": "median_pretax${agg__slug_suffix} median_posttax_nat${agg__slug_suffix}",
+                        "Indicator Dropdown": "Median income",
+                        "Decile/quantile Dropdown": np.nan,
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Period Radio": "${agg__aggregation_capitalized}",
+                        "subtitle": "This data is adjusted for inflation and for differences in the cost of living between countries.",
+                        "note": "This data is expressed in international-$$ at 2022 prices.",
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                        "yScaleToggle": "true",
+                    },
+                    # Thresholds - Deciles
+                    Each(
+                        {"dec9": deciles9},
+                        [
+                            {
+                                "title": "Threshold income per ${agg__aggregation} marking the ${dec9__ordinal} (after tax vs. before tax)",
+                                "ySlugs": "${dec9__wid_notation}_thr_pretax${agg__slug_suffix} ${dec9__wid_notation}_thr_posttax_nat${agg__slug_suffix}",
+                                "Indicator Dropdown": "Decile thresholds",
+                                "Decile/quantile Dropdown": Column("dec9__dropdown"),
+                                "Income measure Dropdown": "After tax vs. before tax",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "subtitle": "The level of income per ${agg__aggregation} below which ${dec9__decile}0% of the population falls.",
+                                "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries.",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            }
+                        ],
+                    ),
+                    # Averages - Deciles
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            {
+                                "title": "Mean income per ${agg__aggregation} within the ${dec10__ordinal} (after tax vs. before tax)",
+                                "ySlugs": "${dec10__wid_notation}_avg_pretax${agg__slug_suffix} ${dec10__wid_notation}_avg_posttax_nat${agg__slug_suffix}",
+                                "Indicator Dropdown": "Mean income, by decile",
+                                "Decile/quantile Dropdown": Column("dec10__dropdown"),
+                                "Income measure Dropdown": "After tax vs. before tax",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "subtitle": "The mean income per ${agg__aggregation} within the ${dec10__ordinal} (tenth of the population).",
+                                "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries.",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            }
+                        ],
+                    ),
+                    # Thresholds - Top
+                    Each(
+                        {"top": top_pct},
+                        [
+                            {
+                                "title": "Threshold income per ${agg__aggregation} marking the richest ${top__percentage} (after tax vs. before tax)",
+                                "ySlugs": "${top__wid_notation}_thr_pretax${agg__slug_suffix} ${top__wid_notation}_thr_posttax_nat${agg__slug_suffix}",
+                                "Indicator Dropdown": "Decile thresholds",
+                                "Decile/quantile Dropdown": Column(
+                                    "top__name_capitalized"
+                                ),
+                                "Income measure Dropdown": "After tax vs. before tax",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "subtitle": "",
+                                "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries.",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            }
+                        ],
+                    ),
+                    # Averages - Top
+                    Each(
+                        {"top": top_pct},
+                        [
+                            {
+                                "title": "Mean income per ${agg__aggregation} within the richest ${top__percentage} (after tax vs. before tax)",
+                                "ySlugs": "${top__wid_notation}_avg_pretax${agg__slug_suffix} ${top__wid_notation}_avg_posttax_nat${agg__slug_suffix}",
+                                "Indicator Dropdown": "Mean income, by decile",
+                                "Decile/quantile Dropdown": Column(
+                                    "top__name_capitalized"
+                                ),
+                                "Income measure Dropdown": "After tax vs. before tax",
+                                "Period Radio": "${agg__aggregation_capitalized}",
+                                "subtitle": "This is the mean income per ${agg__aggregation} within the richest ${top__percentage} of the population.",
+                                "note": "This data is measured in international-$$ at 2022 prices to account for inflation and differences in the cost of living between countries.",
+                                "selectedFacetStrategy": "entity",
+                                "hasMapTab": "false",
+                                "tab": "chart",
+                                "yScaleToggle": "true",
+                            }
+                        ],
+                    ),
+                ],
+            ),
+            # This is an adaptation of the code to make both before and after tax graphs and share graphs
+            Each(
+                {"wel": welfare},
+                [
+                    # Shares - Deciles
+                    Each(
+                        {"dec10": deciles10},
+                        [
+                            {
+                                "title": "${wel__welfare_type_capitalized} share of the ${dec10__ordinal} ${wel__title_capitalized}",
+                                "ySlugs": "${dec10__wid_notation}_share_${wel__slug}",
+                                "Indicator Dropdown": "Decile shares",
+                                "Decile/quantile Dropdown": Column("dec10__dropdown"),
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": np.nan,
+                                "subtitle": "The share of ${wel__welfare_type} received by the ${dec10__ordinal} (tenth of the population). ${wel__subtitle}",
+                                "note": "${wel__note}",
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                            }
+                        ],
+                    ),
+                    # Shares - Top
+                    Each(
+                        {"top": top_pct},
+                        [
+                            {
+                                "title": "${wel__welfare_type_capitalized} share of the richest ${top__percentage} ${wel__title_capitalized}",
+                                "ySlugs": "${top__wid_notation}_share_${wel__slug}",
+                                "Indicator Dropdown": "Decile shares",
+                                "Decile/quantile Dropdown": Column(
+                                    "top__name_capitalized"
+                                ),
+                                "Income measure Dropdown": "${wel__dropdown_option}",
+                                "Period Radio": np.nan,
+                                "subtitle": "The share of ${wel__welfare_type} received by the richest ${top__percentage} of the population. ${wel__subtitle}",
+                                "note": "${wel__note}",
+                                "selectedFacetStrategy": np.nan,
+                                "hasMapTab": "true",
+                                "tab": "map",
+                            }
+                        ],
+                    ),
+                    # Shares - Multiple deciles
+                    {
+                        "title": "${wel__welfare_type_capitalized} share for each decile ${wel__title_capitalized}",
+                        "ySlugs": "p0p10_share_${wel__slug} p20p30_share_${wel__slug} p30p40_share_${wel__slug} p40p50_share_${wel__slug} p50p60_share_${wel__slug} p60p70_share_${wel__slug} p70p80_share_${wel__slug} p80p90_share_${wel__slug} p90p100_share_${wel__slug}",
+                        "Indicator Dropdown": "Decile shares",
+                        "Decile/quantile Dropdown": "All deciles",
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Period Radio": np.nan,
+                        "subtitle": "The share of ${wel__welfare_type} received by each decile (tenth of the population). ${wel__subtitle}",
+                        "note": "${wel__note}",
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    },
+                    # Shares - Multiple deciles (including top)
+                    {
+                        "title": "${wel__welfare_type_capitalized} share for each decile ${wel__title_capitalized}",
+                        "ySlugs": "p0p10_share_${wel__slug} p10p20_share_${wel__slug} p20p30_share_${wel__slug} p30p40_share_${wel__slug} p40p50_share_${wel__slug} p50p60_share_${wel__slug} p60p70_share_${wel__slug} p70p80_share_${wel__slug} p80p90_share_${wel__slug} p90p100_share_${wel__slug} p99p100_share_${wel__slug} p99_9p100_share_${wel__slug}",
+                        "Indicator Dropdown": "Decile shares",
+                        "Decile/quantile Dropdown": "All deciles + top",
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Period Radio": np.nan,
+                        "subtitle": "The share of ${wel__welfare_type} received by each decile (tenth of the population). ${wel__subtitle}",
+                        "note": "${wel__note}",
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    },
+                ],
+            ),
+            # BEFORE VS. AFTER TAX
+            # Shares - Deciles
+            Each(
+                {"dec10": deciles10},
+                [
+                    {
+                        "title": "Income share of the ${dec10__ordinal} (after tax vs. before tax)",
+                        "ySlugs": "${dec10__wid_notation}_share_pretax ${dec10__wid_notation}_share_posttax_nat",
+                        "Indicator Dropdown": "Decile shares",
+                        "Decile/quantile Dropdown": Column("dec10__dropdown"),
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Period Radio": np.nan,
+                        "subtitle": "The share of income received by the ${dec10__ordinal} (tenth of the population).",
+                        "note": "",
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    }
+                ],
+            ),
+            # Shares - Top
+            Each(
+                {"top": top_pct},
+                [
+                    {
+                        "title": "Income share of the richest ${top__percentage} (after tax vs. before tax)",
+                        "ySlugs": "${top__wid_notation}_share_pretax ${top__wid_notation}_share_posttax_nat",
+                        "Indicator Dropdown": "Decile shares",
+                        "Decile/quantile Dropdown": Column("top__name_capitalized"),
+                        "Income measure Dropdown": "After tax vs. before tax",
+                        "Period Radio": np.nan,
+                        "subtitle": "The share of income received by the richest ${top__percentage} of the population.",
+                        "note": "",
+                        "selectedFacetStrategy": "entity",
+                        "hasMapTab": "false",
+                        "tab": "chart",
+                    }
+                ],
+            ),
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # %% [markdown]
 # Final adjustments to the graphers table: add `relatedQuestion` link and `defaultView`:
@@ -1112,13 +954,15 @@ df_graphers["mapTargetTime"] = mapTargetTime
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Indicator Dropdown"] == "Decile thresholds")
-    & (df_graphers["Decile/quantile Dropdown"] == "All deciles")
-    & (df_graphers["Income measure Dropdown"] == "After tax")
-    & (df_graphers["Period Radio"] == "Year"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Indicator Dropdown": "Decile thresholds",
+        "Decile/quantile Dropdown": "All deciles",
+        "Income measure Dropdown": "After tax",
+        "Period Radio": "Year",
+    },
+)
 
 # Reorder dropdown menus
 # Decile/quantile Dropdown
@@ -1186,29 +1030,18 @@ df_graphers = df_graphers.drop(columns=["metric_dropdown_aux", "decile_dropdown_
 # Define list of variables to iterate: table names
 table_list = list(tables["name"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in range(len(tables)):
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tables["name"][tab]]
-            .copy()
-            .reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tables["name"][tab]]
         f.write("\ntable\t" + tables["link"][tab] + "\t" + tables["name"][tab])
-        f.write("\ncolumns\t" + tables["name"][tab] + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tables["name"][tab] + "\n")
+        write_frame(f, table_tsv, index=False)
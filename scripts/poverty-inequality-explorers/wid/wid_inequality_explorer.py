@@ -2,7 +2,7 @@
 # # Inequality Data Explorer of the World Inequality Database
 # This code creates the tsv file for the inequality explorer from the WID data, available [here](https://owid.cloud/admin/explorers/preview/wid-inequality)
 
-import textwrap
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -11,7 +11,16 @@ import numpy as np
 import pandas as pd
 
 PARENT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
-outfile = PARENT_DIR / "explorers" / "wid-inequality.explorer.tsv"
+sys.path.append(str(PARENT_DIR / "scripts"))
+from explorer_tools.default_view import set_default_view  # noqa: E402
+from explorer_tools.output import open_output  # noqa: E402
+from explorer_tools.paths import EXPLORERS_DIR  # noqa: E402
+from explorer_tools.sheets import read_sheet  # noqa: E402
+from explorer_tools.templating import escape  # noqa: E402
+from explorer_tools.views import Column, Each, expand_views  # noqa: E402
+from explorer_tools.writer import TableBlocks, write_frame  # noqa: E402
+
+outfile = EXPLORERS_DIR / "wid-inequality.explorer.tsv"
 
 # %% [markdown]
 # ## Google sheets auxiliar data
@@ -23,13 +32,11 @@ sheet_id = "18T5IGnpyJwb8KL9USYvME6IaLEcYIo26ioHCpkDnwRQ"
 
 # Welfare type sheet
 sheet_name = "welfare"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-welfare = pd.read_csv(url, keep_default_na=False)
+welfare = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # Tables sheet
 sheet_name = "tables"
-url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-tables = pd.read_csv(url, keep_default_na=False)
+tables = read_sheet(sheet_id, sheet_name, keep_default_na=False)
 
 # %% [markdown]
 # ## Header
@@ -83,146 +90,148 @@ additional_description = new_line.join(
 )
 ppp_description = "The data is measured in international-$ at 2022 prices – this adjusts for inflation and for differences in the cost of living between countries."
 
-df_tables = pd.DataFrame()
-j = 0
-
-for tab in range(len(tables)):
-    # Define country as entityName
-    df_tables.loc[j, "name"] = "Country"
-    df_tables.loc[j, "slug"] = "country"
-    df_tables.loc[j, "type"] = "EntityName"
-    j += 1
-
-    # Define year as Year
-    df_tables.loc[j, "name"] = "Year"
-    df_tables.loc[j, "slug"] = "year"
-    df_tables.loc[j, "type"] = "Year"
-    j += 1
-
-    for wel in range(len(welfare)):
-        # Gini coefficient
-        df_tables.loc[j, "name"] = f"Gini coefficient {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"p0p100_gini_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
-                welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_gini"][wel]
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 1
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Oranges"
-        j += 1
-
-        # Share of the top 10%
-        df_tables.loc[
-            j, "name"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 10% {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"p90p100_share_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {welfare['welfare_type'][wel]} received by the richest 10% of the population.",
-                welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_top10"][wel]
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 100
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-        # Share of the top 1%
-        df_tables.loc[
-            j, "name"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 1% {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"p99p100_share_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {welfare['welfare_type'][wel]} received by the richest 1% of the population.",
-                welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_top1"][wel]
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-        # Share of the top 0.1%
-        df_tables.loc[
-            j, "name"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 0.1% {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"p99_9p100_share_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {welfare['welfare_type'][wel]} received by the richest 0.1% of the population.",
-                welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_top01"][wel]
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "OrRd"
-        j += 1
-
-        # Share of the bottom 50%
-        df_tables.loc[
-            j, "name"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the poorest 50% {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"p0p50_share_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The share of {welfare['welfare_type'][wel]} received by the poorest 50% of the population.",
-                welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = "%"
-        df_tables.loc[j, "shortUnit"] = "%"
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_bottom50"][wel]
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 100
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "Blues"
-        j += 1
-
-        # Palma ratio
-        df_tables.loc[j, "name"] = f"Palma ratio {welfare['title'][wel]}"
-        df_tables.loc[j, "slug"] = f"palma_ratio_{welfare['slug'][wel]}"
-        df_tables.loc[j, "description"] = new_line.join(
-            [
-                f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
-                welfare["description"][wel],
-                additional_description,
-            ]
-        )
-        df_tables.loc[j, "unit"] = np.nan
-        df_tables.loc[j, "shortUnit"] = np.nan
-        df_tables.loc[j, "type"] = "Numeric"
-        df_tables.loc[j, "colorScaleNumericBins"] = welfare["scale_palma_ratio"][wel]
-        df_tables.loc[j, "colorScaleNumericMinValue"] = 0
-        df_tables.loc[j, "colorScaleEqualSizeBins"] = "true"
-        df_tables.loc[j, "colorScaleScheme"] = "YlOrBr"
-        j += 1
-
-    df_tables["tableSlug"] = tables["name"][tab]
+# Capitalized welfare type, for the start of titles
+welfare["welfare_type_capitalized"] = welfare["welfare_type"].str.capitalize()
+
+df_tables = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            # Define country as entityName
+            {
+                "name": "Country",
+                "slug": "country",
+                "type": "EntityName",
+            },
+            # Define year as Year
+            {
+                "name": "Year",
+                "slug": "year",
+                "type": "Year",
+            },
+            Each(
+                {"wel": welfare},
+                [
+                    # Gini coefficient
+                    {
+                        "name": "Gini coefficient ${wel__title}",
+                        "slug": "p0p100_gini_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_gini"),
+                        "colorScaleNumericMinValue": 1,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Oranges",
+                    },
+                    # Share of the top 10%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the richest 10% ${wel__title}",
+                        "slug": "p90p100_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the richest 10% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_top10"),
+                        "colorScaleNumericMinValue": 100,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                    },
+                    # Share of the top 1%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the richest 1% ${wel__title}",
+                        "slug": "p99p100_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the richest 1% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_top1"),
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                    },
+                    # Share of the top 0.1%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the richest 0.1% ${wel__title}",
+                        "slug": "p99_9p100_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the richest 0.1% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_top01"),
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "OrRd",
+                    },
+                    # Share of the bottom 50%
+                    {
+                        "name": "${wel__welfare_type_capitalized} share of the poorest 50% ${wel__title}",
+                        "slug": "p0p50_share_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The share of ${wel__welfare_type} received by the poorest 50% of the population.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": "%",
+                        "shortUnit": "%",
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_bottom50"),
+                        "colorScaleNumericMinValue": 100,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "Blues",
+                    },
+                    # Palma ratio
+                    {
+                        "name": "Palma ratio ${wel__title}",
+                        "slug": "palma_ratio_${wel__slug}",
+                        "description": new_line.join(
+                            [
+                                "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                                "${wel__description}",
+                                escape(additional_description),
+                            ]
+                        ),
+                        "unit": np.nan,
+                        "shortUnit": np.nan,
+                        "type": "Numeric",
+                        "colorScaleNumericBins": Column("wel__scale_palma_ratio"),
+                        "colorScaleNumericMinValue": 0,
+                        "colorScaleEqualSizeBins": "true",
+                        "colorScaleScheme": "YlOrBr",
+                    },
+                ],
+            ),
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 df_tables["sourceName"] = sourceName
 df_tables["dataPublishedBy"] = dataPublishedBy
@@ -242,205 +251,163 @@ df_tables["tolerance"] = df_tables["tolerance"].astype("Int64")
 yAxisMin = 0
 mapTargetTime = 2019
 
-df_graphers = pd.DataFrame()
-
-j = 0
-
-for tab in range(len(tables)):
-    for wel in range(len(welfare)):
-        # Gini coefficient
-        df_graphers.loc[j, "title"] = f"Gini coefficient {welfare['title'][wel]}"
-        df_graphers.loc[j, "ySlugs"] = f"p0p100_gini_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-        df_graphers.loc[
-            j, "Income measure Dropdown"
-        ] = f"{welfare['dropdown_option'][wel]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. {welfare['subtitle_ineq'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the top 10%
-        df_graphers.loc[
-            j, "title"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 10% {welfare['title'][wel]}"
-        df_graphers.loc[j, "ySlugs"] = f"p90p100_share_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-        df_graphers.loc[
-            j, "Income measure Dropdown"
-        ] = f"{welfare['dropdown_option'][wel]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of {welfare['welfare_type'][wel]} received by the richest 10% of the population. {welfare['subtitle'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the top 1%
-        df_graphers.loc[
-            j, "title"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 1% {welfare['title'][wel]}"
-        df_graphers.loc[j, "ySlugs"] = f"p99p100_share_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 1%"
-        df_graphers.loc[
-            j, "Income measure Dropdown"
-        ] = f"{welfare['dropdown_option'][wel]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of {welfare['welfare_type'][wel]} received by the richest 1% of the population. {welfare['subtitle'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the top 0.1%
-        df_graphers.loc[
-            j, "title"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the richest 0.1% {welfare['title'][wel]}"
-        df_graphers.loc[j, "ySlugs"] = f"p99_9p100_share_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 0.1%"
-        df_graphers.loc[
-            j, "Income measure Dropdown"
-        ] = f"{welfare['dropdown_option'][wel]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of {welfare['welfare_type'][wel]} received by the richest 0.1% of the population. {welfare['subtitle'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        j += 1
-
-        # Share of the bottom 50%
-        df_graphers.loc[
-            j, "title"
-        ] = f"{welfare['welfare_type'][wel].capitalize()} share of the poorest 50% {welfare['title'][wel]}"
-        df_graphers.loc[j, "ySlugs"] = f"p0p50_share_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Share of the poorest 50%"
-        df_graphers.loc[
-            j, "Income measure Dropdown"
-        ] = f"{welfare['dropdown_option'][wel]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The share of {welfare['welfare_type'][wel]} received by the poorest 50% of the population. {welfare['subtitle'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        j += 1
-
-        # # Palma ratio
-        df_graphers.loc[j, "title"] = f"Palma ratio {welfare['title'][wel]}"
-        df_graphers.loc[j, "ySlugs"] = f"palma_ratio_{welfare['slug'][wel]}"
-        df_graphers.loc[j, "Indicator Dropdown"] = "Palma ratio"
-        df_graphers.loc[
-            j, "Income measure Dropdown"
-        ] = f"{welfare['dropdown_option'][wel]}"
-        df_graphers.loc[
-            j, "subtitle"
-        ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. {welfare['subtitle_ineq'][wel]}"
-        df_graphers.loc[j, "note"] = f"{welfare['note'][wel]}"
-        df_graphers.loc[j, "type"] = np.nan
-        df_graphers.loc[j, "selectedFacetStrategy"] = np.nan
-        df_graphers.loc[j, "hasMapTab"] = "true"
-        df_graphers.loc[j, "tab"] = "map"
-        j += 1
-
-    # BEFORE VS. AFTER TAX
-    # Gini coefficient
-    df_graphers.loc[j, "title"] = f"Gini coefficient (after tax vs. before tax)"
-    df_graphers.loc[j, "ySlugs"] = f"p0p100_gini_pretax p0p100_gini_posttax_nat"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Gini coefficient"
-    df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality."
-    df_graphers.loc[j, "note"] = ""
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = "false"
-    df_graphers.loc[j, "tab"] = "chart"
-    j += 1
-
-    # Share of the top 10%
-    df_graphers.loc[
-        j, "title"
-    ] = f"Income share of the richest 10% (after tax vs. before tax)"
-    df_graphers.loc[j, "ySlugs"] = f"p90p100_share_pretax p90p100_share_posttax_nat"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 10%"
-    df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The share of income received by the richest 10% of the population."
-    df_graphers.loc[j, "note"] = ""
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = "false"
-    df_graphers.loc[j, "tab"] = "chart"
-    j += 1
-
-    # Share of the top 1%
-    df_graphers.loc[
-        j, "title"
-    ] = f"Income share of the richest 1% (after tax vs. before tax)"
-    df_graphers.loc[j, "ySlugs"] = f"p99p100_share_pretax p99p100_share_posttax_nat"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 1%"
-    df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The share of income received by the richest 1% of the population."
-    df_graphers.loc[j, "note"] = ""
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = "false"
-    df_graphers.loc[j, "tab"] = "chart"
-    j += 1
-
-    # Share of the top 0.1%
-    df_graphers.loc[
-        j, "title"
-    ] = f"Income share of the richest 0.1% (after tax vs. before tax)"
-    df_graphers.loc[j, "ySlugs"] = f"p99_9p100_share_pretax p99_9p100_share_posttax_nat"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Share of the richest 0.1%"
-    df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The share of income received by the richest 0.1% of the population."
-    df_graphers.loc[j, "note"] = ""
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = "false"
-    df_graphers.loc[j, "tab"] = "chart"
-    j += 1
-
-    # # Palma ratio
-    df_graphers.loc[j, "title"] = f"Palma ratio (after tax vs. before tax)"
-    df_graphers.loc[j, "ySlugs"] = f"palma_ratio_pretax palma_ratio_posttax_nat"
-    df_graphers.loc[j, "Indicator Dropdown"] = "Palma ratio"
-    df_graphers.loc[j, "Income measure Dropdown"] = "After tax vs. before tax"
-    df_graphers.loc[
-        j, "subtitle"
-    ] = f"The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality."
-    df_graphers.loc[j, "note"] = ""
-    df_graphers.loc[j, "type"] = np.nan
-    df_graphers.loc[j, "selectedFacetStrategy"] = "entity"
-    df_graphers.loc[j, "hasMapTab"] = "false"
-    df_graphers.loc[j, "tab"] = "chart"
-    j += 1
-
-    df_graphers["tableSlug"] = tables["name"][tab]
+df_graphers = expand_views(
+    Each(
+        {"tab": tables},
+        [
+            Each(
+                {"wel": welfare},
+                [
+                    # Gini coefficient
+                    {
+                        "title": "Gini coefficient ${wel__title}",
+                        "ySlugs": "p0p100_gini_${wel__slug}",
+                        "Indicator Dropdown": "Gini coefficient",
+                        "Income measure Dropdown": "${wel__dropdown_option}",
+                        "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality. ${wel__subtitle_ineq}",
+                        "note": "${wel__note}",
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the top 10%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the richest 10% ${wel__title}",
+                        "ySlugs": "p90p100_share_${wel__slug}",
+                        "Indicator Dropdown": "Share of the richest 10%",
+                        "Income measure Dropdown": "${wel__dropdown_option}",
+                        "subtitle": "The share of ${wel__welfare_type} received by the richest 10% of the population. ${wel__subtitle}",
+                        "note": "${wel__note}",
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the top 1%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the richest 1% ${wel__title}",
+                        "ySlugs": "p99p100_share_${wel__slug}",
+                        "Indicator Dropdown": "Share of the richest 1%",
+                        "Income measure Dropdown": "${wel__dropdown_option}",
+                        "subtitle": "The share of ${wel__welfare_type} received by the richest 1% of the population. ${wel__subtitle}",
+                        "note": "${wel__note}",
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the top 0.1%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the richest 0.1% ${wel__title}",
+                        "ySlugs": "p99_9p100_share_${wel__slug}",
+                        "Indicator Dropdown": "Share of the richest 0.1%",
+                        "Income measure Dropdown": "${wel__dropdown_option}",
+                        "subtitle": "The share of ${wel__welfare_type} received by the richest 0.1% of the population. ${wel__subtitle}",
+                        "note": "${wel__note}",
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # Share of the bottom 50%
+                    {
+                        "title": "${wel__welfare_type_capitalized} share of the poorest 50% ${wel__title}",
+                        "ySlugs": "p0p50_share_${wel__slug}",
+                        "Indicator Dropdown": "Share of the poorest 50%",
+                        "Income measure Dropdown": "${wel__dropdown_option}",
+                        "subtitle": "The share of ${wel__welfare_type} received by the poorest 50% of the population. ${wel__subtitle}",
+                        "note": "${wel__note}",
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                    # # Palma ratio
+                    {
+                        "title": "Palma ratio ${wel__title}",
+                        "ySlugs": "palma_ratio_${wel__slug}",
+                        "Indicator Dropdown": "Palma ratio",
+                        "Income measure Dropdown": "${wel__dropdown_option}",
+                        "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality. ${wel__subtitle_ineq}",
+                        "note": "${wel__note}",
+                        "type": np.nan,
+                        "selectedFacetStrategy": np.nan,
+                        "hasMapTab": "true",
+                        "tab": "map",
+                    },
+                ],
+            ),
+            # BEFORE VS. AFTER TAX
+            # Gini coefficient
+            {
+                "title": "Gini coefficient (after tax vs. before tax)",
+                "ySlugs": "p0p100_gini_pretax p0p100_gini_posttax_nat",
+                "Indicator Dropdown": "Gini coefficient",
+                "Income measure Dropdown": "After tax vs. before tax",
+                "subtitle": "The Gini coefficient measures inequality on a scale from 0 to 1. Higher values indicate higher inequality.",
+                "note": "",
+                "type": np.nan,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": "false",
+                "tab": "chart",
+            },
+            # Share of the top 10%
+            {
+                "title": "Income share of the richest 10% (after tax vs. before tax)",
+                "ySlugs": "p90p100_share_pretax p90p100_share_posttax_nat",
+                "Indicator Dropdown": "Share of the richest 10%",
+                "Income measure Dropdown": "After tax vs. before tax",
+                "subtitle": "The share of income received by the richest 10% of the population.",
+                "note": "",
+                "type": np.nan,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": "false",
+                "tab": "chart",
+            },
+            # Share of the top 1%
+            {
+                "title": "Income share of the richest 1% (after tax vs. before tax)",
+                "ySlugs": "p99p100_share_pretax p99p100_share_posttax_nat",
+                "Indicator Dropdown": "Share of the richest 1%",
+                "Income measure Dropdown": "After tax vs. before tax",
+                "subtitle": "The share of income received by the richest 1% of the population.",
+                "note": "",
+                "type": np.nan,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": "false",
+                "tab": "chart",
+            },
+            # Share of the top 0.1%
+            {
+                "title": "Income share of the richest 0.1% (after tax vs. before tax)",
+                "ySlugs": "p99_9p100_share_pretax p99_9p100_share_posttax_nat",
+                "Indicator Dropdown": "Share of the richest 0.1%",
+                "Income measure Dropdown": "After tax vs. before tax",
+                "subtitle": "The share of income received by the richest 0.1% of the population.",
+                "note": "",
+                "type": np.nan,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": "false",
+                "tab": "chart",
+            },
+            # # Palma ratio
+            {
+                "title": "Palma ratio (after tax vs. before tax)",
+                "ySlugs": "palma_ratio_pretax palma_ratio_posttax_nat",
+                "Indicator Dropdown": "Palma ratio",
+                "Income measure Dropdown": "After tax vs. before tax",
+                "subtitle": "The Palma ratio is a measure of inequality that divides the share received by the richest 10% by the share of the poorest 40%. Higher values indicate higher inequality.",
+                "note": "",
+                "type": np.nan,
+                "selectedFacetStrategy": "entity",
+                "hasMapTab": "false",
+                "tab": "chart",
+            },
+        ],
+        fields={"tableSlug": Column("tab__name")},
+    )
+)
 
 # %% [markdown]
 # Final adjustments to the graphers table: add `relatedQuestion` link and `defaultView`:
@@ -458,11 +425,13 @@ df_graphers["mapTargetTime"] = mapTargetTime
 df_graphers["mapTargetTime"] = df_graphers["mapTargetTime"].astype("Int64")
 
 # Select one default view
-df_graphers.loc[
-    (df_graphers["Indicator Dropdown"] == "Gini coefficient")
-    & (df_graphers["Income measure Dropdown"] == "After tax"),
-    ["defaultView"],
-] = "true"
+set_default_view(
+    df_graphers,
+    {
+        "Indicator Dropdown": "Gini coefficient",
+        "Income measure Dropdown": "After tax",
+    },
+)
 
 
 # %% [markdown]
@@ -473,29 +442,18 @@ df_graphers.loc[
 # Define list of variables to iterate: table names
 table_list = list(tables["name"].unique())
 
-# Header is converted into a tab-separated text
-header_tsv = df_header.to_csv(sep="\t", header=False)
-
-# Graphers table is converted into a tab-separated text
-graphers_tsv = df_graphers
-graphers_tsv = graphers_tsv.to_csv(sep="\t", index=False)
-
-# This table is indented, to follow explorers' format
-graphers_tsv_indented = textwrap.indent(graphers_tsv, "\t")
+# Split the tables by tableSlug, to write them one by one
+table_blocks = TableBlocks(df_tables, "tableSlug")
 
 # The dataframes are combined, including tables and links to the datasets
-with open(outfile, "w", newline="\n", encoding="utf-8") as f:
-    f.write(header_tsv)
-    f.write("\ngraphers\n" + graphers_tsv_indented)
+with open_output(outfile) as f:
+    # The tables are written as tab-separated text, chunk by chunk and indented (except for the header), to follow explorers' format
+    write_frame(f, df_header, indent="", header=False)
+    f.write("\ngraphers\n")
+    write_frame(f, df_graphers, index=False)
 
     for tab in range(len(tables)):
-        table_tsv = (
-            df_tables[df_tables["tableSlug"] == tables["name"][tab]]
-            .copy()
-            .reset_index(drop=True)
-        )
-        table_tsv = table_tsv.drop(columns=["tableSlug"])
-        table_tsv = table_tsv.to_csv(sep="\t", index=False)
-        table_tsv_indented = textwrap.indent(table_tsv, "\t")
+        table_tsv = table_blocks[tables["name"][tab]]
         f.write("\ntable\t" + tables["link"][tab] + "\t" + tables["name"][tab])
-        f.write("\ncolumns\t" + tables["name"][tab] + "\n" + table_tsv_indented)
+        f.write("\ncolumns\t" + tables["name"][tab] + "\n")
+        write_frame(f, table_tsv, index=False)
@@ -0,0 +1,13 @@
+"""
+Tests of explorer_tools. Run them from the `scripts` folder:
+
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+DATAPAGES_DIR = SCRIPTS_DIR.parent / "datapages"
@@ -0,0 +1,97 @@
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from explorer_tools import catalog
+
+CSV = "country,year,population\nFrance,2000,60\nFrance,2001,61\nItaly,2000,57\n"
+
+
+class Handler(SimpleHTTPRequestHandler):
+    # Serves files with a Last-Modified date (and no ETag), and records the status of every request
+    def send_response(self, code, message=None):
+        self.server.statuses.append(code)
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword == "Last-Modified" and not self.server.last_modified:
+            return
+        super().send_header(keyword, value)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(catalog, "OFFLINE", False)
+    files = tmp_path / "files"
+    files.mkdir()
+    (files / "data.csv").write_text(CSV, encoding="utf-8")
+
+    httpd = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(Handler, directory=str(files))
+    )
+    httpd.statuses = []
+    httpd.last_modified = True
+    httpd.files = files
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/data.csv"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def update(server, text):
+    # Rewrite the file with a later modification time (Last-Modified has a resolution of one second)
+    path = server.files / "data.csv"
+    mtime = path.stat().st_mtime
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime + 10, mtime + 10))
+
+
+def test_revalidates_with_last_modified(server):
+    assert catalog.fetch_header(server.url) == ["country", "year", "population"]
+    assert catalog.fetch_column(server.url, "country") == ["France", "Italy"]
+    # The header, then a conditional request before the file is streamed for the column
+    assert server.statuses == [200, 304, 200]
+
+    # The file did not change: the values come from the cache
+    assert catalog.fetch_column(server.url, "country") == ["France", "Italy"]
+    assert server.statuses[3:] == [304]
+
+    update(server, CSV + "Spain,2000,40\n")
+    assert catalog.fetch_column(server.url, "country") == ["France", "Italy", "Spain"]
+    assert server.statuses[4:] == [200, 200]
+
+    with pytest.raises(KeyError):
+        catalog.fetch_column(server.url, "continent")
+
+
+def test_files_without_validators(server, monkeypatch):
+    server.last_modified = False
+    assert catalog.fetch_column(server.url, "country") == ["France", "Italy"]
+
+    # Nothing tells whether the file changed, so it is read again
+    update(server, CSV.replace("Italy", "Spain"))
+    assert catalog.fetch_column(server.url, "country") == ["France", "Spain"]
+    assert 304 not in server.statuses
+
+    # But it is cached for offline use
+    n_requests = len(server.statuses)
+    monkeypatch.setattr(catalog, "OFFLINE", True)
+    assert catalog.fetch_header(server.url) == ["country", "year", "population"]
+    assert catalog.fetch_column(server.url, "country") == ["France", "Spain"]
+    assert len(server.statuses) == n_requests
+
+
+def test_offline_without_cache(server, monkeypatch):
+    monkeypatch.setattr(catalog, "OFFLINE", True)
+    with pytest.raises(catalog.CatalogUnavailableError):
+        catalog.fetch_header(server.url)
+    assert server.statuses == []
@@ -0,0 +1,164 @@
+import json
+
+from explorer_tools.changes import (
+    NO_CHANGES,
+    change_set_path,
+    describe,
+    diff_bytes,
+    diff_explorers,
+    from_json,
+    read_change_set,
+    record_changes,
+    to_json,
+    view_ids,
+)
+from explorer_tools.manifest import hash_bytes
+from explorer_tools.reader import parse_explorer
+
+# A small food explorer: two foods, with and without per capita values, and a table for each food
+TEXT = """\
+explorerTitle\tFood Explorer
+yAxisMin\t0
+graphers
+\ttitle\tFood Dropdown\tMetric Dropdown\tPer Capita Checkbox\tySlugs\ttableSlug
+\tAlmond production\tAlmonds\tProduction\tfalse\tproduction__tonnes\talmonds
+\tPer capita almond production\tAlmonds\tProduction\ttrue\tproduction__kg__per_capita\talmonds
+\tApple production\tApples\tProduction\tfalse\tproduction__tonnes\tapples
+\tPer capita apple production\tApples\tProduction\ttrue\tproduction__kg__per_capita\tapples
+
+table\thttps://example.org/almonds.csv\talmonds
+table\thttps://example.org/apples.csv\tapples
+
+columns\talmonds
+\tslug\tname\ttype\tunit
+\tcountry\tCountry\tEntityName\t
+\tyear\tYear\tYear\t
+\tproduction__tonnes\tProduction\tNumeric\tt
+\tproduction__kg__per_capita\tProduction per capita\tNumeric\tkg
+
+columns\tapples
+\tslug\tname\ttype\tunit
+\tcountry\tCountry\tEntityName\t
+\tyear\tYear\tYear\t
+\tproduction__tonnes\tProduction\tNumeric\tt
+\tproduction__kg__per_capita\tProduction per capita\tNumeric\tkg
+"""
+LINES = TEXT.split("\n")
+DATA = TEXT.encode("utf-8")
+NAME = "food.explorer.tsv"
+
+# The first rows of the graphers block, after its header
+FIRST_VIEW = LINES.index("graphers") + 2
+
+ALMONDS = "Food=Almonds&Metric=Production&Per+Capita=false"
+ALMONDS_PER_CAPITA = "Food=Almonds&Metric=Production&Per+Capita=true"
+
+
+def changed(lines):
+    return "\n".join(lines).encode("utf-8")
+
+
+def replace_line(index, old, new):
+    lines = list(LINES)
+    assert old in lines[index]
+    lines[index] = lines[index].replace(old, new)
+    return lines
+
+
+def test_view_ids():
+    ids = view_ids(parse_explorer(TEXT))
+    assert ids[:2] == [ALMONDS, ALMONDS_PER_CAPITA]
+    assert len(ids) == len(set(ids)) == 4
+
+
+def test_same_bytes():
+    assert diff_bytes(DATA, DATA) == NO_CHANGES
+    assert describe(NO_CHANGES) == "no changes"
+
+
+def test_new_explorer():
+    change_set = diff_bytes(None, DATA)
+    assert len(change_set.views.added) == 4
+    assert change_set.views.removed == change_set.views.modified == []
+    assert change_set.layout == []
+
+
+def test_modified_view():
+    lines = replace_line(FIRST_VIEW, "Almond production", "Almond production (tonnes)")
+    change_set = diff_bytes(DATA, changed(lines))
+    assert change_set.views.modified == [ALMONDS]
+    assert change_set.views.added == change_set.views.removed == []
+    assert describe(change_set) == "views: 1 modified"
+
+
+def test_removed_view():
+    lines = LINES[:FIRST_VIEW] + LINES[FIRST_VIEW + 1 :]
+    change_set = diff_bytes(DATA, changed(lines))
+    assert change_set.views.removed == [ALMONDS]
+    assert describe(change_set) == "views: 1 removed"
+
+
+def test_column_definition_affects_views():
+    index = next(
+        i for i, line in enumerate(LINES) if line.startswith("\tproduction__tonnes\t")
+    )
+    lines = replace_line(index, "\tt", "\ttonnes")
+    change_set = diff_bytes(DATA, changed(lines))
+    assert change_set.columns.modified == [("almonds", "production__tonnes")]
+    assert change_set.views == NO_CHANGES.views
+    assert change_set.affected_views == [ALMONDS]
+    assert describe(change_set) == "views: 1 affected; columns: 1 modified"
+
+
+def test_settings():
+    lines = replace_line(LINES.index("yAxisMin\t0"), "0", "1")
+    change_set = diff_bytes(DATA, changed(lines))
+    assert change_set.settings == ["yAxisMin"]
+    assert describe(change_set) == "settings: yAxisMin"
+
+
+def test_view_order():
+    lines = list(LINES)
+    lines[FIRST_VIEW], lines[FIRST_VIEW + 1] = lines[FIRST_VIEW + 1], lines[FIRST_VIEW]
+    change_set = diff_bytes(DATA, changed(lines))
+    assert change_set == NO_CHANGES._replace(layout=["view order"])
+    assert describe(change_set) == "layout: view order"
+
+
+def test_formatting():
+    change_set = diff_bytes(DATA, DATA.replace(b"\ngraphers\n", b"\n\ngraphers\n"))
+    assert change_set == NO_CHANGES._replace(layout=["formatting"])
+    assert describe(change_set) == "layout: formatting"
+    # The explorer did not change for the reader
+    assert diff_explorers(parse_explorer(TEXT), parse_explorer(TEXT)) == NO_CHANGES
+
+
+def test_json_round_trip():
+    lines = replace_line(FIRST_VIEW, "Almond production", "Almond production (tonnes)")
+    change_set = diff_bytes(DATA, changed(lines))
+    record = json.loads(json.dumps(to_json(change_set)))
+    assert from_json(record) == change_set
+    # Change sets written before `layout` was recorded
+    del record["layout"]
+    assert from_json(record).layout == []
+
+
+def test_record_changes(tmp_path):
+    path = tmp_path / NAME
+    path.write_bytes(DATA)
+    new_path = tmp_path / "new.tsv"
+    new_data = changed(replace_line(FIRST_VIEW, "Almond production", "Almonds"))
+    new_path.write_bytes(new_data)
+
+    change_set = record_changes(path, new_path)
+    assert change_set.views.modified == [ALMONDS]
+    record = read_change_set(path)
+    assert record["explorer"] == "food"
+    assert record["previous_sha256"] == hash_bytes(DATA)
+    assert record["sha256"] == hash_bytes(new_data)
+    assert record["views"]["modified"] == [ALMONDS]
+    assert change_set_path(path).name == "food.explorer.tsv.changes.json"
+
+    # An explorer that is not replaced gets an empty change set
+    assert record_changes(path) == NO_CHANGES
+    assert read_change_set(path)["previous_sha256"] == read_change_set(path)["sha256"]
@@ -0,0 +1,97 @@
+import json
+import shutil
+
+import pytest
+
+from conftest import DATAPAGES_DIR
+from explorer_tools.datapage_schema import (
+    CHART_INDEX_PATH,
+    DATAPAGE_SCHEMA,
+    Optional,
+    chart_ids,
+    chart_index,
+    compile_schema,
+    read_chart_index,
+    validate_datapages,
+    write_chart_index,
+)
+
+DATAPAGE = DATAPAGES_DIR / "180340.json"
+
+validate = compile_schema(DATAPAGE_SCHEMA)
+
+
+@pytest.fixture
+def datapage():
+    return json.loads(DATAPAGE.read_text(encoding="utf-8"))
+
+
+def test_committed_datapages_are_valid():
+    datapages, problems = validate_datapages(DATAPAGES_DIR)
+    assert problems == {}
+    assert len(datapages) == len(list(DATAPAGES_DIR.glob("*.json"))) > 0
+
+
+def test_mutated_datapage(datapage):
+    datapage["showDataPageOnChartIds"] = [5476, "5477", True]
+    del datapage["title"]
+    datapage["relatedData"][0]["url"] = None
+    datapage["sources"][0]["sourceRetrievedOn"] = 2023
+    datapage["descriptionFromSource"] = "United Nations"
+    datapage["unknown"] = 1
+    assert validate(datapage) == [
+        "$: missing property title",
+        "$.showDataPageOnChartIds[1]: expected an integer, got a string",
+        "$.showDataPageOnChartIds[2]: expected an integer, got a boolean",
+        "$.descriptionFromSource: expected an object, got a string",
+        "$.relatedData[0].url: expected a string, got null",
+        "$.sources[0].sourceRetrievedOn: expected a string, got a number",
+        "$: unknown property unknown",
+    ]
+    assert chart_ids(datapage) == [5476]
+
+
+def test_optional_properties(datapage):
+    assert validate(datapage) == []
+    del datapage["subtitle"]
+    assert validate(datapage) == []
+    datapage["subtitle"] = None
+    assert validate(datapage) == ["$.subtitle: expected a string, got null"]
+
+
+def test_compile_schema_errors():
+    with pytest.raises(ValueError):
+        compile_schema([str, int])
+    with pytest.raises(ValueError):
+        compile_schema({"value": float})
+    assert compile_schema({"a": Optional([int])})({"a": [1, 2]}) == []
+
+
+def test_duplicate_chart_ids(tmp_path, datapage):
+    datapage["showDataPageOnChartIds"] = [5476, 5476]
+    (tmp_path / DATAPAGE.name).write_text(json.dumps(datapage), encoding="utf-8")
+    _, problems = validate_datapages(tmp_path)
+    assert problems == {
+        DATAPAGE.name: ["$.showDataPageOnChartIds: chart 5476 is listed 2 times"]
+    }
+
+
+def test_chart_index(tmp_path):
+    datapages, _ = validate_datapages(DATAPAGES_DIR)
+    index = chart_index(datapages)
+    assert index.conflicts == {}
+    assert index.chart_ids[5476] == DATAPAGE.name
+    assert read_chart_index(CHART_INDEX_PATH) == index.chart_ids
+
+    path = tmp_path / "chart-ids.json"
+    assert write_chart_index(index, path)
+    assert not write_chart_index(index, path)
+    assert path.read_bytes() == CHART_INDEX_PATH.read_bytes()
+
+
+def test_chart_claimed_by_two_datapages(tmp_path):
+    shutil.copy(DATAPAGE, tmp_path / "1.json")
+    shutil.copy(DATAPAGE, tmp_path / "2.json")
+    index = chart_index(validate_datapages(tmp_path)[0])
+    assert index.chart_ids == {}
+    assert index.conflicts == {5476: ["1.json", "2.json"]}
@@ -0,0 +1,134 @@
+import json
+import shutil
+
+import pytest
+
+from conftest import DATAPAGES_DIR
+from explorer_tools.datapages import (
+    WILDCARD,
+    DatapageEditError,
+    Edit,
+    edit_datapages,
+    parse_path,
+    serialize,
+)
+
+DATAPAGE = DATAPAGES_DIR / "180340.json"
+
+
+@pytest.fixture
+def folder(tmp_path):
+    shutil.copy(DATAPAGE, tmp_path)
+    return tmp_path
+
+
+def edit(folder, *edits, dry_run=False):
+    [result] = edit_datapages(
+        [Edit.parse(*e) for e in edits], folder=folder, dry_run=dry_run
+    )
+    return result, json.loads((folder / DATAPAGE.name).read_text(encoding="utf-8"))
+
+
+def test_parse_path():
+    assert parse_path("$.sources[0].sourceName") == ("sources", 0, "sourceName")
+    assert parse_path("$.relatedData[*].source") == ("relatedData", WILDCARD, "source")
+    assert parse_path('$["key with spaces"][-1]') == ("key with spaces", -1)
+    with pytest.raises(DatapageEditError):
+        parse_path("sources")
+    with pytest.raises(DatapageEditError):
+        parse_path("$")
+
+
+def test_edit_parse_errors():
+    with pytest.raises(DatapageEditError):
+        Edit.parse("copy", "$.title", "$.subtitle")
+    with pytest.raises(DatapageEditError):
+        Edit.parse("set", "$.title", "not json")
+    with pytest.raises(DatapageEditError):
+        Edit.parse("move", "$.title", "$.relatedData[*].title")
+
+
+def test_datapages_are_serialized_as_in_the_repository():
+    data = DATAPAGE.read_bytes()
+    assert serialize(json.loads(data)) == data
+
+
+def test_no_edits_leaves_the_file_unchanged(folder):
+    result, _ = edit(folder)
+    assert (result.changed, result.n_edits, result.error) == (False, 0, None)
+    assert (folder / DATAPAGE.name).read_bytes() == DATAPAGE.read_bytes()
+
+
+def test_no_edits_leaves_every_datapage_unchanged(tmp_path):
+    # Some datapages are not formatted like `serialize` would
+    for path in DATAPAGES_DIR.glob("*.json"):
+        shutil.copy(path, tmp_path)
+    results = edit_datapages([], folder=tmp_path)
+    assert len(results) > 0
+    assert not any(result.changed or result.error for result in results)
+    for path in DATAPAGES_DIR.glob("*.json"):
+        assert (tmp_path / path.name).read_bytes() == path.read_bytes()
+
+
+def test_edits_that_change_nothing_keep_the_formatting(folder):
+    path = folder / DATAPAGE.name
+    data = json.dumps(json.loads(path.read_bytes()), indent=2).encode("utf-8")
+    path.write_bytes(data)
+    result, _ = edit(folder, ("delete", "$.notAProperty"))
+    assert (result.changed, result.n_edits) == (False, 0)
+    assert path.read_bytes() == data
+
+
+def test_new_order_of_the_properties_is_a_change(folder):
+    # Moving the title to where it is, which puts it last
+    result, datapage = edit(folder, ("move", "$.title", "$.title"))
+    assert result.changed
+    assert list(datapage)[-1] == "title"
+
+
+def test_rename_keeps_the_position(folder):
+    result, datapage = edit(
+        folder, ("rename", "$.sources[*].sourceRetrievedOn", "retrievedOn")
+    )
+    assert result.changed and result.n_edits == 1
+    assert list(datapage["sources"][0]) == [
+        "sourceName",
+        "retrievedOn",
+        "sourceRetrievedFromUrl",
+    ]
+
+
+def test_delete_every_item(folder):
+    original = json.loads(DATAPAGE.read_text(encoding="utf-8"))
+    n_sources = sum("source" in item for item in original["relatedData"])
+    result, datapage = edit(folder, ("delete", "$.relatedData[*].source"))
+    assert result.n_edits == n_sources > 0
+    assert not any("source" in item for item in datapage["relatedData"])
+    assert len(datapage["relatedData"]) == len(original["relatedData"])
+
+
+def test_set_creates_objects(folder):
+    _, datapage = edit(folder, ("set", "$.citation.short", '"UNOOSA (2023)"'))
+    assert datapage["citation"] == {"short": "UNOOSA (2023)"}
+    assert list(datapage)[-1] == "citation"
+
+
+def test_move(folder):
+    original = json.loads(DATAPAGE.read_text(encoding="utf-8"))
+    _, datapage = edit(
+        folder, ("move", "$.nameOfSource", "$.descriptionFromSource.source")
+    )
+    assert "nameOfSource" not in datapage
+    assert datapage["descriptionFromSource"]["source"] == original["nameOfSource"]
+
+
+def test_move_several_values_fails(folder):
+    result, _ = edit(folder, ("move", "$.topicTagsLinks[*].url", "$.url"))
+    assert result.error and not result.changed
+    assert (folder / DATAPAGE.name).read_bytes() == DATAPAGE.read_bytes()
+
+
+def test_dry_run_does_not_write(folder):
+    result, _ = edit(folder, ("delete", "$.nextUpdate"), dry_run=True)
+    assert result.changed and result.n_edits == 1
+    assert (folder / DATAPAGE.name).read_bytes() == DATAPAGE.read_bytes()
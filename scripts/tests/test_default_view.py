@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from explorer_tools.default_view import (
+    DefaultViewError,
+    ViewIndex,
+    find_default_view,
+    set_default_view,
+)
+
+
+@pytest.fixture
+def views():
+    # Filtered views, as the generators have them after dropping some rows: the index is not 0, 1, 2...
+    return pd.DataFrame(
+        {
+            "Indicator Dropdown": ["Gini", "Gini", "Share", "Share"],
+            "Income Radio": ["After tax", "Before tax", "After tax", "After tax"],
+            "ySlugs": ["gini_post", "gini_pre", "share_a", "share_b"],
+        },
+        index=[3, 5, 8, 13],
+    )
+
+
+def test_set_default_view(views):
+    selector = {"Indicator Dropdown": "Gini", "Income Radio": "Before tax"}
+    assert set_default_view(views, selector) == 1
+    assert list(views.columns)[-1] == "defaultView"
+    assert views["defaultView"].tolist()[1] == "true"
+    assert views["defaultView"].isna().tolist() == [True, False, True, True]
+    assert views.index.tolist() == [3, 5, 8, 13]
+
+
+def test_existing_column(views):
+    views["defaultView"] = ["false", np.nan, np.nan, np.nan]
+    set_default_view(views, {"ySlugs": "share_b"})
+    assert views["defaultView"].tolist()[::3] == ["false", "true"]
+
+
+def test_no_view_or_several_views(views):
+    with pytest.raises(DefaultViewError, match="matches 0 views"):
+        set_default_view(views, {"Indicator Dropdown": "Palma"})
+    with pytest.raises(DefaultViewError, match="matches 2 views"):
+        set_default_view(
+            views, {"Indicator Dropdown": "Share", "Income Radio": "After tax"}
+        )
+    assert "defaultView" not in views
+
+
+def test_unknown_columns(views):
+    with pytest.raises(DefaultViewError, match="Period Radio"):
+        find_default_view(views, {"Period Radio": "Year"})
+
+
+def test_view_index(views):
+    index = ViewIndex(views, ["Indicator Dropdown", "Income Radio"])
+    share = {"Income Radio": "After tax", "Indicator Dropdown": "Share"}
+    assert index.find(share) == [2, 3]
+    assert index.find({**share, "Indicator Dropdown": "Palma"}) == []
+    with pytest.raises(DefaultViewError):
+        index.find({"Indicator Dropdown": "Gini"})
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from explorer_tools.frames import RowBuilder, is_number
+
+ROWS = [
+    {"title": "Gini", "yAxisMin": 0, "note": None},
+    {"title": "Mean", "type": "LineChart"},
+    {"yAxisMin": 0.5, "note": "In $", "hasMapTab": True},
+    {"title": "Median", "yAxisMin": "auto"},
+]
+
+
+def build(rows):
+    builder = RowBuilder()
+    for row in rows:
+        builder.add_row(row)
+    return builder
+
+
+def test_same_frame_as_loc():
+    # The frame that `df.loc[j, column] = value` for every cell produced (with pandas < 3, which allowed the upcast of yAxisMin)
+    expected = pd.DataFrame(
+        {
+            "title": np.array(["Gini", "Mean", np.nan, "Median"], dtype=object),
+            "yAxisMin": np.array([0.0, np.nan, 0.5, "auto"], dtype=object),
+            "note": np.array([np.nan, np.nan, "In $", np.nan], dtype=object),
+            "type": np.array([np.nan, "LineChart", np.nan, np.nan], dtype=object),
+            "hasMapTab": np.array([np.nan, np.nan, True, np.nan], dtype=object),
+        }
+    )
+    pd.testing.assert_frame_equal(build(ROWS).to_frame(), expected)
+
+
+def test_column_types():
+    df = build(ROWS).to_frame()
+    # The numbers set before the first text are turned into floats
+    assert df["yAxisMin"].dtype == object
+    assert [type(value) for value in df["yAxisMin"]] == [float, float, float, str]
+    assert df["note"].isna().tolist() == [True, True, False, True]
+
+    df = build([{"value": 1}, {"value": None}, {}]).to_frame()
+    assert df["value"].dtype == np.float64
+    assert df["value"].isna().tolist() == [False, True, True]
+
+
+def test_set_column():
+    builder = build(ROWS[:2])
+    builder.set_column("tableSlug", "gini")
+    builder.add_row({"title": "Share"})
+    df = builder.to_frame()
+    assert len(builder) == 3
+    assert df["tableSlug"][:2].tolist() == ["gini", "gini"]
+    assert pd.isna(df["tableSlug"][2])
+
+
+def test_strings_are_shared():
+    builder = RowBuilder()
+    for word in ["share", "share"]:
+        builder.add_row({"description": "Income " + word})
+    df = builder.to_frame()
+    assert df["description"][0] is df["description"][1]
+
+
+def test_is_number():
+    assert all(map(is_number, [1, 0.5, np.int64(2), np.float32(1), None]))
+    assert not any(map(is_number, [True, np.bool_(False), "1", [1]]))
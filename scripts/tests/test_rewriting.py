@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from explorer_tools import rewriting
+from explorer_tools.rewriting import RewriteRules
+
+RULES = [
+    ("per capita", "per person"),
+    ("per capita per day", "per person per day"),
+    ("Depending on the country and year, ", ""),
+    ("No longer in the sheets.", "Never used."),
+]
+
+NOTES = pd.Series(
+    [
+        "Depending on the country and year, income is per capita per day.",
+        "Income per capita. Income per capita.",
+        np.nan,
+        "Income per capita. Income per capita.",
+        3,
+        "Nothing to rewrite.",
+    ]
+)
+
+
+def test_apply():
+    rules = RewriteRules(RULES)
+    notes = rules.apply(NOTES)
+    assert notes.tolist()[:2] == [
+        "income is per person per day.",
+        "Income per person. Income per person.",
+    ]
+    assert pd.isna(notes[2]) and notes[4] == 3
+    assert notes[5] == "Nothing to rewrite."
+    # The Series passed is left alone
+    assert NOTES[1] == "Income per capita. Income per capita."
+
+
+def test_same_as_str_replace():
+    # Without overlapping phrases, one pass gives the same result as one str.replace per rule
+    rules = [RULES[2], RULES[0]]
+    notes = NOTES[NOTES.map(lambda x: isinstance(x, str))]
+    expected = notes
+    for old, new in rules:
+        expected = expected.str.replace(old, new, regex=False)
+    pd.testing.assert_series_equal(RewriteRules(rules).apply(notes), expected)
+
+
+def test_counts():
+    rules = RewriteRules(RULES)
+    rules.apply(NOTES)
+    # Cells changed by each rule, not occurrences
+    assert rules.counts.tolist() == [2, 1, 1, 0]
+    rules.apply(NOTES[:1])
+    assert rules.counts.tolist() == [2, 2, 2, 0]
+    assert list(rules.counts.index) == [old for old, _ in RULES]
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError, match="non-empty"):
+        RewriteRules([("", "text")])
+    with pytest.raises(ValueError, match="more than one"):
+        RewriteRules([("per capita", "per person"), ("per capita", "each")])
+    with pytest.raises(ValueError, match="contains the phrase"):
+        RewriteRules([("per capita", "per person"), ("per person", "each")])
+
+
+def test_warn_unused(monkeypatch, capsys):
+    rules = RewriteRules(RULES)
+    rules.apply(NOTES)
+    rules.warn_unused()
+    assert capsys.readouterr().out == ""
+
+    monkeypatch.setattr(rewriting, "WARN_UNUSED", True)
+    rules.warn_unused()
+    assert capsys.readouterr().out == (
+        "⚠️ Rewrite rule did not change any cell: No longer in the sheets.\n"
+    )
@@ -0,0 +1,89 @@
+from string import Template
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from explorer_tools.templating import (
+    TemplateError,
+    compile_template,
+    escape,
+    resolve_columns,
+    substitute_columns,
+)
+
+
+@pytest.fixture
+def views():
+    return pd.DataFrame(
+        {
+            "title": [
+                "${food} production",
+                "${food} production per capita",
+                "Yield",
+                np.nan,
+            ],
+            "ySlugs": ["production__${unit}", "production__${unit}__per_capita", 1, ""],
+        }
+    )
+
+
+def test_substitute_columns(views):
+    values = {"food": pd.Series(["Almond", "Apple", "Barley", "Beans"]), "unit": "t"}
+    df = substitute_columns(views, ["title", "ySlugs"], values)
+
+    # Same as Template.substitute on every string cell
+    expected = views.copy()
+    for column in ["title", "ySlugs"]:
+        for i, cell in enumerate(views[column]):
+            if isinstance(cell, str):
+                row = {"food": values["food"][i], "unit": values["unit"]}
+                expected.loc[i, column] = Template(cell).substitute(row)
+    pd.testing.assert_frame_equal(df, expected)
+
+    assert df["title"].tolist()[:3] == [
+        "Almond production",
+        "Apple production per capita",
+        "Yield",
+    ]
+    # The dataframe passed is left alone
+    assert views["title"][0] == "${food} production"
+
+
+def test_missing_placeholders(views):
+    with pytest.raises(TemplateError, match="food"):
+        substitute_columns(views, ["title", "ySlugs"], {"unit": "t"})
+
+
+def test_escaped_dollars():
+    df = pd.DataFrame({"note": [escape("In international-$ at ") + "${year} prices"]})
+    df = substitute_columns(df, ["note"], {"year": 2017})
+    assert df["note"][0] == "In international-$ at 2017 prices"
+    with pytest.raises(TemplateError):
+        compile_template("International-$ at 2017 prices")
+
+
+def test_resolve_columns():
+    df = pd.DataFrame(
+        {
+            "title": ["${name} (${sex__name})", "${name}"],
+            "name": ["Population of ${sex__slug}", "Population"],
+            "sex__name": ["Female", "All"],
+            "sex__slug": ["women", "all"],
+        }
+    )
+    df = resolve_columns(df)
+    # `title` uses `name`, which is itself a template: it is filled in first
+    assert df["title"].tolist() == ["Population of women (Female)", "Population"]
+    assert df["name"].tolist() == ["Population of women", "Population"]
+
+
+def test_resolve_columns_errors():
+    cycle = pd.DataFrame({"a": ["${b}"], "b": ["${a}"]})
+    with pytest.raises(TemplateError, match="a -> b -> a"):
+        resolve_columns(cycle)
+    unknown = pd.DataFrame({"a": ["${c}"]})
+    with pytest.raises(TemplateError, match="c"):
+        resolve_columns(unknown)
+    # Only the columns given are filled in
+    assert resolve_columns(unknown, columns=[])["a"][0] == "${c}"
@@ -0,0 +1,80 @@
+import io
+import textwrap
+from string import Template
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from explorer_tools.templating import TemplateError
+from explorer_tools.writer import TableBlocks, write_frame, write_template
+
+
+@pytest.fixture
+def tables():
+    return pd.DataFrame(
+        {
+            "tableSlug": ["gini", "mean", "gini", "share", "mean", "gini"],
+            "survey": ["income", "income", "consumption", "income", "income", "income"],
+            "slug": ["gini_1", "mean_1", "gini_2", "share_1", "mean_2", "gini_3"],
+            "value": [0.5, np.nan, 1, 2, 3, 4],
+        }
+    )
+
+
+def written(df, **kwargs):
+    f = io.StringIO()
+    write_frame(f, df, **kwargs)
+    return f.getvalue()
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4, 1000])
+def test_write_frame_in_chunks(tables, chunksize):
+    expected = textwrap.indent(tables.to_csv(sep="\t", index=False), "\t")
+    assert written(tables, chunksize=chunksize, index=False) == expected
+
+
+def test_write_frame_options(tables):
+    assert written(tables, indent="", header=False, index=False, chunksize=4) == (
+        tables.to_csv(sep="\t", header=False, index=False)
+    )
+    # An empty frame still gets its header
+    assert written(tables.iloc[:0], index=False) == "\ttableSlug\tsurvey\tslug\tvalue\n"
+
+
+def test_table_blocks(tables):
+    blocks = TableBlocks(tables, "tableSlug")
+    for slug in ["gini", "mean", "share", "missing"]:
+        expected = tables[tables["tableSlug"] == slug].drop(columns="tableSlug")
+        pd.testing.assert_frame_equal(
+            blocks[slug].reset_index(drop=True), expected.reset_index(drop=True)
+        )
+
+
+def test_table_blocks_by_several_columns(tables):
+    blocks = TableBlocks(tables, ["tableSlug", "survey"])
+    assert blocks["gini", "income"]["slug"].tolist() == ["gini_1", "gini_3"]
+    assert blocks["gini", "consumption"]["slug"].tolist() == ["gini_2"]
+    assert list(blocks["mean", "consumption"].columns) == ["slug", "value"]
+    assert len(blocks["mean", "consumption"]) == 0
+
+
+def test_write_template(tables):
+    template = "explorerTitle\t$title\ngraphers\n$graphers\nyAxisMin\t$${min}\n"
+    f = io.StringIO()
+    write_template(
+        f,
+        Template(template),
+        title="Inequality",
+        graphers=lambda f: write_frame(f, tables, index=False),
+    )
+    graphers = written(tables, index=False)
+    assert f.getvalue() == Template(template).substitute(
+        title="Inequality", graphers=graphers
+    )
+
+    f = io.StringIO()
+    with pytest.raises(TemplateError, match="graphers"):
+        write_template(f, template, title="Inequality")
+    # Nothing was written
+    assert f.getvalue() == ""